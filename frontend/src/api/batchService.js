@@ -0,0 +1,20 @@
+import axiosInstance from './axiosInstance';
+
+/**
+ * Birden fazla API isteğini tek HTTP isteğiyle gönderir (POST /api/v1/batch/).
+ * Yanıtlar isteklerle aynı sıradadır. Her birinin `status` ve `body` alanı normal isteğin yanıtıyla aynıdır.
+ * @param {Array<{method: string, path: string, body?: object}>} requests Sırayla çalıştırılacak istekler.
+ * @param {object} [options]
+ * @param {boolean} [options.atomic=false] True ise biri başarısız olduğunda tüm değişiklikler geri alınır.
+ * @returns {Promise<{results: Array<{status: number, body: any}>, rolled_back: boolean}>}
+ * @throws {Error} Batch isteğinin kendisi başarısız olursa hata fırlatır.
+ */
+export const sendBatchAPI = async (requests, { atomic = false } = {}) => {
+    try {
+        const response = await axiosInstance.post('/api/v1/batch/', { atomic, requests });
+        return response.data;
+    } catch (error) {
+        console.error("Batch isteği başarısız:", error.response ? error.response.data : error.message);
+        throw error;
+    }
+};
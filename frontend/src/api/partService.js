@@ -1,4 +1,5 @@
 import axiosInstance from './axiosInstance';
+import { sendBatchAPI } from './batchService';
 
 /**
  * Yeni bir parça oluşturur.
@@ -49,3 +50,16 @@ export const recyclePart = async (partId) => {
 };
 
 // Diğer parça işlemleri (get_by_id, update, delete) buraya eklenebilir.
+
+/**
+ * Birden fazla parçayı tek istekle geri dönüşüme gönderir.
+ * @param {Array<string|number>} partIds Geri dönüşüme gönderilecek parçaların ID'leri.
+ * @returns {Promise<Array<{status: number, body: any}>>} Her parça için (aynı sırayla) sonuç.
+ * @throws {Error} Batch isteğinin kendisi başarısız olursa hata fırlatır.
+ */
+export const recycleParts = async (partIds) => {
+    const { results } = await sendBatchAPI(
+        partIds.map((partId) => ({ method: 'POST', path: `/api/v1/envanter/parts/${partId}/recycle/` }))
+    );
+    return results;
+};
@@ -72,7 +72,7 @@ function AircraftAssemblyPage() {
         const partTypeId = partTypeMap[partTypeCode];
 
         try {
-            const apiUrl = `/api/v1/envanter/parts/?status=STOKTA&aircraft_model_compatibility=${aircraftModelId}&part_type=${partTypeId}`;
+            const apiUrl = `/api/v1/envanter/parts/?available=true&aircraft_model_compatibility=${aircraftModelId}&part_type=${partTypeId}`;
             const res = await axiosInstance.get(apiUrl);
             return res.data.results || res.data || [];
         } catch (err) {
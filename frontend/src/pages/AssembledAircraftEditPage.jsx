@@ -174,6 +174,8 @@ function AssembledAircraftEditPage() {
             setLoading(false);
             return;
         }
+        // Uçak bu sayfa açıldıktan sonra başka biri tarafından değiştirildiyse API 409 döner.
+        dataToSubmit.version = originalAircraft.version;
 
         try {
             await updateAssembledAircraftAPI(aircraftId, dataToSubmit);
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import AssemblyRollup, ProductionRollup
+
+
+@admin.register(ProductionRollup)
+class ProductionRollupAdmin(admin.ModelAdmin):
+    list_display = ('grain', 'bucket_start', 'team', 'part_type', 'aircraft_model', 'count')
+    list_filter = ('grain', 'team', 'part_type', 'aircraft_model')
+    date_hierarchy = 'bucket_start'
+
+
+@admin.register(AssemblyRollup)
+class AssemblyRollupAdmin(admin.ModelAdmin):
+    list_display = ('grain', 'bucket_start', 'aircraft_model', 'team', 'count')
+    list_filter = ('grain', 'aircraft_model', 'team')
+    date_hierarchy = 'bucket_start'
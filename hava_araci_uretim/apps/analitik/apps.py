@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class AnalitikConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.analitik'
+
+    def ready(self):
+        from . import dashboard, rollups
+        rollups.connect_signals()
+        dashboard.connect_signals()
@@ -0,0 +1,172 @@
+"""
+Dashboard özeti: Stok durumu, model bazında montaj kapasitesi, takımın son üretimleri ve son montajlar.
+
+Özet sabit sayıda sorgu ile üretilir (en fazla 4):
+1. Parçalar durum, parça tipi ve uçak modeline göre tek bir GROUP BY ile sayılır. Durum, tip ve
+   model toplamları ile kapasite bu en ince gruplamadan (en fazla 3 x 4 x 4 satır) Python'da
+   toplanır. GROUPING SETS ile aynı sonuç elde edilir, ancak veritabanından bağımsızdır. Montaj için
+   rezerve edilmiş (bkz. montaj.KitReservation) stoktaki parçalar aynı sorguda ayrıca sayılır ve
+   kapasiteden düşülür.
+2. Takımın son 7 ve 30 gündeki üretim/montaj sayıları özet (rollup) tablolarından okunur.
+3. Takımın son üretimleri (montaj takımı için son montajları).
+4. Son montajlar.
+
+Sonuç takım başına önbelleğe alınır. Parça veya uçak kaydedildiğinde/silindiğinde (transaction
+commit edildikten sonra) önbellek sürümü artırılır ve tüm takımların özetleri geçersiz olur.
+Önbellek process'e özelse (LocMem) diğer worker'lar yeni veriyi en geç DASHBOARD_CACHE_TTL
+saniye sonra görür.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from apps.core import reference_cache
+from .rollups import bucket_start
+
+DEFAULT_TTL = 30
+RECENT_LIMIT = 5
+REQUIRED_PART_TYPES = ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK']
+
+VERSION_KEY = 'dashboard:summary:version'
+
+
+def _names_by_id(mapping):
+    return {obj.pk: name for name, obj in mapping.items()}
+
+
+def _stock_summary():
+    from apps.envanter.models import Part
+    from apps.montaj.models import KitReservation
+
+    part_types = _names_by_id(reference_cache.get_part_types())
+    aircraft_models = _names_by_id(reference_cache.get_aircraft_models())
+
+    rows = (
+        Part.objects
+        .values('status', 'part_type_id', 'aircraft_model_compatibility_id')
+        .annotate(total=Count('id'), reserved=Count('id', filter=KitReservation.reserved()))
+        .order_by()
+    )
+
+    by_status = {code: 0 for code, _label in Part.STATUS_CHOICES}
+    by_part_type = {name: 0 for name in part_types.values()}
+    by_aircraft_model = {name: 0 for name in aircraft_models.values()}
+    in_stock = {model: {part_type: 0 for part_type in REQUIRED_PART_TYPES} for model in aircraft_models.values()}
+    reserved = {model: 0 for model in aircraft_models.values()}
+
+    for row in rows:
+        by_status[row['status']] = by_status.get(row['status'], 0) + row['total']
+        if row['status'] != 'STOKTA':
+            continue
+        part_type = part_types.get(row['part_type_id'])
+        model = aircraft_models.get(row['aircraft_model_compatibility_id'])
+        by_part_type[part_type] = by_part_type.get(part_type, 0) + row['total']
+        by_aircraft_model[model] = by_aircraft_model.get(model, 0) + row['total']
+        if model in in_stock and part_type in in_stock[model]:
+            in_stock[model][part_type] += row['total'] - row['reserved']
+            reserved[model] += row['reserved']
+
+    capacity = {
+        model: {
+            'buildable': min(counts.values()),
+            'missing_part_types': [part_type for part_type, count in counts.items() if count == 0],
+            'in_stock': counts,
+            'reserved': reserved[model],
+        }
+        for model, counts in in_stock.items()
+    }
+    stock = {'by_status': by_status, 'by_part_type': by_part_type, 'by_aircraft_model': by_aircraft_model}
+    return stock, capacity
+
+
+def _team_activity(team, now):
+    from apps.envanter.models import Part
+    from apps.montaj.models import AssembledAircraft
+    from .models import AssemblyRollup, ProductionRollup
+
+    is_assembly_team = team.name == 'MONTAJ'
+    rollup_model = AssemblyRollup if is_assembly_team else ProductionRollup
+    last_7_start = bucket_start(now - timedelta(days=6), 'DAY')
+    last_30_start = bucket_start(now - timedelta(days=29), 'DAY')
+    totals = rollup_model.objects.filter(grain='DAY', team=team, bucket_start__gte=last_30_start).aggregate(
+        last_7_days=Sum('count', filter=Q(bucket_start__gte=last_7_start), default=0),
+        last_30_days=Sum('count', default=0),
+    )
+
+    if is_assembly_team:
+        recent = [
+            {'tail_number': aircraft.tail_number, 'aircraft_model': aircraft.aircraft_model.name,
+             'created_at': aircraft.created_at}
+            for aircraft in AssembledAircraft.objects.filter(assembled_by_team=team)
+            .select_related('aircraft_model').order_by('-created_at')[:RECENT_LIMIT]
+        ]
+    else:
+        recent = [
+            {'serial_number': part.serial_number, 'part_type': part.part_type.name,
+             'aircraft_model': part.aircraft_model_compatibility.name, 'status': part.status,
+             'created_at': part.created_at}
+            for part in Part.objects.filter(produced_by_team=team)
+            .select_related('part_type', 'aircraft_model_compatibility').order_by('-created_at')[:RECENT_LIMIT]
+        ]
+    return {'kind': 'assembly' if is_assembly_team else 'production', **totals, 'recent': recent}
+
+
+def _recent_assemblies():
+    from apps.montaj.models import AssembledAircraft
+
+    return [
+        {'tail_number': aircraft.tail_number, 'aircraft_model': aircraft.aircraft_model.name,
+         'assembled_by_team': aircraft.assembled_by_team.name if aircraft.assembled_by_team else None,
+         'assembly_date': aircraft.assembly_date}
+        for aircraft in AssembledAircraft.objects.select_related('aircraft_model', 'assembled_by_team')
+        .order_by('-created_at')[:RECENT_LIMIT]
+    ]
+
+
+def build_summary(team):
+    """Özeti önbelleğe bakmadan üretir."""
+    now = timezone.now()
+    stock, capacity = _stock_summary()
+    return {
+        'team': {'id': team.pk, 'name': team.name, 'display_name': team.get_name_display()} if team else None,
+        'stock': stock,
+        'capacity': capacity,
+        'my_team_activity': _team_activity(team, now) if team else None,
+        'recent_assemblies': _recent_assemblies(),
+        'generated_at': now,
+    }
+
+
+def get_summary(team):
+    """Takımın özetini önbellekten döndürür, yoksa üretip önbelleğe yazar."""
+    version = cache.get_or_set(VERSION_KEY, 1, timeout=None)
+    key = f"dashboard:summary:{version}:{team.pk if team else 'none'}"
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_summary(team)
+        cache.set(key, summary, getattr(settings, 'DASHBOARD_CACHE_TTL', DEFAULT_TTL))
+    return summary
+
+
+def invalidate(**kwargs):
+    """Tüm takımların özetlerini geçersiz kılar (eski sürümün anahtarları TTL ile silinir)."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+def _invalidate_on_commit(**kwargs):
+    # Commit'ten önce geçersiz kılınırsa, eşzamanlı bir istek eski veriyi yeni sürümle önbelleğe yazabilir.
+    transaction.on_commit(invalidate)
+
+
+def connect_signals():
+    for sender in ('envanter.Part', 'montaj.AssembledAircraft'):
+        post_save.connect(_invalidate_on_commit, sender=sender, dispatch_uid=f'dashboard_{sender}_saved')
+        post_delete.connect(_invalidate_on_commit, sender=sender, dispatch_uid=f'dashboard_{sender}_deleted')
@@ -0,0 +1,10 @@
+# apps/analitik/dashboard_urls.py
+
+from django.urls import path
+
+from .views import DashboardSummaryView
+
+urlpatterns = [
+    # URL: /api/v1/dashboard/summary/
+    path('summary/', DashboardSummaryView.as_view(), name='dashboard-summary'),
+]
@@ -0,0 +1,236 @@
+"""
+Stok tükenme tahmini: Her uçak modeli x parça tipi için stoğun kaç gün sonra biteceği.
+
+Günlük üretim (ProductionRollup, tüm takımların toplamı) ve montaj (AssemblyRollup) sayıları son
+FORECAST_WINDOW_DAYS tamamlanmış gün için özet tablolarından okunur. Her monte edilen uçak, modelinin
+her parça tipinden bir tane kullanır. Tüm kombinasyonlar için seriler NumPy dizilerinde tutulur
+(model x parça tipi x gün) ve hesaplar kombinasyon başına döngü olmadan tüm dizi üzerinde yapılır:
+
+- Hareketli ortalama: Son FORECAST_MOVING_AVERAGE_DAYS günün ortalaması.
+- Üstel düzeltme: alpha = FORECAST_SMOOTHING_ALPHA. Yinelemeli formül, serinin ağırlıklı toplamı
+  olarak (ağırlıklar alpha * (1 - alpha)^k) tek bir matris çarpımıyla hesaplanır.
+
+Net tüketim (tüketim - üretim) pozitifse tükenme süresi stok / net tüketimdir, değilse stok tükenmez (None).
+HORIZON_DAYS gününden sonraki tükenmeler de (örn: aylar önceki tek montajdan kalan çok küçük üstel düzeltme
+hızları) tükenmez sayılır.
+
+Günlük seriler önbellekte tutulur ve artımlı olarak güncellenir: Bir sonraki gün sadece yeni tamamlanan
+günlerin özet satırları okunup dizilerin sonuna eklenir. Geçmiş günlerde yapılan düzeltmeler (örn:
+silinen parçalar) seriler her STATE_TTL süresinde bir baştan okunduğunda yansır. Stok her hesaplamada
+okunur ve sonuç FORECAST_CACHE_TTL saniye önbellekte tutulur. Sonuç en fazla 3 sorgu ile üretilir.
+"""
+from datetime import datetime, time, timedelta
+from itertools import product
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from apps.core import reference_cache
+from .dashboard import REQUIRED_PART_TYPES
+from .models import AssemblyRollup, ProductionRollup
+
+DEFAULT_WINDOW_DAYS = 90
+DEFAULT_MOVING_AVERAGE_DAYS = 14
+DEFAULT_SMOOTHING_ALPHA = 0.2
+DEFAULT_TTL = 300
+STATE_TTL = 24 * 60 * 60
+HORIZON_DAYS = 10 * 365
+
+RESULT_KEY = 'analitik:forecast:result'
+STATE_KEY = 'analitik:forecast:state'
+
+METHODS = ('moving_average', 'exponential_smoothing')
+
+
+def _settings():
+    return {
+        'window_days': getattr(settings, 'FORECAST_WINDOW_DAYS', DEFAULT_WINDOW_DAYS),
+        'moving_average_days': getattr(settings, 'FORECAST_MOVING_AVERAGE_DAYS', DEFAULT_MOVING_AVERAGE_DAYS),
+        'smoothing_alpha': getattr(settings, 'FORECAST_SMOOTHING_ALPHA', DEFAULT_SMOOTHING_ALPHA),
+    }
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _day_offsets(bucket_starts, first_day):
+    return np.fromiter((timezone.localdate(start).toordinal() for start in bucket_starts), dtype=np.int64,
+                       count=len(bucket_starts)) - first_day.toordinal()
+
+
+def _load_days(state, since):
+    """`since` gününden dizilerin son gününe kadar olan günleri özet tablolarından okuyup dizilere ekler."""
+    model_ids, part_type_ids = np.array(state['model_ids']), np.array(state['part_type_ids'])
+    first_day = state['last_day'] - timedelta(days=state['production'].shape[-1] - 1)
+    rollup_range = {'grain': 'DAY', 'bucket_start__gte': _day_start(since),
+                    'bucket_start__lt': _day_start(state['last_day'] + timedelta(days=1))}
+
+    production = list(
+        ProductionRollup.objects
+        .filter(aircraft_model_id__in=state['model_ids'], part_type_id__in=state['part_type_ids'], **rollup_range)
+        .values_list('aircraft_model_id', 'part_type_id', 'bucket_start')
+        .annotate(total=Sum('count'))
+        .order_by()
+    )
+    if production:
+        models, part_types, starts, totals = zip(*production)
+        # id'ler sıralı olduğu için dizideki indeksleri searchsorted ile bulunur.
+        np.add.at(state['production'], (np.searchsorted(model_ids, models), np.searchsorted(part_type_ids, part_types),
+                                        _day_offsets(starts, first_day)), totals)
+
+    assembly = list(
+        AssemblyRollup.objects
+        .filter(aircraft_model_id__in=state['model_ids'], **rollup_range)
+        .values_list('aircraft_model_id', 'bucket_start')
+        .annotate(total=Sum('count'))
+        .order_by()
+    )
+    if assembly:
+        models, starts, totals = zip(*assembly)
+        np.add.at(state['assembly'], (np.searchsorted(model_ids, models), _day_offsets(starts, first_day)), totals)
+
+
+def refresh_series(state, last_day, model_ids, part_type_ids, window_days):
+    """
+    Günlük üretim ve montaj serilerini `last_day` dahil son `window_days` güne getirir.
+    Önceki durum aynı kombinasyonlar içinse sadece eksik günler okunur, değilse seriler baştan okunur.
+    """
+    if state is not None and timezone.now() - state['loaded_at'] > timedelta(seconds=STATE_TTL):
+        state = None  # Geçmiş günlerdeki düzeltmelerin yansıması için seriler periyodik olarak baştan okunur.
+    shift = (last_day - state['last_day']).days if state else None
+    if (state is None or state['model_ids'] != model_ids or state['part_type_ids'] != part_type_ids
+            or state['production'].shape[-1] != window_days or not 0 <= shift < window_days):
+        state = {
+            'model_ids': model_ids,
+            'part_type_ids': part_type_ids,
+            'last_day': last_day,
+            'loaded_at': timezone.now(),
+            'production': np.zeros((len(model_ids), len(part_type_ids), window_days)),
+            'assembly': np.zeros((len(model_ids), window_days)),
+        }
+        _load_days(state, last_day - timedelta(days=window_days - 1))
+        return state
+    if shift == 0:
+        return state
+
+    state = dict(state, last_day=last_day)
+    for key in ('production', 'assembly'):
+        series = np.roll(state[key], -shift, axis=-1)
+        series[..., -shift:] = 0
+        state[key] = series
+    _load_days(state, last_day - timedelta(days=shift - 1))
+    return state
+
+
+def smoothing_weights(window_days, alpha):
+    """
+    Üstel düzeltmenin (s_0 = x_0, s_t = alpha * x_t + (1 - alpha) * s_{t-1}) son değerini
+    serinin ağırlıklı toplamı olarak veren ağırlıklar. Ağırlıkların toplamı 1'dir.
+    """
+    weights = alpha * (1 - alpha) ** np.arange(window_days - 1, -1, -1, dtype=float)
+    weights[0] = (1 - alpha) ** (window_days - 1)
+    return weights
+
+
+def compute_rates(production, assembly, moving_average_days, alpha):
+    """
+    Her yöntem için (model x parça tipi) günlük üretim ve tüketim hızı dizilerini döndürür.
+    `production`: (model, parça tipi, gün), `assembly`: (model, gün).
+    """
+    # Her uçak modelinin her parça tipinden bir tane kullanılır.
+    consumption = np.broadcast_to(assembly[:, np.newaxis, :], production.shape)
+    weights = smoothing_weights(production.shape[-1], alpha)
+    return {
+        'moving_average': (production[..., -moving_average_days:].mean(axis=-1),
+                           consumption[..., -moving_average_days:].mean(axis=-1)),
+        'exponential_smoothing': (production @ weights, consumption @ weights),
+    }
+
+
+def days_to_stockout(stock, production_rate, consumption_rate):
+    """
+    Net tüketim pozitif olan ve stoğu HORIZON_DAYS gün içinde tükenen kombinasyonlar için stoğun tükenmesine
+    kalan gün, diğerleri için NaN.
+    """
+    net = consumption_rate - production_rate
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days = stock / net
+    return np.where((net > 0) & (days <= HORIZON_DAYS), days, np.nan)
+
+
+def _stock(model_ids, part_type_ids):
+    from apps.envanter.models import Part
+
+    stock = np.zeros((len(model_ids), len(part_type_ids)))
+    rows = list(
+        Part.objects
+        .filter(status='STOKTA', aircraft_model_compatibility_id__in=model_ids, part_type_id__in=part_type_ids)
+        .values_list('aircraft_model_compatibility_id', 'part_type_id')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    if rows:
+        models, part_types, totals = zip(*rows)
+        stock[np.searchsorted(model_ids, models), np.searchsorted(part_type_ids, part_types)] = totals
+    return stock
+
+
+def _rounded(values):
+    return [None if np.isnan(value) else round(value, 2) for value in values.tolist()]
+
+
+def build_forecast(state=None):
+    """Tahmini üretir. Güncellenmiş seri durumunu ve sonucu döndürür."""
+    params = _settings()
+    today = timezone.localdate()
+    aircraft_models = {obj.pk: name for name, obj in reference_cache.get_aircraft_models().items()}
+    part_types = {obj.pk: name for name, obj in reference_cache.get_part_types().items()
+                  if name in REQUIRED_PART_TYPES}
+    model_ids, part_type_ids = sorted(aircraft_models), sorted(part_types)
+
+    state = refresh_series(state, today - timedelta(days=1), model_ids, part_type_ids, params['window_days'])
+    stock = _stock(model_ids, part_type_ids)
+    rates = compute_rates(state['production'], state['assembly'], params['moving_average_days'],
+                          params['smoothing_alpha'])
+
+    columns = {'in_stock': stock.astype(int).ravel().tolist()}
+    for method, (production_rate, consumption_rate) in rates.items():
+        days = days_to_stockout(stock, production_rate, consumption_rate)
+        columns[method] = {
+            'production_rate': _rounded(production_rate.ravel()),
+            'consumption_rate': _rounded(consumption_rate.ravel()),
+            'days_to_stockout': _rounded(days.ravel()),
+            'stockout_date': [None if np.isnan(value) else today + timedelta(days=int(value))
+                              for value in days.ravel().tolist()],
+        }
+
+    # Diziler model x parça tipi sırasıyla düzleştirildiği için satırlar aynı sırayla eşlenir.
+    results = [
+        {
+            'aircraft_model': aircraft_models[model_id],
+            'part_type': part_types[part_type_id],
+            'in_stock': columns['in_stock'][index],
+            **{method: {field: values[index] for field, values in columns[method].items()} for method in METHODS},
+        }
+        for index, (model_id, part_type_id) in enumerate(product(model_ids, part_type_ids))
+    ]
+    return state, {
+        **params,
+        'last_day': state['last_day'],
+        'generated_at': timezone.now(),
+        'results': results,
+    }
+
+
+def get_forecast():
+    """Tahmini önbellekten döndürür, yoksa seri durumunu artımlı güncelleyip yeniden hesaplar."""
+    result = cache.get(RESULT_KEY)
+    if result is None:
+        state, result = build_forecast(cache.get(STATE_KEY))
+        cache.set(STATE_KEY, state, STATE_TTL)
+        cache.set(RESULT_KEY, result, getattr(settings, 'FORECAST_CACHE_TTL', DEFAULT_TTL))
+    return result
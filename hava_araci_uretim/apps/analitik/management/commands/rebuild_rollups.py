@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.analitik.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Üretim ve montaj özet tablolarını kaynak tablolardan yeniden üretir."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            default=None,
+            help="YYYY-MM-DD. Sadece bu tarihin bulunduğu aydan itibaren yeniden hesaplanır. Varsayılan: tümü"
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since_date = parse_date(options['since'])
+            if since_date is None:
+                raise CommandError("--since YYYY-MM-DD formatında olmalıdır.")
+            since = timezone.make_aware(datetime.combine(since_date, datetime.min.time()))
+        created = rebuild(since=since)
+        self.stdout.write(self.style.SUCCESS(f"{created} özet satırı oluşturuldu."))
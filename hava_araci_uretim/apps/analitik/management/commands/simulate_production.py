@@ -0,0 +1,58 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analitik.serializers import SimulationRequestSerializer
+from apps.analitik.simulation import estimate_rates, simulate
+
+
+class Command(BaseCommand):
+    help = ("Üretim hattını geçmiş hızlarla Monte Carlo yöntemiyle simüle eder ve takım sayıları senaryosunu "
+            "mevcut durumla karşılaştırır. Örnek: simulate_production --team AVIYONIK=2 --days 30")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--team', action='append', default=[], metavar='TIP=SAYI',
+                            help="Senaryodaki takım sayısı (örn: AVIYONIK=2). Birden fazla verilebilir.")
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--replications', type=int, default=10000)
+        parser.add_argument('--history-days', type=int, default=90, help="Hızların hesaplandığı geçmiş gün sayısı")
+        parser.add_argument('--empty-stock', action='store_true', help="Mevcut stok yerine boş stokla başlar")
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Process sayısı")
+
+    def handle(self, *args, **options):
+        teams = {}
+        for value in options['team']:
+            name, _sep, count = value.partition('=')
+            teams[name.strip().upper()] = count.strip()
+        serializer = SimulationRequestSerializer(data={
+            'teams': teams,
+            'days': options['days'],
+            'replications': options['replications'],
+            'history_days': options['history_days'],
+            'initial_stock': not options['empty_stock'],
+            **({'seed': options['seed']} if options['seed'] is not None else {}),
+        })
+        if not serializer.is_valid():
+            raise CommandError(serializer.errors)
+        params = serializer.validated_data
+
+        started = time.perf_counter()
+        rates = estimate_rates(params['history_days'], initial_stock=params['initial_stock'])
+        result = simulate(rates, params['teams'], params['days'], params['replications'],
+                          seed=params.get('seed'), workers=options['workers'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"Takımlar: {', '.join(f'{name}={count}' for name, count in result['teams'].items())}")
+        self.stdout.write(f"{result['days']} gün, {result['replications']} replikasyon, tohum {result['seed']}")
+        for row in result['results']:
+            baseline, scenario = row['baseline'], row['scenario']
+            self.stdout.write(
+                f"{row['aircraft_model']:>10}: mevcut {baseline['throughput']['mean']:7.2f}  "
+                f"senaryo {scenario['throughput']['mean']:7.2f} "
+                f"(p5-p95 {scenario['throughput']['p5']:.0f}-{scenario['throughput']['p95']:.0f})  "
+                f"fark {row['mean_difference']:+.2f}  darboğaz: "
+                + ', '.join(f"{factor} %{share * 100:.0f}" for factor, share in scenario['bottlenecks'].items())
+            )
+        self.stdout.write(self.style.SUCCESS(f"{elapsed:.2f} sn"))
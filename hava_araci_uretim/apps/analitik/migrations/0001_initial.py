@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('envanter', '0004_populate_initial_aircraft_models'),
+        ('uretim', '0002_populate_initial_teams'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssemblyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grain', models.CharField(choices=[('HOUR', 'Saatlik'), ('DAY', 'Günlük'), ('MONTH', 'Aylık')], max_length=5, verbose_name='Zaman Dilimi')),
+                ('bucket_start', models.DateTimeField(verbose_name='Dilim Başlangıcı')),
+                ('count', models.IntegerField(default=0, verbose_name='Adet')),
+                ('aircraft_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='envanter.aircraftmodel', verbose_name='Uçak Modeli')),
+                ('team', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='uretim.team', verbose_name='Montajı Yapan Takım')),
+            ],
+            options={
+                'verbose_name': 'Montaj Özeti',
+                'verbose_name_plural': 'Montaj Özetleri',
+                'indexes': [models.Index(fields=['grain', 'bucket_start'], name='assembly_rollup_range_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('team__isnull', False)), fields=('grain', 'bucket_start', 'aircraft_model', 'team'), name='uniq_assembly_rollup'), models.UniqueConstraint(condition=models.Q(('team__isnull', True)), fields=('grain', 'bucket_start', 'aircraft_model'), name='uniq_assembly_rollup_no_team')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grain', models.CharField(choices=[('HOUR', 'Saatlik'), ('DAY', 'Günlük'), ('MONTH', 'Aylık')], max_length=5, verbose_name='Zaman Dilimi')),
+                ('bucket_start', models.DateTimeField(verbose_name='Dilim Başlangıcı')),
+                ('count', models.IntegerField(default=0, verbose_name='Adet')),
+                ('aircraft_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='envanter.aircraftmodel', verbose_name='Uçak Modeli')),
+                ('part_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='envanter.parttype', verbose_name='Parça Tipi')),
+                ('team', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='uretim.team', verbose_name='Üreten Takım')),
+            ],
+            options={
+                'verbose_name': 'Üretim Özeti',
+                'verbose_name_plural': 'Üretim Özetleri',
+                'indexes': [models.Index(fields=['grain', 'bucket_start'], name='production_rollup_range_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('team__isnull', False)), fields=('grain', 'bucket_start', 'team', 'part_type', 'aircraft_model'), name='uniq_production_rollup'), models.UniqueConstraint(condition=models.Q(('team__isnull', True)), fields=('grain', 'bucket_start', 'part_type', 'aircraft_model'), name='uniq_production_rollup_no_team')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def backfill_rollups(apps, schema_editor):
+    from apps.analitik.rollups import rebuild
+    rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analitik', '0001_initial'),
+        ('envanter', '0004_populate_initial_aircraft_models'),
+        ('montaj', '0001_initial'),
+    ]
+
+    operations = [
+        # Mevcut parça ve uçaklar için özetleri oluşturur. Sonraki kayıtlar sinyallerle eklenir.
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
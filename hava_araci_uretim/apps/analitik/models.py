@@ -0,0 +1,95 @@
+from django.db import models
+from django.db.models import Q
+
+
+class Rollup(models.Model):
+    """
+    Zaman dilimlerine (saat, gün, ay) göre önceden toplanmış sayaçlar için abstract base model.
+    Her satır bir zaman dilimindeki bir boyut kombinasyonunun sayısını tutar.
+    """
+
+    GRAIN_CHOICES = [
+        ('HOUR', 'Saatlik'),
+        ('DAY', 'Günlük'),
+        ('MONTH', 'Aylık'),
+    ]
+
+    grain = models.CharField(max_length=5, choices=GRAIN_CHOICES, verbose_name="Zaman Dilimi")
+    # Dilimin başlangıcı (TIME_ZONE'a göre saat/gün/ay başı)
+    bucket_start = models.DateTimeField(verbose_name="Dilim Başlangıcı")
+    count = models.IntegerField(default=0, verbose_name="Adet")
+
+    class Meta:
+        abstract = True
+
+
+class ProductionRollup(Rollup):
+    """
+    Üretilen parça sayıları (takım, parça tipi ve uçak modeline göre).
+    Kaynak: `Part.created_at`.
+    """
+
+    team = models.ForeignKey(
+        'uretim.Team',
+        on_delete=models.CASCADE,
+        null=True,  # Takımı olmayan parçalar
+        related_name='+',
+        verbose_name="Üreten Takım"
+    )
+    part_type = models.ForeignKey('envanter.PartType', on_delete=models.CASCADE, related_name='+',
+                                  verbose_name="Parça Tipi")
+    aircraft_model = models.ForeignKey('envanter.AircraftModel', on_delete=models.CASCADE, related_name='+',
+                                       verbose_name="Uçak Modeli")
+
+    class Meta:
+        verbose_name = "Üretim Özeti"
+        verbose_name_plural = "Üretim Özetleri"
+        # Analitik sorguları dilim ve zaman aralığıyla filtreler (koşullu unique index'ler burada kullanılamaz).
+        indexes = [models.Index(fields=['grain', 'bucket_start'], name='production_rollup_range_idx')]
+        constraints = [
+            # NULL değerler unique constraint'te birbirinden farklı sayıldığı için takımsız satırlar ayrı tutulur.
+            models.UniqueConstraint(
+                fields=['grain', 'bucket_start', 'team', 'part_type', 'aircraft_model'],
+                condition=Q(team__isnull=False),
+                name='uniq_production_rollup'
+            ),
+            models.UniqueConstraint(
+                fields=['grain', 'bucket_start', 'part_type', 'aircraft_model'],
+                condition=Q(team__isnull=True),
+                name='uniq_production_rollup_no_team'
+            ),
+        ]
+
+
+class AssemblyRollup(Rollup):
+    """
+    Monte edilen uçak sayıları (uçak modeli ve montaj takımına göre).
+    Kaynak: `AssembledAircraft.created_at`.
+    """
+
+    aircraft_model = models.ForeignKey('envanter.AircraftModel', on_delete=models.CASCADE, related_name='+',
+                                       verbose_name="Uçak Modeli")
+    team = models.ForeignKey(
+        'uretim.Team',
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='+',
+        verbose_name="Montajı Yapan Takım"
+    )
+
+    class Meta:
+        verbose_name = "Montaj Özeti"
+        verbose_name_plural = "Montaj Özetleri"
+        indexes = [models.Index(fields=['grain', 'bucket_start'], name='assembly_rollup_range_idx')]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['grain', 'bucket_start', 'aircraft_model', 'team'],
+                condition=Q(team__isnull=False),
+                name='uniq_assembly_rollup'
+            ),
+            models.UniqueConstraint(
+                fields=['grain', 'bucket_start', 'aircraft_model'],
+                condition=Q(team__isnull=True),
+                name='uniq_assembly_rollup_no_team'
+            ),
+        ]
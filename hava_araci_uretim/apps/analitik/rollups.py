@@ -0,0 +1,165 @@
+"""
+Üretim ve montaj özet (rollup) tablolarının güncellenmesi.
+
+Her parça üretimi ve uçak montajı, kayıt ile aynı transaction içinde saatlik, günlük ve aylık
+özet satırlarını bir artırır (silinince bir azaltır). Böylece analitik sorguları ana tabloları
+taramadan sadece özet tablolardan okur. Zaman dilimleri TIME_ZONE'a göre hesaplanır.
+
+Sinyaller `save()`/`delete()` ile yapılan değişiklikleri yakalar. `bulk_create` veya
+`QuerySet.update()` gibi sinyal tetiklemeyen toplu işlemler `record_production()` /
+`record_assembly()` fonksiyonlarını doğrudan çağırmalıdır. Özetler kaynak tablolardan
+`manage.py rebuild_rollups` ile her zaman yeniden üretilebilir.
+"""
+from collections import Counter
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDay, TruncHour, TruncMonth
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import AssemblyRollup, ProductionRollup
+
+GRAINS = ('HOUR', 'DAY', 'MONTH')
+
+_TRUNC_FUNCTIONS = {'HOUR': TruncHour, 'DAY': TruncDay, 'MONTH': TruncMonth}
+
+
+def bucket_start(value, grain):
+    """Verilen zamanın içinde bulunduğu saatin, günün veya ayın başlangıcını döndürür."""
+    local = timezone.localtime(value).replace(minute=0, second=0, microsecond=0)
+    if grain in ('DAY', 'MONTH'):
+        local = local.replace(hour=0)
+    if grain == 'MONTH':
+        local = local.replace(day=1)
+    # Yaz saati geçişlerinde doğru offset için yeniden yerelleştirilir.
+    return timezone.make_aware(local.replace(tzinfo=None))
+
+
+def _increment(model, grain, start, dimensions, delta):
+    lookup = {'grain': grain, 'bucket_start': start, **dimensions}
+    if model.objects.filter(**lookup).update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **lookup)
+    except IntegrityError:
+        # Aynı satırı başka bir istek bu arada oluşturdu.
+        model.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def _record(model, events, delta):
+    """`events`: (zaman, boyutlar) ikilileri. Aynı satıra düşenler tek sorguda güncellenir."""
+    counts = Counter()
+    for created_at, dimensions in events:
+        for grain in GRAINS:
+            counts[(grain, bucket_start(created_at, grain), tuple(sorted(dimensions.items())))] += delta
+    for (grain, start, dimensions), total in counts.items():
+        _increment(model, grain, start, dict(dimensions), total)
+
+
+def record_production(parts, delta=1):
+    """Verilen parçaları üretim özetlerine ekler (`delta=-1` ile çıkarır)."""
+    _record(ProductionRollup, [
+        (part.created_at, {
+            'team_id': part.produced_by_team_id,
+            'part_type_id': part.part_type_id,
+            'aircraft_model_id': part.aircraft_model_compatibility_id,
+        })
+        for part in parts
+    ], delta)
+
+
+def record_assembly(aircrafts, delta=1):
+    """Verilen uçakları montaj özetlerine ekler (`delta=-1` ile çıkarır)."""
+    _record(AssemblyRollup, [
+        (aircraft.created_at, {
+            'aircraft_model_id': aircraft.aircraft_model_id,
+            'team_id': aircraft.assembled_by_team_id,
+        })
+        for aircraft in aircrafts
+    ], delta)
+
+
+def _archived_parts(apps):
+    """Arşivlenmiş parçalar (bkz. apps.envanter.archive). Arşiv tablosundan önceki migration'larda boştur."""
+    try:
+        return [apps.get_model('envanter', 'PartArchive').objects.all()]
+    except LookupError:
+        return []
+
+
+def rebuild(since=None, apps=global_apps):
+    """
+    Özetleri kaynak tablolardan yeniden üretir (ilk kurulum, geçmiş verinin yüklenmesi veya onarım).
+    Üretim sayılarına arşivlenmiş parçalar da dahildir.
+    `since` verilirse sadece o zamanın içinde bulunduğu aydan itibaren yeniden hesaplanır.
+    Yoğun yazma olmayan bir zamanda çalıştırılmalıdır. Oluşturulan satır sayısını döndürür.
+    `apps`: Migration'lardan çağrılırken tarihsel model kayıt defteri.
+    """
+    sources = [
+        (apps.get_model('analitik', 'ProductionRollup'),
+         [apps.get_model('envanter', 'Part').objects.all(), *_archived_parts(apps)],
+         {'team_id': 'produced_by_team_id', 'part_type_id': 'part_type_id',
+          'aircraft_model_id': 'aircraft_model_compatibility_id'}),
+        (apps.get_model('analitik', 'AssemblyRollup'), [apps.get_model('montaj', 'AssembledAircraft').objects.all()],
+         {'aircraft_model_id': 'aircraft_model_id', 'team_id': 'assembled_by_team_id'}),
+    ]
+    start = bucket_start(since, 'MONTH') if since else None
+    created = 0
+    with transaction.atomic():
+        for model, querysets, dimensions in sources:
+            rollups = model.objects.all()
+            if start:
+                rollups = rollups.filter(bucket_start__gte=start)
+            rollups.delete()
+
+            objects = []
+            for grain in GRAINS:
+                totals = Counter()
+                for queryset in querysets:
+                    if start:
+                        queryset = queryset.filter(created_at__gte=start)
+                    rows = (
+                        queryset
+                        .annotate(bucket=_TRUNC_FUNCTIONS[grain]('created_at'))
+                        .values('bucket', *dimensions.values())
+                        .annotate(total=Count('id'))
+                        .order_by()
+                    )
+                    for row in rows:
+                        totals[(row['bucket'], *(row[source] for source in dimensions.values()))] += row['total']
+                objects.extend(
+                    model(grain=grain, bucket_start=bucket, count=total, **dict(zip(dimensions, values)))
+                    for (bucket, *values), total in totals.items()
+                )
+            model.objects.bulk_create(objects, batch_size=1000)
+            created += len(objects)
+    return created
+
+
+def _part_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_production([instance])
+
+
+def _part_deleted(sender, instance, **kwargs):
+    record_production([instance], delta=-1)
+
+
+def _aircraft_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_assembly([instance])
+
+
+def _aircraft_deleted(sender, instance, **kwargs):
+    record_assembly([instance], delta=-1)
+
+
+def connect_signals():
+    post_save.connect(_part_saved, sender='envanter.Part', dispatch_uid='analitik_part_saved')
+    post_delete.connect(_part_deleted, sender='envanter.Part', dispatch_uid='analitik_part_deleted')
+    post_save.connect(_aircraft_saved, sender='montaj.AssembledAircraft', dispatch_uid='analitik_aircraft_saved')
+    post_delete.connect(_aircraft_deleted, sender='montaj.AssembledAircraft',
+                        dispatch_uid='analitik_aircraft_deleted')
@@ -0,0 +1,249 @@
+"""
+Analitik uygulaması view'lerinin OpenAPI dökümantasyonu.
+
+Sadece şema üretilirken yüklenir (bkz. apps.core.schema).
+"""
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, inline_serializer
+from rest_framework import serializers
+
+from apps.core.schema import ViewSchemaExtension
+from .serializers import SimulationRequestSerializer
+
+
+def _query_parameters(dimensions):
+    return [
+        OpenApiParameter(name='start', description="Başlangıç zamanı (dahil). ISO 8601 veya YYYY-MM-DD. "
+                                                   "Varsayılan: bitişten 30 gün önce.",
+                         type=OpenApiTypes.DATETIME, location=OpenApiParameter.QUERY),
+        OpenApiParameter(name='end', description="Bitiş zamanı (hariç). Varsayılan: şimdi.",
+                         type=OpenApiTypes.DATETIME, location=OpenApiParameter.QUERY),
+        OpenApiParameter(name='grain', description="Zaman dilimi.", type=OpenApiTypes.STR,
+                         location=OpenApiParameter.QUERY, enum=['hour', 'day', 'week', 'month'], default='day'),
+        OpenApiParameter(name='group_by', description=f"Virgülle ayrılmış gruplama alanları: {', '.join(dimensions)}.",
+                         type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
+    ]
+
+
+def _response(name, dimensions):
+    return inline_serializer(
+        name=name,
+        fields={
+            'grain': serializers.CharField(),
+            'start': serializers.DateTimeField(),
+            'end': serializers.DateTimeField(),
+            'group_by': serializers.ListField(child=serializers.CharField()),
+            'total': serializers.IntegerField(),
+            'results': inline_serializer(
+                name=f'{name}Row',
+                fields={
+                    'bucket': serializers.DateTimeField(),
+                    **{dimension: serializers.CharField(allow_null=True, required=False) for dimension in dimensions},
+                    'count': serializers.IntegerField(),
+                },
+                many=True
+            ),
+        }
+    )
+
+
+class ProductionAnalyticsViewSchema(ViewSchemaExtension):
+    target_class = 'apps.analitik.views.ProductionAnalyticsView'
+
+    def build_replacement(self):
+        dimensions = list(self.target_class.dimensions)
+
+        @extend_schema(
+            tags=["Analitik"],
+            summary="Üretim Analitiği",
+            description="Zaman dilimine göre üretilen parça sayıları. Sadece özet tablolarından okunur.",
+            parameters=_query_parameters(dimensions),
+            responses={
+                200: _response('ProductionAnalyticsResponse', dimensions),
+                400: OpenApiResponse(description="Geçersiz sorgu parametresi."),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+            }
+        )
+        class ProductionAnalyticsView(self.target_class):
+            pass
+
+        return ProductionAnalyticsView
+
+
+class AssemblyAnalyticsViewSchema(ViewSchemaExtension):
+    target_class = 'apps.analitik.views.AssemblyAnalyticsView'
+
+    def build_replacement(self):
+        dimensions = list(self.target_class.dimensions)
+
+        @extend_schema(
+            tags=["Analitik"],
+            summary="Montaj Analitiği",
+            description="Zaman dilimine göre monte edilen uçak sayıları. Sadece özet tablolarından okunur.",
+            parameters=_query_parameters(dimensions),
+            responses={
+                200: _response('AssemblyAnalyticsResponse', dimensions),
+                400: OpenApiResponse(description="Geçersiz sorgu parametresi."),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+            }
+        )
+        class AssemblyAnalyticsView(self.target_class):
+            pass
+
+        return AssemblyAnalyticsView
+
+
+class DashboardSummaryViewSchema(ViewSchemaExtension):
+    target_class = 'apps.analitik.views.DashboardSummaryView'
+
+    def build_replacement(self):
+        count_map = serializers.DictField(child=serializers.IntegerField())
+
+        @extend_schema(
+            tags=["Analitik"],
+            summary="Dashboard Özeti",
+            description="Stok durumu (duruma, parça tipine ve uçak modeline göre), model bazında montaj kapasitesi, "
+                        "kullanıcının takımının son 7/30 gündeki üretimleri ve son montajlar. "
+                        "Takım bilgisi `request.user.profile.team`'den alınır. Sonuç takım başına önbelleğe alınır.",
+            responses={
+                200: inline_serializer(
+                    name='DashboardSummaryResponse',
+                    fields={
+                        'team': serializers.DictField(allow_null=True),
+                        'stock': inline_serializer(
+                            name='DashboardStock',
+                            fields={'by_status': count_map, 'by_part_type': count_map, 'by_aircraft_model': count_map}
+                        ),
+                        'capacity': serializers.DictField(
+                            child=inline_serializer(
+                                name='DashboardModelCapacity',
+                                fields={
+                                    'buildable': serializers.IntegerField(),
+                                    'missing_part_types': serializers.ListField(child=serializers.CharField()),
+                                    'in_stock': count_map,
+                                    'reserved': serializers.IntegerField(
+                                        help_text="Montaj için rezerve edilmiş (kapasiteye sayılmayan) parça sayısı."),
+                                }
+                            )
+                        ),
+                        'my_team_activity': serializers.DictField(allow_null=True),
+                        'recent_assemblies': serializers.ListField(child=serializers.DictField()),
+                        'generated_at': serializers.DateTimeField(),
+                    }
+                ),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+            }
+        )
+        class DashboardSummaryView(self.target_class):
+            pass
+
+        return DashboardSummaryView
+
+
+class StockForecastViewSchema(ViewSchemaExtension):
+    target_class = 'apps.analitik.views.StockForecastView'
+
+    def build_replacement(self):
+        method_fields = {
+            'production_rate': serializers.FloatField(help_text="Günlük ortalama üretim"),
+            'consumption_rate': serializers.FloatField(help_text="Günlük ortalama tüketim (montaj)"),
+            'days_to_stockout': serializers.FloatField(allow_null=True, help_text="Stok tükenmiyorsa null"),
+            'stockout_date': serializers.DateField(allow_null=True),
+        }
+
+        @extend_schema(
+            tags=["Analitik"],
+            summary="Stok Tükenme Tahmini",
+            description="Her uçak modeli x parça tipi için son tamamlanmış günlerin üretim ve montaj hızlarına göre "
+                        "stoğun kaç gün sonra tükeneceği. Hızlar hareketli ortalama ve üstel düzeltme ile hesaplanır. "
+                        "Her monte edilen uçak modelinin her parça tipinden bir tane kullanır. "
+                        "Sonuç önbelleğe alınır (varsayılan 5 dakika).",
+            responses={
+                200: inline_serializer(
+                    name='StockForecastResponse',
+                    fields={
+                        'window_days': serializers.IntegerField(),
+                        'moving_average_days': serializers.IntegerField(),
+                        'smoothing_alpha': serializers.FloatField(),
+                        'last_day': serializers.DateField(help_text="Hesaba katılan son (tamamlanmış) gün"),
+                        'generated_at': serializers.DateTimeField(),
+                        'results': inline_serializer(
+                            name='StockForecastRow',
+                            fields={
+                                'aircraft_model': serializers.CharField(),
+                                'part_type': serializers.CharField(),
+                                'in_stock': serializers.IntegerField(),
+                                'moving_average': inline_serializer(name='StockForecastMovingAverage',
+                                                                    fields=method_fields),
+                                'exponential_smoothing': inline_serializer(name='StockForecastExponentialSmoothing',
+                                                                           fields=method_fields),
+                            },
+                            many=True
+                        ),
+                    }
+                ),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+            }
+        )
+        class StockForecastView(self.target_class):
+            pass
+
+        return StockForecastView
+
+
+class ProductionSimulationViewSchema(ViewSchemaExtension):
+    target_class = 'apps.analitik.views.ProductionSimulationView'
+
+    def build_replacement(self):
+        summary = inline_serializer(
+            name='ProductionSimulationSummary',
+            fields={
+                'throughput': inline_serializer(
+                    name='ProductionSimulationThroughput',
+                    fields={name: serializers.FloatField() for name in ['mean', 'std', 'p5', 'p50', 'p95']}
+                ),
+                'bottlenecks': serializers.DictField(
+                    child=serializers.FloatField(),
+                    help_text="Darboğaz olduğu replikasyonların payı (parça tipi veya MONTAJ)"
+                ),
+            }
+        )
+
+        @extend_schema(
+            tags=["Analitik"],
+            summary="Üretim Hattı Simülasyonu",
+            description="Son `history_days` gündeki üretim ve montaj hızlarıyla üretim hattını Monte Carlo yöntemiyle "
+                        "`days` gün boyunca simüle eder. `teams` ile verilen takım sayıları senaryosunu "
+                        "(örn: `{\"AVIYONIK\": 2}`) aynı rastgele sayılarla mevcut durumla karşılaştırır ve model "
+                        "başına monte edilen uçak sayısının dağılımını ve darboğazları döndürür. "
+                        "Veritabanına yazmaz. Sadece adminler çalıştırabilir.",
+            request=SimulationRequestSerializer,
+            responses={
+                200: inline_serializer(
+                    name='ProductionSimulationResponse',
+                    fields={
+                        'days': serializers.IntegerField(),
+                        'replications': serializers.IntegerField(),
+                        'seed': serializers.IntegerField(),
+                        'teams': serializers.DictField(child=serializers.IntegerField()),
+                        'results': inline_serializer(
+                            name='ProductionSimulationRow',
+                            fields={
+                                'aircraft_model': serializers.CharField(),
+                                'baseline': summary,
+                                'scenario': summary,
+                                'mean_difference': serializers.FloatField(),
+                            },
+                            many=True
+                        ),
+                    }
+                ),
+                400: OpenApiResponse(description="Geçersiz parametre."),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                403: OpenApiResponse(description="Sadece adminler çalıştırabilir."),
+            }
+        )
+        class ProductionSimulationView(self.target_class):
+            pass
+
+        return ProductionSimulationView
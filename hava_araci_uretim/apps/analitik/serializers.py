@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+DATETIME_INPUT_FORMATS = ['iso-8601', '%Y-%m-%d']
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    """
+    Analitik endpoint'lerinin sorgu parametreleri.
+    `start` dahil, `end` hariçtir. Verilmezlerse son 30 gün kullanılır.
+    """
+
+    GRAIN_CHOICES = ['hour', 'day', 'week', 'month']
+
+    start = serializers.DateTimeField(required=False, input_formats=DATETIME_INPUT_FORMATS)
+    end = serializers.DateTimeField(required=False, input_formats=DATETIME_INPUT_FORMATS)
+    grain = serializers.ChoiceField(choices=GRAIN_CHOICES, default='day')
+    # Virgülle ayrılmış gruplama alanları (örn: "team,part_type"). Boşsa sadece zamana göre gruplanır.
+    group_by = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def __init__(self, *args, dimensions=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dimensions = dimensions
+
+    def validate_group_by(self, value):
+        fields = [field.strip() for field in value.split(',') if field.strip()]
+        invalid = [field for field in fields if field not in self.dimensions]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Geçersiz gruplama alanı: {', '.join(invalid)}. Geçerli alanlar: {', '.join(self.dimensions)}."
+            )
+        return list(dict.fromkeys(fields))
+
+    def validate(self, attrs):
+        end = attrs.get('end') or timezone.now()
+        start = attrs.get('start') or end - timedelta(days=30)
+        if start >= end:
+            raise serializers.ValidationError({"start": "Başlangıç zamanı bitiş zamanından önce olmalıdır."})
+        attrs['start'], attrs['end'] = start, end
+        return attrs
+
+
+class SimulationRequestSerializer(serializers.Serializer):
+    """Üretim hattı simülasyonunun parametreleri (bkz. apps.analitik.simulation)."""
+
+    TEAM_TYPES = ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK', 'MONTAJ']
+
+    # Senaryodaki takım sayıları (örn: {"AVIYONIK": 2}). Verilmeyen takım tipleri için 1.
+    teams = serializers.DictField(child=serializers.IntegerField(min_value=0, max_value=10), required=False,
+                                  default=dict)
+    days = serializers.IntegerField(min_value=1, max_value=365, default=30)
+    replications = serializers.IntegerField(min_value=1, default=2000)
+    # Hızların hesaplandığı geçmiş gün sayısı
+    history_days = serializers.IntegerField(min_value=1, max_value=365, default=90)
+    # Simülasyon mevcut stokla mı, boş stokla mı başlar
+    initial_stock = serializers.BooleanField(default=True)
+    seed = serializers.IntegerField(min_value=0, required=False)
+
+    def __init__(self, *args, max_replications=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_replications = max_replications
+
+    def validate_teams(self, value):
+        invalid = [name for name in value if name not in self.TEAM_TYPES]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Geçersiz takım tipi: {', '.join(invalid)}. Geçerli tipler: {', '.join(self.TEAM_TYPES)}."
+            )
+        return value
+
+    def validate_replications(self, value):
+        if self.max_replications is not None and value > self.max_replications:
+            raise serializers.ValidationError(f"En fazla {self.max_replications} replikasyon çalıştırılabilir.")
+        return value
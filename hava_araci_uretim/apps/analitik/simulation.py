@@ -0,0 +1,192 @@
+"""
+Üretim hattı simülasyonu: Takım sayıları değişirse aylık kaç uçak monte edilebilir?
+
+Hat, geçmiş veriden tahmin edilen günlük hızlarla modellenir (üretim verisine yazılmaz):
+- Üretim takımları (KANAT, GOVDE, KUYRUK, AVIYONIK) her gün her uçak modeli için sorumlu oldukları
+  parça tipinden Poisson dağılımlı sayıda parça üretir. Ortalama: son `history_days` gündeki günlük
+  üretim (ProductionRollup).
+- MONTAJ takımı her gün her model için Poisson dağılımlı sayıda uçak monte edebilir (ortalama: son
+  `history_days` gündeki günlük montaj, AssemblyRollup), ancak en fazla stoktaki tam set sayısı kadar.
+  Geçmiş montajlar parça eksikliğinden kısıtlanmış olabileceği için kapasite düşük tahmin edilebilir.
+
+Senaryoda bir takım tipinin sayısı `n` ise o takımın hızı `n` ile çarpılır (mevcut durumda her tipten
+bir takım vardır). Her gün montajı sınırlayan faktör (en az stoğu olan parça tipi veya MONTAJ kapasitesi)
+kaydedilir. Bir replikasyonun darboğazı en çok gün sınırlayan faktördür.
+
+Replikasyonlar REPLICATIONS_PER_CHUNK'lık parçalara bölünür. Her parçada tüm olaylar (gün x replikasyon x
+model x parça tipi) tek seferde örneklenir ve günler üzerindeki stok hesabı tüm replikasyonlar için
+birlikte yapılır. Parçalar `workers` > 1 ise ayrı process'lerde çalışır. Her parça kendi tohumunu
+(`SeedSequence.spawn`) kullandığı için sonuç process sayısından bağımsızdır. Temel durum ve senaryo aynı
+tohumlarla çalıştırılır.
+
+Bu modül process'lerde Django kurulmadan yüklenebilmesi için modelleri sadece fonksiyon içinde import eder.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import numpy as np
+
+REPLICATIONS_PER_CHUNK = 500
+ASSEMBLY_TEAM = 'MONTAJ'
+PERCENTILES = (5, 50, 95)
+
+
+def estimate_rates(history_days, initial_stock=True):
+    """Son `history_days` gündeki günlük ortalama üretim ve montaj hızlarını ve (istenirse) mevcut stoğu okur."""
+    from django.db.models import Count, Sum
+    from django.utils import timezone
+
+    from apps.core import reference_cache
+    from apps.envanter.models import Part
+    from .dashboard import REQUIRED_PART_TYPES
+    from .forecast import _day_start
+    from .models import AssemblyRollup, ProductionRollup
+
+    aircraft_models = {obj.pk: name for name, obj in reference_cache.get_aircraft_models().items()}
+    part_types = {obj.pk: name for name, obj in reference_cache.get_part_types().items()
+                  if name in REQUIRED_PART_TYPES}
+    model_index = {pk: index for index, pk in enumerate(sorted(aircraft_models))}
+    part_type_index = {pk: index for index, pk in enumerate(sorted(part_types))}
+    today = timezone.localdate()
+    rollup_range = {'grain': 'DAY', 'bucket_start__gte': _day_start(today - timedelta(days=history_days)),
+                    'bucket_start__lt': _day_start(today)}
+
+    production = np.zeros((len(model_index), len(part_type_index)))
+    for model_id, part_type_id, total in (
+            ProductionRollup.objects
+            .filter(aircraft_model_id__in=model_index, part_type_id__in=part_type_index, **rollup_range)
+            .values_list('aircraft_model_id', 'part_type_id')
+            .annotate(total=Sum('count'))
+            .order_by()):
+        production[model_index[model_id], part_type_index[part_type_id]] = total
+
+    assembly = np.zeros(len(model_index))
+    for model_id, total in (
+            AssemblyRollup.objects
+            .filter(aircraft_model_id__in=model_index, **rollup_range)
+            .values_list('aircraft_model_id')
+            .annotate(total=Sum('count'))
+            .order_by()):
+        assembly[model_index[model_id]] = total
+
+    stock = np.zeros((len(model_index), len(part_type_index)), dtype=np.int64)
+    if initial_stock:
+        for model_id, part_type_id, total in (
+                Part.objects
+                .filter(status='STOKTA', aircraft_model_compatibility_id__in=model_index,
+                        part_type_id__in=part_type_index)
+                .values_list('aircraft_model_compatibility_id', 'part_type_id')
+                .annotate(total=Count('id'))
+                .order_by()):
+            stock[model_index[model_id], part_type_index[part_type_id]] = total
+
+    return {
+        'aircraft_models': [aircraft_models[pk] for pk in model_index],
+        'part_types': [part_types[pk] for pk in part_type_index],
+        'production': production / history_days,
+        'assembly': assembly / history_days,
+        'stock': stock,
+    }
+
+
+def run_chunk(production, assembly, stock, days, replications, seed):
+    """
+    `replications` adet replikasyonu çalıştırır.
+    Dönen değerler: Monte edilen uçak sayıları (replikasyon x model) ve her faktörün montajı kaç gün
+    sınırladığı (replikasyon x model x [parça tipleri..., MONTAJ]).
+    """
+    rng = np.random.default_rng(seed)
+    models, part_types = production.shape
+    produced = rng.poisson(production, size=(days, replications, models, part_types))
+    capacity = rng.poisson(assembly, size=(days, replications, models))
+
+    stock = np.broadcast_to(stock, (replications, models, part_types)).copy()
+    built = np.zeros((replications, models), dtype=np.int64)
+    limited_days = np.zeros((replications, models, part_types + 1), dtype=np.int64)
+    factors = np.arange(part_types + 1)
+    for day in range(days):
+        stock += produced[day]
+        kits = stock.min(axis=-1)
+        # Set sayısı kapasiteden azsa en az stoğu olan parça tipi, değilse montaj kapasitesi sınırlar.
+        limiting = np.where(kits < capacity[day], stock.argmin(axis=-1), part_types)
+        assembled = np.minimum(kits, capacity[day])
+        stock -= assembled[..., np.newaxis]
+        built += assembled
+        limited_days += limiting[..., np.newaxis] == factors
+    return built, limited_days
+
+
+def _chunks(replications):
+    return [min(REPLICATIONS_PER_CHUNK, replications - start)
+            for start in range(0, replications, REPLICATIONS_PER_CHUNK)]
+
+
+def run_replications(production, assembly, stock, days, replications, seed=None, workers=1):
+    """Replikasyonları parçalar halinde (workers > 1 ise process havuzunda) çalıştırır ve sonuçları birleştirir."""
+    sizes = _chunks(replications)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    arguments = [(production, assembly, stock, days, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    if workers > 1 and len(arguments) > 1:
+        # fork yerine spawn: Web process'inin thread'leri ve veritabanı bağlantıları kopyalanmaz.
+        with ProcessPoolExecutor(max_workers=min(workers, len(arguments)),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(run_chunk, *zip(*arguments)))
+    else:
+        results = [run_chunk(*args) for args in arguments]
+    built, limited_days = zip(*results)
+    return np.concatenate(built), np.concatenate(limited_days)
+
+
+def _summary(built, limited_days, factors):
+    """Model başına verim dağılımı ve darboğazların replikasyonlardaki payı."""
+    percentiles = np.percentile(built, PERCENTILES, axis=0)
+    bottleneck = limited_days.argmax(axis=-1)
+    shares = (bottleneck[..., np.newaxis] == np.arange(len(factors))).mean(axis=0)
+    return [
+        {
+            'throughput': {
+                'mean': round(float(built[:, model].mean()), 2),
+                'std': round(float(built[:, model].std()), 2),
+                **{f'p{percentile}': float(value) for percentile, value in zip(PERCENTILES, percentiles[:, model])},
+            },
+            'bottlenecks': {factor: round(float(share), 4) for factor, share in zip(factors, shares[model]) if share},
+        }
+        for model in range(built.shape[1])
+    ]
+
+
+def simulate(rates, teams, days, replications, seed=None, workers=1):
+    """
+    Mevcut durumu ve `teams` (takım tipi -> takım sayısı) senaryosunu aynı tohumlarla simüle eder.
+    Verilmeyen takım tipleri için sayı 1'dir.
+    """
+    team_counts = {part_type: 1 for part_type in rates['part_types']}
+    team_counts[ASSEMBLY_TEAM] = 1
+    team_counts.update(teams)
+    factors = [*rates['part_types'], ASSEMBLY_TEAM]
+    scale = np.array([team_counts.get(part_type, 1) for part_type in rates['part_types']], dtype=float)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    baseline = run_replications(rates['production'], rates['assembly'], rates['stock'], days, replications,
+                                seed, workers)
+    scenario = run_replications(rates['production'] * scale, rates['assembly'] * team_counts[ASSEMBLY_TEAM],
+                                rates['stock'], days, replications, seed, workers)
+    baseline_summary = _summary(*baseline, factors)
+    scenario_summary = _summary(*scenario, factors)
+    return {
+        'days': days,
+        'replications': replications,
+        'seed': seed,
+        'teams': team_counts,
+        'results': [
+            {
+                'aircraft_model': aircraft_model,
+                'baseline': baseline_summary[index],
+                'scenario': scenario_summary[index],
+                'mean_difference': round(float((scenario[0][:, index] - baseline[0][:, index]).mean()), 2),
+            }
+            for index, aircraft_model in enumerate(rates['aircraft_models'])
+        ],
+    }
@@ -0,0 +1,364 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+
+import numpy as np
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core import reference_cache
+from apps.envanter.archive import archive_recycled_parts
+from apps.envanter.factories import AircraftModelFactory, PartFactory, PartTypeFactory
+from apps.envanter.models import Part
+from apps.uretim.factories import KanatTeamFactory
+from apps.users.factories import AdminUserFactory, UserFactory
+from apps.users.models import AuthToken
+from . import dashboard, forecast, simulation
+from .models import AssemblyRollup, ProductionRollup
+from .rollups import bucket_start, rebuild
+
+
+def local_time(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class RollupMaintenanceTest(APITestCase):
+    """Özet tablolarının yazma işlemleriyle birlikte güncellenmesi testleri."""
+
+    def setUp(self):
+        self.kanat = PartTypeFactory(name='KANAT')
+        self.tb2 = AircraftModelFactory(name='TB2')
+
+    def create_part(self, created_at):
+        with mock.patch('django.utils.timezone.now', return_value=created_at):
+            return PartFactory(part_type=self.kanat, aircraft_model_compatibility=self.tb2)
+
+    def test_bucket_start_truncates_in_local_time(self):
+        value = local_time(2025, 5, 24, 13, 45)
+        self.assertEqual(bucket_start(value, 'HOUR'), local_time(2025, 5, 24, 13))
+        self.assertEqual(bucket_start(value, 'DAY'), local_time(2025, 5, 24))
+        self.assertEqual(bucket_start(value, 'MONTH'), local_time(2025, 5, 1))
+
+    def test_create_and_delete_update_all_grains(self):
+        part = self.create_part(local_time(2025, 5, 24, 13, 45))
+        self.create_part(local_time(2025, 5, 24, 14, 10))
+
+        counts = dict(ProductionRollup.objects.filter(part_type=self.kanat).values_list('grain', 'count')
+                      .filter(bucket_start__in=[local_time(2025, 5, 24, 13), local_time(2025, 5, 24), local_time(2025, 5, 1)]))
+        self.assertEqual(counts, {'HOUR': 1, 'DAY': 2, 'MONTH': 2})
+
+        part.delete()
+        self.assertEqual(ProductionRollup.objects.get(grain='MONTH', part_type=self.kanat).count, 1)
+
+    def test_rebuild_matches_incremental_rollups(self):
+        self.create_part(local_time(2025, 4, 30, 23, 30))
+        self.create_part(local_time(2025, 5, 1, 0, 30))
+        incremental = set(ProductionRollup.objects.values_list('grain', 'bucket_start', 'team', 'count'))
+
+        ProductionRollup.objects.all().delete()
+        rebuild()
+        self.assertEqual(set(ProductionRollup.objects.values_list('grain', 'bucket_start', 'team', 'count')), incremental)
+
+
+    def test_rebuild_counts_archived_parts(self):
+        for hour in (10, 11):
+            part = self.create_part(local_time(2025, 5, 24, hour))
+            Part.objects.filter(pk=part.pk).update(status='GERI_DONUSUMDE', updated_at=local_time(2025, 5, 25))
+        self.create_part(local_time(2025, 5, 24, 12))
+        fields = ('grain', 'bucket_start', 'team', 'part_type', 'aircraft_model', 'count')
+        counts = set(ProductionRollup.objects.values_list(*fields))
+
+        self.assertEqual(archive_recycled_parts(local_time(2025, 6, 1)), 2)
+        rebuild()
+        self.assertEqual(set(ProductionRollup.objects.values_list(*fields)), counts)
+        rebuild(since=local_time(2025, 5, 10))
+        self.assertEqual(set(ProductionRollup.objects.values_list(*fields)), counts)
+
+
+class AnalyticsAPITest(APITestCase):
+    """/api/v1/analytics/ endpoint'lerinin testleri."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + AuthToken.objects.create(user=self.user).key)
+        self.kanat = PartTypeFactory(name='KANAT')
+        self.govde = PartTypeFactory(name='GOVDE')
+        tb2 = AircraftModelFactory(name='TB2')
+        for created_at, part_type in [
+            (local_time(2025, 5, 5, 10), self.kanat),   # Pazartesi
+            (local_time(2025, 5, 7, 10), self.kanat),
+            (local_time(2025, 5, 7, 11), self.govde),
+            (local_time(2025, 5, 12, 9), self.kanat),   # Sonraki hafta
+        ]:
+            with mock.patch('django.utils.timezone.now', return_value=created_at):
+                PartFactory(part_type=part_type, aircraft_model_compatibility=tb2)
+        self.url = reverse('analytics-production')
+
+    def test_weekly_production_grouped_by_part_type(self):
+        params = {'start': '2025-05-01', 'end': '2025-06-01', 'grain': 'week', 'group_by': 'part_type'}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        # Ana tablolar okunmaz, tek bir özet sorgusu çalışır.
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertFalse([query for query in sql if '"envanter_part"' in query])
+        self.assertEqual(len([query for query in sql if 'analitik_productionrollup' in query]), 1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['total'], 4)
+        rows = [(row['bucket'].date().isoformat(), row['part_type'], row['count']) for row in response.data['results']]
+        self.assertEqual(rows, [
+            ('2025-05-05', 'GOVDE', 1),
+            ('2025-05-05', 'KANAT', 2),
+            ('2025-05-12', 'KANAT', 1),
+        ])
+
+    def test_range_filter_and_daily_grain(self):
+        params = {'start': '2025-05-07T00:00:00', 'end': '2025-05-08T00:00:00', 'grain': 'day'}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['count'] for row in response.data['results']], [2])
+
+    def test_invalid_group_by_is_rejected(self):
+        response = self.client.get(self.url, {'group_by': 'serial_number'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('group_by', response.data)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class DashboardSummaryAPITest(APITestCase):
+    """/api/v1/dashboard/summary/ endpoint'inin testleri."""
+
+    def setUp(self):
+        cache.clear()
+        self.kanat_team = KanatTeamFactory()
+        self.user = UserFactory()
+        self.user.profile.team = self.kanat_team
+        self.user.profile.save()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + AuthToken.objects.create(user=self.user).key)
+        self.tb2 = AircraftModelFactory(name='TB2')
+        self.part_types = {name: PartTypeFactory(name=name) for name in ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK']}
+        for name in ['KANAT', 'KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK']:
+            PartFactory(part_type=self.part_types[name], aircraft_model_compatibility=self.tb2)
+        PartFactory(part_type=self.part_types['KANAT'], aircraft_model_compatibility=self.tb2, status='GERI_DONUSUMDE')
+        self.url = reverse('dashboard-summary')
+
+    def test_summary_contents(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data
+        self.assertEqual(data['team']['name'], 'KANAT')
+        self.assertEqual(data['stock']['by_status']['STOKTA'], 5)
+        self.assertEqual(data['stock']['by_status']['GERI_DONUSUMDE'], 1)
+        self.assertEqual(data['stock']['by_part_type']['KANAT'], 2)
+        self.assertEqual(data['stock']['by_aircraft_model']['TB2'], 5)
+        self.assertEqual(data['capacity']['TB2']['buildable'], 1)
+        self.assertEqual(data['capacity']['AKINCI']['missing_part_types'], ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK'])
+        activity = data['my_team_activity']
+        self.assertEqual((activity['kind'], activity['last_7_days'], activity['last_30_days']), ('production', 3, 3))
+        self.assertEqual(len(activity['recent']), 3)
+
+    def test_summary_uses_fixed_number_of_queries(self):
+        # Referans verileri önbellekte olduğu varsayılır (TestCase transaction'ı içinde önbellek atlanır).
+        with mock.patch.object(connection, 'in_atomic_block', False):
+            reference_cache.warm()
+            self.addCleanup(reference_cache.invalidate)
+            with CaptureQueriesContext(connection) as queries:
+                dashboard.build_summary(self.kanat_team)
+        self.assertEqual(len(queries.captured_queries), 4)
+
+    def test_summary_is_cached_and_invalidated_on_write(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse([query for query in queries.captured_queries if '"envanter_part"' in query['sql']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PartFactory(part_type=self.part_types['KANAT'], aircraft_model_compatibility=self.tb2)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['stock']['by_part_type']['KANAT'], 3)
+
+
+@override_settings(FORECAST_WINDOW_DAYS=10, FORECAST_MOVING_AVERAGE_DAYS=5, FORECAST_SMOOTHING_ALPHA=0.5)
+class StockForecastTest(APITestCase):
+    """Stok tükenme tahmini ve /api/v1/analytics/forecast/ endpoint'inin testleri."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + AuthToken.objects.create(user=self.user).key)
+        self.tb2 = AircraftModelFactory(name='TB2')
+        self.part_types = {name: PartTypeFactory(name=name) for name in ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK']}
+        self.yesterday = timezone.localdate() - timedelta(days=1)
+        # Son 5 gün: Günde 2 uçak monte edildi, 1 kanat üretildi. Stokta 6 kanat var.
+        for days_ago in range(5):
+            self.add_day(self.yesterday - timedelta(days=days_ago), assembled=2, wings=1)
+        for _ in range(6):
+            PartFactory(part_type=self.part_types['KANAT'], aircraft_model_compatibility=self.tb2)
+        self.url = reverse('analytics-forecast')
+
+    def add_day(self, day, assembled, wings):
+        start = forecast._day_start(day)
+        AssemblyRollup.objects.create(grain='DAY', bucket_start=start, aircraft_model=self.tb2, count=assembled)
+        ProductionRollup.objects.create(grain='DAY', bucket_start=start, aircraft_model=self.tb2,
+                                        part_type=self.part_types['KANAT'], count=wings)
+
+    def row(self, data, part_type):
+        return next(row for row in data['results'] if row['aircraft_model'] == 'TB2' and row['part_type'] == part_type)
+
+    def test_smoothing_weights_match_recursive_formula(self):
+        series = [3.0, 0.0, 5.0, 1.0, 2.0, 4.0]
+        smoothed = series[0]
+        for value in series[1:]:
+            smoothed = 0.3 * value + 0.7 * smoothed
+        weights = forecast.smoothing_weights(len(series), 0.3)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertAlmostEqual(float(weights @ series), smoothed)
+
+    def test_forecast_contents(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['last_day'], self.yesterday)
+
+        wing = self.row(response.data, 'KANAT')
+        self.assertEqual(wing['in_stock'], 6)
+        moving_average = wing['moving_average']
+        self.assertEqual((moving_average['production_rate'], moving_average['consumption_rate']), (1.0, 2.0))
+        self.assertEqual(moving_average['days_to_stockout'], 6.0)
+        self.assertEqual(moving_average['stockout_date'], timezone.localdate() + timedelta(days=6))
+        # İlk 5 gün boş olduğu için üstel düzeltme daha düşük hız verir: 2 * (1 - 0.5^5)
+        self.assertEqual(wing['exponential_smoothing']['consumption_rate'], 1.94)
+
+        # Stoğu olmayan parça hemen tükenir, üretimi tüketimi karşılayan parça tükenmez.
+        self.assertEqual(self.row(response.data, 'GOVDE')['moving_average']['days_to_stockout'], 0.0)
+        akinci = next(row for row in response.data['results'] if row['aircraft_model'] != 'TB2')
+        self.assertIsNone(akinci['moving_average']['days_to_stockout'])
+
+    def test_negligible_consumption_does_not_stock_out(self):
+        # 60 gün önceki tek montaj: Üstel düzeltme hızı çok küçüktür, tükenme tarihi hesaplanamayacak kadar uzaktır.
+        AssemblyRollup.objects.all().delete()
+        ProductionRollup.objects.all().delete()
+        self.add_day(self.yesterday - timedelta(days=59), assembled=1, wings=0)
+        production, consumption = forecast.compute_rates(np.zeros((1, 1, 90)), np.eye(1, 90, 30), 14, 0.2)[
+            'exponential_smoothing']
+        self.assertTrue(np.isnan(forecast.days_to_stockout(np.array([[3.0]]), production, consumption)).all())
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        smoothing = self.row(response.data, 'KANAT')['exponential_smoothing']
+        self.assertIsNone(smoothing['days_to_stockout'])
+        self.assertIsNone(smoothing['stockout_date'])
+
+    def test_forecast_is_cached(self):
+        self.client.get(self.url)
+        PartFactory(part_type=self.part_types['KANAT'], aircraft_model_compatibility=self.tb2)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertFalse([query for query in queries.captured_queries if 'analitik_' in query['sql']])
+        self.assertEqual(self.row(response.data, 'KANAT')['in_stock'], 6)
+
+    def test_series_are_refreshed_incrementally(self):
+        model_ids = [self.tb2.pk]
+        part_type_ids = sorted(part_type.pk for part_type in self.part_types.values())
+        state = forecast.refresh_series(None, self.yesterday, model_ids, part_type_ids, 10)
+
+        today = self.yesterday + timedelta(days=1)
+        self.add_day(today, assembled=3, wings=4)
+        with CaptureQueriesContext(connection) as queries:
+            incremental = forecast.refresh_series(state, today, model_ids, part_type_ids, 10)
+        # Sadece yeni gün okunur (üretim ve montaj özetleri için birer sorgu).
+        self.assertEqual(len(queries.captured_queries), 2)
+
+        full = forecast.refresh_series(None, today, model_ids, part_type_ids, 10)
+        self.assertEqual(incremental['production'].tolist(), full['production'].tolist())
+        self.assertEqual(incremental['assembly'].tolist(), full['assembly'].tolist())
+        self.assertEqual(full['assembly'][0, -1], 3)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ProductionSimulationTest(APITestCase):
+    """Üretim hattı simülasyonu ve /api/v1/analytics/simulation/ endpoint'inin testleri."""
+
+    # Tek model. Aviyonik günde 1, diğer parçalar günde 5 üretiliyor, montaj kapasitesi günde 3.
+    RATES = {
+        'aircraft_models': ['AKINCI'],
+        'part_types': ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK'],
+        'production': np.array([[5.0, 5.0, 5.0, 1.0]]),
+        'assembly': np.array([3.0]),
+        'stock': np.zeros((1, 4), dtype=np.int64),
+    }
+
+    def setUp(self):
+        self.admin = AdminUserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + AuthToken.objects.create(user=self.admin).key)
+        akinci = AircraftModelFactory(name='AKINCI')
+        part_types = {name: PartTypeFactory(name=name) for name in self.RATES['part_types']}
+        for days_ago in range(1, 11):
+            start = forecast._day_start(timezone.localdate() - timedelta(days=days_ago))
+            AssemblyRollup.objects.create(grain='DAY', bucket_start=start, aircraft_model=akinci, count=3)
+            for name, count in zip(part_types, self.RATES['production'][0]):
+                ProductionRollup.objects.create(grain='DAY', bucket_start=start, aircraft_model=akinci,
+                                                part_type=part_types[name], count=int(count))
+        self.url = reverse('analytics-simulation')
+
+    def test_adding_a_team_moves_the_bottleneck(self):
+        result = simulation.simulate(self.RATES, {'AVIYONIK': 3}, days=30, replications=1000, seed=1)
+        row = result['results'][0]
+        self.assertEqual(result['teams']['AVIYONIK'], 3)
+        self.assertGreater(row['baseline']['bottlenecks']['AVIYONIK'], 0.99)
+        self.assertGreater(row['scenario']['bottlenecks']['MONTAJ'], 0.5)
+        # Aviyonik günde ~1 uçak ile sınırlıyken senaryoda montaj kapasitesine (~3) yaklaşılır.
+        self.assertAlmostEqual(row['baseline']['throughput']['mean'], 30, delta=3)
+        self.assertGreater(row['mean_difference'], 40)
+
+    def test_results_do_not_depend_on_worker_count(self):
+        args = (self.RATES['production'], self.RATES['assembly'], self.RATES['stock'], 10, 1200)
+        single = simulation.run_replications(*args, seed=7, workers=1)
+        parallel = simulation.run_replications(*args, seed=7, workers=2)
+        self.assertEqual(single[0].shape, (1200, 1))
+        self.assertTrue(np.array_equal(single[0], parallel[0]))
+        self.assertTrue(np.array_equal(single[1], parallel[1]))
+
+    def test_rates_are_estimated_from_rollups(self):
+        rates = simulation.estimate_rates(history_days=10, initial_stock=False)
+        index = rates['aircraft_models'].index('AKINCI')
+        self.assertEqual(rates['assembly'][index], 3)
+        self.assertEqual(dict(zip(rates['part_types'], rates['production'][index])),
+                         {'KANAT': 5, 'GOVDE': 5, 'KUYRUK': 5, 'AVIYONIK': 1})
+
+    def test_simulation_endpoint(self):
+        response = self.client.post(self.url, {'teams': {'AVIYONIK': 2}, 'days': 30, 'replications': 200,
+                                               'history_days': 10, 'seed': 3}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        row = next(row for row in response.data['results'] if row['aircraft_model'] == 'AKINCI')
+        self.assertGreater(row['scenario']['throughput']['mean'], row['baseline']['throughput']['mean'])
+        self.assertEqual(response.data['seed'], 3)
+
+    def test_invalid_team_and_too_many_replications_are_rejected(self):
+        with override_settings(SIMULATION_MAX_REPLICATIONS=100):
+            response = self.client.post(self.url, {'teams': {'BOYA': 1}, 'replications': 101}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {'teams', 'replications'})
+
+    def test_requires_admin(self):
+        user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + AuthToken.objects.create(user=user).key)
+        self.assertEqual(self.client.post(self.url, {}, format='json').status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('simulate_production', '--team', 'aviyonik=2', '--days', '10', '--replications', '100',
+                     '--history-days', '10', '--seed', '1', '--workers', '1', stdout=out)
+        self.assertIn('AVIYONIK=2', out.getvalue())
+        self.assertIn('AKINCI', out.getvalue())
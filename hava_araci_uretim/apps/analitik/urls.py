@@ -0,0 +1,16 @@
+# apps/analitik/urls.py
+
+from django.urls import path
+
+from .views import ProductionAnalyticsView, AssemblyAnalyticsView, ProductionSimulationView, StockForecastView
+
+urlpatterns = [
+    # URL: /api/v1/analytics/production/?start=2025-01-01&end=2026-01-01&grain=day&group_by=team
+    path('production/', ProductionAnalyticsView.as_view(), name='analytics-production'),
+    # URL: /api/v1/analytics/assembly/?grain=week&group_by=aircraft_model
+    path('assembly/', AssemblyAnalyticsView.as_view(), name='analytics-assembly'),
+    # URL: /api/v1/analytics/forecast/
+    path('forecast/', StockForecastView.as_view(), name='analytics-forecast'),
+    # URL: /api/v1/analytics/simulation/ (POST, sadece admin)
+    path('simulation/', ProductionSimulationView.as_view(), name='analytics-simulation'),
+]
@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import dashboard, forecast, simulation
+from .models import AssemblyRollup, ProductionRollup
+from .rollups import bucket_start
+from .serializers import AnalyticsQuerySerializer, SimulationRequestSerializer
+
+# OpenAPI dökümantasyonu (extend_schema tanımları) schema.py içindedir ve sadece şema üretilirken yüklenir.
+
+# İstenen zaman diliminin hangi özet tablosu diliminden okunacağı. Haftalık değerler günlük özetlerden toplanır.
+SOURCE_GRAINS = {'hour': 'HOUR', 'day': 'DAY', 'week': 'DAY', 'month': 'MONTH'}
+
+
+class RollupAnalyticsView(APIView):
+    """
+    Özet (rollup) tablolarından zaman dilimine ve istenen alanlara göre gruplanmış sayıları döndürür.
+    Ana tablolar (Part, AssembledAircraft) hiç okunmaz.
+    """
+    model = None
+    # API'deki gruplama alanı -> özet tablosundaki değer
+    dimensions = {}
+
+    def get(self, request, *args, **kwargs):
+        serializer = AnalyticsQuerySerializer(data=request.query_params, dimensions=list(self.dimensions))
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        grain, group_by = params['grain'], params['group_by']
+
+        # Başlangıç zamanını içeren dilim de dahil edilir.
+        start = bucket_start(params['start'], SOURCE_GRAINS[grain])
+        if grain == 'week':
+            local = timezone.localtime(start)
+            start = timezone.make_aware(local.replace(tzinfo=None) - timedelta(days=local.weekday()))  # Pazartesi
+
+        lookups = [self.dimensions[field] for field in group_by]
+        bucket = TruncWeek('bucket_start') if grain == 'week' else F('bucket_start')
+        rows = (
+            self.model.objects
+            .filter(grain=SOURCE_GRAINS[grain], bucket_start__gte=start, bucket_start__lt=params['end'])
+            .exclude(count=0)
+            .annotate(bucket=bucket)
+            .values('bucket', *lookups)
+            .annotate(total=Sum('count'))
+            .order_by('bucket', *lookups)
+        )
+
+        results = [
+            {'bucket': row['bucket'], **{field: row[self.dimensions[field]] for field in group_by}, 'count': row['total']}
+            for row in rows
+        ]
+        return Response({
+            'grain': grain,
+            'start': start,
+            'end': params['end'],
+            'group_by': group_by,
+            'total': sum(row['count'] for row in results),
+            'results': results,
+        })
+
+
+class ProductionAnalyticsView(RollupAnalyticsView):
+    """Üretilen parça sayıları. Gruplama: takım, parça tipi, uçak modeli."""
+    model = ProductionRollup
+    dimensions = {
+        'team': 'team__name',
+        'part_type': 'part_type__name',
+        'aircraft_model': 'aircraft_model__name',
+    }
+
+
+class AssemblyAnalyticsView(RollupAnalyticsView):
+    """Monte edilen uçak sayıları. Gruplama: uçak modeli, montaj takımı."""
+    model = AssemblyRollup
+    dimensions = {
+        'aircraft_model': 'aircraft_model__name',
+        'team': 'team__name',
+    }
+
+
+class DashboardSummaryView(APIView):
+    """
+    Dashboard'un ihtiyaç duyduğu özet verileri tek istekte döndürür: Stok durumu (duruma, parça tipine ve
+    uçak modeline göre), model bazında montaj kapasitesi, kullanıcının takımının son üretimleri ve son montajlar.
+    Sonuç takım başına önbelleğe alınır (bkz. apps.analitik.dashboard).
+    """
+
+    def get(self, request, *args, **kwargs):
+        profile = getattr(request.user, 'profile', None)
+        return Response(dashboard.get_summary(profile.team if profile else None))
+
+
+class StockForecastView(APIView):
+    """
+    Her uçak modeli x parça tipi için son günlerin üretim ve montaj hızlarına göre stoğun tükenmesine kalan
+    gün sayısı (hareketli ortalama ve üstel düzeltme ile). Sonuç önbelleğe alınır (bkz. apps.analitik.forecast).
+    """
+
+    def get(self, request, *args, **kwargs):
+        return Response(forecast.get_forecast())
+
+
+class ProductionSimulationView(APIView):
+    """
+    Geçmiş üretim ve montaj hızlarıyla üretim hattını Monte Carlo yöntemiyle simüle eder ve verilen takım
+    sayıları senaryosunu mevcut durumla karşılaştırır. Veritabanına yazmaz. Sadece adminler çalıştırabilir.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = SimulationRequestSerializer(data=request.data, max_replications=settings.SIMULATION_MAX_REPLICATIONS)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        rates = simulation.estimate_rates(params['history_days'], initial_stock=params['initial_stock'])
+        return Response(simulation.simulate(rates, params['teams'], params['days'], params['replications'],
+                                            seed=params.get('seed'), workers=settings.SIMULATION_WORKERS))
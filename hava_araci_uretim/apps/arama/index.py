@@ -0,0 +1,273 @@
+"""
+Parça, uçak, takım ve kullanıcıların birleşik araması.
+
+Her nesne için `SearchDocument` tablosunda bir satır (doküman) tutulur. Arama tek tabloda, tek sorguyla
+yapılır. PostgreSQL'de dokümanın `vector` sütunu (tsvector) trigger ile doldurulur ve GIN index'i ile
+aranır (bkz. migrations/0001_initial.py). Diğer veritabanlarında (geliştirme, testler) kelimeler metin içinde
+aranır.
+
+Metinler `normalize()` ile Türkçe kurallarına göre küçük harfe çevrilir ve Türkçe karakterlerden arındırılır.
+Seçenek alanlarının hem kodu hem görünen adı eklenir (örn: `GOVDE` ve `Gövde Takımı` -> `govde takimi`),
+böylece "gövde", "GOVDE" ve "govde" aynı sonucu verir.
+
+Dokümanlar kayıt ile aynı transaction içinde güncellenir: `save()`/`delete()` sinyallerle yakalanır (aranan
+alanlar değişmediyse doküman yazılmaz), ham SQL ile silme veya `bulk_create` yapan toplu işlemler `index()` /
+`remove()` fonksiyonlarını doğrudan çağırır. Parça durumu dokümanda yer almadığı için montaj, söküm ve geri
+dönüşüm dokümanları değiştirmez. Takım silinmesi gibi nadir değişikliklerden sonra veya onarım için dokümanlar
+`manage.py rebuild_search_index` ile yeniden üretilebilir.
+"""
+import re
+import unicodedata
+from itertools import islice
+
+from django.apps import apps as global_apps
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.signals import post_delete, post_save
+
+from .models import SearchDocument
+
+BATCH_SIZE = 1000
+SEARCH_CONFIG = 'simple'  # Kelimeler Python'da normalize edildiği için dil sözlüğü kullanılmaz.
+
+_TURKISH_FOLD = str.maketrans({'ı': 'i', 'ş': 's', 'ğ': 'g', 'ü': 'u', 'ö': 'o', 'ç': 'c'})
+_WORD = re.compile(r'[^\W_]+')
+
+# Dokümanda yer alan alanlar. Sadece başka alanları güncelleyen `save(update_fields=...)` çağrıları dokümanı yazmaz.
+PART_FIELDS = {'serial_number', 'part_type', 'aircraft_model_compatibility', 'produced_by_team'}
+AIRCRAFT_FIELDS = {'tail_number', 'aircraft_model', 'assembled_by_team', 'wing', 'fuselage', 'tail', 'avionics'}
+TEAM_FIELDS = {'name', 'responsible_part_type'}
+USER_FIELDS = {'username', 'first_name', 'last_name', 'email'}
+
+
+def normalize(*values):
+    """
+    Değerleri aranabilir metne çevirir: Türkçe kurallarıyla küçük harf (`İ` -> `i`, `I` -> `ı`), Türkçe
+    karakterler ve aksanlar olmadan, sadece harf ve rakamlardan oluşan tekrarsız kelimeler.
+    Örn: `normalize('GOVDE', 'Gövde Takımı')` -> `'govde takimi'`.
+    """
+    words = {}
+    for value in values:
+        if value in (None, ''):
+            continue
+        text = str(value).replace('İ', 'i').replace('I', 'ı').lower().translate(_TURKISH_FOLD)
+        text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+        words.update(dict.fromkeys(_WORD.findall(text)))
+    return ' '.join(words)
+
+
+def _choices(model, field):
+    return dict(model._meta.get_field(field).flatchoices)
+
+
+def _related_choices(model, field):
+    return _choices(model._meta.get_field(field).related_model, 'name')
+
+
+def _join(*values):
+    return ' · '.join(str(value) for value in values if value)
+
+
+def _parts(queryset):
+    part_types = _related_choices(queryset.model, 'part_type')
+    teams = _related_choices(queryset.model, 'produced_by_team')
+    rows = queryset.values_list('id', 'serial_number', 'part_type__name', 'aircraft_model_compatibility__name',
+                                'produced_by_team__name')
+    for pk, serial_number, part_type, aircraft_model, team in rows.iterator(chunk_size=BATCH_SIZE):
+        yield pk, {
+            'title': serial_number,
+            'subtitle': _join(part_types.get(part_type, part_type), aircraft_model, teams.get(team, team)),
+            'keywords': normalize(serial_number),
+            'document': normalize(part_type, part_types.get(part_type), aircraft_model, team, teams.get(team)),
+        }
+
+
+def _aircrafts(queryset):
+    teams = _related_choices(queryset.model, 'assembled_by_team')
+    rows = queryset.values_list('id', 'tail_number', 'aircraft_model__name', 'assembled_by_team__name',
+                                'wing__serial_number', 'fuselage__serial_number', 'tail__serial_number',
+                                'avionics__serial_number')
+    for pk, tail_number, aircraft_model, team, *serial_numbers in rows.iterator(chunk_size=BATCH_SIZE):
+        yield pk, {
+            'title': tail_number,
+            'subtitle': _join(aircraft_model, teams.get(team, team)),
+            'keywords': normalize(tail_number),
+            # Parça seri numarası ile aramada parçanın takılı olduğu uçak da bulunur.
+            'document': normalize(aircraft_model, team, teams.get(team), *serial_numbers),
+        }
+
+
+def _teams(queryset):
+    teams = _choices(queryset.model, 'name')
+    part_types = _related_choices(queryset.model, 'responsible_part_type')
+    rows = queryset.values_list('id', 'name', 'responsible_part_type__name')
+    for pk, name, part_type in rows.iterator(chunk_size=BATCH_SIZE):
+        yield pk, {
+            'title': teams.get(name, name),
+            'subtitle': part_types.get(part_type, part_type) or '',
+            'keywords': normalize(name, teams.get(name)),
+            'document': normalize(part_type, part_types.get(part_type)),
+        }
+
+
+def _users(queryset):
+    profile_model = queryset.model._meta.get_field('profile').related_model
+    teams = _related_choices(profile_model, 'team')
+    rows = queryset.values_list('id', 'username', 'first_name', 'last_name', 'email', 'profile__team__name')
+    for pk, username, first_name, last_name, email, team in rows.iterator(chunk_size=BATCH_SIZE):
+        yield pk, {
+            'title': username,
+            'subtitle': _join(f'{first_name} {last_name}'.strip(), teams.get(team, team)),
+            'keywords': normalize(username, first_name, last_name),
+            'document': normalize(email, team, teams.get(team)),
+        }
+
+
+# Tür -> (uygulama, model, doküman üreticisi)
+SOURCES = {
+    'PART': ('envanter', 'Part', _parts),
+    'AIRCRAFT': ('montaj', 'AssembledAircraft', _aircrafts),
+    'TEAM': ('uretim', 'Team', _teams),
+    'USER': ('auth', 'User', _users),
+}
+
+
+def _documents(kind, ids=None, apps=global_apps):
+    app_label, model_name, build = SOURCES[kind]
+    queryset = apps.get_model(app_label, model_name)._default_manager.order_by()
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    document_model = apps.get_model('arama', 'SearchDocument')
+    for pk, fields in build(queryset):
+        yield document_model(kind=kind, object_id=pk, **fields)
+
+
+def index(kind, ids):
+    """
+    `kind` türündeki `ids` nesnelerinin dokümanlarını oluşturur veya günceller (bir okuma ve bir upsert sorgusu).
+    Artık olmayan nesnelerin dokümanları silinir.
+    """
+    ids = set(ids)
+    if not ids:
+        return
+    documents = list(_documents(kind, ids))
+    if documents:
+        SearchDocument.objects.bulk_create(
+            documents, batch_size=BATCH_SIZE, update_conflicts=True, unique_fields=['kind', 'object_id'],
+            update_fields=['title', 'subtitle', 'keywords', 'document'],
+        )
+    missing = ids - {document.object_id for document in documents}
+    if missing:
+        remove(kind, missing)
+
+
+def remove(kind, ids):
+    """`kind` türündeki `ids` nesnelerinin dokümanlarını siler."""
+    SearchDocument.objects.filter(kind=kind, object_id__in=list(ids)).delete()
+
+
+def rebuild(apps=global_apps):
+    """
+    Tüm dokümanları kaynak tablolardan yeniden üretir, oluşturulan doküman sayısını döndürür.
+    `apps`: Migration'lardan çağrılırken tarihsel model kayıt defteri.
+    """
+    document_model = apps.get_model('arama', 'SearchDocument')
+    created = 0
+    with transaction.atomic():
+        document_model.objects.all().delete()
+        for kind in SOURCES:
+            documents = _documents(kind, apps=apps)
+            while batch := list(islice(documents, BATCH_SIZE)):
+                document_model.objects.bulk_create(batch)
+                created += len(batch)
+    return created
+
+
+def search(text, kinds, limit):
+    """
+    `text` ile eşleşen `kinds` türündeki dokümanları en alakalıdan başlayarak döndürür (`rank` ile).
+    Her kelime önek olarak aranır ve tüm kelimeler eşleşmelidir (`tb2 00` -> `tb2:* & 00:*`). Kimlikte
+    (seri numarası, kuyruk numarası, kullanıcı adı) geçen eşleşmeler diğer bilgilerde geçenlerden önce gelir.
+    """
+    words = normalize(text).split()
+    if not words or not kinds:
+        return SearchDocument.objects.none()
+    queryset = SearchDocument.objects.filter(kind__in=kinds)
+
+    if connection.vendor == 'postgresql':
+        # Kelimeler sadece harf ve rakamdan oluştuğu için ham tsquery sözdizimi güvenle kurulabilir.
+        query = SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=SEARCH_CONFIG)
+        queryset = queryset.filter(vector=query).annotate(rank=SearchRank(F('vector'), query))
+    else:
+        for word in words:
+            queryset = queryset.filter(Q(keywords__contains=word) | Q(document__contains=word))
+        queryset = queryset.annotate(rank=Case(
+            When(Q(*[Q(keywords__contains=word) for word in words]), then=Value(1.0)),
+            default=Value(0.5),
+            output_field=FloatField(),
+        ))
+    return queryset.order_by('-rank', 'title')[:limit]
+
+
+def _changed(fields, update_fields):
+    return update_fields is None or any(field.removesuffix('_id') in fields for field in update_fields)
+
+
+def _part_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _changed(PART_FIELDS, update_fields):
+        return
+    index('PART', [instance.pk])
+    if instance.used_in_aircraft_id:
+        # Uçağın dokümanı parçanın seri numarasını içerir.
+        index('AIRCRAFT', [instance.used_in_aircraft_id])
+
+
+def _part_deleted(sender, instance, **kwargs):
+    remove('PART', [instance.pk])
+
+
+def _aircraft_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw and _changed(AIRCRAFT_FIELDS, update_fields):
+        index('AIRCRAFT', [instance.pk])
+
+
+def _aircraft_deleted(sender, instance, **kwargs):
+    remove('AIRCRAFT', [instance.pk])
+
+
+def _team_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw and _changed(TEAM_FIELDS, update_fields):
+        index('TEAM', [instance.pk])
+
+
+def _team_deleted(sender, instance, **kwargs):
+    remove('TEAM', [instance.pk])
+
+
+def _user_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Yeni kullanıcılar, hemen ardından oluşturulan profilleri kaydedilirken indekslenir.
+    if not created and not raw and _changed(USER_FIELDS, update_fields):
+        index('USER', [instance.pk])
+
+
+def _user_deleted(sender, instance, **kwargs):
+    remove('USER', [instance.pk])
+
+
+def _profile_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw and _changed({'team'}, update_fields):
+        index('USER', [instance.user_id])
+
+
+def connect_signals():
+    receivers = [
+        ('envanter.Part', _part_saved, _part_deleted),
+        ('montaj.AssembledAircraft', _aircraft_saved, _aircraft_deleted),
+        ('uretim.Team', _team_saved, _team_deleted),
+        ('auth.User', _user_saved, _user_deleted),
+    ]
+    for sender, saved, deleted in receivers:
+        post_save.connect(saved, sender=sender, dispatch_uid=f'arama_{sender}_saved')
+        post_delete.connect(deleted, sender=sender, dispatch_uid=f'arama_{sender}_deleted')
+    post_save.connect(_profile_saved, sender='users.UserProfile', dispatch_uid='arama_users.UserProfile_saved')
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.arama.index import rebuild
+
+
+class Command(BaseCommand):
+    help = ("Arama dokümanlarını parça, uçak, takım ve kullanıcı tablolarından yeniden üretir "
+            "(ilk kurulum, toplu veri yükleme veya onarım için).")
+
+    def handle(self, *args, **options):
+        created = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{created} arama dokümanı oluşturuldu."))
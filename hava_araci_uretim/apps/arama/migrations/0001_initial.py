@@ -0,0 +1,75 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:04
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+POSTGRESQL_STATEMENTS = [
+    # Kimlik (keywords) eşleşmeleri diğer bilgilerden (document) daha yüksek ağırlık alır.
+    """
+CREATE FUNCTION arama_search_document_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.vector := setweight(to_tsvector('simple', NEW.keywords), 'A')
+               || setweight(to_tsvector('simple', NEW.document), 'B');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql""",
+    """
+CREATE TRIGGER arama_search_document_vector
+BEFORE INSERT OR UPDATE OF keywords, document ON arama_searchdocument
+FOR EACH ROW EXECUTE FUNCTION arama_search_document_vector()""",
+    'CREATE INDEX search_document_vector_idx ON arama_searchdocument USING gin (vector)',
+]
+
+
+def create_vector_index(apps, schema_editor):
+    # Diğer veritabanlarında `vector` boş kalır, arama metin üzerinden yapılır (bkz. apps.arama.index.search).
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in POSTGRESQL_STATEMENTS:
+            schema_editor.execute(statement)
+
+
+def drop_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX search_document_vector_idx')
+        schema_editor.execute('DROP TRIGGER arama_search_document_vector ON arama_searchdocument')
+        schema_editor.execute('DROP FUNCTION arama_search_document_vector()')
+
+
+def backfill_documents(apps, schema_editor):
+    from apps.arama.index import rebuild
+    rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('envanter', '0009_part_reservation'),
+        ('montaj', '0004_kitreservation'),
+        ('uretim', '0003_aircraftorder_workorder'),
+        ('users', '0004_auth_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('PART', 'Parça'), ('AIRCRAFT', 'Uçak'), ('TEAM', 'Takım'), ('USER', 'Kullanıcı')], max_length=10, verbose_name='Tür')),
+                ('object_id', models.BigIntegerField(verbose_name='Nesne ID')),
+                ('title', models.CharField(max_length=150, verbose_name='Başlık')),
+                ('subtitle', models.CharField(blank=True, max_length=255, verbose_name='Açıklama')),
+                ('keywords', models.TextField(verbose_name='Anahtar Kelimeler')),
+                ('document', models.TextField(blank=True, verbose_name='Doküman')),
+                ('vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+            options={
+                'verbose_name': 'Arama Dokümanı',
+                'verbose_name_plural': 'Arama Dokümanları',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='uniq_search_document')],
+            },
+        ),
+        migrations.RunPython(create_vector_index, drop_vector_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
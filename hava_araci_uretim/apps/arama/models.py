@@ -0,0 +1,37 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Parça, uçak, takım ve kullanıcıların arama dokümanları (bkz. apps.arama.index).
+
+    `keywords` nesnenin kimliği (seri numarası, kuyruk numarası, kullanıcı adı), `document` diğer aranabilir
+    bilgileridir. İkisi de normalize edilmiş metindir. PostgreSQL'de `vector` sütunu bir trigger ile bu iki
+    alandan (`keywords` daha yüksek ağırlıkla) doldurulur ve GIN index'i ile aranır. Diğer veritabanlarında boş kalır.
+    """
+
+    KIND_CHOICES = [
+        ('PART', 'Parça'),
+        ('AIRCRAFT', 'Uçak'),
+        ('TEAM', 'Takım'),
+        ('USER', 'Kullanıcı'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name="Tür")
+    object_id = models.BigIntegerField(verbose_name="Nesne ID")
+    title = models.CharField(max_length=150, verbose_name="Başlık")
+    subtitle = models.CharField(max_length=255, blank=True, verbose_name="Açıklama")
+    keywords = models.TextField(verbose_name="Anahtar Kelimeler")
+    document = models.TextField(blank=True, verbose_name="Doküman")
+    vector = SearchVectorField(null=True, editable=False)
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+    class Meta:
+        verbose_name = "Arama Dokümanı"
+        verbose_name_plural = "Arama Dokümanları"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='uniq_search_document'),
+        ]
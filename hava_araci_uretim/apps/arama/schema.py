@@ -0,0 +1,38 @@
+"""
+Arama uygulaması view'lerinin OpenAPI dökümantasyonu.
+
+Sadece şema üretilirken yüklenir (bkz. apps.core.schema).
+"""
+from drf_spectacular.utils import extend_schema, OpenApiResponse, inline_serializer
+
+from apps.core.schema import ViewSchemaExtension
+from .serializers import SearchHitSerializer, SearchQuerySerializer
+
+
+class SearchViewSchema(ViewSchemaExtension):
+    target_class = 'apps.arama.views.SearchView'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Arama"],
+            summary="Birleşik Arama",
+            description="Parçalarda (seri numarası, tip, model, üreten takım), uçaklarda (kuyruk numarası, model, "
+                        "takım, takılı parçaların seri numaraları), takımlarda ve kullanıcılarda tek istekte arama "
+                        "yapar. Her kelime önek olarak aranır ve tüm kelimeler eşleşmelidir. Büyük/küçük harf ve "
+                        "Türkçe karakterler fark etmez (örn: `gövde`, `GOVDE`). Sonuçlar ilgi sırasıyla (`rank`) "
+                        "döner, kimlikte (seri/kuyruk numarası, kullanıcı adı) geçen eşleşmeler önce gelir.\n"
+                        "Takım ve kullanıcı sonuçları sadece adminlere döner.",
+            parameters=[SearchQuerySerializer],
+            responses={
+                200: inline_serializer(
+                    name='SearchResponse',
+                    fields={'results': SearchHitSerializer(many=True)}
+                ),
+                400: OpenApiResponse(description="Geçersiz veya çok kısa arama ifadesi."),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+            }
+        )
+        class SearchView(self.target_class):
+            pass
+
+        return SearchView
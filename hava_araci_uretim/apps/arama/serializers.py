@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from .models import SearchDocument
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Arama sorgusunun parametreleri."""
+    q = serializers.CharField(min_length=2, max_length=100, help_text="Aranan ifade (seri/kuyruk numarası, isim vb.).")
+    kind = serializers.MultipleChoiceField(
+        choices=SearchDocument.KIND_CHOICES, required=False,
+        help_text="Sadece bu türlerde ara (birden fazla verilebilir). Varsayılan: erişilebilen tüm türler."
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, required=False,
+                                     help_text="En fazla sonuç sayısı (varsayılan: SEARCH_RESULT_LIMIT).")
+
+
+class SearchHitSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='object_id')
+    rank = serializers.FloatField()
+
+    class Meta:
+        model = SearchDocument
+        fields = ['kind', 'id', 'title', 'subtitle', 'rank']
@@ -0,0 +1,122 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.envanter.archive import archive_recycled_parts
+from apps.envanter.factories import AircraftModelFactory, PartFactory
+from apps.envanter.models import Part, PartType
+from apps.montaj.models import AssembledAircraft
+from apps.uretim.models import Team
+from apps.users.factories import AdminUserFactory, UserFactory
+from . import index
+from .models import SearchDocument
+
+
+class NormalizeTest(APITestCase):
+
+    def test_turkish_text_is_folded_to_ascii_words(self):
+        self.assertEqual(index.normalize('GÖVDE', 'Gövde Takımı', 'AVİYONİK', 'IŞIK'), 'govde takimi aviyonik isik')
+        self.assertEqual(index.normalize('TC-AKN_001', None, ''), 'tc akn 001')
+
+
+class SearchIndexTest(APITestCase):
+    """Arama dokümanlarının yazmalarla güncellenmesini ve birleşik arama endpoint'ini test eder."""
+
+    def setUp(self):
+        self.url = reverse('search')
+        self.tb2 = AircraftModelFactory(name='TB2')
+        self.user = UserFactory()
+        self.client.force_authenticate(self.user)
+
+    def assemble(self, label):
+        parts = {slot: PartFactory(part_type=PartType.objects.get_or_create(name=name)[0],
+                                   aircraft_model_compatibility=self.tb2, serial_number=f'SRC-{label}-{slot}')
+                 for slot, name in AssembledAircraft.PART_SLOTS.items()}
+        return AssembledAircraft.objects.create(aircraft_model=self.tb2, tail_number=f'TC-SRC-{label}', **parts)
+
+    def search(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [(hit['kind'], hit['title']) for hit in response.data['results']]
+
+    def test_existing_rows_are_indexed_by_migration(self):
+        self.assertEqual(SearchDocument.objects.filter(kind='TEAM').count(), Team.objects.count())
+        self.assertEqual(set(SearchDocument.objects.filter(kind='USER').values_list('object_id', flat=True)),
+                         set(User.objects.values_list('pk', flat=True)))
+
+    def test_serial_number_finds_part_before_aircraft_it_is_installed_in(self):
+        aircraft = self.assemble('1')
+        self.assemble('2')
+        self.assertEqual(self.search('src-1-wi'), [('PART', 'SRC-1-wing'), ('AIRCRAFT', 'TC-SRC-1')])
+        self.assertEqual(self.search('TC SRC 1'), [('AIRCRAFT', aircraft.tail_number)])
+
+        hit = self.client.get(self.url, {'q': 'TC-SRC-1'}).data['results'][0]
+        self.assertEqual(hit['id'], aircraft.pk)
+        self.assertEqual(hit['subtitle'], 'TB2')
+
+    def test_choice_display_names_match_without_turkish_characters(self):
+        part = PartFactory(part_type=PartType.objects.get(name='GOVDE'), aircraft_model_compatibility=self.tb2,
+                           serial_number='SRC-GVD-1')
+        self.assertEqual(self.search('govde takımı src'), [('PART', part.serial_number)])
+        self.assertEqual(self.search('GÖVDE SRC'), [('PART', part.serial_number)])
+
+    def test_teams_and_users_are_only_returned_to_admins(self):
+        self.assertEqual(self.search('gövde', kind=['TEAM']), [])
+        self.client.force_authenticate(AdminUserFactory())
+        self.assertEqual(self.search('gövde', kind=['TEAM']), [('TEAM', 'Gövde Takımı')])
+        self.assertIn(('USER', self.user.username), self.search(self.user.username))
+
+    def test_search_is_a_single_query(self):
+        self.assemble('1')
+        with CaptureQueriesContext(connection) as queries:
+            hits = list(index.search('src 1', ['PART', 'AIRCRAFT'], 3))
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(hits), 3)
+
+    def test_documents_follow_updates_and_deletes(self):
+        aircraft = self.assemble('1')
+        part = aircraft.wing
+        part.serial_number = 'SRC-RENAMED'
+        part.save()
+        self.assertEqual(self.search('src renamed'), [('PART', 'SRC-RENAMED'), ('AIRCRAFT', 'TC-SRC-1')])
+
+        # Durum dokümanda yer almaz, sadece durum değiştiren kayıtlar dokümanı yazmaz.
+        with CaptureQueriesContext(connection) as queries:
+            part.save(update_fields=['status', 'updated_at'])
+        self.assertFalse([query for query in queries.captured_queries if 'arama_searchdocument' in query['sql']])
+
+        aircraft.delete()
+        self.assertEqual(self.search('tc src'), [])
+
+    def test_profile_team_change_updates_user_document(self):
+        self.client.force_authenticate(AdminUserFactory())
+        self.user.profile.team = Team.objects.get(name='KUYRUK')
+        self.user.profile.save()
+        self.assertIn(('USER', self.user.username), self.search(f'{self.user.username} kuyruk'))
+
+    def test_archived_parts_are_removed(self):
+        part = PartFactory(serial_number='SRC-ARCHIVE', status='GERI_DONUSUMDE')
+        Part.objects.filter(pk=part.pk).update(updated_at=timezone.now() - timedelta(days=60))
+        self.assertEqual(archive_recycled_parts(timezone.now() - timedelta(days=30)), 1)
+        self.assertFalse(SearchDocument.objects.filter(kind='PART', object_id=part.pk).exists())
+
+    def test_rebuild_command_recreates_documents(self):
+        self.assemble('1')
+        documents = set(SearchDocument.objects.values_list('kind', 'object_id', 'title', 'keywords', 'document'))
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(set(SearchDocument.objects.values_list('kind', 'object_id', 'title', 'keywords', 'document')),
+                         documents)
+
+    def test_invalid_query_is_rejected(self):
+        response = self.client.get(self.url, {'q': 'a'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('q', response.data)
@@ -0,0 +1,10 @@
+# apps/arama/urls.py
+
+from django.urls import path
+
+from .views import SearchView
+
+urlpatterns = [
+    # URL: /api/v1/search/?q=TB2-0005&kind=PART&kind=AIRCRAFT
+    path('', SearchView.as_view(), name='search'),
+]
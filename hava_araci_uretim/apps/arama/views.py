@@ -0,0 +1,32 @@
+from django.conf import settings
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import index
+from .models import SearchDocument
+from .serializers import SearchHitSerializer, SearchQuerySerializer
+
+# OpenAPI dökümantasyonu (extend_schema tanımları) schema.py içindedir ve sadece şema üretilirken yüklenir.
+
+# Takım ve kullanıcı listeleri sadece adminlere açık olduğu için bu türler sadece adminlerin sonuçlarında yer alır.
+PUBLIC_KINDS = ('PART', 'AIRCRAFT')
+ADMIN_KINDS = tuple(kind for kind, _label in SearchDocument.KIND_CHOICES)
+
+
+class SearchView(APIView):
+    """
+    Parça, uçak, takım ve kullanıcılarda birleşik arama. Türleri ve ilgi sırası belli sonuçlar tek sorguyla
+    arama dokümanları tablosundan okunur (bkz. apps.arama.index).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        query_serializer = SearchQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        params = query_serializer.validated_data
+
+        allowed = ADMIN_KINDS if request.user.is_staff else PUBLIC_KINDS
+        kinds = [kind for kind in allowed if not params.get('kind') or kind in params['kind']]
+        hits = index.search(params['q'], kinds, params.get('limit', settings.SEARCH_RESULT_LIMIT))
+        return Response({'results': SearchHitSerializer(hits, many=True).data})
@@ -1 +1,89 @@
-# Register your models here.
+"""
+Büyük tablolar (parçalar, monte edilmiş uçaklar) için admin yardımcıları.
+
+Django admin'in varsayılanları her sayfada tablo boyutuyla büyüyen sorgular çalıştırır: Sayfalama için
+filtrelenmiş ve filtresiz iki tam COUNT, filtre seçenekleri ve facet sayıları için ilişkili tabloların
+okunması, liste sütunlarında ilişkili nesnelerin `__str__` metotları. `LargeTableAdmin`:
+
+- Sayfalamada COUNT en fazla ADMIN_EXACT_COUNT_LIMIT satırı sayar. Sonuç bu sınırı aşarsa PostgreSQL'de
+  sorgu planlayıcısının tahmini kullanılır (bkz. `apps.core.counts`), diğer veritabanlarında tam sayım yapılır.
+- Filtresiz toplam sayı (`show_full_result_count`) ve filtre facet sayıları hesaplanmaz.
+- Referans tablolarına (parça tipi, uçak modeli, takım) giden filtrelerin seçenekleri ve liste sütunları
+  `apps.core.reference_cache`'ten okunur, sorgu veya JOIN gerektirmez.
+- Satırların işlem kutusu etiketi `__str__` (ilişkili nesneleri okuyabilir) yerine `row_label_field`
+  alanından üretilir.
+
+Arama alanları index'li önek aramaları (`<alan>__startswith`) olmalıdır. PostgreSQL'de unique/index'li
+CharField'lar için Django `varchar_pattern_ops` ile ayrıca bir `_like` index oluşturur, `LIKE 'önek%'`
+sorguları bu index'i kullanır.
+"""
+from django import forms
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin import helpers
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+from django.utils.translation import gettext as _
+
+from . import reference_cache
+from .counts import bounded_count, estimated_count
+
+DEFAULT_EXACT_COUNT_LIMIT = 10000
+
+# İlişkili model -> referans önbelleği
+_REFERENCE_GETTERS = {
+    'envanter.PartType': reference_cache.get_part_types,
+    'envanter.AircraftModel': reference_cache.get_aircraft_models,
+    'uretim.Team': reference_cache.get_teams,
+}
+
+
+class EstimatedCountPaginator(Paginator):
+    """Satır sayısını en fazla ADMIN_EXACT_COUNT_LIMIT'e kadar sayar, aşarsa tahmini kullanır."""
+
+    @cached_property
+    def count(self):
+        limit = getattr(settings, 'ADMIN_EXACT_COUNT_LIMIT', DEFAULT_EXACT_COUNT_LIMIT)
+        bounded = bounded_count(self.object_list, limit)
+        if bounded <= limit:
+            return bounded
+        estimate = estimated_count(self.object_list)
+        if estimate is None:
+            return self.object_list.count()
+        return max(estimate, bounded)
+
+
+def reference_name(kind, pk):
+    """Referans nesnesinin (`kind`: 'envanter.PartType' vb.) görünen adı. Önbellekte yoksa boş döner."""
+    if pk is None:
+        return None
+    for obj in _REFERENCE_GETTERS[kind]().values():
+        if obj.pk == pk:
+            return obj.get_name_display()
+    return None
+
+
+class ReferenceFieldListFilter(admin.RelatedFieldListFilter):
+    """Seçenekleri veritabanı yerine referans önbelleğinden okunan ilişki filtresi."""
+
+    def field_choices(self, field, request, model_admin):
+        objects = _REFERENCE_GETTERS[field.related_model._meta.label]().values()
+        return sorted(((obj.pk, obj.get_name_display()) for obj in objects), key=lambda choice: str(choice[1]))
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Milyonlarca satırlık tablolar için admin tabanı (bkz. modül açıklaması)."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    row_label_field = 'pk'
+
+    def action_checkbox(self, obj):
+        # ModelAdmin.action_checkbox ile aynı, etiket için `__str__` çağrılmaz.
+        attrs = {
+            'class': 'action-select',
+            'aria-label': format_html(_("Select this object for an action - {}"), getattr(obj, self.row_label_field)),
+        }
+        checkbox = forms.CheckboxInput(attrs, lambda value: False)
+        return checkbox.render(helpers.ACTION_CHECKBOX_NAME, str(obj.pk))
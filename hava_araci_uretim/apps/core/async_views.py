@@ -0,0 +1,115 @@
+"""
+ASGI modunda çalışan async okuma endpoint'leri için ortak yardımcılar.
+
+Bu endpoint'ler DRF view'leri değildir; Django'nun async ORM'i ile çalışan düz
+`async def` view'lerdir. Yavaş bir istemci veya veritabanı beklemesi sırasında
+worker'ı bloklamazlar. Yanıt formatları, aynı veriyi dönen senkron DRF
+endpoint'leriyle birebir aynıdır, böylece frontend ikisini de kullanabilir.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import NotAuthenticated, NotFound, Throttled
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from apps.users.models import AuthToken
+from .throttling import UserRateThrottle
+
+
+async def aget_token_user(request):
+    """
+    `Authorization: Token <key>` başlığındaki token'a ait aktif kullanıcıyı döndürür.
+    Kullanıcının profili ve takımı da aynı sorguda yüklenir.
+    Başlık yoksa None, token geçersiz veya süresi dolmuşsa False döner.
+    """
+    keyword, _sep, key = request.headers.get('Authorization', '').partition(' ')
+    if keyword != 'Token' or not key.strip():
+        return None
+    try:
+        token = await AuthToken.objects.select_related(
+            'user', 'user__profile', 'user__profile__team'
+        ).aget(key=key.strip(), expires_at__gt=timezone.now())
+    except AuthToken.DoesNotExist:
+        return False
+    if not token.user.is_active:
+        return False
+    return token.user
+
+
+def _unauthorized(detail):
+    response = JsonResponse({"detail": str(detail)}, status=401)
+    response['WWW-Authenticate'] = 'Token'
+    return response
+
+
+def async_api_view(view_func):
+    """
+    Async view'ler için token kimlik doğrulaması yapan ve sadece GET isteklerine izin veren dekoratör.
+    Kimliği doğrulanan kullanıcı `request.user` olarak atanır. Senkron endpoint'lerle aynı
+    kullanıcı rate limit'i (`UserRateThrottle`) uygulanır.
+    """
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return JsonResponse({"detail": f'"{request.method}" metoduna izin verilmiyor.'}, status=405)
+
+        user = await aget_token_user(request)
+        if user is None:
+            return _unauthorized(NotAuthenticated.default_detail)
+        if user is False:
+            return _unauthorized(_('Invalid token.'))
+        request.user = user
+
+        throttle = UserRateThrottle()
+        if not await sync_to_async(throttle.allow_request)(request, None):
+            wait = await sync_to_async(throttle.wait)()
+            response = JsonResponse({"detail": str(Throttled(wait).detail)}, status=429)
+            if wait is not None:
+                response['Retry-After'] = '%d' % wait
+            return response
+
+        try:
+            return await view_func(request, *args, **kwargs)
+        except Http404:
+            return JsonResponse({"detail": str(NotFound.default_detail)}, status=404)
+
+    return wrapper
+
+
+async def apaginated_response(request, queryset, serializer_class):
+    """
+    DRF `PageNumberPagination` ile aynı formatta (`count`, `next`, `previous`, `results`)
+    sayfalanmış bir yanıt üretir.
+    """
+    page_size = api_settings.PAGE_SIZE
+    try:
+        page_number = int(request.GET.get('page', 1))
+    except ValueError:
+        page_number = 0
+
+    count = await queryset.acount()
+    offset = (page_number - 1) * page_size
+    if page_number < 1 or (page_number > 1 and offset >= count):
+        return JsonResponse({"detail": "Geçersiz sayfa."}, status=404)
+
+    objects = [obj async for obj in queryset[offset:offset + page_size]]
+
+    url = request.build_absolute_uri()
+    next_url = replace_query_param(url, 'page', page_number + 1) if offset + page_size < count else None
+    previous_url = None
+    if page_number == 2:
+        previous_url = remove_query_param(url, 'page')
+    elif page_number > 2:
+        previous_url = replace_query_param(url, 'page', page_number - 1)
+
+    return JsonResponse({
+        "count": count,
+        "next": next_url,
+        "previous": previous_url,
+        "results": serializer_class(objects, many=True, context={'request': request}).data,
+    })
@@ -0,0 +1,135 @@
+"""
+Birden fazla API isteğinin tek HTTP isteğiyle çalıştırılması (`POST /api/v1/batch/`).
+
+Alt istekler aynı process'te, sırayla ve mevcut DRF view'leri çağrılarak çalıştırılır. Yanıtları
+normal isteklerin yanıtlarıyla aynıdır. Kimlik doğrulama ve genel rate limit (AnonRateThrottle,
+UserRateThrottle) batch isteğinin kendisi için bir kez yapılır, limitten alt istek sayısı kadar token
+tüketilir (kova yetmezse tüm batch 429 ile reddedilir). Alt istekler aynı kullanıcı ile
+çalışır. Scope'lu limitler (örn: login) alt isteklere de uygulanır. Middleware'ler alt istekler
+için tekrar çalışmaz.
+
+`atomic: true` verilirse tüm alt istekler tek transaction'da çalışır. Biri 400 veya üzeri bir kodla
+dönerse o ana kadar yapılan değişiklikler geri alınır ve kalan istekler çalıştırılmaz.
+
+Sadece DRF view'leri çağrılabilir (async view'ler, admin ve dökümantasyon sayfaları çağrılamaz).
+"""
+import io
+import json
+import logging
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .serializers import BatchRequestSerializer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_REQUESTS = 50
+
+# Alt isteklerde korunan yanıt başlıkları
+FORWARDED_HEADERS = ('Location', 'Retry-After', 'ETag')
+
+
+def max_requests():
+    return getattr(settings, 'BATCH_MAX_REQUESTS', DEFAULT_MAX_REQUESTS)
+
+
+def _result(status_code, body, headers=None):
+    result = {'status': status_code, 'body': body}
+    if headers:
+        result['headers'] = headers
+    return result
+
+
+def _build_subrequest(parent, method, path, body):
+    """Ana isteğin başlıklarını ve kullanıcısını taşıyan bir alt istek oluşturur."""
+    path, _sep, query_string = path.partition('?')
+    payload = b'' if body is None else json.dumps(body, cls=DjangoJSONEncoder).encode()
+    environ = {
+        key: value for key, value in parent.META.items()
+        if key.startswith('HTTP_') or key in ('REMOTE_ADDR', 'SERVER_NAME', 'SERVER_PORT')
+    }
+    environ.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'SCRIPT_NAME': '',
+        'QUERY_STRING': query_string,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.input': io.BytesIO(payload),
+        'wsgi.url_scheme': parent.scheme,
+    })
+    request = WSGIRequest(environ)
+    # DRF alt isteklerde kimlik doğrulamayı tekrar yapmaz, bu kullanıcıyı kullanır.
+    request._force_auth_user = parent.user
+    request._force_auth_token = parent.auth
+    request.user = parent.user
+    request.is_batch_subrequest = True
+    return request
+
+
+def run_subrequest(parent, method, path, body=None):
+    """Tek bir alt isteği çalıştırır ve sonucunu (`status`, `body`, `headers`) döndürür."""
+    try:
+        match = resolve(path.partition('?')[0])
+    except Resolver404:
+        return _result(status.HTTP_404_NOT_FOUND, {"detail": "Adres bulunamadı."})
+
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is None or issubclass(view_class, BatchView):
+        return _result(status.HTTP_400_BAD_REQUEST, {"detail": "Bu adres batch isteği içinde çağrılamaz."})
+
+    request = _build_subrequest(parent, method, path, body)
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception("Batch alt isteği başarısız oldu: %s %s", method, path)
+        return _result(status.HTTP_500_INTERNAL_SERVER_ERROR, {"detail": "Sunucu hatası."})
+
+    headers = {name: response[name] for name in FORWARDED_HEADERS if response.has_header(name)}
+    return _result(response.status_code, getattr(response, 'data', None), headers)
+
+
+class BatchView(APIView):
+    """
+    Sıralı bir alt istek listesini çalıştırır ve yanıtlarını aynı sırayla döndürür.
+    Batch isteğinin kendisi geçerliyse HTTP 200 döner. Her alt isteğin durumu kendi `status` alanındadır.
+    """
+
+    def throttle_cost(self, request):
+        """Genel rate limit'ten tüketilen token sayısı: Alt istek sayısı (en fazla `max_requests()`)."""
+        try:
+            items = request.data.get('requests')
+        except (AttributeError, ParseError):
+            return 1
+        return max(1, min(len(items), max_requests())) if isinstance(items, list) else 1
+
+    def post(self, request, *args, **kwargs):
+        serializer = BatchRequestSerializer(data=request.data, max_requests=max_requests())
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['requests']
+
+        if not serializer.validated_data['atomic']:
+            results = [run_subrequest(request, item['method'], item['path'], item.get('body')) for item in items]
+            return Response({'results': results, 'rolled_back': False})
+
+        results = []
+        with transaction.atomic():
+            for item in items:
+                results.append(run_subrequest(request, item['method'], item['path'], item.get('body')))
+                if results[-1]['status'] >= 400:
+                    transaction.set_rollback(True)
+                    break
+
+        rolled_back = results[-1]['status'] >= 400
+        skipped = _result(status.HTTP_424_FAILED_DEPENDENCY,
+                          {"detail": "Önceki bir istek başarısız olduğu için çalıştırılmadı."})
+        results.extend(dict(skipped) for _item in items[len(results):])
+        return Response({'results': results, 'rolled_back': rolled_back})
@@ -0,0 +1,62 @@
+"""
+ViewSet'ler için toplu işlem altyapısı.
+
+Toplu aksiyonlar hedef kayıtları bir ID listesi veya ViewSet'in `filterset_fields` tanımıyla
+aynı filtre alanları ile alır. Her kayıt için bir sonuç (`id`, `outcome`, `detail`) döner.
+İşlemin kendisi (durum geçişi, silme) aksiyon tarafından tek koşullu UPDATE/DELETE ile yapılır.
+"""
+from collections import Counter
+
+from django.core.validators import EMPTY_VALUES
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import serializers
+
+from .serializers import BulkActionSerializer
+
+
+class BulkActionMixin:
+    """`get_bulk_targets()` ve `bulk_response()` yardımcılarını sağlar."""
+
+    def get_bulk_targets(self, queryset, filter_scope=None):
+        """
+        İstekteki hedef kayıtları filtreleyen queryset'i ve (ID listesi verildiyse) istenen ID'leri döndürür.
+        `filter_scope`: Sadece filtre ile seçimde uygulanan ek koşul (Q), örn: kullanıcının takımı.
+
+        Filtre ile seçimde en az bir filtrenin değeri dolu olmalıdır (django-filter boş değerleri uygulamaz, boş
+        filtre tüm kayıtları seçerdi) ve eşleşen kayıt sayısı ID listesi sınırını (`MAX_IDS`) aşamaz.
+        """
+        serializer = BulkActionSerializer(data=self.request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data.get('ids')
+        if ids is not None:
+            ids = list(dict.fromkeys(ids))
+            return queryset.filter(pk__in=ids), ids
+
+        filterset_class = DjangoFilterBackend().get_filterset_class(self, queryset)
+        filterset = filterset_class(data=serializer.validated_data['filter'], queryset=queryset, request=self.request)
+        unknown = set(serializer.validated_data['filter']) - set(filterset.filters)
+        if unknown:
+            raise serializers.ValidationError({'filter': f"Geçersiz filtre alanı: {', '.join(sorted(unknown))}."})
+        if not filterset.is_valid():
+            raise serializers.ValidationError({'filter': filterset.errors})
+        if all(value in EMPTY_VALUES for value in filterset.form.cleaned_data.values()):
+            raise serializers.ValidationError({'filter': "En az bir filtre alanına değer verilmelidir."})
+        targets = filterset.qs if filter_scope is None else filterset.qs.filter(filter_scope)
+        if targets.values('pk')[:BulkActionSerializer.MAX_IDS + 1].count() > BulkActionSerializer.MAX_IDS:
+            raise serializers.ValidationError({
+                'filter': f"Filtre {BulkActionSerializer.MAX_IDS} kayıttan fazlasını seçiyor, filtreyi daraltın."
+            })
+        return targets, None
+
+    @staticmethod
+    def bulk_response(outcomes, requested_ids=None, not_found_detail="Kayıt bulunamadı."):
+        """
+        `outcomes`: ID -> (sonuç, açıklama). İstenen ama bulunamayan ID'ler `not_found` olarak eklenir.
+        Yanıt: Sonuç türlerine göre sayılar (`summary`) ve kayıt başına sonuçlar (`results`).
+        """
+        if requested_ids is not None:
+            for pk in requested_ids:
+                outcomes.setdefault(pk, ('not_found', not_found_detail))
+        order = requested_ids if requested_ids is not None else sorted(outcomes)
+        results = [{'id': pk, 'outcome': outcomes[pk][0], 'detail': outcomes[pk][1]} for pk in order]
+        return {'summary': dict(Counter(result['outcome'] for result in results)), 'results': results}
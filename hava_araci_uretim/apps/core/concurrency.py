@@ -0,0 +1,88 @@
+"""
+İyimser eşzamanlılık kontrolü (optimistic concurrency control).
+
+`VersionedModel`'den türeyen modellerde her kayıt bir sürüm numarası taşır. `save()` satırı
+`UPDATE ... WHERE id = ? AND version = ?` ile günceller ve sürümü bir artırır. Satır, instance
+okunduktan sonra başka bir işlem tarafından değiştirilmişse hiçbir satır güncellenmez ve
+`VersionConflict` (HTTP 409) fırlatılır. Böylece aynı uçağı düzenleyen iki montajcı veya aynı
+parçayı geri dönüşüme gönderen ve uçağa takan iki istek, satırları kilitlemeden birbirinin
+değişikliğini ezemez. Çakışan istek transaction'ı ile birlikte geri alınır.
+
+İstemci `If-Match` başlığı (yanıtlardaki `ETag`) veya istek gövdesindeki `version` alanı ile
+okuduğu sürümü gönderebilir. Bu durumda kayıt o sürümden sonra değişmişse istek hiçbir şey
+yapılmadan 409 ile reddedilir (bkz. `OptimisticConcurrencyMixin`). Sürüm gönderilmezse sadece
+istek süresince oluşan çakışmalar yakalanır.
+
+`QuerySet.update()` ile yapılan toplu güncellemeler sürümü kendileri artırmalıdır
+(`version=F('version') + 1`).
+"""
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+
+class VersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Kayıt siz okuduktan sonra başka bir işlem tarafından değiştirilmiş. Güncel hali ile tekrar deneyin."
+    default_code = 'version_conflict'
+
+    def __init__(self, current_version=None):
+        detail = self.default_detail
+        if current_version is not None:
+            detail = f"{detail} (Güncel sürüm: {current_version})"
+        super().__init__(detail)
+
+
+def etag(version):
+    return f'"{version}"'
+
+
+def parse_if_match(value):
+    """
+    `If-Match` başlığındaki sürümü döndürür. `*` veya başlık yoksa None döner.
+    Sürüm olarak okunamayan değerler istemci hatasıdır (`ValidationError`, 400).
+    """
+    value = (value or '').strip()
+    if not value or value == '*':
+        return None
+    if value.startswith('W/'):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise ValidationError({
+            'If-Match': ["Geçersiz sürüm. Yanıttaki ETag değeri (örn: \"3\") gönderilmelidir."]
+        }) from None
+
+
+class OptimisticConcurrencyMixin:
+    """
+    `versioned_actions` için istemcinin gönderdiği sürümü (`If-Match` başlığı veya `version` alanı)
+    nesnenin güncel sürümü ile karşılaştırır. Tekil nesne yanıtlarına `ETag` başlığı ekler.
+    """
+    versioned_actions = ('update', 'partial_update', 'destroy')
+
+    def expected_version(self):
+        version = parse_if_match(self.request.headers.get('If-Match'))
+        if version is None and isinstance(self.request.data, dict):
+            version = self.request.data.get('version')
+        if version is None:
+            return None
+        try:
+            return int(version)
+        except (TypeError, ValueError):
+            raise ValidationError({'version': ["Geçerli bir tam sayı girin."]}) from None
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.action in self.versioned_actions:
+            expected = self.expected_version()
+            if expected is not None and expected != instance.version:
+                raise VersionConflict(instance.version)
+        return instance
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        data = getattr(response, 'data', None)
+        if self.detail and status.is_success(response.status_code) and isinstance(data, dict) and 'version' in data:
+            response['ETag'] = etag(data['version'])
+        return response
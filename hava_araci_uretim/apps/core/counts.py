@@ -0,0 +1,48 @@
+"""
+Büyük tablolarda satır sayma yardımcıları.
+
+Milyonlarca satırlık tablolarda `COUNT(*)` tüm satırları (veya index'i) okur ve listeleme isteklerinin en
+pahalı kısmı olur. Buradaki fonksiyonlar sayımı sınırlar veya PostgreSQL'in istatistiklerinden tahmin eder:
+
+- `bounded_count`: En fazla `limit + 1` satır sayar. Küçük sonuçlar için tam sayının kendisidir.
+- `table_estimate`: Filtresiz tablo için `pg_class.reltuples` (son ANALYZE/autovacuum'daki satır sayısı).
+- `estimated_count`: Filtreli sorgu için sorgu planlayıcısının tahmini (`EXPLAIN`).
+
+Tahminler PostgreSQL dışındaki veritabanlarında (ve tablo hiç analiz edilmemişse) None döner, çağıran tam
+sayıma döner.
+"""
+import json
+
+from django.db import connections
+
+
+def bounded_count(queryset, limit):
+    """En fazla `limit + 1` satır sayar: SELECT COUNT(*) FROM (SELECT ... LIMIT n)."""
+    return queryset.order_by()[:limit + 1].count()
+
+
+def is_unfiltered(queryset):
+    """Sorgunun WHERE koşulu yoksa (tablonun tamamı) True döner."""
+    return not queryset.query.where
+
+
+def table_estimate(model, using='default'):
+    """Tablonun `pg_class.reltuples` satır sayısı tahmini. Desteklenmeyen veritabanlarında None döner."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    # PostgreSQL 14+: Hiç analiz edilmemiş tablolar için -1.
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def estimated_count(queryset):
+    """Sorgu planlayıcısının satır sayısı tahmini. Desteklenmeyen veritabanlarında None döner."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
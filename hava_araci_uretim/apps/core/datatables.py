@@ -0,0 +1,141 @@
+"""
+DataTables ve sayfalı listeler için sayım stratejileri.
+
+rest_framework_datatables her DataTables isteğinde `recordsTotal` ve `recordsFiltered` için filtre backend'inde
+iki (başka filtre backend'i varsa üç) tam `COUNT(*)` çalıştırır, standart sayfalı yanıttaki `count` da tam
+COUNT'tur. Parça tablosunda bu sayımlar sayfanın kendisinden çok daha pahalıdır. Ayrıca DataTables sayımları
+DataTables backend'inden sonra çalışan backend'lerin (`DjangoFilterBackend` vb.) filtrelerini içermez.
+
+Buradaki `DatatablesFilterBackend` sayım yapmaz. `EstimatedCountDatatablesPagination` sayıları tüm filtreler
+uygulandıktan sonra view'in seçtiği stratejiyle hesaplar. View'de `total_count_strategy` (filtresiz sayı,
+`recordsTotal`) ve `count_strategy` (filtreli sayı, `recordsFiltered` ve `count`) ile seçilir:
+
+- 'exact' (varsayılan): Tam COUNT.
+- 'capped': En fazla DATATABLES_EXACT_COUNT_LIMIT satır sayılır. Sonuç sınırı aşarsa sınır döner ("10.000+").
+- 'estimate': Sınıra kadar tam sayılır. Aşarsa filtresiz sorgularda `pg_class.reltuples`, filtreli sorgularda
+  sorgu planlayıcısının tahmini kullanılır (bkz. `apps.core.counts`). PostgreSQL dışında tam sayım yapılır.
+- Fonksiyon: Sorguyu alıp kesin sayıyı döndürür (örn: ayrıca tutulan bir sayaç).
+
+DataTables isteklerinde filtre yoksa filtreli sayı ayrıca hesaplanmaz. Yanıttaki `recordsTotalExact` /
+`recordsFilteredExact` (standart yanıtta `count_exact`) sayıların kesin olup olmadığını belirtir. Sayı kesin
+değilse istenen sayfa sayıya göre doğrulanmaz, son sayfadan sonrası boş döner.
+"""
+from django.conf import settings
+from django.core.paginator import EmptyPage, Paginator
+from rest_framework_datatables import filters as datatables_filters
+from rest_framework_datatables.pagination import DatatablesPageNumberPagination
+
+from .counts import bounded_count, estimated_count, is_unfiltered, table_estimate
+
+DEFAULT_EXACT_COUNT_LIMIT = 10000
+EXACT, CAPPED, ESTIMATE = 'exact', 'capped', 'estimate'
+
+
+def count(queryset, strategy, limit):
+    """`strategy` ile satır sayısını hesaplar. (sayı, kesin mi) döndürür."""
+    if callable(strategy):
+        return strategy(queryset), True
+    if strategy == EXACT:
+        return queryset.count(), True
+    if strategy not in (CAPPED, ESTIMATE):
+        raise ValueError(f"Bilinmeyen sayım stratejisi: {strategy!r}")
+
+    if strategy == ESTIMATE and is_unfiltered(queryset):
+        # reltuples tek satırlık bir katalog sorgusudur, sınırlı sayımdan önce denenir.
+        estimate = table_estimate(queryset.model, queryset.db)
+        if estimate is not None and estimate > limit:
+            return estimate, False
+    bounded = bounded_count(queryset, limit)
+    if bounded <= limit:
+        return bounded, True
+    if strategy == CAPPED:
+        return limit, False
+    estimate = estimated_count(queryset)
+    if estimate is None:
+        return queryset.count(), True
+    return max(estimate, bounded), False
+
+
+class DatatablesFilterBackend(datatables_filters.DatatablesFilterBackend):
+    """DataTables arama ve sıralamasını uygular, sayımı `EstimatedCountDatatablesPagination`'a bırakır."""
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.check_renderer_format(request):
+            return queryset
+        datatables_query = self.parse_datatables_query(request, view)
+        q = self.get_q(datatables_query)
+        if q:
+            queryset = queryset.filter(q).distinct()
+        ordering = self.get_ordering(request, view, datatables_query['fields'])
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+
+class _UncheckedPaginator(Paginator):
+    """Sayı kesin değilken sayfa numarasını üst sınıra göre doğrulamaz."""
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return super().validate_number(number)
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class EstimatedCountDatatablesPagination(DatatablesPageNumberPagination):
+    """Sayfalama sayılarını view'in sayım stratejileriyle hesaplar (bkz. modül açıklaması)."""
+
+    def _limit(self):
+        return getattr(settings, 'DATATABLES_EXACT_COUNT_LIMIT', DEFAULT_EXACT_COUNT_LIMIT)
+
+    def _use_count(self, value, exact):
+        base = Paginator if exact else _UncheckedPaginator
+        self.django_paginator_class = type('CountedPaginator', (base,), {'count': value})
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.accepted_renderer.format != 'datatables' and self.get_page_size(request):
+            value, self.count_exact = count(queryset, getattr(view, 'count_strategy', EXACT), self._limit())
+            self._use_count(value, self.count_exact)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count_and_total_count(self, queryset, view):
+        if hasattr(view, '_datatables_filtered_count'):
+            # Sayımı kendisi yapan (kütüphanenin) filtre backend'i kullanılmış.
+            return super().get_count_and_total_count(queryset, view)
+
+        base_queryset = view.get_queryset()
+        total_count, self.total_exact = count(base_queryset, getattr(view, 'total_count_strategy', EXACT),
+                                              self._limit())
+        if queryset.query.where == base_queryset.query.where and not queryset.query.distinct:
+            filtered_count, self.count_exact = total_count, self.total_exact
+        else:
+            filtered_count, self.count_exact = count(queryset, getattr(view, 'count_strategy', EXACT), self._limit())
+        self._use_count(filtered_count, self.count_exact)
+        return filtered_count, total_count
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if not hasattr(self, 'count_exact'):
+            return response
+        if self.is_datatable_request:
+            response.data['recordsTotalExact'] = self.total_exact
+            response.data['recordsFilteredExact'] = self.count_exact
+        else:
+            response.data['count_exact'] = self.count_exact
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count_exact'] = {
+            'type': 'boolean',
+            'description': "False ise count tahmini veya sınırlandırılmış bir sayıdır.",
+        }
+        return schema
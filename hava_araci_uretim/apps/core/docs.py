@@ -0,0 +1,54 @@
+"""
+API dökümantasyonu (OpenAPI şeması, Swagger UI, ReDoc) view'leri.
+
+Bu modül drf_spectacular'ı import eder. URL'lerde `apps.core.views.lazy_view` ile
+bağlandığı için sadece dökümantasyon endpoint'lerinden birine istek geldiğinde yüklenir.
+"""
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+from rest_framework import status
+from rest_framework.response import Response
+
+from .openapi import get_schema_artifact
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    `SpectacularAPIView` ile aynı formatları (YAML/JSON) sunar, ancak şemayı her istekte
+    üretmek yerine önceden üretilmiş dosyadan okur.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        artifact = get_schema_artifact()
+        if artifact is None:
+            if settings.DEBUG:
+                return super().get(request, *args, **kwargs)
+            return Response(
+                {"detail": "API şeması henüz oluşturulmamış. `manage.py build_openapi_schema` çalıştırılmalı."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        fmt = 'json' if isinstance(request.accepted_renderer, OpenApiJsonRenderer) else 'yaml'
+        etag = artifact.etag(fmt)
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        elif fmt == 'json' and 'gzip' in request.headers.get('Accept-Encoding', ''):
+            # Sıkıştırılmış dosya olduğu gibi gönderilir.
+            response = HttpResponse(artifact.json_gzip, content_type=request.accepted_media_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            body = artifact.json if fmt == 'json' else artifact.yaml
+            response = HttpResponse(body, content_type=request.accepted_media_type)
+
+        response['ETag'] = etag
+        response['Vary'] = 'Accept, Accept-Encoding'
+        response['Cache-Control'] = 'public, no-cache'
+        response['Content-Disposition'] = (
+            f'inline; filename="{spectacular_settings.TITLE or "schema"}.{request.accepted_renderer.format}"'
+        )
+        return response
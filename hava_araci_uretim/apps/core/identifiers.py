@@ -0,0 +1,99 @@
+"""
+Sunucu tarafında seri numarası ve kuyruk numarası üretimi.
+
+İstemcinin seçtiği numaralar sadece INSERT sırasında unique constraint ile kontrol edilir. Eşzamanlı üretimde
+çakışmalar tekrar denemeye yol açar, toplu işlemler de güvenli numara seçemez. Bu modül her tür (`KINDS`) için
+veritabanındaki bir sayaçtan benzersiz numaralar alır ve ayarlardaki biçimle tanımlayıcıya çevirir
+(örn: `KANAT-TB2-0000042`, `TC-TB2-00007`). Biçimde `{number}` ve türün alanları (parça tipi, uçak modeli, takım
+kodları) kullanılabilir. Numara türün tüm tanımlayıcılarında ortaktır, bu yüzden her biçim benzersiz sonuç verir.
+
+- PostgreSQL'de numaralar sequence'lardan (bkz. migrations/0002_identifiersequence.py) alınır. Sequence'lar
+  transaction dışında ilerler, kilit tutmaz ve geri alınan işlemler numaraları tekrar kullandırmaz.
+- Her process, IDENTIFIER_BLOCK_SIZE numaralık blokları tek sorguyla ayırır ve bellekten dağıtır. Böylece
+  her tanımlayıcı için veritabanına gidilmez. Kullanılmayan numaralar process kapanınca boşa gider (numaralar
+  artan sırada ama boşluklu olabilir).
+- Diğer veritabanlarında (geliştirme, testler) sayaç `IdentifierSequence` tablosunda tutulur. Sayaç açık bir
+  transaction ile geri alınabileceği için transaction içindeyken blok saklanmaz.
+
+Fork sonrası (örn: gunicorn preload) çocuk process'te bloklar boşaltılır, numaralar process'ler arasında
+paylaşılmaz.
+"""
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+DEFAULT_BLOCK_SIZE = 100
+
+# Tür -> (biçim ayarı, varsayılan biçim, PostgreSQL sequence'ı)
+KINDS = {
+    'part_serial_number': ('PART_SERIAL_NUMBER_FORMAT', '{part_type}-{aircraft_model}-{number:07d}',
+                           'core_part_serial_number_seq'),
+    'tail_number': ('TAIL_NUMBER_FORMAT', 'TC-{aircraft_model}-{number:05d}', 'core_tail_number_seq'),
+}
+NO_AIRCRAFT_MODEL = 'GENEL'  # Uçak modeli belirtilmemiş parçalar için
+
+_lock = threading.Lock()
+_blocks = {}  # tür -> deque(numara)
+
+
+def _reset():
+    global _lock
+    _lock = threading.Lock()
+    _blocks.clear()
+
+
+os.register_at_fork(after_in_child=_reset)
+
+
+def _fetch(kind, count):
+    """Veritabanından `count` yeni numara alır."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT nextval(%s) FROM generate_series(1, %s)', [KINDS[kind][2], count])
+            return sorted(row[0] for row in cursor.fetchall())
+
+    from .models import IdentifierSequence
+    with transaction.atomic():
+        sequence, _created = IdentifierSequence.objects.select_for_update().get_or_create(name=kind)
+        IdentifierSequence.objects.filter(pk=kind).update(last_value=F('last_value') + count)
+    return list(range(sequence.last_value + 1, sequence.last_value + count + 1))
+
+
+def allocate(kind, count=1):
+    """`kind` türü için `count` benzersiz numara döndürür (artan sırada)."""
+    if kind not in KINDS:
+        raise ValueError(f"Bilinmeyen tanımlayıcı türü: {kind}")
+    if connection.vendor != 'postgresql' and connection.in_atomic_block:
+        return _fetch(kind, count)
+    block_size = getattr(settings, 'IDENTIFIER_BLOCK_SIZE', DEFAULT_BLOCK_SIZE)
+    with _lock:
+        numbers = _blocks.setdefault(kind, deque())
+        if len(numbers) < count:
+            numbers.extend(_fetch(kind, max(block_size, count - len(numbers))))
+        return [numbers.popleft() for _ in range(count)]
+
+
+def format_identifier(kind, number, **fields):
+    setting, default, _sequence = KINDS[kind]
+    return getattr(settings, setting, default).format(number=number, **fields)
+
+
+def part_serial_numbers(part_type, aircraft_model=None, team=None, count=1):
+    """`part_type` tipinde, `aircraft_model` modeliyle uyumlu ve `team` tarafından üretilen parçalar için seri numaraları."""
+    fields = {
+        'part_type': part_type.name,
+        'aircraft_model': aircraft_model.name if aircraft_model is not None else NO_AIRCRAFT_MODEL,
+        'team': team.name if team is not None else '',
+    }
+    return [format_identifier('part_serial_number', number, **fields)
+            for number in allocate('part_serial_number', count)]
+
+
+def tail_numbers(aircraft_model, team=None, count=1):
+    """`aircraft_model` modelinde, `team` tarafından monte edilen uçaklar için kuyruk numaraları."""
+    fields = {'aircraft_model': aircraft_model.name, 'team': team.name if team is not None else ''}
+    return [format_identifier('tail_number', number, **fields) for number in allocate('tail_number', count)]
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.openapi import generate_schema_json, write_schema_artifact
+
+
+class Command(BaseCommand):
+    help = "OpenAPI şemasını üretir ve /api/v1/schema/ tarafından sunulacak sıkıştırılmış dosyaya yazar."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=None,
+            help="Çıktı dosyası. Varsayılan: settings.OPENAPI_SCHEMA_ARTIFACT"
+        )
+
+    def handle(self, *args, **options):
+        path = options['output'] or settings.OPENAPI_SCHEMA_ARTIFACT
+        schema_json = generate_schema_json()
+        write_schema_artifact(path, schema_json)
+        self.stdout.write(self.style.SUCCESS(f"OpenAPI şeması yazıldı: {path} ({len(schema_json)} bayt)"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.throttling import purge_expired_buckets
+
+
+class Command(BaseCommand):
+    help = "Tamamen dolmuş rate limit kovalarını siler (örn: cron ile saatte bir çalıştırılabilir)."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_buckets()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} rate limit kovası silindi."))
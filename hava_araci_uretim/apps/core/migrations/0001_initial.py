@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+def set_unlogged(apps, schema_editor):
+    # Rate limit durumu kalıcı olmak zorunda değildir. WAL yazılmaması her kontrolü ucuzlatır.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('ALTER TABLE core_throttlebucket SET UNLOGGED')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleBucket',
+            fields=[
+                ('key', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('tokens', models.FloatField()),
+                ('updated_at', models.FloatField()),
+            ],
+            options={
+                'verbose_name': 'Rate Limit Kovası',
+                'verbose_name_plural': 'Rate Limit Kovaları',
+            },
+        ),
+        migrations.RunPython(set_unlogged, migrations.RunPython.noop),
+    ]
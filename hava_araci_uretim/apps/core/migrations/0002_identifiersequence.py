@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+SEQUENCES = ['core_part_serial_number_seq', 'core_tail_number_seq']
+
+
+def create_sequences(apps, schema_editor):
+    # Sequence'lar transaction dışında ilerler: Geri alınan istekler numaraları tekrar kullandırmaz ve worker'lar
+    # numara bloklarını birbirini beklemeden alır. Diğer veritabanlarında sayaçlar tabloda tutulur.
+    if schema_editor.connection.vendor == 'postgresql':
+        for sequence in SEQUENCES:
+            schema_editor.execute(f'CREATE SEQUENCE {sequence}')
+
+
+def drop_sequences(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sequence in SEQUENCES:
+            schema_editor.execute(f'DROP SEQUENCE {sequence}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdentifierSequence',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('last_value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Tanımlayıcı Sayacı',
+                'verbose_name_plural': 'Tanımlayıcı Sayaçları',
+            },
+        ),
+        migrations.RunPython(create_sequences, drop_sequences),
+    ]
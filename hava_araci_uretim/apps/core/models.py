@@ -1,5 +1,7 @@
 from django.db import models
 
+from .concurrency import VersionConflict
+
 class TimeStampedModel(models.Model):
     """
     Zaman damgalarını (oluşturulma ve güncellenme) tutan bir abstract base model.
@@ -16,4 +18,55 @@ class TimeStampedModel(models.Model):
     class Meta:
         abstract = True # Soyut model. Sadece kalıtım için kullanılacak.
 
-        ordering = ['-created_at', '-updated_at'] # Oluşturulma tarihine göre sırala
\ No newline at end of file
+        ordering = ['-created_at', '-updated_at'] # Oluşturulma tarihine göre sırala
+
+class VersionedModel(models.Model):
+    """
+    İyimser eşzamanlılık kontrolü için sürüm numarası tutan abstract base model (bkz. apps.core.concurrency).
+    Her güncelleme okunan sürüme göre koşullu yapılır ve sürümü bir artırır.
+    """
+    version = models.PositiveIntegerField(default=1, editable=False, verbose_name="Sürüm")
+
+    class Meta:
+        abstract = True
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # UPDATE ... SET ..., version = okunan + 1 WHERE id = ? AND version = okunan
+        version_field = self._meta.get_field('version')
+        expected = self.version
+        values = [value for value in values if value[0] is not version_field]
+        values.append((version_field, None, expected + 1))
+        if base_qs.filter(pk=pk_val, version=expected)._update(values):
+            self.version = expected + 1
+            return True
+        current = base_qs.filter(pk=pk_val).values_list('version', flat=True).first()
+        if current is not None:
+            raise VersionConflict(current)
+        return False  # Satır yok, Django'nun normal davranışı (INSERT veya hata) devam eder.
+
+
+class ThrottleBucket(models.Model):
+    """
+    Rate limit için token bucket durumu. Tüm gunicorn worker'ları aynı satırları kullanır.
+    Postgres'te tablo UNLOGGED'dır (WAL yazılmaz). Çökme sonrası boşalması sadece limitleri sıfırlar.
+    """
+    key = models.CharField(max_length=255, primary_key=True)
+    tokens = models.FloatField()
+    updated_at = models.FloatField()  # Unix zamanı (saniye). Son token tüketimi.
+
+    class Meta:
+        verbose_name = "Rate Limit Kovası"
+        verbose_name_plural = "Rate Limit Kovaları"
+
+
+class IdentifierSequence(models.Model):
+    """
+    Sunucuda üretilen tanımlayıcıların (seri numarası, kuyruk numarası) sayacı (bkz. apps.core.identifiers).
+    PostgreSQL'de numaralar veritabanı sequence'larından alınır ve bu tablo kullanılmaz.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    last_value = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Tanımlayıcı Sayacı"
+        verbose_name_plural = "Tanımlayıcı Sayaçları"
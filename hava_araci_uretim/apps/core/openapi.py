@@ -0,0 +1,84 @@
+"""
+Önceden üretilmiş OpenAPI şemasının sunulması.
+
+Şema her istekte tüm ViewSet'ler ve `extend_schema` tanımları taranarak üretilmez.
+Build sırasında `manage.py build_openapi_schema` ile sıkıştırılmış bir dosyaya yazılır.
+Process başına bir kez belleğe yüklenir ve ETag ile sunulur. Dosya yoksa şema sadece
+DEBUG modunda canlı üretilir. Production'da 503 döner.
+
+Bu modül drf_spectacular'ı sadece şema üretilirken import eder. Şemayı sunan view
+`apps.core.docs` içindedir.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.utils import translation
+
+
+def generate_schema_json():
+    """Şemayı canlı üretir ve `SpectacularAPIView` ile aynı JSON çıktısını döndürür."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    with translation.override(settings.LANGUAGE_CODE):
+        schema = spectacular_settings.DEFAULT_GENERATOR_CLASS().get_schema(request=None, public=True)
+        return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def write_schema_artifact(path, schema_json):
+    """JSON şemayı gzip ile sıkıştırıp yazar. Yazma işlemi atomiktir."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as temp_file:
+        # mtime=0: Aynı şema her build'de aynı dosyayı üretir.
+        with gzip.GzipFile(fileobj=temp_file, mode='wb', mtime=0) as gz:
+            gz.write(schema_json)
+    os.replace(temp_path, path)
+
+
+class SchemaArtifact:
+    """Belleğe yüklenmiş şema. JSON ve YAML gösterimleri ile ETag'leri bir kez hesaplanır."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as artifact_file:
+            self.json_gzip = artifact_file.read()
+        self.json = gzip.decompress(self.json_gzip)
+        self.digest = hashlib.sha256(self.json).hexdigest()[:32]
+        self._yaml = None
+
+    @property
+    def yaml(self):
+        if self._yaml is None:
+            from drf_spectacular.renderers import OpenApiYamlRenderer
+            self._yaml = OpenApiYamlRenderer().render(json.loads(self.json))
+        return self._yaml
+
+    def etag(self, fmt):
+        return f'"{self.digest}-{fmt}"'
+
+
+_lock = threading.Lock()
+_loaded = {}  # dosya yolu -> SchemaArtifact
+
+
+def get_schema_artifact():
+    """Yapılandırılmış şema dosyasını (ilk çağrıda) yükler. Dosya yoksa None döner."""
+    path = settings.OPENAPI_SCHEMA_ARTIFACT
+    artifact = _loaded.get(path)
+    if artifact is None:
+        if not os.path.exists(path):
+            return None
+        with _lock:
+            artifact = _loaded.get(path) or SchemaArtifact(path)
+            _loaded[path] = artifact
+    return artifact
+
+
+def warm_schema_artifact():
+    """Şemayı fork öncesi belleğe yükler (bkz. apps.core.warmup)."""
+    artifact = get_schema_artifact()
+    return len(artifact.json) if artifact else "dosya yok"
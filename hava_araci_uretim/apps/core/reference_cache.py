@@ -0,0 +1,96 @@
+"""
+Referans verileri (parça tipleri, uçak modelleri, takımlar) için process içi önbellek.
+
+Bu tablolar sabit seçeneklerden oluşur ve neredeyse hiç değişmez, ancak pek çok istekte
+isimle aranırlar. Veriler process başına bir kez okunur ve `REFERENCE_CACHE_TTL` saniye
+boyunca bellekten sunulur. Aynı process'te yapılan değişiklikler önbelleği sinyallerle
+hemen geçersiz kılar, diğer worker'lar yeni veriyi en geç TTL süresi sonunda görür.
+
+Açık bir transaction içindeyken önbellek kullanılmaz, veriler doğrudan veritabanından okunur.
+Dönen model nesneleri thread'ler arasında paylaşıldığı için değiştirilmemelidir.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+
+DEFAULT_TTL = 300
+
+_lock = threading.Lock()
+_entries = {}  # tür -> (yüklenme zamanı, {isim: nesne})
+
+
+def _load_part_types():
+    from apps.envanter.models import PartType
+    return {part_type.name: part_type for part_type in PartType.objects.all()}
+
+
+def _load_aircraft_models():
+    from apps.envanter.models import AircraftModel
+    return {aircraft_model.name: aircraft_model for aircraft_model in AircraftModel.objects.all()}
+
+
+def _load_teams():
+    from apps.uretim.models import Team
+    return {team.name: team for team in Team.objects.select_related('responsible_part_type')}
+
+
+_LOADERS = {
+    'part_types': _load_part_types,
+    'aircraft_models': _load_aircraft_models,
+    'teams': _load_teams,
+}
+
+
+def _get(kind):
+    if connection.in_atomic_block:
+        return _LOADERS[kind]()
+
+    ttl = getattr(settings, 'REFERENCE_CACHE_TTL', DEFAULT_TTL)
+    entry = _entries.get(kind)
+    if entry is not None and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+
+    mapping = _LOADERS[kind]()
+    with _lock:
+        _entries[kind] = (time.monotonic(), mapping)
+    return mapping
+
+
+def get_part_types():
+    """Parça tiplerini `{'KANAT': <PartType>, ...}` şeklinde döndürür."""
+    return _get('part_types')
+
+
+def get_aircraft_models():
+    """Uçak modellerini `{'TB2': <AircraftModel>, ...}` şeklinde döndürür."""
+    return _get('aircraft_models')
+
+
+def get_teams():
+    """Takımları (sorumlu parça tipleriyle birlikte) `{'KANAT': <Team>, ...}` şeklinde döndürür."""
+    return _get('teams')
+
+
+def warm():
+    """
+    Tüm referans verilerini yükler ve toplam kayıt sayısını döndürür.
+    Worker'lar fork edilmeden önce çağrılır.
+    """
+    with _lock:
+        _entries.clear()
+    return sum(len(_get(kind)) for kind in _LOADERS)
+
+
+def invalidate(**kwargs):
+    """Önbelleği temizler. Sinyal alıcısı olarak da kullanılır."""
+    with _lock:
+        _entries.clear()
+
+
+def connect_signals():
+    for sender in ('envanter.PartType', 'envanter.AircraftModel', 'uretim.Team'):
+        post_save.connect(invalidate, sender=sender, dispatch_uid=f'reference_cache_save_{sender}')
+        post_delete.connect(invalidate, sender=sender, dispatch_uid=f'reference_cache_delete_{sender}')
@@ -0,0 +1,130 @@
+"""
+OpenAPI şema üretimi için ortak altyapı.
+
+ViewSet'lerin `extend_schema` tanımları view modüllerinde değil, her uygulamanın `schema.py`
+modülündedir. Böylece istek karşılayan process'ler drf_spectacular'ı hiç import etmez. Bu
+modüller sadece şema üretilirken (`SchemaGenerator` oluşturulduğunda) yüklenir.
+"""
+import importlib
+import importlib.util
+
+from django.apps import apps
+from drf_spectacular import generators
+from drf_spectacular.extensions import OpenApiViewExtension
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema, inline_serializer
+from rest_framework import serializers
+
+from .serializers import BatchRequestSerializer, BulkActionSerializer
+
+
+def load_schema_extensions():
+    """Proje uygulamalarındaki `schema.py` modüllerini import eder (eklentiler import sırasında kaydolur)."""
+    for app_config in apps.get_app_configs():
+        module_name = f"{app_config.name}.schema"
+        if app_config.name.startswith('apps.') and importlib.util.find_spec(module_name) is not None:
+            importlib.import_module(module_name)
+
+
+class ViewSchemaExtension(OpenApiViewExtension):
+    """
+    Bir view'in dökümantasyonunu view modülünün dışında tanımlamak için temel sınıf.
+    Alt sınıflar `target_class` ve `build_replacement()` tanımlar. `build_replacement()`
+    hedef view'den türetilmiş ve `extend_schema` ile işaretlenmiş bir sınıf döndürür.
+    Bu sınıf view başına bir kez üretilir (inline_serializer bileşenleri tekrar oluşturulmaz).
+    """
+    _replacement = None
+
+    def build_replacement(self):
+        raise NotImplementedError
+
+    def view_replacement(self):
+        cls = type(self)
+        if cls._replacement is None:
+            cls._replacement = self.build_replacement()
+        return cls._replacement
+
+
+# Sürümlü kayıtları (bkz. apps.core.concurrency) değiştiren endpoint'ler için ortak tanımlar
+IF_MATCH_PARAMETER = OpenApiParameter(
+    name='If-Match', type=OpenApiTypes.STR, location=OpenApiParameter.HEADER, required=False,
+    description="Kaydın okunan sürümü (yanıtlardaki `ETag`, örn: `\"3\"`). İstek gövdesindeki `version` alanı ile de "
+                "gönderilebilir. Kayıt bu sürümden sonra değişmişse istek 409, sürüm geçersizse 400 ile reddedilir."
+)
+VERSION_CONFLICT_RESPONSE = OpenApiResponse(
+    description="Kayıt okunduktan sonra başka bir işlem tarafından değiştirilmiş (sürüm çakışması)."
+)
+
+
+class BulkActionResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    outcome = serializers.CharField(help_text="Sonuç türü (örn: recycled, forbidden, not_found).")
+    detail = serializers.CharField()
+
+
+class BulkActionResponseSerializer(serializers.Serializer):
+    """Toplu aksiyonların yanıtı (bkz. apps.core.bulk)."""
+    summary = serializers.DictField(child=serializers.IntegerField(), help_text="Sonuç türlerine göre kayıt sayıları.")
+    results = BulkActionResultSerializer(many=True)
+
+
+def bulk_action_schema(summary, description, not_found_description):
+    """Toplu aksiyonlar için ortak `extend_schema` tanımı."""
+    return extend_schema(
+        summary=summary,
+        description=description + " Hedef kayıtlar `ids` (ID listesi) veya `filter` (liste endpoint'inin filtre "
+                                  "alanları) ile verilir. Her kayıt için ayrı bir sonuç döner. " + not_found_description,
+        request=BulkActionSerializer,
+        responses={
+            200: BulkActionResponseSerializer,
+            400: OpenApiResponse(description="Geçersiz `ids` veya `filter`."),
+            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok."),
+        }
+    )
+
+
+class SchemaGenerator(generators.SchemaGenerator):
+    """Şema üretiminden önce uygulamaların dökümantasyon modüllerini yükler."""
+
+    def __init__(self, *args, **kwargs):
+        load_schema_extensions()
+        super().__init__(*args, **kwargs)
+
+
+class BatchViewSchema(ViewSchemaExtension):
+    target_class = 'apps.core.batch.BatchView'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Batch"],
+            summary="Birden Fazla İsteği Tek Seferde Çalıştır",
+            description="`requests` listesindeki alt istekleri sırayla, aynı kullanıcı ile ve aynı process'te "
+                        "çalıştırır. Yanıtlar aynı sırayla döner ve her birinin `status` ve `body` alanı normal "
+                        "isteğin yanıtıyla aynıdır. `atomic: true` ile tüm istekler tek transaction'da çalışır. "
+                        "Biri başarısız olursa değişiklikler geri alınır ve kalan istekler 424 ile döner.",
+            request=BatchRequestSerializer,
+            responses={
+                200: inline_serializer(
+                    name='BatchResponse',
+                    fields={
+                        'results': inline_serializer(
+                            name='BatchResult',
+                            fields={
+                                'status': serializers.IntegerField(),
+                                'body': serializers.JSONField(allow_null=True),
+                                'headers': serializers.DictField(child=serializers.CharField(), required=False),
+                            },
+                            many=True
+                        ),
+                        'rolled_back': serializers.BooleanField(),
+                    }
+                ),
+                400: OpenApiResponse(description="Geçersiz batch isteği (örn: çok fazla alt istek)."),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+            }
+        )
+        class BatchView(self.target_class):
+            pass
+
+        return BatchView
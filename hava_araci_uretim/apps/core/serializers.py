@@ -12,3 +12,46 @@ class TimeStampedSerializer(serializers.ModelSerializer):
     updated_at = serializers.DateTimeField(
         read_only=True
     )
+
+
+class BatchItemSerializer(serializers.Serializer):
+    """Batch isteğindeki tek bir alt istek."""
+    METHOD_CHOICES = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+
+    method = serializers.ChoiceField(choices=METHOD_CHOICES)
+    # Sorgu parametreleri dahil tam adres (örn: "/api/v1/envanter/parts/?status=STOKTA")
+    path = serializers.RegexField(r'^/', max_length=2000)
+    body = serializers.JSONField(required=False, allow_null=True)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """`POST /api/v1/batch/` gövdesi."""
+    atomic = serializers.BooleanField(default=False)
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+
+    def __init__(self, *args, max_requests=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_requests = max_requests
+
+    def validate_requests(self, value):
+        if self.max_requests and len(value) > self.max_requests:
+            raise serializers.ValidationError(f"Bir batch isteğinde en fazla {self.max_requests} alt istek olabilir.")
+        return value
+
+
+class BulkActionSerializer(serializers.Serializer):
+    """
+    Toplu işlemlerin hedefi: ID listesi (`ids`) veya ViewSet'in filtre alanlarıyla bir filtre (`filter`).
+    İkisinden sadece biri verilmelidir.
+    """
+    MAX_IDS = 1000
+
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False,
+                                max_length=MAX_IDS)
+    # Örn: {"status": "STOKTA", "part_type": 1}
+    filter = serializers.DictField(required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("`ids` veya `filter` alanlarından sadece biri verilmelidir.")
+        return attrs
@@ -1 +1,492 @@
-# Create your tests here.
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework_datatables.renderers import DatatablesRenderer
+
+from apps.core import identifiers, reference_cache, throttling
+from apps.core.admin import EstimatedCountPaginator
+from apps.core.datatables import count as datatables_count
+from apps.core.models import ThrottleBucket
+from apps.core.warmup import warm_serializers, warm_url_resolvers
+from apps.envanter.factories import AircraftModelFactory, PartFactory, PartTypeFactory
+from apps.envanter.models import Part, PartType, AircraftModel
+from apps.envanter.views import PartViewSet
+from apps.uretim.factories import GovdeTeamFactory, KanatTeamFactory
+from apps.uretim.models import Team
+from apps.users.factories import AdminUserFactory, UserFactory
+from apps.users.models import AuthToken
+
+
+class ReferenceCacheTest(TestCase):
+    """Referans veri önbelleği testleri."""
+
+    def setUp(self):
+        reference_cache.invalidate()
+        self.addCleanup(reference_cache.invalidate)
+
+    def test_cache_is_served_from_memory_and_invalidated_on_save(self):
+        # TestCase her testi bir transaction içinde çalıştırdığı için önbellek normalde atlanır.
+        with mock.patch.object(connection, 'in_atomic_block', False):
+            part_types = reference_cache.get_part_types()
+            self.assertEqual(set(part_types), set(PartType.objects.values_list('name', flat=True)))
+
+            with self.assertNumQueries(0):
+                reference_cache.get_part_types()
+
+            PartType.objects.get(name='KANAT').save()
+            with self.assertNumQueries(1):
+                reference_cache.get_part_types()
+
+    def test_cache_is_bypassed_inside_transactions(self):
+        reference_cache.get_aircraft_models()
+        with self.assertNumQueries(1):
+            reference_cache.get_aircraft_models()
+
+    def test_warm_loads_all_reference_data(self):
+        with mock.patch.object(connection, 'in_atomic_block', False):
+            loaded = reference_cache.warm()
+            expected = PartType.objects.count() + AircraftModel.objects.count() + Team.objects.count()
+            self.assertEqual(loaded, expected)
+            with self.assertNumQueries(0):
+                reference_cache.get_teams()
+
+
+class LargeTableAdminTest(TestCase):
+    """Parça ve uçak admin listelerinin sorgu sayısının satır sayısından bağımsız olduğunu test eder."""
+
+    def setUp(self):
+        reference_cache.invalidate()
+        self.addCleanup(reference_cache.invalidate)
+        self.client.force_login(AdminUserFactory())
+        self.kanat = PartTypeFactory(name='KANAT')
+        self.tb2 = AircraftModelFactory(name='TB2')
+        self.team = KanatTeamFactory()
+        self.parts_url = reverse('admin:envanter_part_changelist')
+
+    def _create_parts(self, count, prefix):
+        return [PartFactory(part_type=self.kanat, aircraft_model_compatibility=self.tb2, produced_by_team=self.team,
+                            serial_number=f'{prefix}-{i}') for i in range(count)]
+
+    def _changelist_queries(self, url, **params):
+        # Admin listesi transaction dışında çalışır, referans önbelleği kullanılır.
+        with mock.patch.object(connection, 'in_atomic_block', False), CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries.captured_queries)
+
+    def test_part_changelist_queries_do_not_grow_with_rows(self):
+        self._create_parts(2, 'ADM-A')
+        self._changelist_queries(self.parts_url)  # Referans önbelleği yüklenir.
+        _response, few = self._changelist_queries(self.parts_url)
+        self._create_parts(20, 'ADM-B')
+        response, many = self._changelist_queries(self.parts_url)
+        self.assertEqual(few, many)
+        self.assertContains(response, self.kanat.get_name_display())
+
+    def test_part_search_uses_serial_number_prefix(self):
+        self._create_parts(3, 'ADM-X')
+        self._create_parts(3, 'ADM-Y')
+        response, _queries = self._changelist_queries(self.parts_url, q='ADM-Y')
+        self.assertEqual(response.context['cl'].result_count, 3)
+        response, _queries = self._changelist_queries(self.parts_url, q='Y-1')
+        self.assertEqual(response.context['cl'].result_count, 0)
+
+    def test_reference_filter_choices_come_from_cache(self):
+        self._create_parts(1, 'ADM-F')
+        response, _queries = self._changelist_queries(self.parts_url, part_type__id__exact=self.kanat.pk)
+        self.assertEqual(response.context['cl'].result_count, 1)
+        part_type_filter = next(spec for spec in response.context['cl'].filter_specs
+                                if spec.field_path == 'part_type')
+        self.assertIn((self.kanat.pk, self.kanat.get_name_display()), part_type_filter.lookup_choices)
+
+    def test_aircraft_changelist_shows_serial_numbers_without_part_queries(self):
+        from apps.montaj.models import AssembledAircraft
+
+        part_types = {slot: PartType.objects.get_or_create(name=name)[0]
+                      for slot, name in AssembledAircraft.PART_SLOTS.items()}
+
+        def assemble(label):
+            parts = {slot: PartFactory(part_type=part_type, aircraft_model_compatibility=self.tb2,
+                                       serial_number=f'ADM-{label}-{slot}')
+                     for slot, part_type in part_types.items()}
+            return AssembledAircraft.objects.create(aircraft_model=self.tb2, tail_number=f'TC-ADM-{label}', **parts)
+
+        url = reverse('admin:montaj_assembledaircraft_changelist')
+        aircraft = assemble('1')
+        self._changelist_queries(url)
+        _response, few = self._changelist_queries(url)
+        for label in range(2, 6):
+            assemble(label)
+        response, many = self._changelist_queries(url, q='TC-ADM')
+        self.assertEqual(few, many)
+        self.assertEqual(response.context['cl'].result_count, 5)
+        self.assertContains(response, 'ADM-1-wing')
+        self.assertContains(response, f'?used_in_aircraft={aircraft.pk}')
+
+        response, _queries = self._changelist_queries(self.parts_url, used_in_aircraft=aircraft.pk)
+        self.assertEqual(response.context['cl'].result_count, 4)
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=3)
+    def test_paginator_count_is_bounded(self):
+        self._create_parts(5, 'ADM-P')
+        paginator = EstimatedCountPaginator(Part.objects.order_by('pk'), 2)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(paginator.count, 5)
+        self.assertIn('LIMIT 4', queries.captured_queries[0]['sql'])
+
+
+class DatatablesCountTest(APITestCase):
+    """DataTables yanıtlarındaki recordsTotal/recordsFiltered sayım stratejilerini test eder."""
+
+    def setUp(self):
+        self.client.force_authenticate(UserFactory())
+        self.kanat = PartTypeFactory(name='KANAT')
+        self.tb2 = AircraftModelFactory(name='TB2')
+        for i in range(5):
+            PartFactory(part_type=self.kanat, aircraft_model_compatibility=self.tb2, serial_number=f'DT-{i}',
+                        status='STOKTA' if i < 3 else 'GERI_DONUSUMDE')
+        self.url = reverse('part-list')
+        # DataTables renderer'ı ayarlarda tanımlı değil, bu testlerde view'e eklenir.
+        patcher = mock.patch.object(PartViewSet, 'renderer_classes', [JSONRenderer, DatatablesRenderer])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _list(self, **params):
+        params = {'format': 'datatables', 'start': 0, 'length': 2, 'columns[0][data]': 'serial_number',
+                  'columns[0][searchable]': 'true', **params}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), queries.captured_queries
+
+    def test_counts_are_exact_below_limit(self):
+        data, queries = self._list()
+        self.assertEqual((data['recordsTotal'], data['recordsFiltered']), (5, 5))
+        self.assertTrue(data['recordsTotalExact'] and data['recordsFilteredExact'])
+        # Filtre yokken filtreli sayı ayrıca hesaplanmaz.
+        self.assertEqual(sum('COUNT(' in query['sql'] for query in queries), 1)
+
+    def test_filtered_count_includes_all_filter_backends(self):
+        data, _queries = self._list(status='STOKTA')
+        self.assertEqual((data['recordsTotal'], data['recordsFiltered']), (5, 3))
+        data, _queries = self._list(**{'search[value]': 'DT-1'})
+        self.assertEqual(data['recordsFiltered'], 1)
+
+    @override_settings(DATATABLES_EXACT_COUNT_LIMIT=2)
+    def test_capped_count_allows_pages_beyond_cap(self):
+        with mock.patch.object(PartViewSet, 'total_count_strategy', 'capped'):
+            data, queries = self._list(start=2)
+        self.assertEqual(data['recordsTotal'], 2)
+        self.assertFalse(data['recordsTotalExact'])
+        self.assertEqual(len(data['data']), 2)
+        self.assertIn('LIMIT 3', next(query['sql'] for query in queries if 'COUNT(' in query['sql']))
+
+    @override_settings(DATATABLES_EXACT_COUNT_LIMIT=2)
+    def test_estimate_falls_back_to_exact_count_without_postgres(self):
+        data, _queries = self._list()
+        self.assertEqual(data['recordsTotal'], 5)
+        self.assertTrue(data['recordsTotalExact'])
+
+    @override_settings(DATATABLES_EXACT_COUNT_LIMIT=2)
+    def test_standard_pagination_uses_count_strategy(self):
+        with mock.patch.object(PartViewSet, 'count_strategy', 'capped'):
+            response = self.client.get(self.url, {'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['count'], response.data['count_exact']), (2, False))
+        self.assertEqual(response.data['results'], [])  # Sayfa boyutu 10, ikinci sayfa boş döner.
+
+        response = self.client.get(self.url, {'status': 'STOKTA'})
+        self.assertEqual((response.data['count'], response.data['count_exact']), (3, True))
+
+    def test_callable_and_unknown_strategies(self):
+        self.assertEqual(datatables_count(Part.objects.all(), lambda queryset: 42, 10), (42, True))
+        with self.assertRaises(ValueError):
+            datatables_count(Part.objects.all(), 'approximate', 10)
+
+
+class WarmUpTest(TestCase):
+    """Sunucu ısınma adımlarının testleri."""
+
+    def test_url_resolvers_and_serializers_are_warmed(self):
+        self.assertGreater(warm_url_resolvers(), 0)
+        self.assertGreater(warm_serializers(), 0)
+
+
+class OpenApiSchemaArtifactTest(TestCase):
+    """Önceden üretilmiş OpenAPI şemasının sunulması testleri."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.artifact_path = os.path.join(cls.temp_dir.name, 'openapi-test.json.gz')
+        call_command('build_openapi_schema', output=cls.artifact_path, stdout=io.StringIO())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+        super().tearDownClass()
+
+    def test_schema_is_served_from_artifact_with_etag(self):
+        # Rate limit sorguları dışarıda tutulur, sadece şemanın sunulması ölçülür.
+        with override_settings(OPENAPI_SCHEMA_ARTIFACT=self.artifact_path, THROTTLE_BACKEND='cache'):
+            with self.assertNumQueries(0):
+                response = self.client.get(reverse('schema'), HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('/api/v1/envanter/parts/', response.json()['paths'])
+
+            not_modified = self.client.get(
+                reverse('schema'), HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=response['ETag']
+            )
+            self.assertEqual(not_modified.status_code, 304)
+
+    def test_yaml_matches_live_generation(self):
+        with override_settings(OPENAPI_SCHEMA_ARTIFACT=self.artifact_path):
+            cached = self.client.get(reverse('schema'))
+        with override_settings(OPENAPI_SCHEMA_ARTIFACT=os.path.join(self.temp_dir.name, 'yok.json.gz'), DEBUG=True):
+            live = self.client.get(reverse('schema'))
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.content, live.content)
+
+    def test_missing_artifact_is_not_generated_live_without_debug(self):
+        with override_settings(OPENAPI_SCHEMA_ARTIFACT=os.path.join(self.temp_dir.name, 'yok.json.gz'), DEBUG=False):
+            response = self.client.get(reverse('schema'))
+        self.assertEqual(response.status_code, 503)
+
+
+class StartupImportBudgetTest(TestCase):
+    """
+    Başlangıç import süresi testleri. Ölçüm ayrı bir process'te `python -X importtime` ile yapılır.
+    Bu makinede `manage.py check` toplam ~720 ms sürüyor (büyük kısmı Django, DRF ve psycopg).
+    Bütçe yavaş CI makineleri için geniş tutulmuştur.
+    """
+    IMPORT_BUDGET_MS = 2500
+    # İstek karşılayan process'lerde yüklenmemesi gereken dökümantasyon modülleri.
+    DOCUMENTATION_MODULES = [
+        'drf_spectacular.views', 'drf_spectacular.generators', 'apps.core.docs', 'apps.core.schema',
+        'apps.analitik.schema', 'apps.arama.schema', 'apps.envanter.schema', 'apps.montaj.schema',
+        'apps.uretim.schema', 'apps.users.schema',
+    ]
+
+    def run_python(self, *args):
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run(
+            [sys.executable, *args], cwd=base_dir, capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        return result
+
+    def test_manage_check_import_time_is_within_budget(self):
+        result = self.run_python('-X', 'importtime', 'manage.py', 'check')
+        self_times = re.findall(r'^import time:\s+(\d+) \|', result.stderr, re.MULTILINE)
+        total_ms = sum(int(us) for us in self_times) / 1000
+        self.assertLess(total_ms, self.IMPORT_BUDGET_MS)
+
+    def test_url_conf_does_not_load_documentation_modules(self):
+        code = (
+            "import json, sys, django; django.setup(); "
+            "from django.urls import get_resolver; get_resolver().url_patterns; "
+            f"print(json.dumps([m for m in {self.DOCUMENTATION_MODULES!r} if m in sys.modules]))"
+        )
+        result = self.run_python('-c', code)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '[]')
+
+    def test_schema_endpoint_loads_documentation_on_demand(self):
+        with override_settings(DEBUG=True, OPENAPI_SCHEMA_ARTIFACT='/yok/openapi.json.gz'):
+            response = self.client.get(reverse('schema'), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('apps.envanter.schema', sys.modules)
+
+
+class SharedThrottleTest(TestCase):
+    """Veritabanı tabanlı (worker'lar arası ortak) rate limit testleri."""
+
+    def test_token_bucket_consumes_and_refills(self):
+        # Kapasite 2, saniyede 0.5 token.
+        self.assertTrue(throttling.consume('test', 2, 0.5, now=1000.0))
+        self.assertTrue(throttling.consume('test', 2, 0.5, now=1000.0))
+        self.assertFalse(throttling.consume('test', 2, 0.5, now=1001.0))
+        self.assertAlmostEqual(throttling.seconds_until_available('test', 2, 0.5, now=1001.0), 1.0)
+        self.assertTrue(throttling.consume('test', 2, 0.5, now=1002.0))
+        self.assertFalse(throttling.consume('test', 2, 0.5, now=1002.0))
+
+    def test_consume_with_cost_is_all_or_nothing(self):
+        self.assertTrue(throttling.consume('test', 5, 0.5, now=1000.0, cost=3))
+        self.assertFalse(throttling.consume('test', 5, 0.5, now=1000.0, cost=3))
+        self.assertAlmostEqual(throttling.seconds_until_available('test', 5, 0.5, now=1000.0, cost=3), 2.0)
+        self.assertTrue(throttling.consume('test', 5, 0.5, now=1000.0, cost=2))
+        self.assertFalse(throttling.consume('other', 5, 0.5, now=1000.0, cost=6))
+
+    def test_login_limit_is_shared_between_processes(self):
+        url = reverse('user-login')
+        data = {'username': 'yok', 'password': 'yanlis'}
+        for _ in range(5):
+            # Her seferinde process'e özel cache temizlenir, limit yine de korunur.
+            cache.clear()
+            self.assertNotEqual(self.client.post(url, data).status_code, 429)
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertTrue(ThrottleBucket.objects.filter(key__contains='login_attempts').exists())
+
+    def test_database_errors_fail_open_without_retrying(self):
+        self.addCleanup(setattr, throttling, '_unavailable_until', 0.0)
+        with mock.patch.object(throttling, 'consume', side_effect=DatabaseError) as consume:
+            for _ in range(3):
+                response = self.client.post(reverse('user-login'), {'username': 'yok', 'password': 'yanlis'})
+                self.assertNotEqual(response.status_code, 429)
+        # İlk hatadan sonra veritabanına tekrar gidilmez.
+        self.assertEqual(consume.call_count, 1)
+
+    def test_purge_removes_only_full_buckets(self):
+        now = 100000.0
+        ThrottleBucket.objects.create(key='eski', tokens=0, updated_at=now - 2 * 3600)
+        ThrottleBucket.objects.create(key='yeni', tokens=0, updated_at=now - 60)
+        self.assertEqual(throttling.purge_expired_buckets(now=now), 1)
+        self.assertTrue(ThrottleBucket.objects.filter(key='yeni').exists())
+
+
+class BatchAPITest(APITestCase):
+    """Birden fazla isteğin tek HTTP isteğiyle çalıştırılması testleri."""
+
+    def setUp(self):
+        self.kanat_team = KanatTeamFactory()
+        self.user = UserFactory()
+        self.user.profile.team = self.kanat_team
+        self.user.profile.save()
+        token = AuthToken.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        kanat_pt = PartTypeFactory(name='KANAT')
+        tb2_model = AircraftModelFactory(name='TB2')
+        self.own_parts = [PartFactory(part_type=kanat_pt, aircraft_model_compatibility=tb2_model,
+                                      produced_by_team=self.kanat_team, status='STOKTA') for _ in range(2)]
+        self.other_part = PartFactory(part_type=kanat_pt, aircraft_model_compatibility=tb2_model,
+                                      produced_by_team=GovdeTeamFactory(), status='STOKTA')
+        self.url = reverse('batch')
+
+    def recycle(self, part):
+        return {'method': 'POST', 'path': reverse('part-recycle', kwargs={'pk': part.pk})}
+
+    def test_subrequests_run_in_order_and_report_their_own_status(self):
+        requests = [self.recycle(part) for part in [*self.own_parts, self.other_part]]
+        requests.append({'method': 'GET', 'path': f"{reverse('part-list')}?status=GERI_DONUSUMDE"})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'requests': requests}, format='json')
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([result['status'] for result in results], [200, 200, 403, 200])
+        self.assertEqual(results[3]['body']['count'], 2)
+        self.assertFalse(response.data['rolled_back'])
+        self.assertEqual(Part.objects.filter(status='GERI_DONUSUMDE').count(), 2)
+        # Token bir kez doğrulanır.
+        self.assertEqual(sum('"users_authtoken"' in query['sql'] for query in queries.captured_queries), 1)
+
+    def test_atomic_batch_is_rolled_back_on_failure(self):
+        requests = [self.recycle(self.own_parts[0]), self.recycle(self.other_part), self.recycle(self.own_parts[1])]
+        response = self.client.post(self.url, {'atomic': True, 'requests': requests}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.data['results']], [200, 403, 424])
+        self.assertTrue(response.data['rolled_back'])
+        self.assertFalse(Part.objects.filter(status='GERI_DONUSUMDE').exists())
+
+    def test_atomic_batch_commits_when_all_succeed(self):
+        requests = [self.recycle(part) for part in self.own_parts]
+        response = self.client.post(self.url, {'atomic': True, 'requests': requests}, format='json')
+        self.assertFalse(response.data['rolled_back'])
+        self.assertEqual(Part.objects.filter(status='GERI_DONUSUMDE').count(), 2)
+
+    def test_unknown_and_non_api_paths_are_rejected(self):
+        response = self.client.post(self.url, {'requests': [
+            {'method': 'GET', 'path': '/yok/'},
+            {'method': 'POST', 'path': self.url, 'body': {'requests': []}},
+            {'method': 'GET', 'path': reverse('schema')},
+        ]}, format='json')
+        self.assertEqual([result['status'] for result in response.data['results']], [404, 400, 400])
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_request_count_is_limited(self):
+        requests = [self.recycle(part) for part in [*self.own_parts, self.other_part]]
+        response = self.client.post(self.url, {'requests': requests}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('requests', response.data)
+
+    def test_batch_consumes_one_user_token_per_subrequest(self):
+        # Kovada 2 token kaldı: 3 alt istekli batch hiç çalıştırılmaz, 2 alt istekli batch çalışır.
+        key = f'throttle_user_{self.user.pk}'
+        ThrottleBucket.objects.create(key=key, tokens=2, updated_at=time.time())
+        requests = [self.recycle(part) for part in [*self.own_parts, self.other_part]]
+        response = self.client.post(self.url, {'requests': requests}, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(Part.objects.filter(status='GERI_DONUSUMDE').exists())
+
+        response = self.client.post(self.url, {'requests': requests[:2]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(ThrottleBucket.objects.get(key=key).tokens, 1)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.post(self.url, {'requests': [self.recycle(self.other_part)]}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+
+class IdentifierAllocatorTest(TestCase):
+    """Sunucuda üretilen seri/kuyruk numaralarının bloklar halinde ayrılmasını ve biçimlenmesini test eder."""
+
+    def setUp(self):
+        identifiers._reset()
+        self.addCleanup(identifiers._reset)
+
+    @override_settings(IDENTIFIER_BLOCK_SIZE=10)
+    def test_numbers_are_served_from_preallocated_blocks(self):
+        fetched = []
+
+        def fetch(kind, count):
+            fetched.append((kind, count))
+            start = sum(n for k, n in fetched[:-1] if k == kind)
+            return list(range(start + 1, start + count + 1))
+
+        # TestCase her testi bir transaction içinde çalıştırdığı için bloklar normalde saklanmaz.
+        with mock.patch.object(connection, 'in_atomic_block', False), mock.patch.object(identifiers, '_fetch', fetch):
+            self.assertEqual(identifiers.allocate('tail_number', 3), [1, 2, 3])
+            self.assertEqual(identifiers.allocate('tail_number', 5), [4, 5, 6, 7, 8])
+            self.assertEqual(identifiers.allocate('tail_number', 5), [9, 10, 11, 12, 13])
+            self.assertEqual(identifiers.allocate('tail_number', 25), list(range(14, 39)))
+            # Türlerin sayaçları ayrıdır.
+            self.assertEqual(identifiers.allocate('part_serial_number'), [1])
+        self.assertEqual(fetched, [('tail_number', 10), ('tail_number', 10), ('tail_number', 18),
+                                   ('part_serial_number', 10)])
+
+    def test_numbers_are_not_kept_inside_transactions(self):
+        self.assertEqual(identifiers.allocate('tail_number', 2), [1, 2])
+        self.assertEqual(identifiers.allocate('tail_number'), [3])
+        self.assertFalse(identifiers._blocks)
+
+    def test_identifiers_are_formatted_per_part_type_model_and_team(self):
+        kanat = PartType.objects.get(name='KANAT')
+        tb2 = AircraftModelFactory(name='TB2')
+        team = Team.objects.get(name='KANAT')
+        self.assertEqual(identifiers.part_serial_numbers(kanat, tb2, team, count=2),
+                         ['KANAT-TB2-0000001', 'KANAT-TB2-0000002'])
+        self.assertEqual(identifiers.part_serial_numbers(kanat), ['KANAT-GENEL-0000003'])
+        self.assertEqual(identifiers.tail_numbers(tb2), ['TC-TB2-00001'])
+        with override_settings(TAIL_NUMBER_FORMAT='{team}/{aircraft_model}/{number}'):
+            self.assertEqual(identifiers.tail_numbers(tb2, Team.objects.get(name='MONTAJ')), ['MONTAJ/TB2/2'])
+        with self.assertRaises(ValueError):
+            identifiers.allocate('work_order')
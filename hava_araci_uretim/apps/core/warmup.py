@@ -0,0 +1,97 @@
+"""
+Sunucu başlangıcında, worker'lar fork edilmeden önce çalışan ısınma adımları.
+
+Gunicorn `preload_app` ile çalıştığında uygulama master process'te bir kez yüklenir ve
+buradaki adımlar da orada çalışır. Fork edilen worker'lar URL çözümleyicilerini, import
+edilmiş serializer/view modüllerini, referans veri önbelleğini ve OpenAPI şemasını hazır
+devralır, böylece ilk istek bu maliyetleri ödemez.
+"""
+import importlib
+import importlib.util
+import inspect
+import time
+
+from django.apps import apps
+from django.db import DatabaseError, connections
+from django.urls import get_resolver
+from rest_framework import serializers
+
+from . import reference_cache
+from .openapi import warm_schema_artifact
+
+# Her uygulamada import edilecek modüller
+WARM_MODULES = ('serializers', 'views', 'async_views')
+
+
+def _project_app_configs():
+    return [app_config for app_config in apps.get_app_configs() if app_config.name.startswith('apps.')]
+
+
+def warm_url_resolvers():
+    """URL çözümleyicisini ve tüm include'ları (dolayısıyla view modüllerini) yükler."""
+    resolver = get_resolver()
+    resolver.reverse_dict
+    resolver.namespace_dict
+    resolver.app_dict
+    return len(resolver.reverse_dict)
+
+
+def warm_serializers():
+    """
+    Uygulamaların serializer ve view modüllerini import eder, serializer sınıflarının
+    alanlarını bir kez oluşturarak model `_meta` önbelleklerini doldurur.
+    """
+    warmed = 0
+    for app_config in _project_app_configs():
+        for module_name in WARM_MODULES:
+            full_name = f"{app_config.name}.{module_name}"
+            if importlib.util.find_spec(full_name) is None:
+                continue
+            module = importlib.import_module(full_name)
+            if module_name != 'serializers':
+                continue
+            for _name, serializer_class in inspect.getmembers(module, inspect.isclass):
+                if serializer_class.__module__ != full_name or not issubclass(serializer_class, serializers.Serializer):
+                    continue
+                try:
+                    serializer_class().fields
+                except Exception:
+                    # Context gerektiren serializer'lar ilk istekte hazırlanır.
+                    continue
+                warmed += 1
+    return warmed
+
+
+def close_connections():
+    """
+    Fork öncesi açık veritabanı bağlantılarını (ve havuz modunda bağlantı havuzunu) kapatır.
+    Aksi halde worker'lar aynı soketi paylaşır.
+    """
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        # Havuz sadece oluşturulmuşsa kapatılır, `pool` özelliğine erişmek yeni bir havuz açar.
+        if connection.alias in getattr(connection, '_connection_pools', {}):
+            connection.close_pool()
+
+
+def warm_up():
+    """
+    Tüm ısınma adımlarını çalıştırır ve adım başına süreyi (ms) döndürür.
+    Veritabanına erişilemezse referans önbelleği atlanır, sunucu yine de başlar.
+    """
+    report = {}
+    steps = [
+        ('url_resolvers', warm_url_resolvers),
+        ('serializers', warm_serializers),
+        ('reference_cache', reference_cache.warm),
+        ('openapi_schema', warm_schema_artifact),
+    ]
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            result = step()
+        except DatabaseError as e:
+            result = f"atlandı ({e.__class__.__name__})"
+        report[name] = {'result': result, 'ms': round((time.perf_counter() - started) * 1000, 1)}
+    close_connections()
+    return report
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Part
+from apps.core.admin import LargeTableAdmin, ReferenceFieldListFilter, reference_name
+from .models import Part, PartArchive, PartEvent, StockCheckpoint
 from .models import PartType, AircraftModel
 
 
@@ -16,28 +17,29 @@ class AircraftModelAdmin(admin.ModelAdmin):
 
 
 @admin.register(Part)
-class PartAdmin(admin.ModelAdmin):
+class PartAdmin(LargeTableAdmin):
+    """
+    Sütunlar ilişkili nesnelerin `__str__` metotlarını çağırmaz: Referans adları önbellekten okunur,
+    sadece kullanıldığı uçak JOIN edilir. Arama seri numarası önekiyle yapılır (unique index).
+    Bir uçağın parçaları `?used_in_aircraft=<id>` ile listelenebilir.
+    """
     list_display = (
         'serial_number',
-        'part_type',
-        'aircraft_model_compatibility',
+        'part_type_name',
+        'aircraft_model_name',
         'status',
-        'produced_by_team',
-        'used_in_aircraft',
+        'produced_by_team_name',
+        'used_in_aircraft_tail_number',
         'created_at'
     )
     list_filter = (
         'status',
-        'part_type',
-        'aircraft_model_compatibility',
-        'produced_by_team'
-    )
-    search_fields = (
-        'serial_number',
-        'used_in_aircraft__tail_number',
-        'part_type__name',
-        'aircraft_model_compatibility__name'
+        ('part_type', ReferenceFieldListFilter),
+        ('aircraft_model_compatibility', ReferenceFieldListFilter),
+        ('produced_by_team', ReferenceFieldListFilter),
     )
+    search_fields = ('serial_number__startswith',)
+    search_help_text = "Seri numarasının başlangıcı ile arar."
     autocomplete_fields = [
         'part_type',
         'aircraft_model_compatibility',
@@ -45,9 +47,76 @@ class PartAdmin(admin.ModelAdmin):
         'used_in_aircraft'
     ]
 
-    list_select_related = (
-        'part_type',
-        'aircraft_model_compatibility',
-        'produced_by_team',
-        'used_in_aircraft'
-    )
+    list_select_related = ('used_in_aircraft',)
+    # Sadece index'li sıralamalar: Varsayılan en yeni kayıt (PK), seri numarası (unique index).
+    ordering = ('-pk',)
+    row_label_field = 'serial_number'
+    sortable_by = ('serial_number',)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name == 'autocomplete':
+            # Otomatik tamamlama sonuçları Part.__str__ ile gösterilir.
+            queryset = queryset.select_related('part_type', 'aircraft_model_compatibility')
+        return queryset
+
+    @admin.display(description="Parça Tipi")
+    def part_type_name(self, obj):
+        return reference_name('envanter.PartType', obj.part_type_id)
+
+    @admin.display(description="Uyumlu Uçak Modeli")
+    def aircraft_model_name(self, obj):
+        return reference_name('envanter.AircraftModel', obj.aircraft_model_compatibility_id)
+
+    @admin.display(description="Üreten Takım")
+    def produced_by_team_name(self, obj):
+        return reference_name('uretim.Team', obj.produced_by_team_id)
+
+    @admin.display(description="Kullanıldığı Uçak")
+    def used_in_aircraft_tail_number(self, obj):
+        return obj.used_in_aircraft.tail_number if obj.used_in_aircraft_id else None
+
+
+@admin.register(PartArchive)
+class PartArchiveAdmin(admin.ModelAdmin):
+    """Arşiv sadece okunabilir. Satırlar `archive_parts` komutu ile eklenir."""
+    list_display = ('serial_number', 'part_type', 'aircraft_model_compatibility', 'status', 'produced_by_team',
+                    'created_at', 'archived_at')
+    list_filter = ('part_type', 'aircraft_model_compatibility', 'produced_by_team')
+    search_fields = ('serial_number',)
+    list_select_related = ('part_type', 'aircraft_model_compatibility', 'produced_by_team')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(PartEvent)
+class PartEventAdmin(admin.ModelAdmin):
+    """Parça geçmişi değiştirilemez."""
+    list_display = ('occurred_at', 'serial_number', 'kind', 'from_status', 'to_status', 'tail_number')
+    list_filter = ('kind', 'part_type', 'aircraft_model')
+    search_fields = ('serial_number', 'tail_number')
+    date_hierarchy = 'occurred_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StockCheckpoint)
+class StockCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('taken_at', 'created_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EnvanterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.envanter'
+
+    def ready(self):
+        from . import history
+        history.connect_signals()
@@ -0,0 +1,58 @@
+"""
+Soğuk parçaların arşiv tablosuna taşınması.
+
+Geri dönüşüme gönderilmiş parçalar bir daha değişmez, ancak `Part` tablosunda kaldıkça her liste,
+sayım ve index taraması bu satırları da dolaşır. `archive_recycled_parts()` belirli bir süreden
+uzun zamandır geri dönüşümde olan parçaları `PartArchive` tablosuna taşır.
+
+Taşıma işlemi küçük partiler halinde, her parti kendi transaction'ında yapılır. Satırlar ham SQL
+ile silinir. Bu bir üretim geri alma işlemi olmadığı için sinyaller tetiklenmez, özet (rollup)
+tablolarındaki üretim sayıları değişmez (`apps.analitik.rollups.rebuild` arşiv tablosunu da sayar). Bir uçağa bağlı parçalar taşınmaz. Taşınan parçalar aramada
+görünmez (arama dokümanları silinir).
+"""
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.arama import index as search_index
+from .models import Part, PartArchive
+
+ARCHIVED_FIELDS = [
+    'id', 'part_type_id', 'aircraft_model_compatibility_id', 'serial_number', 'status',
+    'produced_by_team_id', 'created_at', 'updated_at',
+]
+
+
+def archivable_parts(before):
+    """`before` zamanından önce geri dönüşüme gönderilmiş ve hiçbir uçağa bağlı olmayan parçalar."""
+    return Part.objects.filter(status='GERI_DONUSUMDE', updated_at__lt=before, used_in_aircraft__isnull=True).exclude(
+        Q(used_as_wing_in__isnull=False) | Q(used_as_fuselage_in__isnull=False)
+        | Q(used_as_tail_in__isnull=False) | Q(used_as_avionics_in__isnull=False)
+    )
+
+
+def _archive_batch(before, batch_size):
+    with transaction.atomic():
+        queryset = archivable_parts(before).order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            # Aynı anda çalışan başka bir arşivleme veya güncelleme ile çakışan satırlar atlanır.
+            queryset = queryset.select_for_update(skip_locked=True, of=('self',))
+        rows = list(queryset.values(*ARCHIVED_FIELDS)[:batch_size])
+        if not rows:
+            return 0
+        PartArchive.objects.bulk_create([PartArchive(**row) for row in rows])
+        table = connection.ops.quote_name(Part._meta.db_table)
+        ids = [row['id'] for row in rows]
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+        search_index.remove('PART', ids)
+        return len(rows)
+
+
+def archive_recycled_parts(before, batch_size=1000):
+    """Arşivlenebilir tüm parçaları partiler halinde taşır. Taşınan parça sayısını döndürür."""
+    total = 0
+    while True:
+        moved = _archive_batch(before, batch_size)
+        total += moved
+        if moved < batch_size:
+            return total
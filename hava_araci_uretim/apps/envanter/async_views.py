@@ -0,0 +1,33 @@
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404
+
+from apps.core.async_views import async_api_view, apaginated_response
+from .models import PartType, AircraftModel, Part
+from .serializers import PartTypeSerializer, AircraftModelSerializer, PartSerializer
+
+
+@async_api_view
+async def part_type_list(request):
+    """Parça tiplerini listeler. `PartTypeViewSet.list` ile aynı yanıtı döner."""
+    return await apaginated_response(request, PartType.objects.all().order_by('name'), PartTypeSerializer)
+
+
+@async_api_view
+async def aircraft_model_list(request):
+    """Uçak modellerini listeler. `AircraftModelViewSet.list` ile aynı yanıtı döner."""
+    return await apaginated_response(request, AircraftModel.objects.all().order_by('name'), AircraftModelSerializer)
+
+
+@async_api_view
+async def part_detail(request, pk):
+    """Bir parçanın detayını döndürür. `PartViewSet.retrieve` ile aynı yanıtı döner."""
+    part = await aget_object_or_404(
+        Part.objects.select_related(
+            'part_type',
+            'produced_by_team',
+            'used_in_aircraft',
+            'aircraft_model_compatibility'
+        ),
+        pk=pk
+    )
+    return JsonResponse(PartSerializer(part, context={'request': request}).data)
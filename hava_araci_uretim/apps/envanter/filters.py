@@ -0,0 +1,30 @@
+import django_filters
+
+from .models import Part
+
+
+class PartFilter(django_filters.FilterSet):
+    """
+    Parça listesi filtreleri. `available=true` sadece montajda kullanılabilecek parçaları döndürür: Stokta
+    olan ve başka bir montajcı tarafından rezerve edilmemiş (kullanıcının kendi rezervasyonundakiler dahil).
+    `available=false` filtre uygulamaz.
+    """
+    available = django_filters.BooleanFilter(method='filter_available', label="Montaj için kullanılabilir")
+
+    class Meta:
+        model = Part
+        fields = {
+            'part_type': ['exact'],
+            'status': ['exact'],
+            'produced_by_team': ['exact'],
+            'aircraft_model_compatibility': ['exact'],  # ForeignKey için filtreleme
+            'serial_number': ['exact', 'icontains'],
+        }
+
+    def filter_available(self, queryset, name, value):
+        from apps.montaj.models import KitReservation
+
+        if not value:
+            return queryset
+        user = self.request.user if self.request is not None else None
+        return queryset.filter(KitReservation.available_to(user), status='STOKTA')
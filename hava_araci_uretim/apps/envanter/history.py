@@ -0,0 +1,114 @@
+"""
+Parça geçmişi ve belirli bir andaki stok durumu.
+
+Her durum geçişi (üretim, uçağa takılma, uçak silinince sökülme, değişim, geri dönüşüm, silinme)
+`PartEvent` tablosuna bir satır olarak eklenir. Olaylar değişikliği yapan kod ile aynı transaction
+içinde yazılır ve bir işlemin tüm olayları (örn: montajdaki 4 parça) tek INSERT ile eklenir.
+
+Üretim ve silinme sinyallerle yakalanır. Diğer geçişler onları yapan kod tarafından kaydedilir
+(`AssembledAircraft.save()`, montaj view'i ve serializer'ı, `recycle` aksiyonu). Admin panelinden
+durumun elle değiştirilmesi kaydedilmez.
+
+Belirli bir andaki stok, o andan önceki son kontrol noktasının (`StockCheckpoint`) sayılarına
+aradaki olayların eklenmesi ile hesaplanır: Her olay önceki durumun sayısını bir azaltır, yeni
+durumun sayısını bir artırır. Böylece sadece kontrol noktasından sonraki olaylar (zaman index'i ile)
+okunur. Arşive taşınan parçalar geçmişte geri dönüşümde olarak kalır.
+
+Kaydedilen olaylar `parts_changed` sinyali ile (aynı transaction içinde) diğer uygulamalara bildirilir
+(örn: apps.uretim.scheduler iş emirlerini günceller).
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import PartEvent, StockCheckpoint
+
+# Olaylar transaction commit edilmeden önce zaman damgası alır. Kontrol noktası, devam eden
+# transaction'ların olaylarını kaçırmamak için bu kadar geriden oluşturulur.
+CHECKPOINT_LAG = timedelta(minutes=10)
+
+# Olaylar kaydedildikten sonra gönderilir. Argüman: events (PartEvent listesi)
+parts_changed = Signal()
+
+
+def part_event(part, kind, from_status, aircraft=None, occurred_at=None):
+    """Parçanın şu anki durumuna geçişi anlatan (kaydedilmemiş) bir olay döndürür."""
+    return PartEvent(
+        occurred_at=occurred_at or timezone.now(),
+        kind=kind,
+        part_id=part.pk,
+        serial_number=part.serial_number,
+        part_type_id=part.part_type_id,
+        aircraft_model_id=part.aircraft_model_compatibility_id,
+        from_status=from_status,
+        to_status=None if kind == 'DELETED' else part.status,
+        aircraft_id=aircraft.pk if aircraft else None,
+        tail_number=aircraft.tail_number if aircraft else '',
+    )
+
+
+def record(events):
+    """Olayları tek sorguda ekler ve `parts_changed` sinyalini gönderir."""
+    if events:
+        PartEvent.objects.bulk_create(events)
+        parts_changed.send(sender=PartEvent, events=events)
+
+
+def stock_at(at):
+    """
+    `at` anındaki parça sayılarını döndürür: ((durum, parça tipi ID, uçak modeli ID) -> adet, kontrol noktası).
+    `at` ilk kontrol noktasından önceyse geçmiş bilinmediği için (None, None) döner.
+    """
+    checkpoint = StockCheckpoint.objects.filter(taken_at__lte=at).order_by('-taken_at').first()
+    if checkpoint is None:
+        return None, None
+
+    counts = Counter()
+    for status, part_type_id, aircraft_model_id, total in checkpoint.counts:
+        counts[(status, part_type_id, aircraft_model_id)] += total
+
+    events = PartEvent.objects.filter(occurred_at__gt=checkpoint.taken_at, occurred_at__lte=at)
+    for field, sign in (('to_status', 1), ('from_status', -1)):
+        rows = (
+            events.filter(**{f'{field}__isnull': False})
+            .values_list(field, 'part_type_id', 'aircraft_model_id')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        for status, part_type_id, aircraft_model_id, total in rows:
+            counts[(status, part_type_id, aircraft_model_id)] += sign * total
+    return +counts, checkpoint  # Sıfır olanlar atılır.
+
+
+def create_checkpoint(at=None):
+    """`at` (varsayılan: şimdi - CHECKPOINT_LAG) anı için kontrol noktası oluşturur. Varsa mevcut olanı döndürür."""
+    at = at or timezone.now() - CHECKPOINT_LAG
+    existing = StockCheckpoint.objects.filter(taken_at=at).first()
+    if existing:
+        return existing
+    counts, previous = stock_at(at)
+    if previous is None:
+        raise ValueError("İlk kontrol noktasından önceki bir an için kontrol noktası oluşturulamaz.")
+    return StockCheckpoint.objects.create(
+        taken_at=at,
+        counts=[[status, part_type_id, aircraft_model_id, total]
+                for (status, part_type_id, aircraft_model_id), total in sorted(counts.items())],
+    )
+
+
+def _part_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record([part_event(instance, 'PRODUCED', None, occurred_at=instance.created_at)])
+
+
+def _part_deleted(sender, instance, **kwargs):
+    record([part_event(instance, 'DELETED', instance.status)])
+
+
+def connect_signals():
+    post_save.connect(_part_saved, sender='envanter.Part', dispatch_uid='envanter_history_part_saved')
+    post_delete.connect(_part_deleted, sender='envanter.Part', dispatch_uid='envanter_history_part_deleted')
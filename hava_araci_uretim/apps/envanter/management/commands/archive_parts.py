@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.envanter.archive import archivable_parts, archive_recycled_parts
+
+
+class Command(BaseCommand):
+    help = "Uzun süredir geri dönüşümde olan parçaları Part tablosundan PartArchive tablosuna taşır."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=90,
+            help="Bu kadar gündür geri dönüşümde olan parçalar taşınır (varsayılan: 90)."
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help="Her transaction'da taşınan parça sayısı.")
+        parser.add_argument('--dry-run', action='store_true', help="Sadece taşınacak parça sayısını gösterir.")
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['older_than_days'])
+        if options['dry_run']:
+            self.stdout.write(f"Taşınacak parça sayısı: {archivable_parts(before).count()}")
+            return
+        moved = archive_recycled_parts(before, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{moved} parça arşive taşındı."))
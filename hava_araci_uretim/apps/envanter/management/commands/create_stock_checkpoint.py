@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.envanter.history import create_checkpoint
+
+
+class Command(BaseCommand):
+    help = ("Parça geçmişi için stok kontrol noktası oluşturur. Belirli bir andaki stok sorguları son kontrol "
+            "noktasından sonraki olayları okur, bu yüzden periyodik (örn: günlük) çalıştırılmalıdır.")
+
+    def handle(self, *args, **options):
+        checkpoint = create_checkpoint()
+        self.stdout.write(self.style.SUCCESS(
+            f"{checkpoint.taken_at:%Y-%m-%d %H:%M:%S} için kontrol noktası oluşturuldu "
+            f"({sum(row[3] for row in checkpoint.counts)} parça)."
+        ))
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('envanter', '0004_populate_initial_aircraft_models'),
+        ('montaj', '0001_initial'),
+        ('uretim', '0002_populate_initial_teams'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PartArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('serial_number', models.CharField(max_length=100, unique=True, verbose_name='Seri Numarası')),
+                ('status', models.CharField(choices=[('STOKTA', 'Stokta'), ('KULLANILDI', 'Kullanıldı'), ('GERI_DONUSUMDE', 'Geri Dönüşümde')], max_length=20, verbose_name='Durum')),
+                ('created_at', models.DateTimeField(verbose_name='Oluşturulma Tarihi')),
+                ('updated_at', models.DateTimeField(verbose_name='Güncellenme Tarihi')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Arşivlenme Tarihi')),
+            ],
+            options={
+                'verbose_name': 'Arşivlenmiş Parça',
+                'verbose_name_plural': 'Arşivlenmiş Parçalar',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(condition=models.Q(('status', 'STOKTA')), fields=['part_type', 'aircraft_model_compatibility', '-created_at'], name='part_in_stock_idx'),
+        ),
+        migrations.AddField(
+            model_name='partarchive',
+            name='aircraft_model_compatibility',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='envanter.aircraftmodel', verbose_name='Uyumlu Uçak Modeli'),
+        ),
+        migrations.AddField(
+            model_name='partarchive',
+            name='part_type',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='envanter.parttype', verbose_name='Parça Tipi'),
+        ),
+        migrations.AddField(
+            model_name='partarchive',
+            name='produced_by_team',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='uretim.team', verbose_name='Üreten Takım'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def create_occurred_at_index(apps, schema_editor):
+    # Olaylar zaman sırasıyla eklenir. BRIN index'i B-tree'ye göre çok küçüktür ve zaman aralığı
+    # taramaları için yeterlidir. Diğer veritabanlarında normal index kullanılır.
+    using = 'USING brin ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(f'CREATE INDEX part_event_occurred_at_idx ON envanter_partevent {using}(occurred_at)')
+
+
+def drop_occurred_at_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX part_event_occurred_at_idx')
+
+
+def create_initial_checkpoint(apps, schema_editor):
+    # Geçmiş olaylar bilinmediği için zaman yolculuğu sorguları bu andan itibaren yapılabilir.
+    counts = []
+    for model_name in ('Part', 'PartArchive'):
+        rows = (
+            apps.get_model('envanter', model_name).objects
+            .values_list('status', 'part_type_id', 'aircraft_model_compatibility_id')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        counts.extend(list(row) for row in rows)
+    apps.get_model('envanter', 'StockCheckpoint').objects.create(taken_at=timezone.now(), counts=counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('envanter', '0005_part_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(unique=True, verbose_name='Zaman')),
+                ('counts', models.JSONField(default=list, verbose_name='Sayılar')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+            ],
+            options={
+                'verbose_name': 'Stok Kontrol Noktası',
+                'verbose_name_plural': 'Stok Kontrol Noktaları',
+            },
+        ),
+        migrations.CreateModel(
+            name='PartEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurred_at', models.DateTimeField(verbose_name='Zaman')),
+                ('kind', models.CharField(choices=[('PRODUCED', 'Üretildi'), ('ASSEMBLED', 'Uçağa Takıldı'), ('RELEASED', 'Uçak Silindiği İçin Söküldü'), ('SWAPPED_IN', 'Değişimle Uçağa Takıldı'), ('SWAPPED_OUT', 'Değişimle Uçaktan Söküldü'), ('RECYCLED', 'Geri Dönüşüme Gönderildi'), ('DELETED', 'Silindi')], max_length=12, verbose_name='Olay')),
+                ('part_id', models.BigIntegerField(db_index=True, verbose_name='Parça ID')),
+                ('serial_number', models.CharField(max_length=100, verbose_name='Seri Numarası')),
+                ('from_status', models.CharField(choices=[('STOKTA', 'Stokta'), ('KULLANILDI', 'Kullanıldı'), ('GERI_DONUSUMDE', 'Geri Dönüşümde')], max_length=20, null=True, verbose_name='Önceki Durum')),
+                ('to_status', models.CharField(choices=[('STOKTA', 'Stokta'), ('KULLANILDI', 'Kullanıldı'), ('GERI_DONUSUMDE', 'Geri Dönüşümde')], max_length=20, null=True, verbose_name='Yeni Durum')),
+                ('aircraft_id', models.BigIntegerField(null=True, verbose_name='Uçak ID')),
+                ('tail_number', models.CharField(blank=True, max_length=50, verbose_name='Kuyruk Numarası')),
+                ('aircraft_model', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='envanter.aircraftmodel', verbose_name='Uyumlu Uçak Modeli')),
+                ('part_type', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='envanter.parttype', verbose_name='Parça Tipi')),
+            ],
+            options={
+                'verbose_name': 'Parça Olayı',
+                'verbose_name_plural': 'Parça Olayları',
+            },
+        ),
+        migrations.RunPython(create_occurred_at_index, drop_occurred_at_index),
+        migrations.RunPython(create_initial_checkpoint, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('envanter', '0007_part_version'),
+        ('montaj', '0002_assembledaircraft_version'),
+        ('uretim', '0002_populate_initial_teams'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='part',
+            constraint=models.CheckConstraint(condition=models.Q(('status__in', ['STOKTA', 'KULLANILDI', 'GERI_DONUSUMDE'])), name='part_status_valid'),
+        ),
+    ]
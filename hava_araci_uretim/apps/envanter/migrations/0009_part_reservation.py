@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('envanter', '0008_part_status_constraint'),
+        ('montaj', '0004_kitreservation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='part',
+            name='reservation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='parts', to='montaj.kitreservation', verbose_name='Rezervasyon'),
+        ),
+    ]
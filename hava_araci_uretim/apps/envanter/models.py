@@ -1,6 +1,6 @@
 from django.db import models
 
-from apps.core.models import TimeStampedModel
+from apps.core.models import TimeStampedModel, VersionedModel
 
 
 class PartType(TimeStampedModel):
@@ -60,7 +60,7 @@ class AircraftModel(TimeStampedModel):
         ordering = ['name']
 
 
-class Part(TimeStampedModel):
+class Part(TimeStampedModel, VersionedModel):
     """
     Üretilen her bir spesifik parçayı temsil eder.
     """
@@ -122,6 +122,16 @@ class Part(TimeStampedModel):
         db_index=True # Sık sık uçağa göre filtreleneceği için indexleme performansı arttıracaktır.
     )
 
+    # Parçayı montaj için ayıran set rezervasyonu (parça STOKTA kalır, bkz. montaj.KitReservation)
+    reservation = models.ForeignKey(
+        'montaj.KitReservation',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='parts',
+        verbose_name="Rezervasyon"
+    )
+
     def __str__(self):
         # __str__ metodunu eski haline getirin
         compatibility_display = self.aircraft_model_compatibility.get_name_display() if self.aircraft_model_compatibility else "Uyumsuz/Bilinmiyor"
@@ -130,3 +140,114 @@ class Part(TimeStampedModel):
     class Meta:
         verbose_name = "Parça"
         verbose_name_plural = "Parçalar"
+        indexes = [
+            # Sık kullanılan sorgular (stok sayımı, eksik parça kontrolü, montaj için parça seçimi) sadece
+            # stoktaki parçalarla ilgilenir. Kısmi index sadece bu satırları içerir, bu yüzden boyutu
+            # geri dönüşüme giden veya kullanılan parça sayısı arttıkça büyümez.
+            models.Index(
+                fields=['part_type', 'aircraft_model_compatibility', '-created_at'],
+                condition=models.Q(status='STOKTA'),
+                name='part_in_stock_idx'
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(status__in=['STOKTA', 'KULLANILDI', 'GERI_DONUSUMDE']),
+                name='part_status_valid',
+            ),
+        ]
+
+
+class PartArchive(models.Model):
+    """
+    Arşivlenmiş (soğuk) parçalar. Uzun süredir geri dönüşümde olan parçalar `archive_parts` komutu ile
+    `Part` tablosundan buraya taşınır. Böylece ana tablo ve index'leri sadece aktif parçaları içerir.
+    Satırlar orijinal parça ID'sini korur.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    part_type = models.ForeignKey(PartType, on_delete=models.PROTECT, related_name='+', verbose_name="Parça Tipi")
+    aircraft_model_compatibility = models.ForeignKey(
+        AircraftModel,
+        on_delete=models.PROTECT,
+        related_name='+',
+        verbose_name="Uyumlu Uçak Modeli"
+    )
+    serial_number = models.CharField(max_length=100, unique=True, verbose_name="Seri Numarası")
+    status = models.CharField(max_length=20, choices=Part.STATUS_CHOICES, verbose_name="Durum")
+    produced_by_team = models.ForeignKey(
+        'uretim.Team',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name="Üreten Takım"
+    )
+    created_at = models.DateTimeField(verbose_name="Oluşturulma Tarihi")
+    updated_at = models.DateTimeField(verbose_name="Güncellenme Tarihi")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Arşivlenme Tarihi")
+
+    def __str__(self):
+        return f"{self.serial_number} [{self.get_status_display()}] (Arşiv)"
+
+    class Meta:
+        verbose_name = "Arşivlenmiş Parça"
+        verbose_name_plural = "Arşivlenmiş Parçalar"
+
+
+class PartEvent(models.Model):
+    """
+    Parça durum geçişlerinin değişmez (append-only) kaydı. Satırlar hiçbir zaman güncellenmez veya silinmez.
+
+    Parça silinse veya arşive taşınsa bile geçmişi korunur, bu yüzden parça ve uçak alanları foreign key
+    değildir. Her satır geçişten önceki ve sonraki durumu tutar. Böylece belirli bir andaki stok, son
+    kontrol noktasına (`StockCheckpoint`) o andan sonraki olayların eklenmesiyle hesaplanır (bkz. history.py).
+    `occurred_at` üzerindeki index Postgres'te BRIN'dir (migration 0006).
+    """
+
+    KIND_CHOICES = [
+        ('PRODUCED', 'Üretildi'),
+        ('ASSEMBLED', 'Uçağa Takıldı'),
+        ('RELEASED', 'Uçak Silindiği İçin Söküldü'),
+        ('SWAPPED_IN', 'Değişimle Uçağa Takıldı'),
+        ('SWAPPED_OUT', 'Değişimle Uçaktan Söküldü'),
+        ('RECYCLED', 'Geri Dönüşüme Gönderildi'),
+        ('DELETED', 'Silindi'),
+    ]
+
+    occurred_at = models.DateTimeField(verbose_name="Zaman")
+    kind = models.CharField(max_length=12, choices=KIND_CHOICES, verbose_name="Olay")
+    part_id = models.BigIntegerField(db_index=True, verbose_name="Parça ID")
+    serial_number = models.CharField(max_length=100, verbose_name="Seri Numarası")
+    part_type = models.ForeignKey(PartType, on_delete=models.PROTECT, related_name='+', db_index=False,
+                                  verbose_name="Parça Tipi")
+    aircraft_model = models.ForeignKey(AircraftModel, on_delete=models.PROTECT, related_name='+', db_index=False,
+                                       verbose_name="Uyumlu Uçak Modeli")
+    # Üretimde önceki durum, silinmede sonraki durum yoktur.
+    from_status = models.CharField(max_length=20, choices=Part.STATUS_CHOICES, null=True, verbose_name="Önceki Durum")
+    to_status = models.CharField(max_length=20, choices=Part.STATUS_CHOICES, null=True, verbose_name="Yeni Durum")
+    aircraft_id = models.BigIntegerField(null=True, verbose_name="Uçak ID")
+    tail_number = models.CharField(max_length=50, blank=True, verbose_name="Kuyruk Numarası")
+
+    def __str__(self):
+        return f"{self.serial_number}: {self.get_kind_display()} ({self.occurred_at:%Y-%m-%d %H:%M})"
+
+    class Meta:
+        verbose_name = "Parça Olayı"
+        verbose_name_plural = "Parça Olayları"
+
+
+class StockCheckpoint(models.Model):
+    """
+    Belirli bir andaki stok sayıları (durum, parça tipi ve uçak modeline göre). Zaman yolculuğu sorgularında
+    olay tekrarının başlangıç noktasıdır. `create_stock_checkpoint` komutu ile periyodik olarak oluşturulur.
+    """
+    taken_at = models.DateTimeField(unique=True, verbose_name="Zaman")
+    # [durum, parça tipi ID, uçak modeli ID, adet] listesi
+    counts = models.JSONField(default=list, verbose_name="Sayılar")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+
+    def __str__(self):
+        return f"Stok kontrol noktası ({self.taken_at:%Y-%m-%d %H:%M})"
+
+    class Meta:
+        verbose_name = "Stok Kontrol Noktası"
+        verbose_name_plural = "Stok Kontrol Noktaları"
@@ -0,0 +1,290 @@
+"""
+Envanter uygulaması view'lerinin OpenAPI dökümantasyonu.
+
+Sadece şema üretilirken yüklenir (bkz. apps.core.schema).
+"""
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiResponse, inline_serializer
+from rest_framework import serializers
+
+from apps.core.schema import IF_MATCH_PARAMETER, VERSION_CONFLICT_RESPONSE, ViewSchemaExtension, bulk_action_schema
+from .models import Part
+from .serializers import (
+    PartTypeSerializer, AircraftModelSerializer, PartSerializer, PartEventSerializer, StockSnapshotQuerySerializer
+)
+
+
+class PartTypeViewSetSchema(ViewSchemaExtension):
+    target_class = 'apps.envanter.views.PartTypeViewSet'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Envanter - Parça Tipleri (Admin)"],  # Etiket güncellendi
+            description="Sistemde tanımlı olan parça tiplerini (Kanat, Gövde vb.) yönetir. CRUD işlemleri sadece admin yetkisine sahip kullanıcılar tarafından gerçekleştirilebilir."
+        )
+        @extend_schema_view(
+            create=extend_schema(summary="Yeni Parça Tipi Oluştur (Admin)", request=PartTypeSerializer,
+                           responses={201: PartTypeSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
+                                      403: OpenApiResponse(description="Yetkiniz yok.")}),
+            list=extend_schema(summary="Tüm Parça Tiplerini Listele", responses={200: PartTypeSerializer(many=True)}),
+            retrieve=extend_schema(summary="Belirli Bir Parça Tipinin Detayını Getir",
+                           responses={200: PartTypeSerializer, 404: OpenApiResponse(description="Bulunamadı.")}),
+            update=extend_schema(summary="Parça Tipini Güncelle (Admin)", request=PartTypeSerializer,
+                           responses={200: PartTypeSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
+                                      403: OpenApiResponse(description="Yetkiniz yok."),
+                                      404: OpenApiResponse(description="Bulunamadı.")}),
+            partial_update=extend_schema(summary="Parça Tipini Kısmen Güncelle (Admin)", request=PartTypeSerializer,
+                           responses={200: PartTypeSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
+                                      403: OpenApiResponse(description="Yetkiniz yok."),
+                                      404: OpenApiResponse(description="Bulunamadı.")}),
+            destroy=extend_schema(summary="Parça Tipini Sil (Admin)",
+                           responses={204: OpenApiResponse(description="Başarıyla silindi."),
+                                      403: OpenApiResponse(description="Yetkiniz yok."),
+                                      404: OpenApiResponse(description="Bulunamadı."), 409: OpenApiResponse(
+                                   description="Bu parça tipi kullanıldığı için silinemiyor (PROTECT).")}),
+        )
+        class PartTypeViewSet(self.target_class):
+            pass
+
+        return PartTypeViewSet
+
+
+class AircraftModelViewSetSchema(ViewSchemaExtension):
+    target_class = 'apps.envanter.views.AircraftModelViewSet'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Envanter - Uçak Modelleri"],
+            description="Sistemde tanımlı olan uçak modellerini (TB2, AKINCI vb.) listeler ve detaylarını gösterir."
+        )
+        @extend_schema_view(
+            list=extend_schema(
+                summary="Tüm Uçak Modellerini Listele",
+                description="Sistemdeki tüm uçak modellerinin sayfalanmış bir listesini döndürür.",
+                responses={200: AircraftModelSerializer(many=True),
+                           401: OpenApiResponse(description="Kimlik doğrulaması gerekli.")}
+            ),
+            retrieve=extend_schema(
+                summary="Belirli Bir Uçak Modelinin Detayını Getir",
+                description="Verilen ID'ye sahip uçak modelinin detaylarını döndürür.",
+                parameters=[
+                    OpenApiParameter(name='id', description='Uçak modelinin unique IDsi.', required=True, type=OpenApiTypes.INT,
+                                     location=OpenApiParameter.PATH)
+                ],
+                responses={200: AircraftModelSerializer, 401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                           404: OpenApiResponse(description="Belirtilen ID ile uçak modeli bulunamadı.")}
+            ),
+        )
+        class AircraftModelViewSet(self.target_class):
+            pass
+
+        return AircraftModelViewSet
+
+
+class PartViewSetSchema(ViewSchemaExtension):
+    target_class = 'apps.envanter.views.PartViewSet'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Envanter - Parçalar"],
+            description="Sistemdeki üretilmiş bireysel parçaları yönetir. Parça oluşturma, listeleme, detay görme, "
+                        "güncelleme (kısıtlı), geri dönüşüme gönderme ve silme (sadece admin) işlemlerini içerir. "
+                        "Bu endpoint, jQuery DataTables server-side processing ile uyumludur."  # DataTables notu eklendi
+        )
+        @extend_schema_view(
+            create=extend_schema(
+                summary="Yeni Parça Üret (Oluştur)",
+                description="Yeni bir parça oluşturur. Sadece sorumlu üretim takımı tarafından çağrılabilir. "
+                            "Parçanın tipi, istek yapan takımın sorumlu olduğu parça tipiyle eşleşmelidir. "
+                            "Oluşturulan parça otomatik olarak 'STOKTA' durumunda ve üreten takıma bağlı olur. "
+                            "`aircraft_model_compatibility` alanı (ID olarak) zorunludur. "  # Ek bilgi
+                            "`serial_number` gönderilmezse sunucuda benzersiz bir seri numarası üretilir "
+                            "(biçim: `PART_SERIAL_NUMBER_FORMAT` ayarı).",
+                request=PartSerializer,
+                responses={
+                    201: PartSerializer,
+                    400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok.")
+                }
+            ),
+            list=extend_schema(
+                summary="Tüm Parçaları Listele",
+                description="Sistemdeki tüm parçaların sayfalanmış bir listesini döndürür. "
+                            "Standart DRF filtreleme parametrelerinin yanı sıra (aşağıda listelenmiştir), "
+                            "jQuery DataTables server-side processing için gerekli olan "
+                            "`draw`, `start`, `length`, `search[value]`, `order[][column/dir]` gibi "
+                            "parametreleri de destekler. Yanıt formatı DataTables uyumludur.",
+                parameters=[
+                    OpenApiParameter(name='part_type', description='Parça tipine göre filtrele (ID).', type=OpenApiTypes.INT,
+                                     location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='status', description='Duruma göre filtrele (örn: STOKTA, KULLANILDI).',
+                                     type=OpenApiTypes.STR, location=OpenApiParameter.QUERY,
+                                     enum=[s[0] for s in Part.STATUS_CHOICES]),  # Enum eklendi
+                    OpenApiParameter(name='produced_by_team', description='Üreten takıma göre filtrele (ID).',
+                                     type=OpenApiTypes.INT, location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='aircraft_model_compatibility',
+                                     description='Uyumlu uçak modeline göre filtrele (ID).', type=OpenApiTypes.INT,
+                                     location=OpenApiParameter.QUERY),  # Güncellendi
+                    OpenApiParameter(name='serial_number', description='Seri numarasına göre tam eşleşme ile filtrele.',
+                                     type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='serial_number__icontains',
+                                     description='Seri numarasında geçen ifadeye göre (büyük/küçük harf duyarsız) filtrele.',
+                                     type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
+                    # DataTables'a özgü parametreler (draw, start, length vb.) genellikle otomatik algılanır veya
+                    # DataTables kullanıcıları tarafından bilinir, buraya eklemek şart değil.
+                ],
+                responses={  # DataTables yanıtı için inline_serializer kullanmak daha doğru olur
+                    200: inline_serializer(
+                        name='PartListDatatablesResponse',
+                        fields={
+                            'draw': serializers.IntegerField(),
+                            'recordsTotal': serializers.IntegerField(),
+                            'recordsFiltered': serializers.IntegerField(),
+                            'recordsTotalExact': serializers.BooleanField(
+                                help_text="False ise recordsTotal tahmini bir sayıdır."),
+                            'recordsFilteredExact': serializers.BooleanField(
+                                help_text="False ise recordsFiltered tahmini veya sınırlandırılmış bir sayıdır."),
+                            'data': PartSerializer(many=True)
+                        }
+                    ),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli.")
+                }
+            ),
+            retrieve=extend_schema(
+                summary="Belirli Bir Parçanın Detayını Getir",
+                description="Verilen ID'ye sahip parçanın detaylarını döndürür.",
+                parameters=[
+                    OpenApiParameter(name='id', description='Parçanın unique IDsi.', required=True, type=OpenApiTypes.INT,
+                                     location=OpenApiParameter.PATH)
+                ],
+                responses={200: PartSerializer, 401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                           404: OpenApiResponse(description="Parça bulunamadı.")}
+            ),
+            partial_update=extend_schema(
+                summary="Parçayı Güncelle (Kısmi)",
+                description="Bir parçanın belirli alanlarını günceller. Parça tipi veya temel uyumluluk "
+                            "gibi özellikler genellikle değiştirilemez (veya serializer'da read_only olmalıdır). "
+                            "İzinler, üreten takım ve sorumlu parça tipi ile kısıtlıdır.",
+                parameters=[IF_MATCH_PARAMETER],
+                request=PartSerializer,
+                responses={
+                    200: PartSerializer,
+                    400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok."),
+                    404: OpenApiResponse(description="Parça bulunamadı."),
+                    409: VERSION_CONFLICT_RESPONSE
+                }
+            ),
+            update=extend_schema(
+                summary="Parçayı Güncelle (Tam)",
+                description="Bir parçanın tüm yazılabilir alanlarını günceller. `partial_update` ile benzer kısıtlamalara ve validasyonlara tabidir.",
+                parameters=[IF_MATCH_PARAMETER],
+                request=PartSerializer,
+                responses={
+                    200: PartSerializer,
+                    400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok."),
+                    404: OpenApiResponse(description="Parça bulunamadı."),
+                    409: VERSION_CONFLICT_RESPONSE
+                }
+            ),
+            recycle=extend_schema(
+                summary="Parçayı Geri Dönüşüme Gönder",
+                description="Belirli bir parçanın durumunu 'GERI_DONUSUMDE' olarak ayarlar. "
+                            "Sadece parçayı üreten takım tarafından çağrılabilir. "
+                            "Kullanımda olan, zaten geri dönüşümde olan veya bir montajcının süresi dolmamış parça seti "
+                            "rezervasyonundaki parçalar için işlem yapılmaz.",
+                parameters=[IF_MATCH_PARAMETER],
+                request=None,
+                responses={
+                    200: inline_serializer(
+                        name='RecycleSuccessResponse',
+                        fields={'message': serializers.CharField()}
+                    ),
+                    400: OpenApiResponse(
+                        description="Parça kullanımda veya rezerve edilmiş olduğu için geri dönüşüme gönderilemiyor."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu parçayı geri dönüşüme gönderme yetkiniz yok."),
+                    404: OpenApiResponse(description="Parça bulunamadı."),
+                    409: VERSION_CONFLICT_RESPONSE
+                }
+            ),
+            bulk_recycle=bulk_action_schema(
+                summary="Parçaları Toplu Olarak Geri Dönüşüme Gönder",
+                description="Birden fazla parçayı geri dönüşüme gönderir. Tekil `recycle` ile aynı kurallar geçerlidir: "
+                            "Sadece üreten takım gönderebilir, kullanımdaki ve rezerve edilmiş parçalar gönderilemez. "
+                            "Filtre ile sadece kullanıcının takımının parçaları seçilir. Sonuç türleri: `recycled`, "
+                            "`already_recycled`, `in_use`, `reserved`, `forbidden`, `not_found`.",
+                not_found_description="Bulunamayan ID'ler `not_found` olarak döner.",
+            ),
+            part_history=extend_schema(
+                summary="Parça Geçmişi",
+                description="Parçanın tüm durum geçişlerini (üretim, uçağa takılma, sökülme, değişim, geri dönüşüm, "
+                            "silinme) zaman sırasıyla döndürür. Silinmiş veya arşivlenmiş parçaların geçmişi de döner.",
+                responses={
+                    200: PartEventSerializer(many=True),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    404: OpenApiResponse(description="Parça için kayıtlı geçmiş bulunamadı.")
+                }
+            ),
+            destroy=extend_schema(
+                summary="Parçayı Sil (Sadece Admin)",
+                description="Belirli bir parçayı veritabanından kalıcı olarak siler. Bu işlem sadece admin yetkisine "
+                            "sahip kullanıcılar tarafından yapılabilir. Normal kullanıcılar 'recycle' endpoint'ini kullanmalıdır.",
+                parameters=[IF_MATCH_PARAMETER],
+                request=None,
+                responses={
+                    204: OpenApiResponse(description="Parça başarıyla silindi (İçerik Yok)."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
+                    404: OpenApiResponse(description="Parça bulunamadı."),
+                    409: VERSION_CONFLICT_RESPONSE
+                }
+            ),
+        )
+        class PartViewSet(self.target_class):
+            pass
+
+        return PartViewSet
+
+
+class StockSnapshotViewSchema(ViewSchemaExtension):
+    target_class = 'apps.envanter.views.StockSnapshotView'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Envanter - Parçalar"],
+            summary="Belirli Bir Andaki Stok Durumu",
+            description="Verilen andaki parça sayılarını (duruma göre) ve stoktaki parçaları (parça tipi ve uçak "
+                        "modeline göre) döndürür. Sonuç, o andan önceki son kontrol noktasına aradaki parça "
+                        "olaylarının eklenmesiyle hesaplanır. Geçmiş, ilk kontrol noktasından itibaren tutulur.",
+            parameters=[StockSnapshotQuerySerializer],
+            responses={
+                200: inline_serializer(
+                    name='StockSnapshotResponse',
+                    fields={
+                        'at': serializers.DateTimeField(),
+                        'checkpoint_at': serializers.DateTimeField(),
+                        'by_status': serializers.DictField(child=serializers.IntegerField()),
+                        'in_stock': inline_serializer(
+                            name='StockSnapshotRow',
+                            fields={
+                                'part_type': serializers.CharField(),
+                                'aircraft_model': serializers.CharField(),
+                                'count': serializers.IntegerField(),
+                            },
+                            many=True
+                        ),
+                    }
+                ),
+                400: OpenApiResponse(description="Geçersiz tarih veya geçmişin tutulmadığı bir tarih."),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+            }
+        )
+        class StockSnapshotView(self.target_class):
+            pass
+
+        return StockSnapshotView
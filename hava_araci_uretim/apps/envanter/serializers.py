@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
 from apps.core.serializers import TimeStampedSerializer  # Import et
-from .models import PartType, AircraftModel, Part
+from .models import PartType, AircraftModel, Part, PartArchive, PartEvent
 
 
 class PartTypeSerializer(TimeStampedSerializer):
@@ -35,7 +35,7 @@ class PartSerializer(TimeStampedSerializer):
             'aircraft_model_compatibility', 'aircraft_model_compatibility_name',
             'produced_by_team', 'produced_by_team_name',
             'used_in_aircraft', 'used_in_aircraft_tail_number', 'status_display',
-            'created_at', 'updated_at'
+            'version', 'created_at', 'updated_at'
         ]
 
         # İş akışıyla değişen salt okunur alanlar
@@ -47,8 +47,17 @@ class PartSerializer(TimeStampedSerializer):
             'part_type_name',
             'aircraft_model_compatibility_name',
             'produced_by_team_name',
-            'used_in_aircraft_tail_number'
+            'used_in_aircraft_tail_number',
+            'version',
         ]
+        # Oluştururken gönderilmezse seri numarası sunucuda üretilir (bkz. apps.core.identifiers).
+        extra_kwargs = {'serial_number': {'required': False}}
+
+    def validate_serial_number(self, value):
+        # Arşive taşınan parçaların seri numaraları da tekrar kullanılamaz.
+        if PartArchive.objects.filter(serial_number=value).exists():
+            raise serializers.ValidationError("Bu seri numarası arşivlenmiş bir parçaya ait.")
+        return value
 
 
 class PartMiniSerializer(serializers.ModelSerializer):
@@ -68,3 +77,21 @@ class PartMiniSerializer(serializers.ModelSerializer):
             'status_display'
         ]
         read_only_fields = fields  # Tüm alanları salt okunur yapar
+
+
+class PartEventSerializer(serializers.ModelSerializer):
+    kind_display = serializers.CharField(source='get_kind_display', read_only=True)
+
+    class Meta:
+        model = PartEvent
+        fields = [
+            'id', 'occurred_at', 'kind', 'kind_display',
+            'from_status', 'to_status',
+            'aircraft_id', 'tail_number',
+        ]
+        read_only_fields = fields
+
+
+class StockSnapshotQuerySerializer(serializers.Serializer):
+    """Belirli bir andaki stok sorgusunun parametreleri."""
+    at = serializers.DateTimeField(input_formats=['iso-8601', '%Y-%m-%d'])
@@ -1,13 +1,24 @@
+import io
+from datetime import timedelta
 from unittest import TestCase
 
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import F, Sum
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from apps.envanter.models import Part
+from apps.analitik.models import ProductionRollup
+from apps.core.concurrency import VersionConflict
+from apps.envanter import history
+from apps.envanter.models import Part, PartArchive, PartEvent
 from apps.envanter.models import PartType
+from apps.montaj.models import AssembledAircraft
 from apps.uretim.factories import KanatTeamFactory, GovdeTeamFactory
 from apps.users.factories import UserFactory, AdminUserFactory
+from apps.users.models import AuthToken
 from .factories import PartTypeFactory, AircraftModelFactory, PartFactory
 
 
@@ -76,6 +87,33 @@ class PartTypeAPITest(APITestCase):
         self.assertEqual(response.data['name'], self.kanat_type.name)
         self.assertEqual(response.data['get_name_display'], self.kanat_type.get_name_display())
 
+    def test_async_list_part_types_matches_sync_list(self):
+        """Async parça tipi listesinin senkron ViewSet ile aynı sayfalanmış yanıtı döndürdüğünü test eder."""
+        token = AuthToken.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        sync_response = self.client.get(self.part_types_list_url)
+        async_response = self.client.get(reverse('async-parttype-list'))
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+
+    def test_async_list_aircraft_models_matches_sync_list(self):
+        """Async uçak modeli listesinin senkron ViewSet ile aynı yanıtı ve hata kodlarını döndürdüğünü test eder."""
+        AircraftModelFactory(name='TB2')
+        url = reverse('async-aircraftmodel-list')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        token = AuthToken.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        sync_response = self.client.get(reverse('aircraftmodel-list'))
+        async_response = self.client.get(url)
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+        self.assertEqual(self.client.get(reverse('aircraftmodel-list'), {'page': 99}).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url, {'page': 99}).status_code, status.HTTP_404_NOT_FOUND)
+
 
 class PartAPITest(APITestCase):
     """Part API endpoint'lerinin (CRUD, recycle) işlevlerini test eder."""
@@ -125,6 +163,18 @@ class PartAPITest(APITestCase):
         self.assertEqual(created_part.status, 'STOKTA')
         self.assertEqual(self.tb2_model, created_part.aircraft_model_compatibility)
 
+    def test_create_part_without_serial_number_allocates_one(self):
+        """Seri numarası gönderilmezse sunucunun tip ve modele göre benzersiz bir numara ürettiğini test eder."""
+        self.client.force_authenticate(user=self.kanat_team_user)
+        serial_numbers = []
+        for _ in range(2):
+            response = self.client.post(self.parts_list_url, self.part_data_kanat_tb2_template, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+            self.assertRegex(response.data['serial_number'], r'^KANAT-TB2-\d{7}$')
+            serial_numbers.append(response.data['serial_number'])
+        self.assertEqual(len(set(serial_numbers)), 2)
+        self.assertEqual(Part.objects.filter(serial_number__in=serial_numbers, produced_by_team=self.kanat_team).count(), 2)
+
     def test_recycle_part_by_producing_team(self):
         """Üreten takımın, stokta olan bir parçayı geri dönüşüme gönderebildiğini test eder."""
         self.client.force_authenticate(user=self.kanat_team_user)
@@ -218,4 +268,291 @@ class PartAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST,
                          f"Beklenen 400, Alınan {response.status_code}, Data: {response.data}")
         self.assertIn("part_type", response.data)
-        self.assertTrue(any(e.code == 'does_not_exist' for e in response.data['part_type']))
\ No newline at end of file
+        self.assertTrue(any(e.code == 'does_not_exist' for e in response.data['part_type']))
+
+    def test_async_part_detail_matches_sync_retrieve(self):
+        """Async parça detayının senkron `retrieve` ile aynı yanıtı ve hata kodlarını döndürdüğünü test eder."""
+        parts = {slot: PartFactory(part_type=PartType.objects.get_or_create(name=name)[0],
+                                   aircraft_model_compatibility=self.tb2_model, produced_by_team=self.kanat_team)
+                 for slot, name in AssembledAircraft.PART_SLOTS.items()}
+        AssembledAircraft.objects.create(aircraft_model=self.tb2_model, tail_number="TC-ASYNC-PART", **parts)
+        in_stock = PartFactory(part_type=self.kanat_pt, aircraft_model_compatibility=self.tb2_model,
+                               produced_by_team=None)
+        async_url = lambda pk: reverse('async-part-detail', kwargs={'pk': pk})
+        self.assertEqual(self.client.get(async_url(in_stock.pk)).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        token = AuthToken.objects.create(user=self.kanat_team_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        for part in (parts['wing'], in_stock):
+            sync_response = self.client.get(self.detail_url(part.pk))
+            async_response = self.client.get(async_url(part.pk))
+            self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+            self.assertEqual(async_response.json(), sync_response.json())
+        self.assertEqual(async_response.json()['used_in_aircraft_tail_number'], None)
+
+        self.assertEqual(self.client.get(self.detail_url(999999)).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(async_url(999999)).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PartArchiveTest(APITestCase):
+    """Soğuk parçaların arşive taşınması testleri."""
+
+    def setUp(self):
+        self.kanat_pt = PartTypeFactory(name='KANAT')
+        self.tb2_model = AircraftModelFactory(name='TB2')
+        self.old = timezone.now() - timedelta(days=200)
+
+    def create_part(self, status, updated_at):
+        part = PartFactory(part_type=self.kanat_pt, aircraft_model_compatibility=self.tb2_model, status=status)
+        Part.objects.filter(pk=part.pk).update(updated_at=updated_at)
+        return part
+
+    def test_only_old_recycled_parts_are_moved(self):
+        old_recycled = [self.create_part('GERI_DONUSUMDE', self.old) for _ in range(3)]
+        recent_recycled = self.create_part('GERI_DONUSUMDE', timezone.now())
+        in_stock = self.create_part('STOKTA', self.old)
+        production_rollup_total = ProductionRollup.objects.filter(grain='MONTH').aggregate(total=Sum('count'))
+
+        call_command('archive_parts', older_than_days=90, batch_size=2, stdout=io.StringIO())
+
+        self.assertFalse(Part.objects.filter(pk__in=[part.pk for part in old_recycled]).exists())
+        self.assertEqual(
+            set(PartArchive.objects.values_list('serial_number', flat=True)),
+            {part.serial_number for part in old_recycled}
+        )
+        self.assertEqual(Part.objects.filter(pk__in=[recent_recycled.pk, in_stock.pk]).count(), 2)
+        # Arşivleme üretim geçmişini değiştirmez.
+        self.assertEqual(ProductionRollup.objects.filter(grain='MONTH').aggregate(total=Sum('count')),
+                         production_rollup_total)
+
+    def test_archived_serial_number_cannot_be_reused(self):
+        archived = self.create_part('GERI_DONUSUMDE', self.old)
+        call_command('archive_parts', stdout=io.StringIO())
+
+        user = UserFactory()
+        user.profile.team = KanatTeamFactory()
+        user.profile.save()
+        self.client.force_authenticate(user=user)
+        response = self.client.post(reverse('part-list'), {
+            'part_type': self.kanat_pt.id, 'aircraft_model_compatibility': self.tb2_model.id,
+            'serial_number': archived.serial_number,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('serial_number', response.data)
+
+
+class PartHistoryTest(APITestCase):
+    """Parça geçmişi ve belirli bir andaki stok sorgusu testleri."""
+
+    def setUp(self):
+        self.kanat_pt = PartTypeFactory(name='KANAT')
+        self.tb2_model = AircraftModelFactory(name='TB2')
+        self.kanat_team = KanatTeamFactory()
+        self.user = UserFactory()
+        self.user.profile.team = self.kanat_team
+        self.user.profile.save()
+        self.client.force_authenticate(user=self.user)
+        self.snapshot_url = reverse('stock-snapshot')
+
+    def produce(self, serial_number):
+        response = self.client.post(reverse('part-list'), {
+            'part_type': self.kanat_pt.id, 'aircraft_model_compatibility': self.tb2_model.id,
+            'serial_number': serial_number,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        return response.data['id']
+
+    def in_stock(self, at):
+        response = self.client.get(self.snapshot_url, {'at': at.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return {(row['part_type'], row['aircraft_model']): row['count'] for row in response.data['in_stock']}, response
+
+    def test_production_and_recycling_are_recorded(self):
+        part_id = self.produce("SN-HIST-001")
+        self.client.post(reverse('part-recycle', kwargs={'pk': part_id}))
+
+        response = self.client.get(reverse('part-history', kwargs={'pk': part_id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(event['kind'], event['from_status'], event['to_status']) for event in response.data], [
+            ('PRODUCED', None, 'STOKTA'),
+            ('RECYCLED', 'STOKTA', 'GERI_DONUSUMDE'),
+        ])
+
+    def test_history_survives_part_deletion(self):
+        part_id = self.produce("SN-HIST-DEL")
+        Part.objects.get(pk=part_id).delete()
+
+        response = self.client.get(reverse('part-history', kwargs={'pk': part_id}))
+        self.assertEqual([event['kind'] for event in response.data], ['PRODUCED', 'DELETED'])
+
+    def test_stock_snapshot_at_past_time(self):
+        baseline = self.in_stock(timezone.now())[0].get(('KANAT', 'TB2'), 0)
+        self.produce("SN-SNAP-001")
+        recycled_id = self.produce("SN-SNAP-002")
+        before_recycle = timezone.now()
+        self.client.post(reverse('part-recycle', kwargs={'pk': recycled_id}))
+        self.produce("SN-SNAP-003")
+
+        stock, response = self.in_stock(before_recycle)
+        self.assertEqual(stock[('KANAT', 'TB2')], baseline + 2)
+        self.assertEqual(self.in_stock(timezone.now())[0][('KANAT', 'TB2')], baseline + 2)
+
+        # Kontrol noktası oluşturulduktan sonra aynı sonuç, daha az olay okunarak elde edilir.
+        checkpoint = history.create_checkpoint(at=before_recycle)
+        stock_after_checkpoint, response = self.in_stock(before_recycle)
+        self.assertEqual(response.data['checkpoint_at'], checkpoint.taken_at)
+        self.assertEqual(stock_after_checkpoint, stock)
+        self.assertEqual(self.in_stock(timezone.now())[0][('KANAT', 'TB2')], baseline + 2)
+
+    def test_stock_snapshot_before_history_is_rejected(self):
+        response = self.client.get(self.snapshot_url, {'at': '2000-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('at', response.data)
+
+    def test_archiving_does_not_change_history(self):
+        part_id = self.produce("SN-HIST-ARC")
+        self.client.post(reverse('part-recycle', kwargs={'pk': part_id}))
+        Part.objects.filter(pk=part_id).update(updated_at=timezone.now() - timedelta(days=200))
+        events_before = PartEvent.objects.count()
+
+        call_command('archive_parts', stdout=io.StringIO())
+        self.assertFalse(Part.objects.filter(pk=part_id).exists())
+        self.assertEqual(PartEvent.objects.count(), events_before)
+        response = self.client.get(self.snapshot_url, {'at': timezone.now().isoformat()})
+        self.assertGreaterEqual(response.data['by_status']['GERI_DONUSUMDE'], 1)
+
+
+class PartBulkRecycleTest(APITestCase):
+    """Toplu geri dönüşüm aksiyonu testleri."""
+
+    def setUp(self):
+        self.kanat_pt = PartTypeFactory(name='KANAT')
+        self.govde_pt = PartTypeFactory(name='GOVDE')
+        self.tb2_model = AircraftModelFactory(name='TB2')
+        self.kanat_team = KanatTeamFactory()
+        self.govde_team = GovdeTeamFactory()
+        self.user = UserFactory()
+        self.user.profile.team = self.kanat_team
+        self.user.profile.save()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('part-bulk-recycle')
+
+    def make_part(self, serial_number, team=None, part_status='STOKTA'):
+        team = team or self.kanat_team
+        return PartFactory(part_type=team.responsible_part_type, aircraft_model_compatibility=self.tb2_model,
+                           produced_by_team=team, status=part_status, serial_number=serial_number)
+
+    def test_bulk_recycle_by_ids_reports_each_part(self):
+        own = self.make_part("SN-BULK-OWN")
+        other_team = self.make_part("SN-BULK-OTHER", team=self.govde_team)
+        in_use = self.make_part("SN-BULK-USED", part_status='KULLANILDI')
+        recycled = self.make_part("SN-BULK-DONE", part_status='GERI_DONUSUMDE')
+
+        response = self.client.post(self.url, {'ids': [own.pk, other_team.pk, in_use.pk, recycled.pk, 999999, own.pk]},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        outcomes = {result['id']: result['outcome'] for result in response.data['results']}
+        self.assertEqual(outcomes, {
+            own.pk: 'recycled', other_team.pk: 'forbidden', in_use.pk: 'in_use',
+            recycled.pk: 'already_recycled', 999999: 'not_found',
+        })
+        self.assertEqual(response.data['summary']['recycled'], 1)
+
+        statuses = dict(Part.objects.filter(pk__in=outcomes).values_list('pk', 'status'))
+        self.assertEqual(statuses, {own.pk: 'GERI_DONUSUMDE', other_team.pk: 'STOKTA', in_use.pk: 'KULLANILDI',
+                                    recycled.pk: 'GERI_DONUSUMDE'})
+        event = PartEvent.objects.get(part_id=own.pk, kind='RECYCLED')
+        self.assertEqual((event.from_status, event.to_status), ('STOKTA', 'GERI_DONUSUMDE'))
+        self.assertFalse(PartEvent.objects.filter(part_id=other_team.pk, kind='RECYCLED').exists())
+
+    def test_bulk_recycle_by_filter_is_limited_to_own_team(self):
+        own_parts = [self.make_part(f"SN-BULK-F-{i}") for i in range(3)]
+        other_team = self.make_part("SN-BULK-F-OTHER", team=self.govde_team)
+
+        response = self.client.post(self.url, {'filter': {'status': 'STOKTA'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['summary'], {'recycled': 3})
+        self.assertEqual(sorted(result['id'] for result in response.data['results']), [part.pk for part in own_parts])
+        other_team.refresh_from_db()
+        self.assertEqual(other_team.status, 'STOKTA')
+
+    def test_bulk_recycle_rejects_invalid_requests(self):
+        for payload in ({}, {'ids': []}, {'ids': [1], 'filter': {'status': 'STOKTA'}}, {'filter': {'unknown': 1}},
+                        {'filter': {'status': ''}}):
+            response = self.client.post(self.url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, payload)
+
+    def test_bulk_recycle_requires_team(self):
+        self.client.force_authenticate(user=UserFactory())
+        response = self.client.post(self.url, {'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PartVersionTest(APITestCase):
+    """İyimser eşzamanlılık kontrolü (sürüm alanı, If-Match, 409) testleri."""
+
+    def setUp(self):
+        self.kanat_pt = PartTypeFactory(name='KANAT')
+        self.tb2_model = AircraftModelFactory(name='TB2')
+        self.kanat_team = KanatTeamFactory()
+        self.user = UserFactory()
+        self.user.profile.team = self.kanat_team
+        self.user.profile.save()
+        self.client.force_authenticate(user=self.user)
+        self.part = PartFactory(part_type=self.kanat_pt, aircraft_model_compatibility=self.tb2_model,
+                                produced_by_team=self.kanat_team, status='STOKTA', serial_number="SN-VER-001")
+        self.detail_url = reverse('part-detail', kwargs={'pk': self.part.pk})
+
+    def test_save_increments_version_and_rejects_stale_instance(self):
+        stale = Part.objects.get(pk=self.part.pk)
+        self.part.status = 'KULLANILDI'
+        self.part.save(update_fields=['status'])
+        self.assertEqual(self.part.version, 2)
+
+        stale.status = 'GERI_DONUSUMDE'
+        with self.assertRaises(VersionConflict), transaction.atomic():
+            stale.save(update_fields=['status', 'updated_at'])
+        self.part.refresh_from_db()
+        self.assertEqual((self.part.status, self.part.version), ('KULLANILDI', 2))
+
+    def test_retrieve_returns_etag_and_update_checks_if_match(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['ETag'], '"1"')
+        self.assertEqual(response.data['version'], 1)
+
+        response = self.client.patch(self.detail_url, {'serial_number': "SN-VER-002"}, format='json',
+                                     HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response['ETag'], '"2"')
+
+        response = self.client.patch(self.detail_url, {'serial_number': "SN-VER-003"}, format='json',
+                                     HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.part.refresh_from_db()
+        self.assertEqual(self.part.serial_number, "SN-VER-002")
+
+    def test_malformed_version_is_a_client_error(self):
+        for kwargs in ({'HTTP_IF_MATCH': 'abc'}, {'HTTP_IF_MATCH': 'W/"x"'}):
+            response = self.client.patch(self.detail_url, {'serial_number': "SN-VER-BAD"}, format='json', **kwargs)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, kwargs)
+            self.assertIn('If-Match', response.data)
+        response = self.client.patch(self.detail_url, {'serial_number': "SN-VER-BAD", 'version': 'abc'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('version', response.data)
+        self.part.refresh_from_db()
+        self.assertEqual((self.part.serial_number, self.part.version), ("SN-VER-001", 1))
+
+    def test_recycle_with_stale_version_is_rejected(self):
+        Part.objects.filter(pk=self.part.pk).update(status='KULLANILDI', version=F('version') + 1)
+        Part.objects.filter(pk=self.part.pk).update(status='STOKTA', version=F('version') + 1)
+
+        response = self.client.post(reverse('part-recycle', kwargs={'pk': self.part.pk}), {'version': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.part.refresh_from_db()
+        self.assertEqual(self.part.status, 'STOKTA')
+        self.assertFalse(PartEvent.objects.filter(part_id=self.part.pk, kind='RECYCLED').exists())
+
+    def test_bulk_recycle_increments_version(self):
+        self.client.post(reverse('part-bulk-recycle'), {'ids': [self.part.pk]}, format='json')
+        self.part.refresh_from_db()
+        self.assertEqual((self.part.status, self.part.version), ('GERI_DONUSUMDE', 2))
@@ -4,7 +4,8 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 # İlgili ViewSet'leri import ediyoruz:
-from .views import PartTypeViewSet, AircraftModelViewSet, PartViewSet
+from .views import PartTypeViewSet, AircraftModelViewSet, PartViewSet, StockSnapshotView
+from . import async_views
 
 router = DefaultRouter()
 
@@ -25,4 +26,13 @@ router.register(r'parts', PartViewSet, basename='part')
 urlpatterns = [
     # Router tarafından oluşturulan tüm URL'leri dahil et.
     path('', include(router.urls)),
+
+    # Parça geçmişinden hesaplanan, belirli bir andaki stok durumu.
+    path('stock-snapshot/', StockSnapshotView.as_view(), name='stock-snapshot'),
+
+    # ASGI modunda kullanılmak üzere async okuma endpoint'leri.
+    # Yanıtları yukarıdaki ViewSet'lerin list/retrieve yanıtlarıyla aynıdır.
+    path('async/part-types/', async_views.part_type_list, name='async-parttype-list'),
+    path('async/aircraft-models/', async_views.aircraft_model_list, name='async-aircraftmodel-list'),
+    path('async/parts/<int:pk>/', async_views.part_detail, name='async-part-detail'),
 ]
\ No newline at end of file
@@ -1,101 +1,41 @@
-from django.db.models import ProtectedError
+from django.db import transaction
+from django.db.models import F, ProtectedError, Q
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter, inline_serializer
-from rest_framework import viewsets, status, permissions, serializers
+from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
-from rest_framework_datatables.filters import DatatablesFilterBackend
-from rest_framework_datatables.pagination import DatatablesPageNumberPagination
+from rest_framework.views import APIView
 
+from apps.analitik import dashboard
+from apps.core import identifiers, reference_cache
+from apps.core.bulk import BulkActionMixin
+from apps.core.concurrency import OptimisticConcurrencyMixin
+from apps.core.datatables import DatatablesFilterBackend, EstimatedCountDatatablesPagination
 from apps.core.permissions import IsProductionTeamAndResponsibleForPartType, CanRecyclePart
-from .models import PartType, AircraftModel, Part
-from .serializers import PartTypeSerializer, AircraftModelSerializer, PartSerializer
+from apps.montaj.models import KitReservation
+from . import history
+from .filters import PartFilter
+from .models import PartType, AircraftModel, Part, PartEvent
+from .serializers import (
+    PartTypeSerializer, AircraftModelSerializer, PartSerializer, PartEventSerializer, StockSnapshotQuerySerializer
+)
 
+# OpenAPI dökümantasyonu (extend_schema tanımları) schema.py içindedir ve sadece şema üretilirken yüklenir.
 
-@extend_schema(
-    tags=["Envanter - Parça Tipleri"], # Swagger UI'da gruplama için etiket
-    description="Sistemde tanımlı olan parça tiplerini (Kanat, Gövde vb.) listeler ve detaylarını gösterir."
-)
-class PartTypeViewSet(viewsets.ReadOnlyModelViewSet):
-    """
-    Parça tiplerini (Kanat, Gövde vb.) listelemek ve detaylarını görmek için salt okunur ViewSet.
-    """
+RESERVED_MESSAGE = "Parça bir montajcı tarafından rezerve edilmiş, rezervasyon bitmeden geri dönüşüme gönderilemez."
 
-    queryset = PartType.objects.all().order_by('name')
-    serializer_class = PartTypeSerializer
-    permission_classes = [permissions.IsAuthenticated]
 
-    @extend_schema(
-        summary="Tüm Parça Tiplerini Listele",
-        description="Sistemdeki tüm parça tiplerinin sayfalanmış bir listesini döndürür.",
-        responses={
-            200: PartTypeSerializer(many=True),  # Başarılı yanıtın şeması
-            401: OpenApiResponse(
-                description="Kimlik doğrulaması gerekli (Authentication credentials were not provided).")
-        }
-    )
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Belirli Bir Parça Tipinin Detayını Getir",
-        description="Verilen ID'ye sahip parça tipinin detaylarını döndürür.",
-        parameters=[
-            OpenApiParameter(name='id', description='Parça tipinin unique IDsi.', required=True, type=OpenApiTypes.INT,
-                             location=OpenApiParameter.PATH)
-        ],
-        responses={
-            200: PartTypeSerializer(),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            404: OpenApiResponse(description="Belirtilen ID ile parça tipi bulunamadı.")
-        }
-    )
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
-
-
-@extend_schema(
-    tags=["Envanter - Uçak Modelleri"],
-    description="Sistemde tanımlı olan uçak modellerini (TB2, AKINCI vb.) listeler ve detaylarını gösterir."
-)
-class AircraftModelViewSet(viewsets.ReadOnlyModelViewSet):
-    """
-    Uçak modellerini (TB2, AKINCI vb.) listelemek ve detaylarını görmek için salt okunur ViewSet.
-    """
+def _live_reservations(reservation_ids, now=None):
+    """Verilen parça seti rezervasyonlarından süresi dolmamış olanların ID'leri."""
+    reservation_ids = [pk for pk in reservation_ids if pk is not None]
+    if not reservation_ids:
+        return set()
+    return set(KitReservation.objects.filter(pk__in=reservation_ids, expires_at__gt=now or timezone.now())
+               .values_list('pk', flat=True))
 
-    queryset = AircraftModel.objects.all().order_by('name')
-    serializer_class = AircraftModelSerializer
-    permission_classes = [permissions.IsAuthenticated]
 
-    @extend_schema(
-        summary="Tüm Uçak Modellerini Listele",
-        description="Sistemdeki tüm uçak modellerinin sayfalanmış bir listesini döndürür.",
-        responses={200: AircraftModelSerializer(many=True),
-                   401: OpenApiResponse(description="Kimlik doğrulaması gerekli.")}
-    )
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Belirli Bir Uçak Modelinin Detayını Getir",
-        description="Verilen ID'ye sahip uçak modelinin detaylarını döndürür.",
-        parameters=[
-            OpenApiParameter(name='id', description='Uçak modelinin unique IDsi.', required=True, type=OpenApiTypes.INT,
-                             location=OpenApiParameter.PATH)
-        ],
-        responses={200: AircraftModelSerializer(), 401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-                   404: OpenApiResponse(description="Belirtilen ID ile uçak modeli bulunamadı.")}
-    )
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
-
-
-@extend_schema(
-    tags=["Envanter - Parça Tipleri (Admin)"],  # Etiket güncellendi
-    description="Sistemde tanımlı olan parça tiplerini (Kanat, Gövde vb.) yönetir. CRUD işlemleri sadece admin yetkisine sahip kullanıcılar tarafından gerçekleştirilebilir."
-)
 class PartTypeViewSet(viewsets.ModelViewSet):  # ReadOnlyModelViewSet'ten ModelViewSet'e değiştirildi
     """
     Parça tiplerini yönetmek için ViewSet.
@@ -115,44 +55,6 @@ class PartTypeViewSet(viewsets.ModelViewSet):  # ReadOnlyModelViewSet'ten ModelV
         # list, retrieve için varsayılan (IsAuthenticated veya settings'ten gelen)
         return [permissions.IsAuthenticated()]
 
-        # @extend_schema tanımları create, update, destroy için eklenebilir.
-
-    # list ve retrieve için olanlar zaten vardı, güncellenebilir.
-
-    @extend_schema(summary="Yeni Parça Tipi Oluştur (Admin)", request=PartTypeSerializer,
-                   responses={201: PartTypeSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
-                              403: OpenApiResponse(description="Yetkiniz yok.")})
-    def create(self, request, *args, **kwargs):
-        return super().create(request, *args, **kwargs)
-
-    @extend_schema(summary="Tüm Parça Tiplerini Listele", responses={200: PartTypeSerializer(many=True)})
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-
-    @extend_schema(summary="Belirli Bir Parça Tipinin Detayını Getir",
-                   responses={200: PartTypeSerializer, 404: OpenApiResponse(description="Bulunamadı.")})
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
-
-    @extend_schema(summary="Parça Tipini Güncelle (Admin)", request=PartTypeSerializer,
-                   responses={200: PartTypeSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
-                              403: OpenApiResponse(description="Yetkiniz yok."),
-                              404: OpenApiResponse(description="Bulunamadı.")})
-    def update(self, request, *args, **kwargs):
-        return super().update(request, *args, **kwargs)
-
-    @extend_schema(summary="Parça Tipini Kısmen Güncelle (Admin)", request=PartTypeSerializer,
-                   responses={200: PartTypeSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
-                              403: OpenApiResponse(description="Yetkiniz yok."),
-                              404: OpenApiResponse(description="Bulunamadı.")})
-    def partial_update(self, request, *args, **kwargs):
-        return super().partial_update(request, *args, **kwargs)
-
-    @extend_schema(summary="Parça Tipini Sil (Admin)",
-                   responses={204: OpenApiResponse(description="Başarıyla silindi."),
-                              403: OpenApiResponse(description="Yetkiniz yok."),
-                              404: OpenApiResponse(description="Bulunamadı."), 409: OpenApiResponse(
-                           description="Bu parça tipi kullanıldığı için silinemiyor (PROTECT).")})
     def destroy(self, request, *args, **kwargs):
         # PartType.parts ilişkisi on_delete=PROTECT olduğu için, eğer bu tipte parçalar varsa
         # silme işlemi IntegrityError (ProtectedError) verecektir.
@@ -167,10 +69,7 @@ class PartTypeViewSet(viewsets.ModelViewSet):  # ReadOnlyModelViewSet'ten ModelV
                 status=status.HTTP_409_CONFLICT
             )
 
-@extend_schema(
-    tags=["Envanter - Uçak Modelleri"],
-    description="Sistemde tanımlı olan uçak modellerini (TB2, AKINCI vb.) listeler ve detaylarını gösterir."
-)
+
 class AircraftModelViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Uçak modellerini (TB2, AKINCI vb.) listelemek ve detaylarını görmek için salt okunur ViewSet.
@@ -180,36 +79,8 @@ class AircraftModelViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = AircraftModelSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    @extend_schema(
-        summary="Tüm Uçak Modellerini Listele",
-        description="Sistemdeki tüm uçak modellerinin sayfalanmış bir listesini döndürür.",
-        responses={200: AircraftModelSerializer(many=True),
-                   401: OpenApiResponse(description="Kimlik doğrulaması gerekli.")}
-    )
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Belirli Bir Uçak Modelinin Detayını Getir",
-        description="Verilen ID'ye sahip uçak modelinin detaylarını döndürür.",
-        parameters=[
-            OpenApiParameter(name='id', description='Uçak modelinin unique IDsi.', required=True, type=OpenApiTypes.INT,
-                             location=OpenApiParameter.PATH)
-        ],
-        responses={200: AircraftModelSerializer, 401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-                   404: OpenApiResponse(description="Belirtilen ID ile uçak modeli bulunamadı.")}
-    )
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
-
-
-@extend_schema(
-    tags=["Envanter - Parçalar"],
-    description="Sistemdeki üretilmiş bireysel parçaları yönetir. Parça oluşturma, listeleme, detay görme, "
-                "güncelleme (kısıtlı), geri dönüşüme gönderme ve silme (sadece admin) işlemlerini içerir. "
-                "Bu endpoint, jQuery DataTables server-side processing ile uyumludur."  # DataTables notu eklendi
-)
-class PartViewSet(viewsets.ModelViewSet):
+
+class PartViewSet(OptimisticConcurrencyMixin, BulkActionMixin, viewsets.ModelViewSet):
     """
     Üretilmiş parçaları yönetmek için ViewSet (CRUD işlemleri).
     İzinler ve bazı iş mantıkları `get_permissions()` ve `perform_create()` gibi
@@ -225,16 +96,14 @@ class PartViewSet(viewsets.ModelViewSet):
     serializer_class = PartSerializer
 
     # DataTables için güncellemeler
-    pagination_class = DatatablesPageNumberPagination
+    pagination_class = EstimatedCountDatatablesPagination
     filter_backends = [DatatablesFilterBackend, DjangoFilterBackend]
+    # Liste sayıları büyük sonuçlarda tahmin edilir (bkz. apps.core.datatables).
+    total_count_strategy = 'estimate'
+    count_strategy = 'estimate'
 
-    filterset_fields = {
-        'part_type': ['exact'],
-        'status': ['exact'],
-        'produced_by_team': ['exact'],
-        'aircraft_model_compatibility': ['exact'],  # ForeignKey için filtreleme
-        'serial_number': ['exact', 'icontains'],
-    }
+    filterset_class = PartFilter
+    versioned_actions = ('update', 'partial_update', 'destroy', 'recycle')
 
     def get_permissions(self):
         if self.action == 'create':
@@ -247,23 +116,6 @@ class PartViewSet(viewsets.ModelViewSet):
             return [permissions.IsAuthenticated(), CanRecyclePart()]
         return [permissions.IsAuthenticated()]
 
-    @extend_schema(
-        summary="Yeni Parça Üret (Oluştur)",
-        description="Yeni bir parça oluşturur. Sadece sorumlu üretim takımı tarafından çağrılabilir. "
-                    "Parçanın tipi, istek yapan takımın sorumlu olduğu parça tipiyle eşleşmelidir. "
-                    "Oluşturulan parça otomatik olarak 'STOKTA' durumunda ve üreten takıma bağlı olur. "
-                    "`aircraft_model_compatibility` alanı (ID olarak) zorunludur.",  # Ek bilgi
-        request=PartSerializer,
-        responses={
-            201: PartSerializer,
-            400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok.")
-        }
-    )
-    def create(self, request, *args, **kwargs):
-        return super().create(request, *args, **kwargs)
-
     def perform_create(self, serializer):
         user_team = self.request.user.profile.team
         part_type_requested = serializer.validated_data.get('part_type')
@@ -272,116 +124,17 @@ class PartViewSet(viewsets.ModelViewSet):
             raise PermissionDenied(
                 detail="Takımınız bu parça tipini üretemez veya bir üretim takımı değil."
             )
+        extra = {}
+        if 'serial_number' not in serializer.validated_data:  # Seri numarası gönderilmediyse sunucuda üretilir.
+            extra['serial_number'], = identifiers.part_serial_numbers(
+                part_type_requested, serializer.validated_data.get('aircraft_model_compatibility'), user_team
+            )
         serializer.save(
             produced_by_team=user_team,
-            status='STOKTA'
+            status='STOKTA',
+            **extra
         )
 
-    @extend_schema(
-        summary="Tüm Parçaları Listele",
-        description="Sistemdeki tüm parçaların sayfalanmış bir listesini döndürür. "
-                    "Standart DRF filtreleme parametrelerinin yanı sıra (aşağıda listelenmiştir), "
-                    "jQuery DataTables server-side processing için gerekli olan "
-                    "`draw`, `start`, `length`, `search[value]`, `order[][column/dir]` gibi "
-                    "parametreleri de destekler. Yanıt formatı DataTables uyumludur.",
-        parameters=[
-            OpenApiParameter(name='part_type', description='Parça tipine göre filtrele (ID).', type=OpenApiTypes.INT,
-                             location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='status', description='Duruma göre filtrele (örn: STOKTA, KULLANILDI).',
-                             type=OpenApiTypes.STR, location=OpenApiParameter.QUERY,
-                             enum=[s[0] for s in Part.STATUS_CHOICES]),  # Enum eklendi
-            OpenApiParameter(name='produced_by_team', description='Üreten takıma göre filtrele (ID).',
-                             type=OpenApiTypes.INT, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='aircraft_model_compatibility',
-                             description='Uyumlu uçak modeline göre filtrele (ID).', type=OpenApiTypes.INT,
-                             location=OpenApiParameter.QUERY),  # Güncellendi
-            OpenApiParameter(name='serial_number', description='Seri numarasına göre tam eşleşme ile filtrele.',
-                             type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='serial_number__icontains',
-                             description='Seri numarasında geçen ifadeye göre (büyük/küçük harf duyarsız) filtrele.',
-                             type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
-            # DataTables'a özgü parametreler (draw, start, length vb.) genellikle otomatik algılanır veya
-            # DataTables kullanıcıları tarafından bilinir, buraya eklemek şart değil.
-        ],
-        responses={  # DataTables yanıtı için inline_serializer kullanmak daha doğru olur
-            200: inline_serializer(
-                name='PartListDatatablesResponse',
-                fields={
-                    'draw': serializers.IntegerField(),
-                    'recordsTotal': serializers.IntegerField(),
-                    'recordsFiltered': serializers.IntegerField(),
-                    'data': PartSerializer(many=True)
-                }
-            ),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli.")
-        }
-    )
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Belirli Bir Parçanın Detayını Getir",
-        description="Verilen ID'ye sahip parçanın detaylarını döndürür.",
-        parameters=[
-            OpenApiParameter(name='id', description='Parçanın unique IDsi.', required=True, type=OpenApiTypes.INT,
-                             location=OpenApiParameter.PATH)
-        ],
-        responses={200: PartSerializer, 401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-                   404: OpenApiResponse(description="Parça bulunamadı.")}
-    )
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Parçayı Güncelle (Kısmi)",
-        description="Bir parçanın belirli alanlarını günceller. Parça tipi veya temel uyumluluk "
-                    "gibi özellikler genellikle değiştirilemez (veya serializer'da read_only olmalıdır). "
-                    "İzinler, üreten takım ve sorumlu parça tipi ile kısıtlıdır.",
-        request=PartSerializer,
-        responses={
-            200: PartSerializer,
-            400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok."),
-            404: OpenApiResponse(description="Parça bulunamadı.")
-        }
-    )
-    def partial_update(self, request, *args, **kwargs):
-        return super().partial_update(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Parçayı Güncelle (Tam)",
-        description="Bir parçanın tüm yazılabilir alanlarını günceller. `partial_update` ile benzer kısıtlamalara ve validasyonlara tabidir.",
-        request=PartSerializer,
-        responses={
-            200: PartSerializer,
-            400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok."),
-            404: OpenApiResponse(description="Parça bulunamadı.")
-        }
-    )
-    def update(self, request, *args, **kwargs):
-        return super().update(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Parçayı Geri Dönüşüme Gönder",
-        description="Belirli bir parçanın durumunu 'GERI_DONUSUMDE' olarak ayarlar. "
-                    "Sadece parçayı üreten takım tarafından çağrılabilir. "
-                    "Kullanımda olan veya zaten geri dönüşümde olan parçalar için işlem yapılmaz.",
-        request=None,
-        responses={
-            200: inline_serializer(
-                name='RecycleSuccessResponse',
-                fields={'message': serializers.CharField()}
-            ),
-            400: OpenApiResponse(
-                description="Parça kullanımda olduğu için geri dönüşüme gönderilemiyor veya zaten geri dönüşümde."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu parçayı geri dönüşüme gönderme yetkiniz yok."),
-            404: OpenApiResponse(description="Parça bulunamadı.")
-        }
-    )
     @action(detail=True, methods=['post'], url_path='recycle')
     def recycle(self, request, pk=None):
         part = self.get_object()
@@ -391,26 +144,120 @@ class PartViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST)
         if part.status == 'GERI_DONUSUMDE':
             return Response({"message": "Parça zaten geri dönüşümde."}, status=status.HTTP_200_OK)  # Veya 400
+        previous_status = part.status
         part.status = 'GERI_DONUSUMDE'
         part.used_in_aircraft = None
-        part.save(update_fields=['status', 'used_in_aircraft', 'updated_at'])
+        with transaction.atomic():
+            # Satır kilitlenir, eşzamanlı bir rezervasyon parçayı kontrolden sonra ayıramaz.
+            reservation_id = Part.objects.select_for_update().filter(pk=part.pk).values_list(
+                'reservation_id', flat=True).first()
+            if _live_reservations([reservation_id]):
+                return Response({"error": RESERVED_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
+            part.save(update_fields=['status', 'used_in_aircraft', 'updated_at'])
+            history.record([history.part_event(part, 'RECYCLED', previous_status)])
         return Response({"message": f"'{part.serial_number}' seri numaralı parça başarıyla geri dönüşüme gönderildi."},
                         status=status.HTTP_200_OK)
 
-    @extend_schema(
-        summary="Parçayı Sil (Sadece Admin)",
-        description="Belirli bir parçayı veritabanından kalıcı olarak siler. Bu işlem sadece admin yetkisine "
-                    "sahip kullanıcılar tarafından yapılabilir. Normal kullanıcılar 'recycle' endpoint'ini kullanmalıdır.",
-        request=None,
-        responses={
-            204: OpenApiResponse(description="Parça başarıyla silindi (İçerik Yok)."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
-            404: OpenApiResponse(description="Parça bulunamadı.")
-        }
-    )
-    def destroy(self, request, *args, **kwargs):
-        return super().destroy(request, *args, **kwargs)
+    @action(detail=False, methods=['post'], url_path='bulk-recycle', url_name='bulk-recycle')
+    def bulk_recycle(self, request):
+        """
+        Birden fazla parçayı (ID listesi veya filtre ile) geri dönüşüme gönderir. `recycle` ile aynı kurallar
+        (sadece üreten takım, kullanımdaki ve rezerve edilmiş parçalar gönderilemez) tüm parçalara birlikte
+        uygulanır ve geçiş tek bir koşullu UPDATE ile yapılır. Filtre ile sadece kullanıcının takımının parçaları
+        seçilir.
+        """
+        team = getattr(getattr(request.user, 'profile', None), 'team', None)
+        if team is None:
+            raise PermissionDenied(detail=CanRecyclePart.message)
+        targets, requested_ids = self.get_bulk_targets(Part.objects.all(), filter_scope=Q(produced_by_team=team))
+
+        outcomes = {}
+        with transaction.atomic():
+            now = timezone.now()
+            rows = list(targets.select_for_update().values(
+                'id', 'serial_number', 'status', 'produced_by_team_id', 'part_type_id', 'aircraft_model_compatibility_id',
+                'reservation_id'
+            ))
+            reserved = _live_reservations([row['reservation_id'] for row in rows], now)
+            recyclable = []
+            for row in rows:
+                if row['produced_by_team_id'] != team.pk:
+                    outcomes[row['id']] = ('forbidden', CanRecyclePart.message)
+                elif row['status'] == 'GERI_DONUSUMDE':
+                    outcomes[row['id']] = ('already_recycled', "Parça zaten geri dönüşümde.")
+                elif row['status'] == 'KULLANILDI':
+                    outcomes[row['id']] = ('in_use', "Kullanımda olan bir parça doğrudan geri dönüşüme gönderilemez. "
+                                                     "Önce uçaktan sökülmelidir.")
+                elif row['reservation_id'] in reserved:
+                    outcomes[row['id']] = ('reserved', RESERVED_MESSAGE)
+                else:
+                    recyclable.append(row)
+
+            Part.objects.filter(KitReservation.unreserved(now), pk__in=[row['id'] for row in recyclable],
+                                status='STOKTA', produced_by_team=team).update(
+                status='GERI_DONUSUMDE', used_in_aircraft=None, updated_at=now, version=F('version') + 1
+            )
+            events = []
+            for row in recyclable:
+                part = Part(id=row['id'], serial_number=row['serial_number'], status='GERI_DONUSUMDE',
+                            part_type_id=row['part_type_id'],
+                            aircraft_model_compatibility_id=row['aircraft_model_compatibility_id'])
+                events.append(history.part_event(part, 'RECYCLED', row['status'], occurred_at=now))
+                outcomes[row['id']] = ('recycled', f"'{row['serial_number']}' geri dönüşüme gönderildi.")
+            history.record(events)
+            if recyclable:
+                # QuerySet.update() sinyal göndermez.
+                transaction.on_commit(dashboard.invalidate)
+
+        return Response(self.bulk_response(outcomes, requested_ids, not_found_detail="Parça bulunamadı."))
+
+    @action(detail=True, methods=['get'], url_path='history', url_name='history')
+    def part_history(self, request, pk=None):
+        """
+        Parçanın tüm durum geçişlerini (hangi uçaklara takılıp söküldüğü dahil) zaman sırasıyla döndürür.
+        Silinmiş veya arşivlenmiş parçaların geçmişi de döner.
+        """
+        events = PartEvent.objects.filter(part_id=pk).order_by('occurred_at', 'id')
+        if not events.exists():
+            return Response({"error": "Bu parça için kayıtlı geçmiş bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(PartEventSerializer(events, many=True).data)
 
     def perform_destroy(self, instance):
-        instance.delete()
\ No newline at end of file
+        instance.delete()
+
+
+class StockSnapshotView(APIView):
+    """
+    Verilen andaki stok durumunu (duruma, parça tipine ve uçak modeline göre) parça geçmişinden hesaplar.
+    Ana parça tablosu okunmaz (bkz. apps.envanter.history).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        query_serializer = StockSnapshotQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        at = query_serializer.validated_data['at']
+
+        counts, checkpoint = history.stock_at(at)
+        if checkpoint is None:
+            return Response({"at": ["Parça geçmişi bu tarihten öncesi için tutulmuyor."]},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        part_types = {obj.pk: name for name, obj in reference_cache.get_part_types().items()}
+        aircraft_models = {obj.pk: name for name, obj in reference_cache.get_aircraft_models().items()}
+        by_status = {code: 0 for code, _label in Part.STATUS_CHOICES}
+        in_stock = []
+        for (part_status, part_type_id, aircraft_model_id), total in sorted(counts.items()):
+            by_status[part_status] = by_status.get(part_status, 0) + total
+            if part_status == 'STOKTA':
+                in_stock.append({
+                    'part_type': part_types.get(part_type_id),
+                    'aircraft_model': aircraft_models.get(aircraft_model_id),
+                    'count': total,
+                })
+        return Response({
+            'at': at,
+            'checkpoint_at': checkpoint.taken_at,
+            'by_status': by_status,
+            'in_stock': in_stock,
+        })
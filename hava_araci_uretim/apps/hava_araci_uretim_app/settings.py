@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
-from decouple import config
+from decouple import Choices, Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -25,15 +25,17 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = config("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = config("DEBUG", default=True, cast=bool)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = config("ALLOWED_HOSTS", default='', cast=Csv())
 
 
 # Application definition
 
+# Admin paneli kapatılırsa admin uygulaması ve tüm admin.py modülleri hiç yüklenmez.
+ADMIN_ENABLED = config("ADMIN_ENABLED", default=True, cast=bool)
+
 INSTALLED_APPS = [
-    'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -54,8 +56,13 @@ INSTALLED_APPS = [
     'apps.uretim.apps.UretimConfig',
     'apps.montaj.apps.MontajConfig',
     'apps.core.apps.CoreConfig',
+    'apps.analitik.apps.AnalitikConfig',
+    'apps.arama.apps.AramaConfig',
 ]
 
+if ADMIN_ENABLED:
+    INSTALLED_APPS.insert(0, 'django.contrib.admin')
+
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -120,13 +127,47 @@ DATABASES = {
         'PASSWORD': config("DATABASE_PASSWORD"),
         'HOST': config("DATABASE_HOST"),
         'PORT': config("DATABASE_PORT"),
+        'OPTIONS': {},
     }
 }
 
+# Veritabanı bağlantı modu:
+# - 'direct': Her istek için yeni bağlantı açılır (Django varsayılanı).
+# - 'persistent': Bağlantılar DB_CONN_MAX_AGE saniye boyunca istekler arasında yeniden kullanılır.
+# - 'pool': Her worker process'i içinde sınırlı boyutlu bir psycopg bağlantı havuzu kullanılır.
+DB_CONNECTION_MODE = config(
+    "DB_CONNECTION_MODE",
+    default='direct',
+    cast=Choices(['direct', 'persistent', 'pool'])
+)
+
+# Yeniden kullanılan bir bağlantı, istekten önce canlılık kontrolünden geçirilir.
+DATABASES['default']['CONN_HEALTH_CHECKS'] = config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool)
+
+if DB_CONNECTION_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = config("DB_CONN_MAX_AGE", default=600, cast=int)
+elif DB_CONNECTION_MODE == 'pool':
+    # Havuz modu kalıcı bağlantılarla (CONN_MAX_AGE) birlikte kullanılamaz, bağlantıları havuz yönetir.
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config("DB_POOL_MIN_SIZE", default=2, cast=int),
+        'max_size': config("DB_POOL_MAX_SIZE", default=4, cast=int),  # Process başına üst sınır
+        'timeout': config("DB_POOL_TIMEOUT", default=10, cast=float),  # Boş bağlantı bekleme süresi (sn)
+        'max_idle': config("DB_POOL_MAX_IDLE", default=300, cast=float),
+        'max_lifetime': config("DB_POOL_MAX_LIFETIME", default=3600, cast=float),
+    }
+
+# Sunucu taraflı prepared statement'lar: Aynı bağlantıda DB_PREPARE_THRESHOLD kez çalışan
+# sabit sorgular (örn: token doğrulama, parça tipi listesi) Postgres tarafında hazırlanır.
+# PgBouncer (transaction modu) arkasında kapalı tutulmalıdır.
+if config("DB_PREPARED_STATEMENTS", default=False, cast=bool):
+    DATABASES['default']['OPTIONS']['server_side_binding'] = True
+    DATABASES['default']['OPTIONS']['prepare_threshold'] = config("DB_PREPARE_THRESHOLD", default=5, cast=int)
+
 # DRF ayarları
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.users.authentication.ExpiringTokenAuthentication', # Süreli token'lar (bkz. apps.users.models.AuthToken)
         'rest_framework.authentication.SessionAuthentication', # Browsable API için
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -137,9 +178,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'], # Varsayılan filtre backend'i
 
-    'DEFAULT_THROTTLE_CLASSES': [ # Rate limit
-        'rest_framework.throttling.AnonRateThrottle', # Anonim kullanıcılar için
-        'rest_framework.throttling.UserRateThrottle'  # Giriş yapmış kullanıcılar için
+    'DEFAULT_THROTTLE_CLASSES': [ # Rate limit (tüm worker'lar için ortak, bkz. apps.core.throttling)
+        'apps.core.throttling.AnonRateThrottle', # Anonim kullanıcılar için
+        'apps.core.throttling.UserRateThrottle'  # Giriş yapmış kullanıcılar için
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',  # Anonim kullanıcılar saatte 100 istek
@@ -150,6 +191,69 @@ REST_FRAMEWORK = {
     }
 }
 
+# Rate limit durumunun tutulduğu yer:
+# - 'database': Tüm worker'lar için ortak token bucket tablosu (Postgres'te UNLOGGED).
+# - 'cache': DRF varsayılanı. Django cache'i (LocMem) kullanıldığı için limit process başınadır.
+THROTTLE_BACKEND = config("THROTTLE_BACKEND", default='database', cast=Choices(['database', 'cache']))
+# Rate limit tablosuna erişilemezse bu süre boyunca limit uygulanmaz (fail open).
+THROTTLE_FAIL_OPEN_SECONDS = config("THROTTLE_FAIL_OPEN_SECONDS", default=30, cast=int)
+
+# Dashboard özetinin (takım başına) önbellekte tutulma süresi (sn). Yazma işlemleri önbelleği hemen
+# geçersiz kılar. Bu süre, process'e özel önbellekte diğer worker'ların en fazla ne kadar eski veri göreceğidir.
+DASHBOARD_CACHE_TTL = config("DASHBOARD_CACHE_TTL", default=30, cast=int)
+
+# Stok tükenme tahmini (bkz. apps.analitik.forecast): Okunan tamamlanmış gün sayısı, hareketli ortalama
+# penceresi, üstel düzeltme katsayısı ve sonucun önbellekte tutulma süresi (sn).
+FORECAST_WINDOW_DAYS = config("FORECAST_WINDOW_DAYS", default=90, cast=int)
+FORECAST_MOVING_AVERAGE_DAYS = config("FORECAST_MOVING_AVERAGE_DAYS", default=14, cast=int)
+FORECAST_SMOOTHING_ALPHA = config("FORECAST_SMOOTHING_ALPHA", default=0.2, cast=float)
+FORECAST_CACHE_TTL = config("FORECAST_CACHE_TTL", default=300, cast=int)
+
+# Üretim hattı simülasyonu (bkz. apps.analitik.simulation): API isteğinde en fazla replikasyon sayısı ve
+# replikasyonların dağıtıldığı process sayısı. 1 ise istek kendi process'inde çalışır.
+SIMULATION_MAX_REPLICATIONS = config("SIMULATION_MAX_REPLICATIONS", default=20000, cast=int)
+SIMULATION_WORKERS = config("SIMULATION_WORKERS", default=1, cast=int)
+
+# CSV'den toplu kullanıcı oluşturma (bkz. apps.users.provisioning): API isteğinde en fazla satır sayısı ve
+# şifrelerin hash'lendiği process sayısı. 1 ise istek kendi process'inde çalışır.
+USER_PROVISIONING_MAX_ROWS = config("USER_PROVISIONING_MAX_ROWS", default=1000, cast=int)
+USER_PROVISIONING_WORKERS = config("USER_PROVISIONING_WORKERS", default=1, cast=int)
+
+# Giriş token'larının geçerlilik süresi (sn) ve yenilenen (rotate) token'ın eski anahtarının geçerli kaldığı süre.
+# Süresi dolan token'lar `purge_expired_tokens` komutuyla (örn: cron ile) silinir.
+AUTH_TOKEN_TTL = config("AUTH_TOKEN_TTL", default=7 * 24 * 60 * 60, cast=int)
+AUTH_TOKEN_ROTATION_GRACE = config("AUTH_TOKEN_ROTATION_GRACE", default=60, cast=int)
+
+# Girişte şifre doğrulamasının çalıştığı thread sayısı (process başına) ve aynı anda bekleyebilecek en fazla
+# doğrulama sayısı. Sınır doluysa giriş 503 ile reddedilir (bkz. apps.users.login).
+LOGIN_HASH_THREADS = config("LOGIN_HASH_THREADS", default=2, cast=int)
+LOGIN_HASH_QUEUE = config("LOGIN_HASH_QUEUE", default=32, cast=int)
+
+# Birleşik aramanın (/api/v1/search/) varsayılan sonuç sayısı (bkz. apps.arama.index).
+SEARCH_RESULT_LIMIT = config("SEARCH_RESULT_LIMIT", default=20, cast=int)
+
+# İstekte gönderilmeyen seri/kuyruk numaralarının sunucuda üretilme biçimi ve her process'in bir sorguda ayırdığı
+# numara sayısı (bkz. apps.core.identifiers). Biçimlerde `{number}`, `{aircraft_model}`, `{team}` ve seri
+# numarasında `{part_type}` kullanılabilir.
+PART_SERIAL_NUMBER_FORMAT = config("PART_SERIAL_NUMBER_FORMAT", default="{part_type}-{aircraft_model}-{number:07d}")
+TAIL_NUMBER_FORMAT = config("TAIL_NUMBER_FORMAT", default="TC-{aircraft_model}-{number:05d}")
+IDENTIFIER_BLOCK_SIZE = config("IDENTIFIER_BLOCK_SIZE", default=100, cast=int)
+
+# Montaj parça seti rezervasyonunun geçerlilik süresi (sn, bkz. apps.montaj.reservations). Süresi dolan
+# rezervasyonlar `release_expired_reservations` komutuyla (örn: cron ile) silinir.
+KIT_RESERVATION_TTL = config("KIT_RESERVATION_TTL", default=1800, cast=int)
+
+# Admin listelerinde tam sayılan en fazla satır sayısı. Daha büyük sonuçlar için PostgreSQL'in tahmini
+# kullanılır (bkz. apps.core.admin).
+ADMIN_EXACT_COUNT_LIMIT = config("ADMIN_EXACT_COUNT_LIMIT", default=10000, cast=int)
+
+# DataTables listelerinde (sayım stratejisi 'capped' veya 'estimate' olan view'ler) tam sayılan en fazla satır
+# sayısı (bkz. apps.core.datatables).
+DATATABLES_EXACT_COUNT_LIMIT = config("DATATABLES_EXACT_COUNT_LIMIT", default=10000, cast=int)
+
+# /api/v1/batch/ isteğinde en fazla kaç alt istek olabileceği (bkz. apps.core.batch).
+BATCH_MAX_REQUESTS = config("BATCH_MAX_REQUESTS", default=50, cast=int)
+
 
 
 # Password validation
@@ -180,9 +284,23 @@ SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 'SWAGGER_UI_SETTINGS': {
         "persistAuthorization": True,
-    }
+    },
+    # Uygulamaların schema.py modüllerini yükleyen generator (bkz. apps.core.schema)
+    'DEFAULT_GENERATOR_CLASS': 'apps.core.schema.SchemaGenerator',
+    # Parça durumları birden fazla alanda (status, from_status, to_status) kullanıldığı için isim sabitlenir.
+    'ENUM_NAME_OVERRIDES': {
+        'StatusEnum': 'apps.envanter.models.Part.STATUS_CHOICES',
+        'PartEventKindEnum': 'apps.envanter.models.PartEvent.KIND_CHOICES',
+    },
 }
 
+# Build sırasında `manage.py build_openapi_schema` ile üretilen sıkıştırılmış şema dosyası.
+# /api/v1/schema/ bu dosyayı bellekten sunar. Dosya yoksa şema sadece DEBUG modunda canlı üretilir.
+OPENAPI_SCHEMA_ARTIFACT = config(
+    "OPENAPI_SCHEMA_ARTIFACT",
+    default=str(BASE_DIR.parent / 'build' / f"openapi-{SPECTACULAR_SETTINGS['VERSION']}.json.gz")
+)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -1,18 +1,18 @@
 # hava_araci_uretim/hava_araci_uretim/urls.py
 
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
-# API dökümantasyonu (Swagger/OpenAPI) için drf-spectacular view'lerini import ediyoruz:
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+
+# API dökümantasyonu (Swagger/OpenAPI) view'leri drf-spectacular'ı import eder. Uygulama açılışını
+# yavaşlatmamaları için lazy_view ile bağlanırlar ve ilk istekte yüklenirler.
+from apps.core.batch import BatchView
+from apps.core.views import lazy_view
 
 # API endpoint'lerimiz için ortak bir ön ek tanımlıyoruz.
 # Bu, API versiyonlaması veya genel bir gruplama için kullanışlıdır.
 API_PREFIX = 'api/v1/' 
 
 urlpatterns = [
-    # Django admin paneli için URL:
-    path('admin/', admin.site.urls),
-
     # Şimdi uygulama seviyesindeki urls.py dosyalarını API_PREFIX altına dahil ediyoruz:
     # apps.envanter uygulamasının URL'lerini /api/v1/envanter/ altına bağlıyoruz.
     path(f'{API_PREFIX}envanter/', include('apps.envanter.urls')),
@@ -22,13 +22,28 @@ urlpatterns = [
     path(f'{API_PREFIX}users/', include('apps.users.urls')),
     # apps.montaj uygulamasının URL'lerini /api/v1/montaj/ altına bağlıyoruz.
     path(f'{API_PREFIX}montaj/', include('apps.montaj.urls')),
+    # apps.analitik uygulamasının URL'lerini /api/v1/analytics/ altına bağlıyoruz.
+    path(f'{API_PREFIX}analytics/', include('apps.analitik.urls')),
+    # Dashboard özeti: /api/v1/dashboard/summary/
+    path(f'{API_PREFIX}dashboard/', include('apps.analitik.dashboard_urls')),
+    path(f'{API_PREFIX}search/', include('apps.arama.urls')),
+    # Birden fazla isteği tek HTTP isteğiyle çalıştırır: /api/v1/batch/
+    path(f'{API_PREFIX}batch/', BatchView.as_view(), name='batch'),
 
     # API Schema ve Dökümantasyon URL'leri (drf-spectacular):
-    # API schema dosyasını (OpenAPI formatında) sunan endpoint:
-    path(f'{API_PREFIX}schema/', SpectacularAPIView.as_view(), name='schema'),
+    # API schema dosyasını (OpenAPI formatında) sunan endpoint.
+    # Şema build sırasında üretilir (`manage.py build_openapi_schema`) ve bellekten sunulur.
+    path(f'{API_PREFIX}schema/', lazy_view('apps.core.docs.CachedSpectacularAPIView'), name='schema'),
     # Swagger UI arayüzünü sunan endpoint:
     # url_name='schema' parametresi, Swagger UI'ın schema dosyasını nereden alacağını belirtir.
-    path(f'{API_PREFIX}schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path(f'{API_PREFIX}schema/swagger-ui/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'),
+         name='swagger-ui'),
     # ReDoc arayüzünü sunan endpoint:
-    path(f'{API_PREFIX}schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
-]
\ No newline at end of file
+    path(f'{API_PREFIX}schema/redoc/', lazy_view('drf_spectacular.views.SpectacularRedocView', url_name='schema'), name='redoc'),
+]
+
+# Django admin paneli için URL (ADMIN_ENABLED=False ise admin uygulaması hiç yüklenmez):
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
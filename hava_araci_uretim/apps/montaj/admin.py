@@ -1,23 +1,42 @@
 from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html
 
-from .models import AssembledAircraft
+from apps.core.admin import LargeTableAdmin, ReferenceFieldListFilter, reference_name
+from . import bom
+from .models import AssembledAircraft, KitReservation
 
 
 @admin.register(AssembledAircraft)
-class AssembledAircraftAdmin(admin.ModelAdmin):
+class AssembledAircraftAdmin(LargeTableAdmin):
+    """
+    Parça sütunları `Part.__str__` (parça tipi ve uçak modeli okur) yerine seri numaralarını gösterir.
+    Model ve takım adları referans önbelleğinden okunur. Arama kuyruk numarası önekiyle yapılır (unique index).
+    """
     list_display = (
         'tail_number',
-        'aircraft_model',
+        'aircraft_model_name',
         'assembly_date',
-        'assembled_by_team',
-        'wing',
-        'fuselage',
-        'tail',
-        'avionics'
+        'assembled_by_team_name',
+        'wing_serial_number',
+        'fuselage_serial_number',
+        'tail_serial_number',
+        'avionics_serial_number',
+        'parts_link',
     )
+    list_select_related = ('wing', 'fuselage', 'tail', 'avionics')
+    # Montaj tarihi oluşturulma sırasıyla aynıdır, sıralama PK index'i ile yapılır.
+    ordering = ('-pk',)
+    row_label_field = 'tail_number'
+    sortable_by = ('tail_number',)
 
-    list_filter = ('aircraft_model', 'assembly_date', 'assembled_by_team')
-    search_fields = ('tail_number', 'aircraft_model__name')
+    list_filter = (
+        ('aircraft_model', ReferenceFieldListFilter),
+        'assembly_date',
+        ('assembled_by_team', ReferenceFieldListFilter),
+    )
+    search_fields = ('tail_number__startswith',)
+    search_help_text = "Kuyruk numarasının başlangıcı ile arar."
     autocomplete_fields = [
         'aircraft_model',
         'assembled_by_team',
@@ -27,3 +46,46 @@ class AssembledAircraftAdmin(admin.ModelAdmin):
         'avionics'
     ]
     readonly_fields = ('assembly_date',)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change:  # Yeni uçağın dokümanı `save()` içinde yazılır.
+            bom.write(obj)
+
+    @admin.display(description="Uçak Modeli")
+    def aircraft_model_name(self, obj):
+        return reference_name('envanter.AircraftModel', obj.aircraft_model_id)
+
+    @admin.display(description="Montajı Yapan Takım")
+    def assembled_by_team_name(self, obj):
+        return reference_name('uretim.Team', obj.assembled_by_team_id)
+
+    @admin.display(description="Kanat")
+    def wing_serial_number(self, obj):
+        return obj.wing.serial_number
+
+    @admin.display(description="Gövde")
+    def fuselage_serial_number(self, obj):
+        return obj.fuselage.serial_number
+
+    @admin.display(description="Kuyruk")
+    def tail_serial_number(self, obj):
+        return obj.tail.serial_number
+
+    @admin.display(description="Aviyonik")
+    def avionics_serial_number(self, obj):
+        return obj.avionics.serial_number
+
+    @admin.display(description="Parçalar")
+    def parts_link(self, obj):
+        url = reverse('admin:envanter_part_changelist')
+        return format_html('<a href="{}?used_in_aircraft={}">Parçalar</a>', url, obj.pk)
+
+
+@admin.register(KitReservation)
+class KitReservationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'aircraft_model', 'reserved_by', 'expires_at', 'created_at')
+    list_filter = ('aircraft_model',)
+    search_fields = ('reserved_by__username',)
+    autocomplete_fields = ['reserved_by']
+    readonly_fields = ('created_at', 'updated_at')
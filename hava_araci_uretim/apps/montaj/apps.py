@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MontajConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.montaj'
+
+    def ready(self):
+        from . import bom
+        bom.connect_signals()
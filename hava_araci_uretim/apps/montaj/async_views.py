@@ -0,0 +1,77 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Count
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404
+
+from apps.core.async_views import async_api_view
+from apps.envanter.models import Part, AircraftModel, PartType
+from .models import AssembledAircraft, KitReservation
+from .serializers import AssembledAircraftSerializer, MissingPartsQuerySerializer
+
+
+@async_api_view
+async def assembled_aircraft_detail(request, pk):
+    """Monte edilmiş bir uçağın detayını döndürür. `AssembledAircraftViewSet.retrieve` ile aynı yanıtı döner."""
+    # Detaylar ürün ağacı dokümanından okunur (bkz. apps.montaj.bom), ilişkili tablolar okunmaz.
+    aircraft = await aget_object_or_404(AssembledAircraft, pk=pk)
+    serializer = AssembledAircraftSerializer(aircraft, context={'request': request})
+    if not aircraft.bom_document:  # İç içe serializer'lar ilişkili nesneleri senkron okur.
+        return JsonResponse(await sync_to_async(lambda: serializer.data)())
+    return JsonResponse(serializer.data)
+
+
+@async_api_view
+async def check_missing_parts(request):
+    """
+    `AssembledAircraftViewSet.check_missing_parts` aksiyonunun async karşılığı.
+    Parça tipi başına ayrı COUNT yerine stok adetleri tek bir gruplanmış sorguyla alınır.
+    """
+    query_serializer = MissingPartsQuerySerializer(data=request.GET)
+    if not query_serializer.is_valid():
+        return JsonResponse(query_serializer.errors, status=400)
+    aircraft_model_name = query_serializer.validated_data['aircraft_model_name']
+
+    try:
+        aircraft_model_instance = await AircraftModel.objects.aget(name=aircraft_model_name)
+    except AircraftModel.DoesNotExist:
+        return JsonResponse({"error": "Belirtilen uçak modeli bulunamadı."}, status=404)
+
+    required_part_type_names = ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK']
+    part_types_map = {pt.name: pt async for pt in PartType.objects.filter(name__in=required_part_type_names)}
+    stock_counts = {
+        row['part_type_id']: row['count'] async for row in Part.objects.filter(
+            KitReservation.available_to(request.user),
+            aircraft_model_compatibility=aircraft_model_instance,
+            part_type__name__in=required_part_type_names,
+            status='STOKTA'
+        ).values('part_type_id').annotate(count=Count('id'))
+    }
+
+    warnings = []
+    available_parts_summary = {}
+    for name_code in required_part_type_names:
+        pt = part_types_map.get(name_code)
+        if not pt:
+            warnings.append(f"Sistem konfigürasyon hatası: Tanımlı '{name_code}' parça tipi bulunamadı!")
+            available_parts_summary[name_code] = 0
+            continue
+
+        display_name_for_summary = pt.get_name_display()
+        count = stock_counts.get(pt.id, 0)
+        available_parts_summary[display_name_for_summary] = count
+        if count == 0:
+            warnings.append(
+                f"{aircraft_model_instance.get_name_display()} için {display_name_for_summary} parçası stokta bulunmamaktadır."
+            )
+
+    response_data = {
+        "aircraft_model": aircraft_model_instance.get_name_display(),
+        "required_parts_check": available_parts_summary,
+    }
+    if warnings:
+        response_data["warnings"] = warnings
+    else:
+        response_data[
+            "message"] = f"{aircraft_model_instance.get_name_display()} için tüm temel parçalardan en az birer adet stokta mevcut."
+
+    return JsonResponse(response_data)
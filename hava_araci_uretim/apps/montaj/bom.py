@@ -0,0 +1,171 @@
+"""
+Uçak ürün ağacı (BOM) dokümanları.
+
+Uçak detay/liste yanıtındaki model, takım ve dört parçanın detayları (`DETAIL_FIELDS`) her istekte 12 tabloyu
+birleştiren bir sorgu ve iç içe serializer'larla üretilmek yerine `AssembledAircraft.bom_document` alanında
+saklanır ve yanıta aynen konur (bkz. `AssembledAircraftSerializer.to_representation`). Uçaklar montajdan sonra
+nadiren değiştiği için doküman yazma anında üretilir:
+
+- Montajda (`AssembledAircraft.save()`) ve parça değişiminde (`AssembledAircraftSerializer.update`).
+- Uçaktaki bir parçanın, uçak modelinin, parça tipinin veya takımın kaydedilmesinde (sinyaller) etkilenen
+  uçaklar için. Admin panelinden yapılan uçak değişikliklerinde `AssembledAircraftAdmin.save_model`.
+
+Doküman ayrıca parçaların soy bilgisini (`parts`: slot, üreten takım, üretim haftası) içerir. "X takımının Y
+haftasında ürettiği parçaları içeren uçaklar" sorgusu (`traced()`) PostgreSQL'de dokümanın GIN index'i ile
+(`@>`, bkz. migrations/0005_assembledaircraft_bom_document.py) tek tabloda yapılır. Dokümanlar
+`manage.py rebuild_bom_documents` ile yeniden üretilebilir.
+"""
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+
+from django.apps import apps as global_apps
+from django.db import connection
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from apps.envanter.models import Part
+from apps.envanter.serializers import AircraftModelSerializer, PartMiniSerializer
+from apps.uretim.serializers import TeamNestedSerializer
+from .models import AssembledAircraft
+
+BATCH_SIZE = 500
+
+SLOTS = list(AssembledAircraft.PART_SLOTS)
+DETAIL_FIELDS = ('aircraft_model_details', 'assembled_by_team_details', *(f'{slot}_details' for slot in SLOTS))
+RELATED = ('aircraft_model', 'assembled_by_team',
+           *(f'{slot}__{field}' for slot in SLOTS for field in ('part_type', 'aircraft_model_compatibility')))
+
+# Parçanın dokümanda yer alan alanları. Sadece başka alanları güncelleyen kayıtlar dokümanı yazmaz.
+PART_FIELDS = {'serial_number', 'part_type', 'aircraft_model_compatibility', 'produced_by_team'}
+
+
+def production_week(moment):
+    """Üretim zamanının ISO haftası (örn: `2026-W07`), yerel saat dilimine göre."""
+    year, week, _weekday = timezone.localtime(moment).isocalendar()
+    return f'{year}-W{week:02d}'
+
+
+def _is_cached(instance, *fields):
+    return all(instance._meta.get_field(field).is_cached(instance) for field in fields)
+
+
+def _parts(aircraft):
+    """Slot -> parça. Tipi ve uyumlu modeliyle yüklenmemiş parçalar tek sorguda okunur."""
+    parts = {slot: getattr(aircraft, slot) for slot in SLOTS
+             if _is_cached(aircraft, slot) and _is_cached(getattr(aircraft, slot), 'part_type',
+                                                         'aircraft_model_compatibility')}
+    missing = {getattr(aircraft, f'{slot}_id'): slot for slot in SLOTS if slot not in parts}
+    if missing:
+        for part in Part.objects.select_related('part_type', 'aircraft_model_compatibility').filter(pk__in=missing):
+            parts[missing[part.pk]] = part
+            setattr(aircraft, missing[part.pk], part)
+    return parts
+
+
+def document(aircraft):
+    """Uçağın ürün ağacı dokümanı. Detay alanları `AssembledAircraftSerializer` yanıtıyla aynıdır."""
+    parts = _parts(aircraft)
+    team = aircraft.assembled_by_team
+    return {
+        'aircraft_model_details': AircraftModelSerializer(aircraft.aircraft_model).data,
+        'assembled_by_team_details': TeamNestedSerializer(team).data if team is not None else None,
+        **{f'{slot}_details': PartMiniSerializer(parts[slot]).data for slot in SLOTS},
+        'parts': [
+            {'slot': slot, 'id': parts[slot].pk, 'produced_by_team': parts[slot].produced_by_team_id,
+             'produced_week': production_week(parts[slot].created_at)}
+            for slot in SLOTS
+        ],
+    }
+
+
+def write(aircraft):
+    """Uçağın dokümanını üretir ve kaydeder (tek UPDATE). Uçak ve parçaları kaydedildikten sonra çağrılmalıdır."""
+    aircraft.bom_document = document(aircraft)
+    AssembledAircraft.objects.filter(pk=aircraft.pk).update(bom_document=aircraft.bom_document)
+
+
+def refresh(aircrafts):
+    """`aircrafts` (queryset) uçaklarının dokümanlarını toplu olarak yeniden üretir, uçak sayısını döndürür."""
+    model = aircrafts.model
+    rows = aircrafts.select_related(*RELATED).order_by('pk').iterator(chunk_size=BATCH_SIZE)
+    updated = 0
+    while batch := list(islice(rows, BATCH_SIZE)):
+        for aircraft in batch:
+            aircraft.bom_document = document(aircraft)
+        model.objects.bulk_update(batch, ['bom_document'])
+        updated += len(batch)
+    return updated
+
+
+def rebuild(apps=global_apps):
+    """
+    Tüm uçakların dokümanlarını yeniden üretir, uçak sayısını döndürür.
+    `apps`: Migration'lardan çağrılırken tarihsel model kayıt defteri.
+    """
+    return refresh(apps.get_model('montaj', 'AssembledAircraft').objects.all())
+
+
+def traced(queryset, produced_by_team=None, produced_week=None):
+    """
+    `queryset` uçaklarından, `produced_by_team` takımının `produced_week` (ISO yıl, hafta) haftasında ürettiği
+    en az bir parçayı içerenleri döndürür. Verilmeyen koşul uygulanmaz.
+    """
+    if produced_by_team is None and produced_week is None:
+        return queryset
+    if connection.vendor == 'postgresql':
+        part = {}
+        if produced_by_team is not None:
+            part['produced_by_team'] = produced_by_team
+        if produced_week is not None:
+            part['produced_week'] = '{}-W{:02d}'.format(*produced_week)
+        return queryset.filter(bom_document__contains={'parts': [part]})
+
+    # Diğer veritabanlarında (geliştirme, testler) parçalar üzerinden aranır.
+    parts = Q(used_in_aircraft__isnull=False)
+    if produced_by_team is not None:
+        parts &= Q(produced_by_team=produced_by_team)
+    if produced_week is not None:
+        start = timezone.make_aware(datetime.combine(date.fromisocalendar(*produced_week, 1), time.min))
+        parts &= Q(created_at__gte=start, created_at__lt=start + timedelta(days=7))
+    return queryset.filter(pk__in=Part.objects.filter(parts).values('used_in_aircraft'))
+
+
+def _changed(fields, update_fields):
+    return update_fields is None or any(field.removesuffix('_id') in fields for field in update_fields)
+
+
+def _part_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw and instance.used_in_aircraft_id and _changed(PART_FIELDS, update_fields):
+        refresh(AssembledAircraft.objects.filter(pk=instance.used_in_aircraft_id))
+
+
+def _part_type_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        used = Part.objects.filter(part_type=instance, used_in_aircraft__isnull=False).values('used_in_aircraft')
+        refresh(AssembledAircraft.objects.filter(pk__in=used))
+
+
+def _aircraft_model_saved(sender, instance, created, raw=False, **kwargs):
+    # Parçaların uyumlu olduğu model uçağın modeliyle aynıdır (bkz. AssembledAircraft).
+    if not created and not raw:
+        refresh(AssembledAircraft.objects.filter(aircraft_model=instance))
+
+
+def _team_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh(AssembledAircraft.objects.filter(assembled_by_team=instance))
+
+
+def _team_deleted(sender, instance, **kwargs):
+    # Uçakların takımı veritabanında (SET_NULL) boşaltıldı, dokümanlar eski takım ID'si ile bulunur.
+    refresh(AssembledAircraft.objects.filter(bom_document__assembled_by_team_details__id=instance.pk))
+
+
+def connect_signals():
+    post_save.connect(_part_saved, sender='envanter.Part', dispatch_uid='montaj_bom_part_saved')
+    post_save.connect(_part_type_saved, sender='envanter.PartType', dispatch_uid='montaj_bom_part_type_saved')
+    post_save.connect(_aircraft_model_saved, sender='envanter.AircraftModel',
+                      dispatch_uid='montaj_bom_aircraft_model_saved')
+    post_save.connect(_team_saved, sender='uretim.Team', dispatch_uid='montaj_bom_team_saved')
+    post_delete.connect(_team_deleted, sender='uretim.Team', dispatch_uid='montaj_bom_team_deleted')
@@ -0,0 +1,60 @@
+from datetime import date
+
+import django_filters
+from django import forms
+
+from . import bom
+from .models import AssembledAircraft
+
+
+class IsoWeekField(forms.RegexField):
+    """`2026-W07` biçimindeki ISO haftasını (yıl, hafta) olarak döndürür."""
+    default_error_messages = {'invalid': "Geçerli bir ISO haftası girin (örn: 2026-W07)."}
+
+    def __init__(self, **kwargs):
+        super().__init__(r'^\d{4}-W\d{2}$', **kwargs)
+
+    def clean(self, value):
+        value = super().clean(value)
+        if not value:
+            return None
+        year, week = int(value[:4]), int(value[6:])
+        try:
+            date.fromisocalendar(year, week, 1)
+        except ValueError:
+            raise forms.ValidationError(self.error_messages['invalid'], code='invalid')
+        return year, week
+
+
+class IsoWeekFilter(django_filters.CharFilter):
+    field_class = IsoWeekField
+
+
+class AssembledAircraftFilter(django_filters.FilterSet):
+    """
+    Uçak listesi filtreleri. `part_produced_by_team` ve `part_produced_week` soy (traceability) filtreleridir:
+    Verilen takımın verilen haftada ürettiği en az bir parçayı içeren uçakları döndürür (bkz. apps.montaj.bom).
+    İkisi birlikte verilirse aynı parça için aranır.
+    """
+    part_produced_by_team = django_filters.NumberFilter(method='filter_genealogy',
+                                                        label="Parçayı üreten takım (ID)")
+    part_produced_week = IsoWeekFilter(method='filter_genealogy', label="Parçanın üretim haftası (örn: 2026-W07)")
+
+    class Meta:
+        model = AssembledAircraft
+        fields = {
+            'aircraft_model': ['exact'],
+            'assembled_by_team': ['exact'],
+            'tail_number': ['icontains'],
+            'assembly_date': ['exact', 'gte', 'lte', 'range']
+        }
+
+    def filter_genealogy(self, queryset, name, value):
+        # İki filtre tek koşul olarak `filter_queryset` içinde uygulanır.
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        team = self.form.cleaned_data.get('part_produced_by_team')
+        return bom.traced(queryset, produced_by_team=int(team) if team is not None else None,
+                          produced_week=self.form.cleaned_data.get('part_produced_week'))
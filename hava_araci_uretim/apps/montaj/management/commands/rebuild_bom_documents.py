@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.montaj.bom import rebuild
+
+
+class Command(BaseCommand):
+    help = ("Monte edilmiş uçakların ürün ağacı (BOM) dokümanlarını uçak ve parça tablolarından yeniden üretir "
+            "(toplu veri yükleme veya onarım için).")
+
+    def handle(self, *args, **options):
+        updated = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{updated} uçağın ürün ağacı dokümanı güncellendi."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.montaj.reservations import release_expired
+
+
+class Command(BaseCommand):
+    help = ("Süresi dolmuş parça seti rezervasyonlarını siler ve parçalarını serbest bırakır "
+            "(örn: cron ile birkaç dakikada bir çalıştırılabilir).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Her transaction'da silinen rezervasyon sayısı.")
+
+    def handle(self, *args, **options):
+        released = release_expired(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{released} süresi dolmuş rezervasyon silindi."))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('montaj', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assembledaircraft',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Sürüm'),
+        ),
+    ]
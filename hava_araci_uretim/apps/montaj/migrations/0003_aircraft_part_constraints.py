@@ -0,0 +1,109 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:11
+
+from django.db import migrations, models
+
+# Slot -> beklenen parça tipi (AssembledAircraft.PART_SLOTS ile aynı)
+SLOTS = {'wing': 'KANAT', 'fuselage': 'GOVDE', 'tail': 'KUYRUK', 'avionics': 'AVIYONIK'}
+SLOT_COLUMNS = ', '.join(f'{slot}_id' for slot in SLOTS)
+
+# Her slot için kontrol sırası ve hata adları (serializer bu adları alan hatalarına çevirir):
+# aircraft_<slot>_exists, aircraft_<slot>_part_type, aircraft_<slot>_aircraft_model, aircraft_<slot>_in_stock
+# Tip ve model uyumu slot veya uçağın modeli değiştiğinde, stok durumu sadece parça yeni atandığında kontrol edilir.
+
+
+def _postgresql_statements():
+    checks = []
+    for slot, part_type in SLOTS.items():
+        assigned = f"TG_OP = 'INSERT' OR NEW.{slot}_id IS DISTINCT FROM OLD.{slot}_id"
+        checks.append(f"""
+    IF {assigned} OR NEW.aircraft_model_id IS DISTINCT FROM OLD.aircraft_model_id THEN
+        -- Satır kilitlenir, böylece eşzamanlı bir geri dönüşüm veya montaj parçayı bu arada değiştiremez.
+        SELECT p.status, p.aircraft_model_compatibility_id, t.name AS part_type INTO part
+        FROM envanter_part p JOIN envanter_parttype t ON t.id = p.part_type_id
+        WHERE p.id = NEW.{slot}_id FOR UPDATE OF p;
+        IF NOT FOUND THEN
+            RAISE EXCEPTION 'aircraft_{slot}_exists' USING ERRCODE = 'foreign_key_violation';
+        ELSIF part.part_type <> '{part_type}' THEN
+            RAISE EXCEPTION 'aircraft_{slot}_part_type' USING ERRCODE = 'check_violation';
+        ELSIF part.aircraft_model_compatibility_id IS DISTINCT FROM NEW.aircraft_model_id THEN
+            RAISE EXCEPTION 'aircraft_{slot}_aircraft_model' USING ERRCODE = 'check_violation';
+        ELSIF ({assigned}) AND part.status <> 'STOKTA' THEN
+            RAISE EXCEPTION 'aircraft_{slot}_in_stock' USING ERRCODE = 'check_violation';
+        END IF;
+    END IF;""")
+    return [
+        f"""
+CREATE FUNCTION montaj_check_aircraft_parts() RETURNS trigger AS $$
+DECLARE
+    part record;
+BEGIN{''.join(checks)}
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql""",
+        f"""
+CREATE TRIGGER montaj_aircraft_parts_check
+BEFORE INSERT OR UPDATE OF aircraft_model_id, {SLOT_COLUMNS} ON montaj_assembledaircraft
+FOR EACH ROW EXECUTE FUNCTION montaj_check_aircraft_parts()""",
+    ]
+
+
+def _sqlite_trigger(name, event, changed):
+    checks = []
+    for slot, part_type in SLOTS.items():
+        assigned = changed(f'NEW.{slot}_id IS NOT OLD.{slot}_id')
+        affected = changed(f'(NEW.{slot}_id IS NOT OLD.{slot}_id OR NEW.aircraft_model_id IS NOT OLD.aircraft_model_id)')
+        part = f'FROM envanter_part WHERE id = NEW.{slot}_id'
+        checks += [
+            f"SELECT RAISE(ABORT, 'aircraft_{slot}_exists') WHERE {affected} AND NOT EXISTS (SELECT 1 {part});",
+            f"SELECT RAISE(ABORT, 'aircraft_{slot}_part_type') WHERE {affected} AND "
+            f"(SELECT t.name FROM envanter_part p JOIN envanter_parttype t ON t.id = p.part_type_id "
+            f"WHERE p.id = NEW.{slot}_id) IS NOT '{part_type}';",
+            f"SELECT RAISE(ABORT, 'aircraft_{slot}_aircraft_model') WHERE {affected} AND "
+            f"(SELECT aircraft_model_compatibility_id {part}) IS NOT NEW.aircraft_model_id;",
+            f"SELECT RAISE(ABORT, 'aircraft_{slot}_in_stock') WHERE {assigned} AND (SELECT status {part}) IS NOT 'STOKTA';",
+        ]
+    body = '\n    '.join(checks)
+    return f"CREATE TRIGGER {name} BEFORE {event} ON montaj_assembledaircraft FOR EACH ROW BEGIN\n    {body}\nEND"
+
+
+def create_part_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = _postgresql_statements()
+    elif vendor == 'sqlite':
+        statements = [
+            _sqlite_trigger('montaj_aircraft_parts_insert', 'INSERT', lambda condition: '1'),
+            _sqlite_trigger('montaj_aircraft_parts_update', f'UPDATE OF aircraft_model_id, {SLOT_COLUMNS}',
+                            lambda condition: condition),
+        ]
+    else:
+        return  # Diğer veritabanlarında kurallar sadece uygulama tarafında kalır.
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_part_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP TRIGGER montaj_aircraft_parts_check ON montaj_assembledaircraft')
+        schema_editor.execute('DROP FUNCTION montaj_check_aircraft_parts()')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TRIGGER montaj_aircraft_parts_insert')
+        schema_editor.execute('DROP TRIGGER montaj_aircraft_parts_update')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('envanter', '0008_part_status_constraint'),
+        ('montaj', '0002_assembledaircraft_version'),
+        ('uretim', '0002_populate_initial_teams'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='assembledaircraft',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('wing', models.F('fuselage')), _negated=True), models.Q(('wing', models.F('tail')), _negated=True), models.Q(('wing', models.F('avionics')), _negated=True), models.Q(('fuselage', models.F('tail')), _negated=True), models.Q(('fuselage', models.F('avionics')), _negated=True), models.Q(('tail', models.F('avionics')), _negated=True)), name='aircraft_parts_distinct', violation_error_message='Bir uçak için aynı parça birden fazla rolde kullanılamaz.'),
+        ),
+        migrations.RunPython(create_part_triggers, drop_part_triggers),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('envanter', '0008_part_status_constraint'),
+        ('montaj', '0003_aircraft_part_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KitReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Bitiş Zamanı')),
+                ('aircraft_model', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='kit_reservations', to='envanter.aircraftmodel', verbose_name='Uçak Modeli')),
+                ('reserved_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='kit_reservations', to=settings.AUTH_USER_MODEL, verbose_name='Rezerve Eden')),
+            ],
+            options={
+                'verbose_name': 'Parça Seti Rezervasyonu',
+                'verbose_name_plural': 'Parça Seti Rezervasyonları',
+                'ordering': ['expires_at'],
+            },
+        ),
+    ]
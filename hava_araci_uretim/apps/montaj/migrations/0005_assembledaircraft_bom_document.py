@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+def create_bom_index(apps, schema_editor):
+    # `jsonb_path_ops`: Sadece `@>` (contains) sorgularını destekler, varsayılan operatör sınıfından küçüktür.
+    # Diğer veritabanlarında soy sorguları parçalar üzerinden yapılır (bkz. apps.montaj.bom.traced).
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX aircraft_bom_document_idx ON montaj_assembledaircraft '
+            'USING gin (bom_document jsonb_path_ops)'
+        )
+
+
+def drop_bom_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX aircraft_bom_document_idx')
+
+
+def backfill_documents(apps, schema_editor):
+    from apps.montaj.bom import rebuild
+    rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('envanter', '0009_part_reservation'),
+        ('montaj', '0004_kitreservation'),
+        ('uretim', '0003_aircraftorder_workorder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assembledaircraft',
+            name='bom_document',
+            field=models.JSONField(editable=False, null=True, verbose_name='Ürün Ağacı Dokümanı'),
+        ),
+        migrations.RunPython(create_bom_index, drop_bom_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,27 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 
-from apps.core.models import TimeStampedModel
+from apps.core.concurrency import VersionConflict
+from apps.core.models import TimeStampedModel, VersionedModel
+from apps.envanter import history
 from apps.envanter.models import AircraftModel, Part, PartType
 from apps.uretim.models import Team
 
 
-class AssembledAircraft(TimeStampedModel):
+class AssembledAircraft(TimeStampedModel, VersionedModel):
     """
     Monte edilmiş bir uçağı temsil eder.
+
+    Parça kuralları veritabanında da uygulanır (bkz. migrations/0003_aircraft_part_constraints.py):
+    Her slottaki parça doğru tipte, uçak modeliyle uyumlu ve (yeni atanıyorsa) stokta olmalıdır,
+    aynı parça birden fazla slotta kullanılamaz. İhlaller IntegrityError olarak döner.
     """
 
+    # Slot -> beklenen parça tipi
+    PART_SLOTS = {'wing': 'KANAT', 'fuselage': 'GOVDE', 'tail': 'KUYRUK', 'avionics': 'AVIYONIK'}
+
     aircraft_model = models.ForeignKey(
         AircraftModel,
         on_delete=models.PROTECT, # Montajı yapılmış bir uçak varken modeli silinmemeli
@@ -42,6 +54,10 @@ class AssembledAircraft(TimeStampedModel):
     tail = models.OneToOneField(Part, on_delete=models.PROTECT, related_name='used_as_tail_in', verbose_name="Kuyruk Parçası")
     avionics = models.OneToOneField(Part, on_delete=models.PROTECT, related_name='used_as_avionics_in', verbose_name="Aviyonik Parçası")
 
+    # Model, takım ve parça detaylarının ve parça soy bilgisinin anlık görüntüsü (bkz. apps.montaj.bom).
+    # Montajda yazılır. Sütun NULL olabilir, böylece eklenmesi SQLite'ta tabloyu (ve trigger'ları) yeniden oluşturmaz.
+    bom_document = models.JSONField(null=True, editable=False, verbose_name="Ürün Ağacı Dokümanı")
+
     def __str__(self):
         return f"{self.aircraft_model} - {self.tail_number} (Monte Edildi: {self.assembly_date})"
 
@@ -123,25 +139,150 @@ class AssembledAircraft(TimeStampedModel):
         if validation_errors:
             raise ValidationError(validation_errors)
 
-    def save(self, *args, **kwargs):
+    def validate_constraints(self, exclude=None):
+        # `aircraft_parts_distinct` clean() içinde aynı mesajla kontrol edilir, hata iki kez gösterilmez.
+        super().validate_constraints(exclude={*(exclude or ()), 'wing'})
+
+    def save(self, *args, reservation=None, **kwargs):
+        # `reservation`: Yeni uçakta kullanılan parçaları ayıran, montajla birlikte tüketilen KitReservation.
+        from . import bom
+
         is_new = self._state.adding
 
         # Model seviyesinde validasyon için eklenebilir
         #if is_new:
         #    self.full_clean()
 
-        super().save(*args, **kwargs)  # DB
+        with transaction.atomic():  # Uçak, parça durumları ve geçmiş birlikte kaydedilir
+            super().save(*args, **kwargs)  # DB (parça kuralları trigger ile kontrol edilir)
+
+            if is_new:  # Yeni bir uçak monte edildiğinde parçaları güncelle
+                history.record(self.attach_parts(self.PART_SLOTS, 'ASSEMBLED', reservation))
+                if reservation is not None:
+                    reservation.delete()  # Rezervasyon tüketilir, kullanılmayan rezerve parçalar serbest kalır.
+                bom.write(self)
+
+    def attach_parts(self, slots, kind, reservation=None):
+        """
+        Verilen slotlardaki parçaları bu uçağa bağlar (STOKTA -> KULLANILDI) ve geçmiş olaylarını (`kind`) döndürür.
+        Parçalar tek sorguda okunur ve tek koşullu UPDATE ile güncellenir. Uçak kaydedildikten sonra çağrılmalıdır.
+        Başka bir montajcının süresi dolmamış rezervasyonundaki parçalar (`reservation` dışında) bağlanamaz.
+        """
+        slot_by_part_id = {getattr(self, f'{slot}_id'): slot for slot in slots}
+        if not slot_by_part_id:
+            return []
+        now = timezone.now()
+        parts = Part.objects.select_related('part_type', 'aircraft_model_compatibility').in_bulk(list(slot_by_part_id))
+        free = KitReservation.unreserved(now)
+        if reservation is not None:
+            free |= Q(reservation=reservation)
+        updated = Part.objects.filter(free, pk__in=list(slot_by_part_id), status='STOKTA').update(
+            status='KULLANILDI', used_in_aircraft=self, reservation=None, updated_at=now, version=F('version') + 1
+        )
+        if updated != len(slot_by_part_id):
+            raise VersionConflict()
 
-        if is_new:  # Yeni bir uçak monte edildiğinde parçaları güncelle
-            parts_to_update = [self.wing, self.fuselage, self.tail, self.avionics]
-            for part in parts_to_update:
-                if part:  # Ekstra güvenlik
-                    part.status = 'KULLANILDI'
-                    part.used_in_aircraft = self  # Uçağa bağla
-                    part.save(update_fields=['status', 'used_in_aircraft',
-                                             'updated_at'])  # Sadece belirli alanları güncelle
+        events = []
+        for part_id, slot in slot_by_part_id.items():
+            part = parts[part_id]
+            previous_status = part.status
+            part.status, part.used_in_aircraft, part.updated_at, part.version = 'KULLANILDI', self, now, part.version + 1
+            part.reservation = None
+            setattr(self, slot, part)  # Yanıt üretilirken parça tekrar okunmaz
+            events.append(history.part_event(part, kind, previous_status, aircraft=self, occurred_at=now))
+        return events
+
+    def detach_parts(self, part_ids, kind):
+        """
+        Verilen parçaları bu uçaktan ayırır (KULLANILDI -> STOKTA) ve geçmiş olaylarını (`kind`) döndürür.
+        Parçalar tek sorguda okunur ve tek koşullu UPDATE ile güncellenir.
+        """
+        part_ids = list(part_ids)
+        if not part_ids:
+            return []
+        now = timezone.now()
+        parts = Part.objects.in_bulk(part_ids)
+        updated = Part.objects.filter(pk__in=part_ids, status='KULLANILDI').update(
+            status='STOKTA', used_in_aircraft=None, updated_at=now, version=F('version') + 1
+        )
+        if updated != len(part_ids):
+            raise VersionConflict()
+
+        events = []
+        for part in parts.values():
+            previous_status = part.status
+            part.status = 'STOKTA'
+            events.append(history.part_event(part, kind, previous_status, aircraft=self, occurred_at=now))
+        return events
 
     class Meta:
         verbose_name = "Monte Edilmiş Uçak"
         verbose_name_plural = "Monte Edilmiş Uçaklar"
-        ordering = ['-assembly_date']  # En son monte edilenler üstte
\ No newline at end of file
+        ordering = ['-assembly_date']  # En son monte edilenler üstte
+        constraints = [
+            models.CheckConstraint(
+                condition=(~Q(wing=F('fuselage')) & ~Q(wing=F('tail')) & ~Q(wing=F('avionics'))
+                           & ~Q(fuselage=F('tail')) & ~Q(fuselage=F('avionics')) & ~Q(tail=F('avionics'))),
+                name='aircraft_parts_distinct',
+                violation_error_message="Bir uçak için aynı parça birden fazla rolde kullanılamaz.",
+            ),
+        ]
+
+
+class KitReservation(TimeStampedModel):
+    """
+    Bir montajcının tezgahta planladığı uçak için ayırdığı parça seti (uçak modeliyle uyumlu, her parça
+    tipinden bir parça, bkz. apps.montaj.reservations).
+
+    Parçalar STOKTA kalır ve `Part.reservation` ile işaretlenir. Süresi dolmamış bir rezervasyondaki
+    parçalar başka montajcıların parça seçim listelerinde ve stok kapasitesi sayımlarında görünmez, başka
+    bir uçağa takılamaz. Süre `expires_at` ile sorgu anında kontrol edilir: Süresi dolan rezervasyonun
+    parçaları hemen tekrar kullanılabilir, satırlar `release_expired_reservations` komutuyla toplu silinir.
+    Rezervasyon montajda (`AssembledAircraftSerializer`, `reservation` alanı) tüketilir ve silinir.
+    """
+    aircraft_model = models.ForeignKey(
+        AircraftModel,
+        on_delete=models.PROTECT,
+        related_name='kit_reservations',
+        verbose_name="Uçak Modeli"
+    )
+    reserved_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='kit_reservations',
+        verbose_name="Rezerve Eden"
+    )
+    expires_at = models.DateTimeField(db_index=True, verbose_name="Bitiş Zamanı")
+
+    def __str__(self):
+        return f"{self.aircraft_model} - {self.reserved_by} ({self.expires_at:%Y-%m-%d %H:%M})"
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    @staticmethod
+    def reserved(now=None):
+        """Süresi dolmamış bir rezervasyondaki parçalar için `Part` filtresi."""
+        return Q(reservation__expires_at__gt=now or timezone.now())
+
+    @staticmethod
+    def unreserved(now=None):
+        """Rezerve edilmemiş veya rezervasyonunun süresi dolmuş parçalar için `Part` filtresi."""
+        return Q(reservation__isnull=True) | Q(reservation__expires_at__lte=now or timezone.now())
+
+    @staticmethod
+    def available_to(user, now=None):
+        """
+        `user` kullanıcısının montajda kullanabileceği parçalar için `Part` filtresi: Rezerve edilmemiş,
+        rezervasyonunun süresi dolmuş veya kullanıcının kendi rezervasyonundaki parçalar.
+        """
+        available = KitReservation.unreserved(now)
+        if user is not None and user.is_authenticated:
+            available |= Q(reservation__reserved_by=user)
+        return available
+
+    class Meta:
+        verbose_name = "Parça Seti Rezervasyonu"
+        verbose_name_plural = "Parça Seti Rezervasyonları"
+        ordering = ['expires_at']
@@ -0,0 +1,122 @@
+"""
+Montaj için parça seti rezervasyonları.
+
+Montajcı uçağı tezgahta planlarken `reserve_kit` ile modelle uyumlu, her parça tipinden bir stoktaki parçayı
+süreli olarak ayırır. Böylece montaj isteği gönderildiğinde seçilen parçaların bu arada başka bir montajda
+kullanılmış olması (409/400 ile geç fark edilen çakışma) önlenir.
+
+- Her parça tipi için en eski boştaki parça seçilir. Destekleyen veritabanlarında (PostgreSQL) satırlar
+  `SELECT ... FOR UPDATE SKIP LOCKED` ile kilitlenir, eşzamanlı rezervasyonlar birbirini beklemeden farklı
+  parçalar alır. Parçalar tek koşullu UPDATE ile işaretlenir. Koşul başka bir isteğin aynı parçayı arada
+  almasını da yakalar, bu durumda seçim RESERVE_ATTEMPTS kez tekrarlanır.
+- Rezervasyonun süresi sorgu anında `expires_at` ile kontrol edilir. Süresi dolmuş satırlar sadece yer kaplar,
+  `release_expired` (`manage.py release_expired_reservations`) bunları partiler halinde toplu siler.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from apps.analitik import dashboard
+from apps.core import reference_cache
+from apps.envanter.models import Part
+from .models import AssembledAircraft, KitReservation
+
+DEFAULT_TTL = 30 * 60
+RESERVE_ATTEMPTS = 3
+
+
+class KitUnavailable(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Bu uçak modeli için stokta rezerve edilebilecek tam bir parça seti yok."
+    default_code = 'kit_unavailable'
+
+    def __init__(self, missing_part_types=()):
+        super().__init__({'detail': self.default_detail, 'missing_part_types': list(missing_part_types)})
+
+
+class _PartTaken(Exception):
+    """Seçilen bir parça UPDATE'ten önce başka bir istek tarafından alındı."""
+
+
+def _pick_part(part_type, aircraft_model, now):
+    queryset = (
+        Part.objects
+        .filter(KitReservation.unreserved(now), status='STOKTA', part_type=part_type,
+                aircraft_model_compatibility=aircraft_model)
+        .order_by('created_at', 'id')
+    )
+    if connection.features.has_select_for_update_skip_locked:
+        # Rezervasyon tablosu LEFT JOIN ile okunduğu için sadece parça satırı kilitlenir.
+        queryset = queryset.select_for_update(skip_locked=True, of=('self',))
+    return queryset.values_list('id', flat=True).first()
+
+
+def _reserve(user, aircraft_model, ttl):
+    now = timezone.now()
+    part_types = reference_cache.get_part_types()
+    with transaction.atomic():
+        part_ids, missing = [], []
+        for part_type_name in AssembledAircraft.PART_SLOTS.values():
+            part_type = part_types.get(part_type_name)
+            part_id = _pick_part(part_type, aircraft_model, now) if part_type else None
+            if part_id is None:
+                missing.append(part_type_name)
+            else:
+                part_ids.append(part_id)
+        if missing:
+            raise KitUnavailable(missing)
+
+        reservation = KitReservation.objects.create(aircraft_model=aircraft_model, reserved_by=user,
+                                                    expires_at=now + timedelta(seconds=ttl))
+        updated = Part.objects.filter(KitReservation.unreserved(now), pk__in=part_ids, status='STOKTA').update(
+            reservation=reservation
+        )
+        if updated != len(part_ids):
+            raise _PartTaken()
+        transaction.on_commit(dashboard.invalidate)
+    return reservation
+
+
+def reserve_kit(user, aircraft_model, ttl=None):
+    """
+    `aircraft_model` için her parça tipinden bir parçayı `ttl` saniyeliğine (varsayılan: KIT_RESERVATION_TTL)
+    `user` adına rezerve eder. Tam set yoksa `KitUnavailable` (409) fırlatır.
+    """
+    if ttl is None:
+        ttl = getattr(settings, 'KIT_RESERVATION_TTL', DEFAULT_TTL)
+    for _attempt in range(RESERVE_ATTEMPTS):
+        try:
+            return _reserve(user, aircraft_model, ttl)
+        except _PartTaken:
+            continue
+    raise KitUnavailable()
+
+
+def release(reservation):
+    """Rezervasyonu siler, montajda kullanılmamış parçaları serbest kalır."""
+    with transaction.atomic():
+        reservation.delete()  # Part.reservation SET_NULL: Parçalar tek UPDATE ile serbest bırakılır.
+        transaction.on_commit(dashboard.invalidate)
+
+
+def release_expired(now=None, batch_size=1000):
+    """
+    Süresi dolmuş rezervasyonları partiler halinde siler. Her partide parçalar tek UPDATE ile serbest
+    bırakılır ve rezervasyonlar tek DELETE ile silinir. Silinen rezervasyon sayısını döndürür.
+    """
+    now = now or timezone.now()
+    total = 0
+    while True:
+        ids = list(KitReservation.objects.filter(expires_at__lte=now).order_by('id')
+                   .values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return total
+        with transaction.atomic():
+            KitReservation.objects.filter(pk__in=ids, expires_at__lte=now).delete()
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
@@ -0,0 +1,264 @@
+"""
+Montaj uygulaması view'lerinin OpenAPI dökümantasyonu.
+
+Sadece şema üretilirken yüklenir (bkz. apps.core.schema).
+"""
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiResponse, inline_serializer
+from rest_framework import serializers
+
+from apps.core.schema import IF_MATCH_PARAMETER, VERSION_CONFLICT_RESPONSE, ViewSchemaExtension, bulk_action_schema
+from apps.envanter.models import AircraftModel
+from .serializers import AssembledAircraftSerializer, KitReservationSerializer
+
+
+class AssembledAircraftViewSetSchema(ViewSchemaExtension):
+    target_class = 'apps.montaj.views.AssembledAircraftViewSet'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Montaj - Monte Edilmiş Uçaklar"],
+            description=(
+                    "Monte edilmiş uçakların yönetimi için ana endpoint.\n"
+                    "- **Oluşturma (POST):** Yeni bir uçak monte eder. Sadece Montaj Takımı erişebilir.\n"
+                    "- **Listeleme (GET):** Tüm monte edilmiş uçakları listeler. Kimliği doğrulanmış tüm kullanıcılar erişebilir.\n"
+                    "- **Detay (GET /id/):** Belirli bir uçağın detaylarını gösterir. Kimliği doğrulanmış tüm kullanıcılar erişebilir.\n"
+                    "- **Güncelleme (PUT/PATCH /id/):** Bir uçağın bilgilerini günceller (örn: kuyruk numarası). Sadece Montaj Takımı erişebilir.\n"
+                    "  Not: Uçağın parçalarını değiştirmek karmaşık bir işlemdir ve mevcut durumda sınırlı desteklenebilir.\n"
+                    "- **Silme (DELETE /id/):** Bir uçağı siler ve kullanılan parçaları stoğa döndürür. Sadece Montaj Takımı erişebilir.\n"
+                    "- **/check_missing_parts/ (GET):** Belirli bir uçak modeli için eksik parçaları kontrol eder."
+            )
+        )
+        @extend_schema_view(
+            create=extend_schema(
+                summary="Yeni Uçak Monte Et (Montaj Takımı)",
+                description=(
+                        "Verilen parçaları ve uçak modeli bilgilerini kullanarak yeni bir hava aracı monte eder. "
+                        "Bu işlem sadece 'Montaj Takımı' rolündeki kullanıcılar tarafından gerçekleştirilebilir.\n"
+                        "İstek body'sinde `aircraft_model` (ID), `tail_number` ve her bir ana parça (`wing`, `fuselage`, `tail`, `avionics`) için "
+                        "geçerli, stokta olan ve belirtilen uçak modeliyle uyumlu `Part` ID'leri gönderilmelidir. "
+                        "`tail_number` gönderilmezse sunucuda benzersiz bir kuyruk numarası üretilir "
+                        "(biçim: `TAIL_NUMBER_FORMAT` ayarı).\n"
+                        "Başarılı montaj sonrası, kullanılan parçaların durumu otomatik olarak 'KULLANILDI' olarak güncellenir "
+                        "ve `assembled_by_team` alanı isteği yapan kullanıcının takımı olarak ayarlanır.\n"
+                        "Başka bir montajcının rezerve ettiği parçalar kullanılamaz. Kullanıcının kendi rezervasyonu "
+                        "(`/kit-reservations/`) `reservation` alanı ile gönderilirse rezervasyon montajla birlikte silinir."
+                ),
+                request=AssembledAircraftSerializer,
+                responses={
+                    201: AssembledAircraftSerializer,
+                    400: OpenApiResponse(
+                        description="Geçersiz veri: Eksik veya yanlış parça bilgisi, parça uyumsuzluğu, stokta olmayan parça veya diğer validasyon hataları."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(
+                        description="Yetki hatası: Bu işlemi yapma yetkiniz yok (örn: Montaj Takımı üyesi değilsiniz).")
+                }
+            ),
+            list=extend_schema(
+                summary="Tüm Monte Edilmiş Uçakları Listele",
+                description=(
+                        "Sistemde kayıtlı tüm monte edilmiş uçakların sayfalanmış bir listesini döndürür.\n"
+                        "Bu endpoint, jQuery DataTables server-side processing ile uyumludur ve DataTables tarafından "
+                        "gönderilen `draw`, `start`, `length`, `search[value]`, `order[][column/dir]` gibi "
+                        "parametreleri destekler. Ayrıca, aşağıda listelenen standart filtre parametreleri de kullanılabilir."
+                ),
+                parameters=[  # filterset_fields için OpenApiParameter tanımları (isteğe bağlı, drf-spectacular algılayabilir)
+                    OpenApiParameter(name='aircraft_model', description='Uçak modeline göre filtrele (ID).',
+                                     type=OpenApiTypes.INT, location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='assembled_by_team', description='Montajı yapan takıma göre filtrele (ID).',
+                                     type=OpenApiTypes.INT, location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='tail_number__icontains',
+                                     description='Kuyruk numarasında geçen ifadeye göre (büyük/küçük harf duyarsız) filtrele.',
+                                     type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='assembly_date', description='Tam montaj tarihine göre filtrele (YYYY-AA-GG).',
+                                     type=OpenApiTypes.DATE, location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='assembly_date__gte',
+                                     description='Belirtilen tarihten itibaren (eşit ve büyük) monte edilmiş uçakları filtrele.',
+                                     type=OpenApiTypes.DATE, location=OpenApiParameter.QUERY),
+                    # ... diğer date filtreleri için de eklenebilir ...
+                ],
+                responses={
+                    200: inline_serializer(  # DataTables yanıtı için
+                        name='AssembledAircraftListDatatablesResponse',
+                        fields={
+                            'draw': serializers.IntegerField(),
+                            'recordsTotal': serializers.IntegerField(),
+                            'recordsFiltered': serializers.IntegerField(),
+                            'recordsTotalExact': serializers.BooleanField(
+                                help_text="False ise recordsTotal tahmini bir sayıdır."),
+                            'recordsFilteredExact': serializers.BooleanField(
+                                help_text="False ise recordsFiltered tahmini veya sınırlandırılmış bir sayıdır."),
+                            'data': AssembledAircraftSerializer(many=True)
+                        }
+                    ),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli.")
+                }
+            ),
+            retrieve=extend_schema(
+                summary="Belirli Bir Monte Edilmiş Uçağın Detayını Getir",
+                description="Verilen ID'ye sahip monte edilmiş uçağın tüm detaylarını döndürür.",
+                parameters=[
+                    OpenApiParameter(name='id', description='Monte edilmiş uçağın unique IDsi.', required=True,
+                                     type=OpenApiTypes.INT, location=OpenApiParameter.PATH)
+                ],
+                responses={
+                    200: AssembledAircraftSerializer,
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    404: OpenApiResponse(description="Belirtilen ID ile monte edilmiş uçak bulunamadı.")
+                }
+            ),
+            partial_update=extend_schema(
+                summary="Monte Edilmiş Uçağı Güncelle (Kısmi - Montaj Takımı)",
+                description=(
+                        "Bir monte edilmiş uçağın belirli alanlarını günceller. "
+                        "Bu işlem sadece 'Montaj Takımı' rolündeki kullanıcılar tarafından gerçekleştirilebilir.\n"
+                        "Genellikle sadece `tail_number` gibi parça olmayan alanların güncellenmesi beklenir. "
+                        "Uçağın parçalarının (`wing`, `fuselage` vb.) bu endpoint üzerinden değiştirilmesi, "
+                        "eski parçaların stoğa döndürülmesi ve yeni parçaların durumunun güncellenmesi gibi "
+                        "karmaşık iş mantıklarını tetikler (eğer `AssembledAircraftSerializer.update` metodu "
+                        "bu şekilde implemente edilmişse)."
+                ),
+                parameters=[IF_MATCH_PARAMETER],
+                request=AssembledAircraftSerializer,
+                responses={
+                    200: AssembledAircraftSerializer,
+                    400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Yetki hatası."),
+                    404: OpenApiResponse(description="Monte edilmiş uçak bulunamadı."),
+                    409: VERSION_CONFLICT_RESPONSE
+                }
+            ),
+            update=extend_schema(
+                summary="Monte Edilmiş Uçağı Güncelle (Tam - Montaj Takımı)",
+                description=(
+                        "Bir monte edilmiş uçağın tüm yazılabilir alanlarını günceller. "
+                        "`partial_update` ile benzer kısıtlamalara ve iş mantıklarına tabidir. "
+                        "Sadece 'Montaj Takımı' rolündeki kullanıcılar tarafından gerçekleştirilebilir."
+                ),
+                parameters=[IF_MATCH_PARAMETER],
+                request=AssembledAircraftSerializer,
+                responses={
+                    200: AssembledAircraftSerializer,
+                    400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Yetki hatası."),
+                    404: OpenApiResponse(description="Monte edilmiş uçak bulunamadı."),
+                    409: VERSION_CONFLICT_RESPONSE
+                }
+            ),
+            destroy=extend_schema(
+                summary="Monte Edilmiş Uçağı Sil (Montaj Takımı)",
+                description=(
+                        "Belirli bir monte edilmiş uçağı veritabanından siler. "
+                        "Bu işlem sadece 'Montaj Takımı' rolündeki kullanıcılar tarafından gerçekleştirilebilir.\n"
+                        "Silme işlemi sırasında, uçakta kullanılan ana parçalar (kanat, gövde, kuyruk, aviyonik) "
+                        "otomatik olarak 'STOKTA' durumuna geri döndürülür ve uçakla olan bağlantıları kaldırılır."
+                ),
+                parameters=[
+                    OpenApiParameter(name='id', description='Silinecek monte edilmiş uçağın unique IDsi.', required=True,
+                                     type=OpenApiTypes.INT, location=OpenApiParameter.PATH),
+                    IF_MATCH_PARAMETER,
+                ],
+                request=None,
+                responses={
+                    204: OpenApiResponse(description="Uçak başarıyla silindi (İçerik Yok)."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Yetki hatası."),
+                    404: OpenApiResponse(description="Monte edilmiş uçak bulunamadı."),
+                    409: VERSION_CONFLICT_RESPONSE
+                }
+            ),
+            bulk_disassemble=bulk_action_schema(
+                summary="Uçakları Toplu Olarak Sök ve Sil (Sadece Montaj Takımı)",
+                description="Birden fazla monte edilmiş uçağı siler ve parçalarını stoğa döndürür. "
+                            "Sonuç türleri: `disassembled`, `not_found`.",
+                not_found_description="Bulunamayan ID'ler `not_found` olarak döner.",
+            ),
+            check_missing_parts=extend_schema(
+                summary="Belirli Uçak Modeli İçin Eksik Parçaları Kontrol Et",
+                description=(
+                        "Verilen `aircraft_model_name` query parametresine göre, o uçak modeli için "
+                        "gerekli olan temel parçaların (Kanat, Gövde, Kuyruk, Aviyonik) envanterdeki "
+                        "stok durumunu ve eksik parçalar varsa uyarıları döndürür."
+                ),
+                parameters=[
+                    OpenApiParameter(
+                        name='aircraft_model_name',
+                        type=OpenApiTypes.STR,
+                        location=OpenApiParameter.QUERY,
+                        required=True,
+                        description='Stok durumu kontrol edilecek uçak modelinin adı.',
+                        enum=[choice[0] for choice in AircraftModel.AIRCRAFT_MODEL_CHOICES]
+                    )
+                ],
+                responses={
+                    200: inline_serializer(
+                        name='MissingPartsResponse',  # Yanıt şeması için açıklayıcı bir isim
+                        fields={
+                            'aircraft_model': serializers.CharField(help_text="Kontrol edilen uçak modelinin adı."),
+                            'required_parts_check': serializers.DictField(
+                                child=serializers.IntegerField(),
+                                help_text="Her bir temel parça tipi için stokta bulunan adet."
+                            ),
+                            'message': serializers.CharField(required=False,
+                                                             help_text="Genel durum mesajı (tüm parçalar varsa)."),
+                            'warnings': serializers.ListField(
+                                child=serializers.CharField(),
+                                required=False,
+                                help_text="Eksik parçalar veya sistem hataları için uyarı listesi."
+                            )
+                        }
+                    ),
+                    400: OpenApiResponse(description="Geçersiz veya eksik 'aircraft_model_name' parametresi."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    404: OpenApiResponse(description="Belirtilen uçak modeli sistemde bulunamadı.")
+                }
+            ),
+        )
+        class AssembledAircraftViewSet(self.target_class):
+            pass
+
+        return AssembledAircraftViewSet
+
+
+class KitReservationViewSetSchema(ViewSchemaExtension):
+    target_class = 'apps.montaj.views.KitReservationViewSet'
+
+    def build_replacement(self):
+        @extend_schema(tags=["Montaj - Parça Seti Rezervasyonları"])
+        @extend_schema_view(
+            create=extend_schema(
+                summary="Parça Seti Rezerve Et (Montaj Takımı)",
+                description=(
+                        "Verilen `aircraft_model` için her parça tipinden (Kanat, Gövde, Kuyruk, Aviyonik) stokta olan ve "
+                        "rezerve edilmemiş birer parçayı `KIT_RESERVATION_TTL` süresince isteği yapan kullanıcı adına ayırır. "
+                        "Rezerve parçalar diğer kullanıcıların parça listelerinde (`available=true`) ve stok kapasitesi "
+                        "sayımlarında görünmez. Montaj isteğinde `reservation` alanı ile gönderilen rezervasyon tüketilir."
+                ),
+                request=inline_serializer(name='KitReservationRequest',
+                                          fields={'aircraft_model': serializers.IntegerField()}),
+                responses={
+                    201: KitReservationSerializer,
+                    400: OpenApiResponse(description="Geçersiz veya eksik uçak modeli."),
+                    403: OpenApiResponse(description="Sadece Montaj Takımı üyeleri rezervasyon yapabilir."),
+                    409: inline_serializer(
+                        name='KitUnavailableResponse',
+                        fields={
+                            'detail': serializers.CharField(),
+                            'missing_part_types': serializers.ListField(child=serializers.CharField()),
+                        }
+                    ),
+                }
+            ),
+            list=extend_schema(summary="Süresi Dolmamış Rezervasyonlarım",
+                               description="Kullanıcının süresi dolmamış rezervasyonları (admin için tümü)."),
+            retrieve=extend_schema(summary="Rezervasyon Detayı"),
+            destroy=extend_schema(summary="Rezervasyonu İptal Et",
+                                  description="Rezervasyonu siler, parçaları tekrar kullanılabilir olur.",
+                                  responses={204: OpenApiResponse(description="Rezervasyon iptal edildi.")}),
+        )
+        class KitReservationViewSet(self.target_class):
+            pass
+
+        return KitReservationViewSet
@@ -1,10 +1,26 @@
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
 
+from apps.core.concurrency import VersionConflict
 from apps.core.serializers import TimeStampedSerializer
+from apps.envanter import history
 from apps.envanter.models import AircraftModel, Part, PartType
 from apps.envanter.serializers import AircraftModelSerializer, PartMiniSerializer
 from apps.uretim.serializers import TeamNestedSerializer
-from .models import AssembledAircraft
+from . import bom
+from .models import AssembledAircraft, KitReservation
+
+
+def _part_field(slot):
+    """Slotun parça ID alanı. Eksik veya boş parça için parça tipinin adıyla hata mesajı verir."""
+    name = dict(PartType.PART_TYPE_CHOICES)[AssembledAircraft.PART_SLOTS[slot]]
+    return serializers.IntegerField(source=f'{slot}_id', min_value=1, error_messages={
+        'required': f"{name} parçası seçilmelidir.",
+        'null': f"{name} parçası boş bırakılamaz.",
+    })
 
 
 class AssembledAircraftSerializer(TimeStampedSerializer):  # TimeStampedSerializer'dan miras alıyor, güzel.
@@ -27,10 +43,18 @@ class AssembledAircraftSerializer(TimeStampedSerializer):  # TimeStampedSerializ
     # ---- Yazılabilir İlişkili Alanlar (Writable Relational Fields) ----
     aircraft_model = serializers.PrimaryKeyRelatedField(queryset=AircraftModel.objects.all())
 
-    wing = serializers.PrimaryKeyRelatedField(queryset=Part.objects.filter(status='STOKTA'))
-    fuselage = serializers.PrimaryKeyRelatedField(queryset=Part.objects.filter(status='STOKTA'))
-    tail = serializers.PrimaryKeyRelatedField(queryset=Part.objects.filter(status='STOKTA'))
-    avionics = serializers.PrimaryKeyRelatedField(queryset=Part.objects.filter(status='STOKTA'))
+    # Parçalar okunmadan ID olarak yazılır. Tip, model uyumu ve stok kontrolü veritabanı tarafından
+    # yapılır ve ihlaller `constraint_errors()` ile alan hatalarına çevrilir.
+    wing = _part_field('wing')
+    fuselage = _part_field('fuselage')
+    tail = _part_field('tail')
+    avionics = _part_field('avionics')
+
+    # İsteği yapan kullanıcının parça seti rezervasyonu (bkz. apps.montaj.reservations). Verilirse bu
+    # rezervasyondaki parçalar kullanılabilir ve rezervasyon montajla birlikte silinir. Güncellemede sadece
+    # takılan parçalardan biri rezervasyondansa silinir.
+    reservation = serializers.PrimaryKeyRelatedField(queryset=KitReservation.objects.all(), required=False,
+                                                     write_only=True)
 
     class Meta:
         model = AssembledAircraft
@@ -43,7 +67,8 @@ class AssembledAircraftSerializer(TimeStampedSerializer):  # TimeStampedSerializ
             'avionics', 'avionics_details',
             'assembled_by_team', 'assembled_by_team_details',
             'assembly_date',  # Modelde auto_now_add=True
-            'created_at', 'updated_at'
+            'reservation',
+            'version', 'created_at', 'updated_at'
         ]
         read_only_fields = [
             'id',
@@ -53,149 +78,180 @@ class AssembledAircraftSerializer(TimeStampedSerializer):  # TimeStampedSerializ
             'assembled_by_team_details',
             'wing_details', 'fuselage_details',
             'tail_details', 'avionics_details',
+            'version',  # Her güncellemede artar (bkz. apps.core.concurrency)
         ]
+        # Kuyruk numarası tekrarı ön sorgu yerine unique constraint ile yakalanır. Montajda gönderilmezse kuyruk
+        # numarası sunucuda üretilir (bkz. apps.core.identifiers).
+        extra_kwargs = {'tail_number': {'validators': [], 'required': False}}
 
     def validate(self, data):
         """
-        Gelen verinin iş kurallarına göre validasyonunu yapar.
-        - Yeni uçak oluşturulurken tüm parçaların zorunlu olması.
-        - Parçaların benzersiz olması (aynı parça birden fazla rolde kullanılamaz).
-        - Seçilen parçaların doğru tipte olması.
-        - Seçilen parçaların hedeflenen uçak modeliyle uyumlu olması (ManyToManyField üzerinden).
-        - Seçilen parçaların (eğer yeni atanıyorsa) stokta olması.
+        Sorgu gerektirmeyen kontrolleri yapar: Aynı parça birden fazla rolde kullanılamaz.
+        Parçaların tipi, hedeflenen uçak modeliyle uyumu ve (yeni atanıyorsa) stokta olması
+        kayıt sırasında veritabanında kontrol edilir (bkz. `AssembledAircraft`).
         """
+        part_ids = [data.get(f'{slot}_id', getattr(self.instance, f'{slot}_id', None))
+                    for slot in AssembledAircraft.PART_SLOTS]
+        part_ids = [part_id for part_id in part_ids if part_id is not None]
+        if len(part_ids) != len(set(part_ids)):
+            raise serializers.ValidationError({"non_field_errors": ["Aynı parça birden fazla rolde kullanılamaz."]})
+
+        reservation = data.get('reservation')
+        if reservation is not None:
+            aircraft_model = data.get('aircraft_model', getattr(self.instance, 'aircraft_model', None))
+            if reservation.reserved_by_id != self.context['request'].user.pk:
+                raise serializers.ValidationError({"reservation": ["Bu rezervasyon size ait değil."]})
+            if reservation.is_expired:
+                raise serializers.ValidationError({"reservation": ["Rezervasyonun süresi dolmuş."]})
+            if reservation.aircraft_model_id != getattr(aircraft_model, 'pk', None):
+                raise serializers.ValidationError({"reservation": ["Rezervasyon farklı bir uçak modeli için yapılmış."]})
+        return data
 
-        is_creating = self.instance is None
-        aircraft_model_instance = data.get('aircraft_model', getattr(self.instance, 'aircraft_model', None))
-
-        if not aircraft_model_instance:
-            raise serializers.ValidationError({"aircraft_model": "Uçak modeli belirtilmelidir."})
-
-        part_field_definitions = {
-            'wing': {'expected_type_code': 'KANAT'}, 'fuselage': {'expected_type_code': 'GOVDE'},
-            'tail': {'expected_type_code': 'KUYRUK'}, 'avionics': {'expected_type_code': 'AVIYONIK'}
-        }
-        errors = {}
-
-        # Ön belleğe almak db yükünü azaltabilir.
-        # Constructora taşınabilir
-        _cached_part_types = {pt.name: pt for pt in PartType.objects.filter(
-            name__in=[d['expected_type_code'] for d in part_field_definitions.values()])}
-
-        if is_creating:
-            for field_name, defs in part_field_definitions.items():
-                if field_name not in data or not data[field_name]:
-                    expected_pt_obj = _cached_part_types.get(defs['expected_type_code'])
-                    pt_display_name = expected_pt_obj.get_name_display() if expected_pt_obj else defs[
-                        'expected_type_code']
-                    errors[field_name] = [f"{pt_display_name} parçası seçilmelidir."]
-            if errors:
-                raise serializers.ValidationError(errors)
-
-        parts_being_validated = {}
-        for field_name_loop in part_field_definitions.keys():
-            if field_name_loop in data:
-                if data[field_name_loop] is not None:
-                    parts_being_validated[field_name_loop] = data[field_name_loop]
-                elif not is_creating and not self.partial and data[field_name_loop] is None:
-                    expected_pt_obj = _cached_part_types.get(
-                        part_field_definitions[field_name_loop]['expected_type_code'])
-                    pt_display_name = expected_pt_obj.get_name_display() if expected_pt_obj else \
-                    part_field_definitions[field_name_loop]['expected_type_code']
-                    errors[field_name_loop] = [f"{pt_display_name} parçası boş bırakılamaz (PUT)."]
-
-        if not parts_being_validated and not is_creating and self.partial:
-            if errors: raise serializers.ValidationError(errors)
-            return data
-
-        part_ids = [p.id for p in parts_being_validated.values() if p]
-        if len(part_ids) > 1 and len(part_ids) != len(set(part_ids)):
-            errors.setdefault("non_field_errors", []).append("Aynı parça birden fazla rolde kullanılamaz.")
-
-        for field_name, part_instance in parts_being_validated.items():
-            if not part_instance: continue
-
-            expected_type_code = part_field_definitions[field_name]['expected_type_code']
-            field_specific_errors = errors.get(field_name, [])
-
-            expected_part_type_obj = _cached_part_types.get(expected_type_code)
-            if not expected_part_type_obj:  # Bu durum kritik bir sistem hatasıdır
-                errors.setdefault('configuration_error', []).append(
-                    f"Sistemde beklenen '{expected_type_code}' parça tipi bulunamadı.")
+    def to_representation(self, instance):
+        """
+        Detay alanları (`bom.DETAIL_FIELDS`) uçağın ürün ağacı dokümanından okunur, model, takım ve parça tabloları
+        okunmaz (bkz. apps.montaj.bom). Dokümanı olmayan uçaklar (örn: `bulk_create` ile eklenmiş) için iç içe
+        serializer'lar kullanılır.
+        """
+        document = instance.bom_document
+        if not document:
+            return super().to_representation(instance)
+        data = {}
+        for field in self._readable_fields:
+            if field.field_name in bom.DETAIL_FIELDS:
+                data[field.field_name] = document[field.field_name]
                 continue
-
-            expected_part_type_display_name = expected_part_type_obj.get_name_display()
-
-            if part_instance.part_type != expected_part_type_obj:
-                field_specific_errors.append(
-                    f"Seçilen {part_instance.serial_number} parçası, beklenen {expected_part_type_display_name} tipiyle uyuşmuyor."
-                )
-            elif part_instance.aircraft_model_compatibility != aircraft_model_instance:
-                field_specific_errors.append(
-                    f"{part_instance.serial_number} parçası, hedeflenen uçak modeli ({aircraft_model_instance.get_name_display()}) ile uyumlu değil."
-                )
-
-            is_newly_assigned_part = True
-            if not is_creating and self.instance:
-                if getattr(self.instance, field_name) == part_instance:
-                    is_newly_assigned_part = False
-
-            if is_newly_assigned_part and part_instance.status != 'STOKTA':
-                field_specific_errors.append(f"{part_instance.serial_number} parçası stokta değil, kullanılamaz.")
-
-            if field_specific_errors:
-                current_errors_for_field = errors.get(field_name, [])
-                for e in field_specific_errors:
-                    if e not in current_errors_for_field:
-                        current_errors_for_field.append(e)
-                if current_errors_for_field:
-                    errors[field_name] = current_errors_for_field
-
-        if errors:
-            raise serializers.ValidationError(errors)
+            attribute = field.get_attribute(instance)
+            data[field.field_name] = None if attribute is None else field.to_representation(attribute)
         return data
 
+    @contextmanager
+    def constraint_errors(self, aircraft):
+        """Kayıt sırasındaki constraint/trigger ihlallerini mevcut alan hata mesajlarına çevirir."""
+        try:
+            yield
+        except IntegrityError as exc:
+            errors = constraint_violation_errors(str(exc), aircraft)
+            if errors is None:
+                raise
+            raise serializers.ValidationError(errors) from exc
+
+    @contextmanager
+    def reservation_errors(self, aircraft, slots, reservation):
+        """
+        Parça bağlanamadıysa (`VersionConflict`), sebep parçanın başka bir montajcının rezervasyonunda olması
+        ise ilgili slot için alan hatası döndürür. Rezervasyonlar sadece hata durumunda okunur.
+        """
+        try:
+            yield
+        except VersionConflict:
+            slot_by_part_id = {getattr(aircraft, f'{slot}_id'): slot for slot in slots}
+            reserved = (Part.objects.filter(KitReservation.reserved(), pk__in=list(slot_by_part_id))
+                        .exclude(reservation=reservation).order_by('id').first())
+            if reserved is None:
+                raise
+            raise serializers.ValidationError({slot_by_part_id[reserved.pk]: [ErrorDetail(
+                f"{reserved.serial_number} parçası başka bir montajcı tarafından rezerve edilmiş.", code='reserved'
+            )]})
+
     def create(self, validated_data):
-        return super().create(validated_data)
+        reservation = validated_data.pop('reservation', None)
+        aircraft = AssembledAircraft(**validated_data)
+        with self.constraint_errors(aircraft), self.reservation_errors(aircraft, AssembledAircraft.PART_SLOTS,
+                                                                        reservation):
+            aircraft.save(reservation=reservation)
+        return aircraft
 
     def update(self, instance, validated_data):
+        reservation = validated_data.pop('reservation', None)
         # Eğer montajdan sonra parça değişimi kısıtlanacaksa parçalar update içerisinde read_only yapılabilir
+        # Sadece kuyruk numarası ve parçalar güncellenir.
         instance.tail_number = validated_data.get('tail_number', instance.tail_number)
-        part_fields = ['wing', 'fuselage', 'tail', 'avionics']
-        changed_parts_info = []
-
-        for field in part_fields:
-            old_part = getattr(instance, field)
-            if field in validated_data:  # Eğer bu parça alanı update isteğinde gönderilmişse
-                new_part = validated_data[field]
-                if old_part != new_part:
-                    setattr(instance, field, new_part)
-                    changed_parts_info.append({'field': field, 'old': old_part, 'new': new_part})
-
-        # Önce uçağın kendisini (tail_number ve yeni parça referanslarıyla) kaydet
-        instance.save()  # Bu, modelin save() metodunu çağırır, ama is_new=False olur.
-        # Dolayısıyla modelin save() metodu parça durumlarını GÜNCELLEMEZ.
-
-        # Şimdi değişen parçaların durumlarını yönet
-        for change in changed_parts_info:
-            new_part = change['new']
-            old_part = change['old']
-
-            if new_part:  # Yeni bir parça atanmışsa
-                if new_part.status == 'STOKTA':  # Sadece stoktaysa güncelle, değilse buraya gelemez
-                    new_part.status = 'KULLANILDI'
-                    new_part.used_in_aircraft = instance
-                    new_part.save(update_fields=['status', 'used_in_aircraft', 'updated_at'])
-
-            if old_part:  # Eğer eski bir parça varsa ve yeni bir parçayla değiştirilmişse
-                old_part.status = 'STOKTA'
-                old_part.used_in_aircraft = None
-                old_part.save(update_fields=['status', 'used_in_aircraft', 'updated_at'])
+        changed_slots = [
+            slot for slot in AssembledAircraft.PART_SLOTS
+            if f'{slot}_id' in validated_data and validated_data[f'{slot}_id'] != getattr(instance, f'{slot}_id')
+        ]
+        released_part_ids = [getattr(instance, f'{slot}_id') for slot in changed_slots]
+        for slot in changed_slots:
+            setattr(instance, f'{slot}_id', validated_data[f'{slot}_id'])
+        # Parça değişmeyen veya rezervasyondan parça kullanmayan güncellemeler rezervasyonu serbest bırakmaz.
+        consumes_reservation = reservation is not None and Part.objects.filter(
+            reservation=reservation, pk__in=[getattr(instance, f'{slot}_id') for slot in changed_slots]
+        ).exists()
+
+        with (self.constraint_errors(instance), self.reservation_errors(instance, changed_slots, reservation),
+              transaction.atomic()):
+            instance.save()  # Yeni parçalar burada veritabanında kontrol edilir (is_new=False).
+            history.record(instance.detach_parts(released_part_ids, 'SWAPPED_OUT')
+                           + instance.attach_parts(changed_slots, 'SWAPPED_IN', reservation))
+            if consumes_reservation:
+                reservation.delete()
+            if changed_slots:
+                bom.write(instance)
         return instance
 
 
+def constraint_violation_errors(message, aircraft):
+    """
+    Veritabanı hata mesajındaki constraint adından serializer hata sözlüğü üretir.
+    Tanınmayan hatalar için None döner. Sadece hata durumunda parçaları okur.
+    """
+    if 'aircraft_parts_distinct' in message:
+        return {"non_field_errors": [ErrorDetail("Aynı parça birden fazla rolde kullanılamaz.", code='distinct')]}
+    if 'tail_number' in message:
+        field = AssembledAircraft._meta.get_field('tail_number')
+        return {"tail_number": [ErrorDetail(field.error_messages['unique'] % {
+            'model_name': AssembledAircraft._meta.verbose_name, 'field_label': field.verbose_name,
+        }, code='unique')]}
+
+    part_type_names = dict(PartType.PART_TYPE_CHOICES)
+    for slot, part_type_name in AssembledAircraft.PART_SLOTS.items():
+        prefix = f'aircraft_{slot}_'
+        if prefix not in message and f'{slot}_id' not in message:
+            continue
+        part_id = getattr(aircraft, f'{slot}_id')
+        part = Part.objects.filter(pk=part_id).first()
+        if part is None or f'{prefix}exists' in message:
+            code = 'does_not_exist'
+            detail = serializers.PrimaryKeyRelatedField.default_error_messages[code].format(pk_value=part_id)
+        elif f'{prefix}part_type' in message:
+            code = 'part_type'
+            detail = (f"Seçilen {part.serial_number} parçası, beklenen {part_type_names[part_type_name]} "
+                      f"tipiyle uyuşmuyor.")
+        elif f'{prefix}aircraft_model' in message:
+            code = 'aircraft_model'
+            detail = (f"{part.serial_number} parçası, hedeflenen uçak modeli "
+                      f"({aircraft.aircraft_model.get_name_display()}) ile uyumlu değil.")
+        else:  # `aircraft_{slot}_in_stock` veya `{slot}_id` unique ihlali
+            code = 'not_in_stock'
+            detail = f"{part.serial_number} parçası stokta değil, kullanılamaz."
+        return {slot: [ErrorDetail(detail, code=code)]}
+    return None
+
+
 class MissingPartsQuerySerializer(serializers.Serializer):
     """
     check_missing_parts action'ı için query parametrelerini valide eder.
     """
     aircraft_model_name = serializers.ChoiceField(choices=AircraftModel.AIRCRAFT_MODEL_CHOICES)
+
+
+class KitReservationSerializer(TimeStampedSerializer):
+    """Parça seti rezervasyonu. Oluştururken sadece `aircraft_model` gönderilir, parçalar sunucuda seçilir."""
+    aircraft_model = serializers.PrimaryKeyRelatedField(queryset=AircraftModel.objects.all())
+    aircraft_model_name = serializers.CharField(source='aircraft_model.get_name_display', read_only=True)
+    reserved_by_username = serializers.CharField(source='reserved_by.username', read_only=True)
+    parts = PartMiniSerializer(many=True, read_only=True)
+    slots = serializers.SerializerMethodField(help_text="Slot (wing, fuselage, tail, avionics) -> rezerve parça ID'si. "
+                                                        "Montaj isteğinde aynen kullanılabilir.")
+
+    class Meta:
+        model = KitReservation
+        fields = ['id', 'aircraft_model', 'aircraft_model_name', 'reserved_by', 'reserved_by_username',
+                  'expires_at', 'slots', 'parts', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'reserved_by', 'expires_at']
+
+    def get_slots(self, obj) -> dict:
+        slot_by_part_type = {part_type: slot for slot, part_type in AssembledAircraft.PART_SLOTS.items()}
+        return {slot_by_part_type[part.part_type.name]: part.pk for part in obj.parts.all()
+                if part.part_type.name in slot_by_part_type}
@@ -1,16 +1,31 @@
 
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
 import factory
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Sum
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from apps.analitik.models import AssemblyRollup
+from apps.core.concurrency import VersionConflict
+from apps.core.serializers import BulkActionSerializer
 from apps.envanter.factories import AircraftModelFactory, PartFactory, PartTypeFactory
-from apps.envanter.models import Part, PartType
-from apps.montaj.models import AssembledAircraft
+from apps.envanter.models import Part, PartEvent, PartType
+from apps.montaj.models import AssembledAircraft, KitReservation
+from apps.montaj.reservations import release_expired
+from apps.montaj.serializers import AssembledAircraftSerializer
 from apps.uretim.factories import AssemblyTeamFactory, KanatTeamFactory
 from apps.users.factories import UserFactory
+from apps.users.models import AuthToken
 
 
 class AssembledAircraftModelTest(TestCase):
@@ -22,10 +37,11 @@ class AssembledAircraftModelTest(TestCase):
         self.akinci_model = AircraftModelFactory(name='AKINCI_MODELTEST') # Kullanılmıyor, kaldırılabilir
         self.montaj_team = AssemblyTeamFactory(name='MONTAJ_TEAM_MODELTEST') # Model testine özel isim
 
-        self.kanat_pt = PartTypeFactory(name='KANAT_MTM') # MTM: Model Test Montaj
-        self.govde_pt = PartTypeFactory(name='GOVDE_MTM')
-        self.kuyruk_pt = PartTypeFactory(name='KUYRUK_MTM')
-        self.aviyonik_pt = PartTypeFactory(name='AVIYONIK_MTM')
+        # Parça tipi veritabanında da kontrol edildiği için slotların gerçek tipleri kullanılır.
+        self.kanat_pt = PartTypeFactory(name='KANAT')
+        self.govde_pt = PartTypeFactory(name='GOVDE')
+        self.kuyruk_pt = PartTypeFactory(name='KUYRUK')
+        self.aviyonik_pt = PartTypeFactory(name='AVIYONIK')
 
         # Geçerli parçalar
         self.valid_wing = PartFactory(part_type=self.kanat_pt, aircraft_model_compatibility=self.tb2_model, status='STOKTA')
@@ -156,6 +172,20 @@ class AssembledAircraftAPITest(APITestCase):
         self.assertEqual(wing_db.used_in_aircraft, assembled_aircraft)
 
 
+    def test_assemble_aircraft_without_tail_number_allocates_one(self):
+        """Kuyruk numarası gönderilmezse sunucunun modele göre benzersiz bir numara ürettiğini test eder."""
+        self.client.force_authenticate(user=self.montaj_team_user)
+        tail_numbers = []
+        for _ in range(2):
+            parts = self._create_valid_parts_for_model(self.tb2_model)
+            response = self.client.post(self.assemble_url, {
+                "aircraft_model": self.tb2_model.id, **{field: part.id for field, part in parts.items()}
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+            self.assertRegex(response.data['tail_number'], r'^TC-TB2-\d{5}$')
+            tail_numbers.append(response.data['tail_number'])
+        self.assertEqual(AssembledAircraft.objects.filter(tail_number__in=tail_numbers).count(), 2)
+
     def test_assemble_aircraft_by_production_team_forbidden(self):
         """Üretim takımının (montaj takımı olmayan) uçak monte etme girişiminin reddedildiğini test eder (403)."""
         self.client.force_authenticate(user=self.kanat_team_user)
@@ -174,7 +204,19 @@ class AssembledAircraftAPITest(APITestCase):
         response = self.client.post(self.assemble_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("avionics", response.data)
-        self.assertTrue(any("alan zorunlu" in err for err in response.data['avionics']))
+        self.assertEqual(response.data['avionics'], ["Aviyonik parçası seçilmelidir."])
+
+    def test_update_aircraft_with_null_part(self):
+        """PUT ile parça alanı boş (null) gönderildiğinde parça tipinin adıyla hata döndürüldüğünü test eder."""
+        self.client.force_authenticate(user=self.montaj_team_user)
+        parts = self._create_valid_parts_for_model(self.tb2_model)
+        aircraft = AssembledAircraft.objects.create(aircraft_model=self.tb2_model, tail_number="TC-ASM-NULL-001",
+                                                    **parts)
+        data = {"aircraft_model": self.tb2_model.id, "tail_number": aircraft.tail_number,
+                **{slot: part.id for slot, part in parts.items()}, "wing": None}
+        response = self.client.put(self.detail_url(aircraft.pk), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['wing'], ["Kanat parçası boş bırakılamaz."])
 
     def test_assemble_aircraft_with_incompatible_part(self):
         """Uçak modeliyle uyumsuz bir parça kullanıldığında montaj girişiminin başarısız olduğunu (400) ve ilgili hata mesajını döndürdüğünü test eder."""
@@ -209,6 +251,71 @@ class AssembledAircraftAPITest(APITestCase):
         self.assertIn("wing", response.data)
         self.assertTrue(any(e.code == 'does_not_exist' or "stokta değil" in str(e) for e in response.data['wing']))
 
+    def test_assemble_aircraft_constraint_violations_map_to_field_errors(self):
+        """Veritabanı constraint/trigger ihlallerinin ilgili alanın hata mesajına çevrildiğini test eder."""
+        self.client.force_authenticate(user=self.montaj_team_user)
+        parts = self._create_valid_parts_for_model(self.tb2_model)
+        data = {"aircraft_model": self.tb2_model.id, "tail_number": "TC-DB-001",
+                **{field: part.id for field, part in parts.items()}}
+        cases = [
+            ({"wing": parts['fuselage'].id, "fuselage": parts['wing'].id}, "wing", "tipiyle uyuşmuyor"),
+            ({"tail": 999999}, "tail", "999999"),
+            ({"avionics": parts['wing'].id}, "non_field_errors", "birden fazla rolde"),
+        ]
+        for overrides, field, message in cases:
+            response = self.client.post(self.assemble_url, {**data, **overrides}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, overrides)
+            self.assertTrue(any(message in str(error) for error in response.data[field]), response.data)
+        self.assertFalse(AssembledAircraft.objects.exists())
+        self.assertEqual(set(Part.objects.filter(pk__in=[p.id for p in parts.values()]).values_list('status', flat=True)),
+                         {'STOKTA'})
+
+        self.assertEqual(self.client.post(self.assemble_url, data, format='json').status_code, status.HTTP_201_CREATED)
+        other_parts = self._create_valid_parts_for_model(self.tb2_model)
+        response = self.client.post(self.assemble_url, {**data, **{f: p.id for f, p in other_parts.items()}},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("tail_number", response.data)
+
+    def test_assemble_aircraft_reads_parts_once(self):
+        """Montajın parçaları validasyon için tek tek okumadığını, tek sorguda okuyup güncellediğini test eder."""
+        self.client.force_authenticate(user=self.montaj_team_user)
+        parts = self._create_valid_parts_for_model(self.tb2_model)
+        data = {"aircraft_model": self.tb2_model.id, "tail_number": "TC-DB-Q-001",
+                **{field: part.id for field, part in parts.items()}}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.assemble_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(response.data['wing_details']['status'], 'KULLANILDI')
+        part_selects = [q['sql'] for q in queries.captured_queries
+                        if q['sql'].startswith('SELECT') and 'FROM "envanter_part"' in q['sql']]
+        part_updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "envanter_part"')]
+        self.assertEqual((len(part_selects), len(part_updates)), (1, 1))
+        self.assertFalse(any('"envanter_parttype"' in q['sql'] and 'JOIN' not in q['sql']
+                             for q in queries.captured_queries))
+
+    def test_swap_to_used_part_is_rejected_by_database(self):
+        """Kullanımdaki bir parçanın başka bir uçağa takılmasının reddedildiğini ve hiçbir şeyin değişmediğini test eder."""
+        self.client.force_authenticate(user=self.montaj_team_user)
+        aircraft_ids = []
+        for i in range(2):
+            parts = self._create_valid_parts_for_model(self.tb2_model)
+            data = {"aircraft_model": self.tb2_model.id, "tail_number": f"TC-DB-SWAP-{i}",
+                    **{field: part.id for field, part in parts.items()}}
+            aircraft_ids.append(self.client.post(self.assemble_url, data, format='json').data['id'])
+        first, second = AssembledAircraft.objects.in_bulk(aircraft_ids).values()
+
+        response = self.client.patch(self.detail_url(first.pk), {"wing": second.wing_id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(any("stokta değil" in str(error) for error in response.data['wing']))
+        first_wing = Part.objects.get(pk=first.wing_id)
+        self.assertEqual((first_wing.status, first_wing.used_in_aircraft_id), ('KULLANILDI', first.pk))
+
+        recycled = PartFactory(part_type=self.kanat_pt, aircraft_model_compatibility=self.tb2_model,
+                               status='GERI_DONUSUMDE', serial_number="SN-DB-RECYCLED")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            AssembledAircraft.objects.filter(pk=first.pk).update(wing=recycled)
+
     def test_check_missing_parts_action_with_missing(self):
         """`check_missing_parts` action'ının, bazı temel parçalar eksik olduğunda doğru uyarıları verdiğini test eder."""
         Part.objects.filter(part_type=self.govde_pt, aircraft_model_compatibility=self.tb2_model).delete()
@@ -238,6 +345,22 @@ class AssembledAircraftAPITest(APITestCase):
         for part_type_display_name, count in response.data['required_parts_check'].items():
             self.assertGreaterEqual(count, 1)
 
+    def test_async_check_missing_parts_matches_sync_action(self):
+        """Async `check_missing_parts` endpoint'inin senkron action ile aynı yanıtı döndürdüğünü test eder."""
+        _ = PartFactory(part_type=self.kanat_pt, aircraft_model_compatibility=self.tb2_model, status='STOKTA')
+        _ = PartFactory(part_type=self.kuyruk_pt, aircraft_model_compatibility=self.tb2_model, status='STOKTA')
+        url_params = f'?aircraft_model_name={self.tb2_model.name}'
+
+        self.client.force_authenticate(user=self.montaj_team_user)
+        sync_response = self.client.get(self.check_missing_url + url_params)
+        self.client.force_authenticate(user=None)
+
+        token = AuthToken.objects.create(user=self.montaj_team_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        async_response = self.client.get(reverse('async-assembledaircraft-check-missing-parts') + url_params)
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+
     def test_update_assembled_aircraft_tail_number(self):
         """Monte edilmiş bir uçağın sadece kuyruk numarasının güncellenebildiğini test eder."""
         self.client.force_authenticate(user=self.montaj_team_user)
@@ -307,6 +430,124 @@ class AssembledAircraftAPITest(APITestCase):
             self.assertEqual(part_after_delete.status, 'STOKTA')
             self.assertIsNone(part_after_delete.used_in_aircraft)
 
+    def test_part_history_follows_assembly_swap_and_release(self):
+        """Montaj, parça değişimi ve uçak silme işlemlerinin parça geçmişine kaydedildiğini test eder."""
+        self.client.force_authenticate(user=self.montaj_team_user)
+        parts = self._create_valid_parts_for_model(self.tb2_model)
+        data = {"aircraft_model": self.tb2_model.id, "tail_number": "TC-HIST-001",
+                **{field: part.id for field, part in parts.items()}}
+        aircraft_id = self.client.post(self.assemble_url, data, format='json').data['id']
+
+        new_wing = PartFactory(part_type=self.kanat_pt, aircraft_model_compatibility=self.tb2_model, status='STOKTA',
+                               serial_number="SN-HIST-NEW-WING")
+        self.client.patch(self.detail_url(aircraft_id), {"wing": new_wing.id}, format='json')
+        self.client.delete(self.detail_url(aircraft_id))
+
+        history_url = lambda part: reverse('part-history', kwargs={'pk': part.pk})
+        old_wing_history = self.client.get(history_url(parts['wing'])).data
+        self.assertEqual([event['kind'] for event in old_wing_history], ['PRODUCED', 'ASSEMBLED', 'SWAPPED_OUT'])
+        self.assertEqual(old_wing_history[1]['tail_number'], "TC-HIST-001")
+        self.assertEqual(old_wing_history[2]['to_status'], 'STOKTA')
+
+        new_wing_history = self.client.get(history_url(new_wing)).data
+        self.assertEqual([event['kind'] for event in new_wing_history], ['PRODUCED', 'SWAPPED_IN', 'RELEASED'])
+        fuselage_history = self.client.get(history_url(parts['fuselage'])).data
+        self.assertEqual([event['kind'] for event in fuselage_history], ['PRODUCED', 'ASSEMBLED', 'RELEASED'])
+        self.assertEqual(fuselage_history[2]['aircraft_id'], aircraft_id)
+
+    def test_concurrent_part_swaps_do_not_overwrite_each_other(self):
+        """Aynı uçakta eşzamanlı iki parça değişiminden ikincisinin 409 ile reddedildiğini ve geri alındığını test eder."""
+        parts = self._create_valid_parts_for_model(self.tb2_model)
+        aircraft = AssembledAircraft.objects.create(aircraft_model=self.tb2_model, tail_number="TC-VER-001",
+                                                    assembled_by_team=self.montaj_team, **parts)
+        new_wings = [PartFactory(part_type=self.kanat_pt, aircraft_model_compatibility=self.tb2_model,
+                                 status='STOKTA', serial_number=f"SN-VER-WING-{i}") for i in range(2)]
+
+        # İki istek de uçağı ve parçaları değişiklikten önce okur ve validasyondan geçer.
+        serializers = [
+            AssembledAircraftSerializer(AssembledAircraft.objects.get(pk=aircraft.pk), data={'wing': wing.pk},
+                                        partial=True)
+            for wing in new_wings
+        ]
+        for serializer in serializers:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializers[0].save()
+        with self.assertRaises(VersionConflict), transaction.atomic():
+            serializers[1].save()
+
+        aircraft.refresh_from_db()
+        self.assertEqual((aircraft.wing_id, aircraft.version), (new_wings[0].pk, 2))
+        new_wings[1].refresh_from_db()
+        self.assertEqual(new_wings[1].status, 'STOKTA')
+
+    def test_update_with_stale_version_returns_conflict(self):
+        """Eski sürümle gönderilen güncelleme isteğinin 409 döndürdüğünü test eder."""
+        self.client.force_authenticate(user=self.montaj_team_user)
+        parts = self._create_valid_parts_for_model(self.tb2_model)
+        aircraft = AssembledAircraft.objects.create(aircraft_model=self.tb2_model, tail_number="TC-VER-002",
+                                                    assembled_by_team=self.montaj_team, **parts)
+
+        response = self.client.patch(self.detail_url(aircraft.pk), {'tail_number': "TC-VER-002A", 'version': 1},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['version'], 2)
+        response = self.client.patch(self.detail_url(aircraft.pk), {'tail_number': "TC-VER-002B", 'version': 1},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response = self.client.delete(self.detail_url(aircraft.pk), HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertTrue(AssembledAircraft.objects.filter(pk=aircraft.pk, tail_number="TC-VER-002A").exists())
+
+    def test_bulk_disassemble_releases_parts_and_updates_rollups(self):
+        """Toplu sökme işleminin uçakları sildiğini, parçaları stoğa döndürdüğünü ve özetleri güncellediğini test eder."""
+        self.client.force_authenticate(user=self.montaj_team_user)
+        aircraft_ids, part_ids = [], []
+        for i in range(2):
+            parts = self._create_valid_parts_for_model(self.tb2_model)
+            data = {"aircraft_model": self.tb2_model.id, "tail_number": f"TC-BULK-{i}",
+                    **{field: part.id for field, part in parts.items()}}
+            aircraft_ids.append(self.client.post(self.assemble_url, data, format='json').data['id'])
+            part_ids.extend(part.id for part in parts.values())
+        assembled = lambda: AssemblyRollup.objects.filter(grain='DAY').aggregate(total=Sum('count'))['total']
+        self.assertEqual(assembled(), 2)
+
+        response = self.client.post(reverse('assembledaircraft-bulk-disassemble'),
+                                    {'ids': [*aircraft_ids, 999999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['summary'], {'disassembled': 2, 'not_found': 1})
+        self.assertFalse(AssembledAircraft.objects.filter(pk__in=aircraft_ids).exists())
+        self.assertEqual(set(Part.objects.filter(pk__in=part_ids).values_list('status', 'used_in_aircraft')),
+                         {('STOKTA', None)})
+        self.assertEqual(PartEvent.objects.filter(part_id__in=part_ids, kind='RELEASED').count(), 8)
+        self.assertEqual(assembled(), 0)
+
+    def test_bulk_disassemble_rejects_empty_or_too_wide_filter(self):
+        """Boş değerli filtrelerin ve `MAX_IDS` sınırını aşan filtrelerin reddedildiğini test eder."""
+        self.client.force_authenticate(user=self.montaj_team_user)
+        parts = self._create_valid_parts_for_model(self.tb2_model)
+        aircraft = AssembledAircraft.objects.create(aircraft_model=self.tb2_model, tail_number="TC-BULK-F",
+                                                    **parts)
+        url = reverse('assembledaircraft-bulk-disassemble')
+        for payload in ({'filter': {'aircraft_model': ''}}, {'filter': {'tail_number__icontains': ''}}):
+            response = self.client.post(url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, payload)
+            self.assertIn('filter', response.data)
+
+        with patch.object(BulkActionSerializer, 'MAX_IDS', 0):
+            response = self.client.post(url, {'filter': {'tail_number__icontains': 'BULK'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(AssembledAircraft.objects.filter(pk=aircraft.pk).exists())
+
+        response = self.client.post(url, {'filter': {'tail_number__icontains': 'BULK'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['summary'], {'disassembled': 1})
+
+    def test_bulk_disassemble_by_non_assembly_team_forbidden(self):
+        """Montaj takımı dışındaki kullanıcıların toplu sökme yapamadığını test eder."""
+        self.client.force_authenticate(user=self.kanat_team_user)
+        response = self.client.post(reverse('assembledaircraft-bulk-disassemble'), {'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_check_missing_parts_non_existent_model_name(self):
         """`check_missing_parts` action'ına var olmayan bir uçak modeli adı gönderildiğinde 400 Bad Request aldığını test eder."""
         self.client.force_authenticate(user=self.montaj_team_user)
@@ -466,3 +707,290 @@ class AssembledAircraftModelLogicTest(TestCase):  # Yeni isim verdim
         self.assertEqual(wing_after_update_db.status, 'KULLANILDI', "Part status should remain KULLANILDI")
         self.assertEqual(wing_after_update_db.used_in_aircraft, aircraft)  # Hala aynı uçağa bağlı olmalı
 
+
+class KitReservationTest(APITestCase):
+    """Parça seti rezervasyonlarının ayrılmasını, diğer kullanıcılardan gizlenmesini ve montajda tüketilmesini test eder."""
+
+    def setUp(self):
+        self.assembly_team = AssemblyTeamFactory()
+        self.user = UserFactory(username="rezervasyon_1")
+        self.other_user = UserFactory(username="rezervasyon_2")
+        for user in (self.user, self.other_user):
+            user.profile.team = self.assembly_team
+            user.profile.save()
+        self.tb2_model = AircraftModelFactory(name='TB2')
+        self.part_types = {slot: PartType.objects.get_or_create(name=name)[0]
+                           for slot, name in AssembledAircraft.PART_SLOTS.items()}
+        self.reservations_url = reverse('kitreservation-list')
+
+    def _create_kit(self, label):
+        return {slot: PartFactory(part_type=part_type, aircraft_model_compatibility=self.tb2_model, status='STOKTA',
+                                  serial_number=f"SN-RES-{label}-{slot}")
+                for slot, part_type in self.part_types.items()}
+
+    def _reserve(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post(self.reservations_url, {'aircraft_model': self.tb2_model.pk}, format='json')
+
+    def _assemble(self, user, tail_number, slots, **extra):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse('assembledaircraft-list'), {
+            'aircraft_model': self.tb2_model.pk, 'tail_number': tail_number, **slots, **extra,
+        }, format='json')
+
+    def test_reserve_kit_picks_one_part_per_type(self):
+        """Rezervasyonun her parça tipinden en eski parçayı ayırdığını ve parçaların STOKTA kaldığını test eder."""
+        oldest = self._create_kit('OLD')
+        self._create_kit('NEW')
+        response = self._reserve(self.user)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(response.data['slots'], {slot: part.pk for slot, part in oldest.items()})
+        self.assertEqual(len(response.data['parts']), 4)
+        reserved = Part.objects.filter(reservation_id=response.data['id'])
+        self.assertEqual(set(reserved.values_list('status', flat=True)), {'STOKTA'})
+
+    def test_reserved_parts_are_hidden_from_other_users(self):
+        """Rezerve parçaların diğer kullanıcıların listesinde ve eksik parça sayımında görünmediğini test eder."""
+        kit = self._create_kit('HIDE')
+        self.assertEqual(self._reserve(self.user).status_code, status.HTTP_201_CREATED)
+        parts_url = reverse('part-list') + f'?available=true&aircraft_model_compatibility={self.tb2_model.pk}'
+
+        self.client.force_authenticate(user=self.other_user)
+        self.assertEqual(self.client.get(parts_url).data['count'], 0)
+        response = self.client.get(reverse('assembledaircraft-check-missing-parts') + '?aircraft_model_name=TB2')
+        self.assertEqual(set(response.data['required_parts_check'].values()), {0})
+
+        self.client.force_authenticate(user=self.user)
+        own = {part['id'] for part in self.client.get(parts_url).data['results']}
+        self.assertEqual(own, {part.pk for part in kit.values()})
+        # Kullanıcının kendi rezervasyonundaki parçalar eksik sayılmaz.
+        for url in (reverse('assembledaircraft-check-missing-parts'),
+                    reverse('async-assembledaircraft-check-missing-parts')):
+            self.client.credentials(HTTP_AUTHORIZATION=f"Token {AuthToken.objects.create(user=self.user).key}")
+            response = self.client.get(url + '?aircraft_model_name=TB2')
+            self.assertEqual(set(response.json()['required_parts_check'].values()), {1}, url)
+
+    def test_second_reservation_without_stock_conflicts(self):
+        """Tam set kalmadığında rezervasyonun 409 ve eksik parça tipleriyle reddedildiğini test eder."""
+        self._create_kit('ONE')
+        self.assertEqual(self._reserve(self.user).status_code, status.HTTP_201_CREATED)
+        response = self._reserve(self.other_user)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['missing_part_types'], ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK'])
+        self.assertEqual(KitReservation.objects.count(), 1)
+
+    def test_assembly_consumes_reservation(self):
+        """Rezervasyonla yapılan montajın parçaları kullandığını ve rezervasyonu sildiğini test eder."""
+        self._create_kit('USE')
+        reservation = self._reserve(self.user).data
+        response = self._assemble(self.user, 'TC-RES-001', reservation['slots'], reservation=reservation['id'])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertFalse(KitReservation.objects.exists())
+        self.assertEqual(Part.objects.filter(status='KULLANILDI', reservation__isnull=True).count(), 4)
+
+    def test_swap_consumes_reservation_only_when_its_part_is_used(self):
+        """Parça değişiminde rezervasyonun sadece rezervasyondaki bir parça takıldığında silindiğini test eder."""
+        first = self._create_kit('FIRST')
+        aircraft_id = self._assemble(self.user, 'TC-RES-SWAP', {slot: part.pk for slot, part in first.items()}).data['id']
+        self._create_kit('SWAP')
+        reservation = self._reserve(self.user).data
+        url = reverse('assembledaircraft-detail', kwargs={'pk': aircraft_id})
+
+        for data in ({'tail_number': 'TC-RES-SWAP2'}, {'wing': first['wing'].pk}):
+            response = self.client.patch(url, {**data, 'reservation': reservation['id']}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            self.assertTrue(KitReservation.objects.filter(pk=reservation['id']).exists())
+
+        response = self.client.patch(url, {'wing': reservation['slots']['wing'], 'reservation': reservation['id']},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertFalse(KitReservation.objects.exists())
+        self.assertEqual(Part.objects.filter(reservation__isnull=False).count(), 0)
+
+    def test_reserved_parts_cannot_be_recycled(self):
+        """Rezerve parçaların üreten takım tarafından geri dönüşüme gönderilemediğini test eder."""
+        kit = self._create_kit('RECYCLE')
+        producer = UserFactory(username="rezervasyon_uretici")
+        producer.profile.team = KanatTeamFactory()
+        producer.profile.save()
+        Part.objects.filter(pk=kit['wing'].pk).update(produced_by_team=producer.profile.team)
+        free_wing = PartFactory(part_type=self.part_types['wing'], aircraft_model_compatibility=self.tb2_model,
+                                produced_by_team=producer.profile.team, status='STOKTA')
+        reservation_id = self._reserve(self.user).data['id']
+
+        self.client.force_authenticate(user=producer)
+        response = self.client.post(reverse('part-recycle', kwargs={'pk': kit['wing'].pk}))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(reverse('part-bulk-recycle'), {'ids': [kit['wing'].pk, free_wing.pk]},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual({result['id']: result['outcome'] for result in response.data['results']},
+                         {kit['wing'].pk: 'reserved', free_wing.pk: 'recycled'})
+        self.assertEqual(Part.objects.get(pk=kit['wing'].pk).status, 'STOKTA')
+
+        KitReservation.objects.filter(pk=reservation_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.client.post(reverse('part-recycle', kwargs={'pk': kit['wing'].pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def test_other_user_cannot_assemble_reserved_parts(self):
+        """Başka bir kullanıcının rezerve parçalarla montajının alan hatasıyla reddedildiğini test eder."""
+        self._create_kit('TAKEN')
+        slots = self._reserve(self.user).data['slots']
+        response = self._assemble(self.other_user, 'TC-RES-002', slots)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['wing'][0].code, 'reserved')
+        self.assertFalse(AssembledAircraft.objects.exists())
+        self.assertEqual(Part.objects.filter(status='STOKTA').count(), 4)
+
+    def test_reservation_of_other_user_is_rejected(self):
+        """Başka bir kullanıcının rezervasyonunun montajda kullanılamadığını test eder."""
+        self._create_kit('FOREIGN')
+        reservation = self._reserve(self.user).data
+        response = self._assemble(self.other_user, 'TC-RES-003', reservation['slots'], reservation=reservation['id'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('reservation', response.data)
+
+    def test_expired_reservation_frees_parts_and_is_swept(self):
+        """Süresi dolan rezervasyonun parçalarının hemen kullanılabildiğini ve toplu silindiğini test eder."""
+        kit = self._create_kit('EXPIRED')
+        reservation_id = self._reserve(self.user).data['id']
+        KitReservation.objects.filter(pk=reservation_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = self._assemble(self.other_user, 'TC-RES-004', {slot: part.pk for slot, part in kit.items()})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(release_expired(), 1)
+        self.assertFalse(KitReservation.objects.exists())
+        self.assertLessEqual(len(queries.captured_queries), 6)
+
+    def test_release_reservation(self):
+        """Rezervasyon iptal edildiğinde parçaların serbest kaldığını ve komutun süresi dolanları sildiğini test eder."""
+        self._create_kit('RELEASE')
+        self._create_kit('SWEEP')
+        reservation_id = self._reserve(self.user).data['id']
+        expired_id = self._reserve(self.other_user).data['id']
+        KitReservation.objects.filter(pk=expired_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.delete(reverse('kitreservation-detail', kwargs={'pk': reservation_id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.delete(reverse('kitreservation-detail', kwargs={'pk': reservation_id}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        call_command('release_expired_reservations', stdout=StringIO())
+        self.assertFalse(KitReservation.objects.exists())
+        self.assertFalse(Part.objects.filter(reservation__isnull=False).exists())
+
+
+class AircraftBomDocumentTest(APITestCase):
+    """Uçak ürün ağacı dokümanlarının yazılmasını, yanıtlarda kullanılmasını ve soy filtrelerini test eder."""
+
+    def setUp(self):
+        self.assembly_team = AssemblyTeamFactory()
+        self.user = UserFactory(username="bom_user")
+        self.user.profile.team = self.assembly_team
+        self.user.profile.save()
+        self.client.force_authenticate(user=self.user)
+        self.tb2_model = AircraftModelFactory(name='TB2')
+        self.part_types = {slot: PartType.objects.get_or_create(name=name)[0]
+                           for slot, name in AssembledAircraft.PART_SLOTS.items()}
+        self.list_url = reverse('assembledaircraft-list')
+
+    def _assemble(self, label, produced_at=None):
+        parts = {slot: PartFactory(part_type=part_type, aircraft_model_compatibility=self.tb2_model,
+                                   serial_number=f"SN-BOM-{label}-{slot}")
+                 for slot, part_type in self.part_types.items()}
+        if produced_at is not None:
+            Part.objects.filter(pk=parts['wing'].pk).update(created_at=produced_at)
+            parts['wing'].refresh_from_db()
+        return AssembledAircraft.objects.create(aircraft_model=self.tb2_model, tail_number=f"TC-BOM-{label}",
+                                                assembled_by_team=self.assembly_team, **parts)
+
+    def _without_document(self, aircraft):
+        """Dokümansız (iç içe serializer'larla üretilen) yanıt."""
+        aircraft = AssembledAircraft.objects.get(pk=aircraft.pk)
+        aircraft.bom_document = None
+        return AssembledAircraftSerializer(aircraft).data
+
+    def test_responses_are_served_from_document_without_joins(self):
+        aircrafts = [self._assemble(label) for label in ('1', '2', '3')]
+        self.assertEqual(aircrafts[0].bom_document['wing_details']['status'], 'KULLANILDI')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertFalse([q['sql'] for q in queries.captured_queries
+                          if '"envanter_' in q['sql'] or '"uretim_team"' in q['sql']])
+
+        response = self.client.get(reverse('assembledaircraft-detail', kwargs={'pk': aircrafts[0].pk}))
+        self.assertEqual(response.json(), self._without_document(aircrafts[0]))
+
+    def test_part_swap_updates_document(self):
+        aircraft = self._assemble('SWAP')
+        new_wing = PartFactory(part_type=self.part_types['wing'], aircraft_model_compatibility=self.tb2_model,
+                               serial_number="SN-BOM-NEW-WING")
+        response = self.client.patch(reverse('assembledaircraft-detail', kwargs={'pk': aircraft.pk}),
+                                     {'wing': new_wing.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['wing_details']['serial_number'], "SN-BOM-NEW-WING")
+
+        aircraft.refresh_from_db()
+        self.assertEqual(aircraft.bom_document['wing_details'], self._without_document(aircraft)['wing_details'])
+        self.assertIn(new_wing.pk, [part['id'] for part in aircraft.bom_document['parts']])
+
+    def test_part_and_team_changes_refresh_document(self):
+        aircraft = self._assemble('REF')
+        aircraft.tail.serial_number = "SN-BOM-RENAMED"
+        aircraft.tail.save()
+        aircraft.refresh_from_db()
+        self.assertEqual(aircraft.bom_document['tail_details']['serial_number'], "SN-BOM-RENAMED")
+
+        # Parçanın sadece dokümanda olmayan alanlarını güncelleyen kayıtlar dokümanı yazmaz.
+        with CaptureQueriesContext(connection) as queries:
+            Part.objects.get(pk=aircraft.tail_id).save(update_fields=['updated_at'])
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('UPDATE "montaj_')])
+
+        self.assembly_team.delete()
+        aircraft.refresh_from_db()
+        self.assertIsNone(aircraft.bom_document['assembled_by_team_details'])
+
+    def test_genealogy_filter_finds_aircraft_by_part_team_and_week(self):
+        week_7 = self._assemble('W07', produced_at=timezone.make_aware(datetime(2026, 2, 11, 12)))
+        self._assemble('OTHER')
+        wing_team = week_7.wing.produced_by_team_id
+        self.assertIn({'slot': 'wing', 'id': week_7.wing_id, 'produced_by_team': wing_team,
+                       'produced_week': '2026-W07'}, week_7.bom_document['parts'])
+
+        def tail_numbers(**params):
+            response = self.client.get(self.list_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            return sorted(aircraft['tail_number'] for aircraft in response.data['results'])
+
+        self.assertEqual(tail_numbers(part_produced_by_team=wing_team, part_produced_week='2026-W07'), ['TC-BOM-W07'])
+        self.assertEqual(tail_numbers(part_produced_week='2026-W07'), ['TC-BOM-W07'])
+        self.assertEqual(tail_numbers(part_produced_by_team=wing_team), ['TC-BOM-OTHER', 'TC-BOM-W07'])
+        # Aynı parça için aranır: Haftanın diğer takımların parçalarıyla eşleşmesi yetmez.
+        tail_team = week_7.tail.produced_by_team_id
+        self.assertEqual(tail_numbers(part_produced_by_team=tail_team, part_produced_week='2026-W07'), [])
+
+        response = self.client.get(self.list_url, {'part_produced_week': '2026-W60'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_aircraft_without_document_is_served_and_rebuilt(self):
+        aircraft = self._assemble('REBUILD')
+        expected = self._without_document(aircraft)
+        AssembledAircraft.objects.update(bom_document=None)
+
+        detail_url = reverse('assembledaircraft-detail', kwargs={'pk': aircraft.pk})
+        self.assertEqual(self.client.get(detail_url).json(), expected)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {AuthToken.objects.create(user=self.user).key}")
+        self.assertEqual(self.client.get(reverse('async-assembledaircraft-detail', kwargs={'pk': aircraft.pk})).json(),
+                         expected)
+
+        call_command('rebuild_bom_documents', stdout=StringIO())
+        aircraft.refresh_from_db()
+        self.assertEqual({name: aircraft.bom_document[name] for name in expected if name.endswith('_details')},
+                         {name: value for name, value in expected.items() if name.endswith('_details')})
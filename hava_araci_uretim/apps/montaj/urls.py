@@ -4,7 +4,8 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 # İlgili ViewSet'i import ediyoruz:
-from .views import AssembledAircraftViewSet
+from .views import AssembledAircraftViewSet, KitReservationViewSet
+from . import async_views
 
 router = DefaultRouter()
 
@@ -13,8 +14,16 @@ router = DefaultRouter()
 # AssembledAircraftViewSet içindeki 'check_missing_parts' action'ı (detail=False) için URL:
 # /api/v1/montaj/assembled-aircrafts/check_missing_parts/ otomatik olarak oluşturulacaktır.
 router.register(r'assembled-aircrafts', AssembledAircraftViewSet, basename='assembledaircraft')
+# Parça seti rezervasyonları: /api/v1/montaj/kit-reservations/
+router.register(r'kit-reservations', KitReservationViewSet, basename='kitreservation')
 
 urlpatterns = [
     # Router tarafından oluşturulan tüm URL'leri dahil et.
     path('', include(router.urls)),
+
+    # ASGI modunda kullanılmak üzere async okuma endpoint'leri.
+    path('async/assembled-aircrafts/check_missing_parts/', async_views.check_missing_parts,
+         name='async-assembledaircraft-check-missing-parts'),
+    path('async/assembled-aircrafts/<int:pk>/', async_views.assembled_aircraft_detail,
+         name='async-assembledaircraft-detail'),
 ]
\ No newline at end of file
@@ -1,33 +1,28 @@
-from rest_framework_datatables.filters import DatatablesFilterBackend
-from rest_framework_datatables.pagination import DatatablesPageNumberPagination
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import F, Prefetch
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, status, permissions, serializers
+from rest_framework import mixins, viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from apps.analitik import dashboard, rollups
+from apps.arama import index as search_index
+from apps.core import identifiers, reference_cache
+from apps.core.bulk import BulkActionMixin
+from apps.core.concurrency import OptimisticConcurrencyMixin
+from apps.core.datatables import DatatablesFilterBackend, EstimatedCountDatatablesPagination
 from apps.core.permissions import IsAssemblyTeam
-from apps.envanter.models import Part, AircraftModel, PartType
-from .models import AssembledAircraft
-from .serializers import AssembledAircraftSerializer, MissingPartsQuerySerializer
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, inline_serializer
-from drf_spectacular.types import OpenApiTypes
+from apps.envanter import history
+from apps.envanter.models import Part
+from . import reservations
+from .filters import AssembledAircraftFilter
+from .models import AssembledAircraft, KitReservation
+from .serializers import AssembledAircraftSerializer, KitReservationSerializer, MissingPartsQuerySerializer
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+# OpenAPI dökümantasyonu (extend_schema tanımları) schema.py içindedir ve sadece şema üretilirken yüklenir.
 
-@extend_schema(
-    tags=["Montaj - Monte Edilmiş Uçaklar"],
-    description=(
-            "Monte edilmiş uçakların yönetimi için ana endpoint.\n"
-            "- **Oluşturma (POST):** Yeni bir uçak monte eder. Sadece Montaj Takımı erişebilir.\n"
-            "- **Listeleme (GET):** Tüm monte edilmiş uçakları listeler. Kimliği doğrulanmış tüm kullanıcılar erişebilir.\n"
-            "- **Detay (GET /id/):** Belirli bir uçağın detaylarını gösterir. Kimliği doğrulanmış tüm kullanıcılar erişebilir.\n"
-            "- **Güncelleme (PUT/PATCH /id/):** Bir uçağın bilgilerini günceller (örn: kuyruk numarası). Sadece Montaj Takımı erişebilir.\n"
-            "  Not: Uçağın parçalarını değiştirmek karmaşık bir işlemdir ve mevcut durumda sınırlı desteklenebilir.\n"
-            "- **Silme (DELETE /id/):** Bir uçağı siler ve kullanılan parçaları stoğa döndürür. Sadece Montaj Takımı erişebilir.\n"
-            "- **/check_missing_parts/ (GET):** Belirli bir uçak modeli için eksik parçaları kontrol eder."
-    )
-)
-class AssembledAircraftViewSet(viewsets.ModelViewSet):
+class AssembledAircraftViewSet(OptimisticConcurrencyMixin, BulkActionMixin, viewsets.ModelViewSet):
     """
     Monte edilmiş hava araçlarının oluşturulması, listelenmesi, güncellenmesi
     ve silinmesi gibi CRUD operasyonlarını yönetir. Ayrıca, belirli bir uçak
@@ -49,194 +44,36 @@ class AssembledAircraftViewSet(viewsets.ModelViewSet):
         - Uçakta kullanılan parçaların durumu 'STOKTA' olarak güncellenir ve uçakla olan
           bağlantıları kaldırılır. Bu işlem atomik bir transaction içinde yapılır.
     """
-    queryset = AssembledAircraft.objects.select_related(
-        'aircraft_model',
-        'assembled_by_team',
-        'wing', 'fuselage', 'tail', 'avionics',
-        'wing__part_type',
-        'fuselage__part_type',
-        'tail__part_type',
-        'avionics__part_type',
-        'wing__aircraft_model_compatibility',  # ForeignKey olduğunu varsayıyoruz
-        'fuselage__aircraft_model_compatibility',
-        'tail__aircraft_model_compatibility',
-        'avionics__aircraft_model_compatibility',
-    ).order_by('-assembly_date', '-created_at')
+    # Model, takım ve parça detayları uçağın ürün ağacı dokümanından okunur (bkz. apps.montaj.bom), ilişkili
+    # tablolar birleştirilmez.
+    queryset = AssembledAircraft.objects.order_by('-assembly_date', '-created_at')
 
     serializer_class = AssembledAircraftSerializer
-    pagination_class = DatatablesPageNumberPagination  # DataTables için
+    pagination_class = EstimatedCountDatatablesPagination  # DataTables için
     filter_backends = [DatatablesFilterBackend, DjangoFilterBackend, SearchFilter, OrderingFilter]  # DataTables ve standart filtreleme
-    filterset_fields = {
-        'aircraft_model': ['exact'],
-        'assembled_by_team': ['exact'],
-        'tail_number': ['icontains'],
-        'assembly_date': ['exact', 'gte', 'lte', 'range']
-    }
+    # Liste sayıları büyük sonuçlarda tahmin edilir (bkz. apps.core.datatables).
+    total_count_strategy = 'estimate'
+    count_strategy = 'estimate'
+    filterset_class = AssembledAircraftFilter
 
     def get_permissions(self):
         """İşleme göre uygun izinleri dinamik olarak döndürür."""
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_disassemble']:
             return [permissions.IsAuthenticated(), IsAssemblyTeam()]
         elif self.action == 'check_missing_parts':
             return [permissions.IsAuthenticated()]
         return [permissions.IsAuthenticated()]
 
-    @extend_schema(
-        summary="Yeni Uçak Monte Et (Montaj Takımı)",
-        description=(
-                "Verilen parçaları ve uçak modeli bilgilerini kullanarak yeni bir hava aracı monte eder. "
-                "Bu işlem sadece 'Montaj Takımı' rolündeki kullanıcılar tarafından gerçekleştirilebilir.\n"
-                "İstek body'sinde `aircraft_model` (ID), `tail_number` ve her bir ana parça (`wing`, `fuselage`, `tail`, `avionics`) için "
-                "geçerli, stokta olan ve belirtilen uçak modeliyle uyumlu `Part` ID'leri gönderilmelidir.\n"
-                "Başarılı montaj sonrası, kullanılan parçaların durumu otomatik olarak 'KULLANILDI' olarak güncellenir "
-                "ve `assembled_by_team` alanı isteği yapan kullanıcının takımı olarak ayarlanır."
-        ),
-        request=AssembledAircraftSerializer,
-        responses={
-            201: AssembledAircraftSerializer,
-            400: OpenApiResponse(
-                description="Geçersiz veri: Eksik veya yanlış parça bilgisi, parça uyumsuzluğu, stokta olmayan parça veya diğer validasyon hataları."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(
-                description="Yetki hatası: Bu işlemi yapma yetkiniz yok (örn: Montaj Takımı üyesi değilsiniz).")
-        }
-    )
-    def create(self, request, *args, **kwargs):
-        """Yeni bir AssembledAircraft instance'ı oluşturur."""
-        return super().create(request, *args, **kwargs)
-
     def perform_create(self, serializer):
         """
         Yeni bir AssembledAircraft oluşturulurken, `assembled_by_team` alanını
         otomatik olarak isteği yapan kullanıcının takımı ile doldurur.
         """
         user_team = self.request.user.profile.team
-        serializer.save(assembled_by_team=user_team)
-
-    @extend_schema(
-        summary="Tüm Monte Edilmiş Uçakları Listele",
-        description=(
-                "Sistemde kayıtlı tüm monte edilmiş uçakların sayfalanmış bir listesini döndürür.\n"
-                "Bu endpoint, jQuery DataTables server-side processing ile uyumludur ve DataTables tarafından "
-                "gönderilen `draw`, `start`, `length`, `search[value]`, `order[][column/dir]` gibi "
-                "parametreleri destekler. Ayrıca, aşağıda listelenen standart filtre parametreleri de kullanılabilir."
-        ),
-        parameters=[  # filterset_fields için OpenApiParameter tanımları (isteğe bağlı, drf-spectacular algılayabilir)
-            OpenApiParameter(name='aircraft_model', description='Uçak modeline göre filtrele (ID).',
-                             type=OpenApiTypes.INT, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='assembled_by_team', description='Montajı yapan takıma göre filtrele (ID).',
-                             type=OpenApiTypes.INT, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='tail_number__icontains',
-                             description='Kuyruk numarasında geçen ifadeye göre (büyük/küçük harf duyarsız) filtrele.',
-                             type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='assembly_date', description='Tam montaj tarihine göre filtrele (YYYY-AA-GG).',
-                             type=OpenApiTypes.DATE, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='assembly_date__gte',
-                             description='Belirtilen tarihten itibaren (eşit ve büyük) monte edilmiş uçakları filtrele.',
-                             type=OpenApiTypes.DATE, location=OpenApiParameter.QUERY),
-            # ... diğer date filtreleri için de eklenebilir ...
-        ],
-        responses={
-            200: inline_serializer(  # DataTables yanıtı için
-                name='AssembledAircraftListDatatablesResponse',
-                fields={
-                    'draw': serializers.IntegerField(),
-                    'recordsTotal': serializers.IntegerField(),
-                    'recordsFiltered': serializers.IntegerField(),
-                    'data': AssembledAircraftSerializer(many=True)
-                }
-            ),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli.")
-        }
-    )
-    def list(self, request, *args, **kwargs):
-        """Monte edilmiş tüm AssembledAircraft instance'larını listeler."""
-        return super().list(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Belirli Bir Monte Edilmiş Uçağın Detayını Getir",
-        description="Verilen ID'ye sahip monte edilmiş uçağın tüm detaylarını döndürür.",
-        parameters=[
-            OpenApiParameter(name='id', description='Monte edilmiş uçağın unique IDsi.', required=True,
-                             type=OpenApiTypes.INT, location=OpenApiParameter.PATH)
-        ],
-        responses={
-            200: AssembledAircraftSerializer,
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            404: OpenApiResponse(description="Belirtilen ID ile monte edilmiş uçak bulunamadı.")
-        }
-    )
-    def retrieve(self, request, *args, **kwargs):
-        """Belirli bir AssembledAircraft instance'ının detaylarını döndürür."""
-        return super().retrieve(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Monte Edilmiş Uçağı Güncelle (Kısmi - Montaj Takımı)",
-        description=(
-                "Bir monte edilmiş uçağın belirli alanlarını günceller. "
-                "Bu işlem sadece 'Montaj Takımı' rolündeki kullanıcılar tarafından gerçekleştirilebilir.\n"
-                "Genellikle sadece `tail_number` gibi parça olmayan alanların güncellenmesi beklenir. "
-                "Uçağın parçalarının (`wing`, `fuselage` vb.) bu endpoint üzerinden değiştirilmesi, "
-                "eski parçaların stoğa döndürülmesi ve yeni parçaların durumunun güncellenmesi gibi "
-                "karmaşık iş mantıklarını tetikler (eğer `AssembledAircraftSerializer.update` metodu "
-                "bu şekilde implemente edilmişse)."
-        ),
-        request=AssembledAircraftSerializer,
-        responses={
-            200: AssembledAircraftSerializer,
-            400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Yetki hatası."),
-            404: OpenApiResponse(description="Monte edilmiş uçak bulunamadı.")
-        }
-    )
-    def partial_update(self, request, *args, **kwargs):
-        """Belirli bir AssembledAircraft instance'ının gönderilen alanlarını günceller."""
-        return super().partial_update(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Monte Edilmiş Uçağı Güncelle (Tam - Montaj Takımı)",
-        description=(
-                "Bir monte edilmiş uçağın tüm yazılabilir alanlarını günceller. "
-                "`partial_update` ile benzer kısıtlamalara ve iş mantıklarına tabidir. "
-                "Sadece 'Montaj Takımı' rolündeki kullanıcılar tarafından gerçekleştirilebilir."
-        ),
-        request=AssembledAircraftSerializer,
-        responses={
-            200: AssembledAircraftSerializer,
-            400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Yetki hatası."),
-            404: OpenApiResponse(description="Monte edilmiş uçak bulunamadı.")
-        }
-    )
-    def update(self, request, *args, **kwargs):
-        """Bir AssembledAircraft instance'ını tamamen günceller."""
-        return super().update(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Monte Edilmiş Uçağı Sil (Montaj Takımı)",
-        description=(
-                "Belirli bir monte edilmiş uçağı veritabanından siler. "
-                "Bu işlem sadece 'Montaj Takımı' rolündeki kullanıcılar tarafından gerçekleştirilebilir.\n"
-                "Silme işlemi sırasında, uçakta kullanılan ana parçalar (kanat, gövde, kuyruk, aviyonik) "
-                "otomatik olarak 'STOKTA' durumuna geri döndürülür ve uçakla olan bağlantıları kaldırılır."
-        ),
-        parameters=[
-            OpenApiParameter(name='id', description='Silinecek monte edilmiş uçağın unique IDsi.', required=True,
-                             type=OpenApiTypes.INT, location=OpenApiParameter.PATH)
-        ],
-        request=None,
-        responses={
-            204: OpenApiResponse(description="Uçak başarıyla silindi (İçerik Yok)."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Yetki hatası."),
-            404: OpenApiResponse(description="Monte edilmiş uçak bulunamadı.")
-        }
-    )
-    def destroy(self, request, *args, **kwargs):
-        """Bir AssembledAircraft instance'ını siler."""
-        return super().destroy(request, *args, **kwargs)
+        extra = {}
+        if 'tail_number' not in serializer.validated_data:  # Kuyruk numarası gönderilmediyse sunucuda üretilir.
+            extra['tail_number'], = identifiers.tail_numbers(serializer.validated_data['aircraft_model'], user_team)
+        serializer.save(assembled_by_team=user_team, **extra)
 
     @transaction.atomic
     def perform_destroy(self, instance):
@@ -244,54 +81,59 @@ class AssembledAircraftViewSet(viewsets.ModelViewSet):
         Bir AssembledAircraft silinmeden önce, ilişkili parçaları stoğa döndürür.
         Bu işlem atomik bir transaction içinde yapılır.
         """
-        parts_to_release = [instance.wing, instance.fuselage, instance.tail, instance.avionics]
-        for part in parts_to_release:
-            if part:
-                part.status = 'STOKTA'
-                part.used_in_aircraft = None
-                part.save(update_fields=['status', 'used_in_aircraft', 'updated_at'])
+        part_ids = [getattr(instance, f'{slot}_id') for slot in AssembledAircraft.PART_SLOTS]
+        history.record(instance.detach_parts(part_ids, 'RELEASED'))
         instance.delete()
 
-    @extend_schema(
-        summary="Belirli Uçak Modeli İçin Eksik Parçaları Kontrol Et",
-        description=(
-                "Verilen `aircraft_model_name` query parametresine göre, o uçak modeli için "
-                "gerekli olan temel parçaların (Kanat, Gövde, Kuyruk, Aviyonik) envanterdeki "
-                "stok durumunu ve eksik parçalar varsa uyarıları döndürür."
-        ),
-        parameters=[
-            OpenApiParameter(
-                name='aircraft_model_name',
-                type=OpenApiTypes.STR,
-                location=OpenApiParameter.QUERY,
-                required=True,
-                description='Stok durumu kontrol edilecek uçak modelinin adı.',
-                enum=[choice[0] for choice in AircraftModel.AIRCRAFT_MODEL_CHOICES]
-            )
-        ],
-        responses={
-            200: inline_serializer(
-                name='MissingPartsResponse',  # Yanıt şeması için açıklayıcı bir isim
-                fields={
-                    'aircraft_model': serializers.CharField(help_text="Kontrol edilen uçak modelinin adı."),
-                    'required_parts_check': serializers.DictField(
-                        child=serializers.IntegerField(),
-                        help_text="Her bir temel parça tipi için stokta bulunan adet."
-                    ),
-                    'message': serializers.CharField(required=False,
-                                                     help_text="Genel durum mesajı (tüm parçalar varsa)."),
-                    'warnings': serializers.ListField(
-                        child=serializers.CharField(),
-                        required=False,
-                        help_text="Eksik parçalar veya sistem hataları için uyarı listesi."
-                    )
-                }
-            ),
-            400: OpenApiResponse(description="Geçersiz veya eksik 'aircraft_model_name' parametresi."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            404: OpenApiResponse(description="Belirtilen uçak modeli sistemde bulunamadı.")
-        }
-    )
+    @action(detail=False, methods=['post'], url_path='bulk-disassemble', url_name='bulk-disassemble')
+    def bulk_disassemble(self, request):
+        """
+        Birden fazla uçağı (ID listesi veya filtre ile) söker ve siler. Tüm uçakların parçaları tek bir UPDATE
+        ile stoğa döndürülür, uçaklar tek bir DELETE ile silinir. Montaj özetleri, parça geçmişi ve arama dokümanları
+        da toplu olarak güncellenir.
+        """
+        targets, requested_ids = self.get_bulk_targets(AssembledAircraft.objects.all())
+        part_fields = ['wing_id', 'fuselage_id', 'tail_id', 'avionics_id']
+
+        outcomes = {}
+        with transaction.atomic():
+            aircrafts = list(targets.select_for_update().only(
+                'id', 'tail_number', 'aircraft_model_id', 'assembled_by_team_id', 'created_at', *part_fields
+            ))
+            part_ids = [getattr(aircraft, field) for aircraft in aircrafts for field in part_fields]
+            parts = {
+                part.pk: part for part in Part.objects.filter(pk__in=part_ids).select_for_update().only(
+                    'id', 'serial_number', 'status', 'part_type_id', 'aircraft_model_compatibility_id'
+                )
+            }
+
+            now = timezone.now()
+            Part.objects.filter(pk__in=list(parts)).update(status='STOKTA', used_in_aircraft=None, updated_at=now,
+                                                           version=F('version') + 1)
+            if aircrafts:
+                # Sinyaller gönderilmez. Özetler ve geçmiş aşağıda toplu olarak güncellenir.
+                table = connection.ops.quote_name(AssembledAircraft._meta.db_table)
+                aircraft_ids = [aircraft.pk for aircraft in aircrafts]
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(aircraft_ids))})",
+                                   aircraft_ids)
+                search_index.remove('AIRCRAFT', aircraft_ids)
+
+            events = []
+            for aircraft in aircrafts:
+                for field in part_fields:
+                    part = parts[getattr(aircraft, field)]
+                    previous_status, part.status = part.status, 'STOKTA'
+                    events.append(history.part_event(part, 'RELEASED', previous_status, aircraft=aircraft,
+                                                     occurred_at=now))
+                outcomes[aircraft.pk] = ('disassembled', f"{aircraft.tail_number} söküldü, parçaları stoğa döndü.")
+            history.record(events)
+            rollups.record_assembly(aircrafts, delta=-1)
+            if aircrafts:
+                transaction.on_commit(dashboard.invalidate)
+
+        return Response(self.bulk_response(outcomes, requested_ids, not_found_detail="Uçak bulunamadı."))
+
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def check_missing_parts(self, request):
         """
@@ -302,13 +144,13 @@ class AssembledAircraftViewSet(viewsets.ModelViewSet):
         query_serializer.is_valid(raise_exception=True)
         aircraft_model_name = query_serializer.validated_data['aircraft_model_name']
 
-        try:
-            aircraft_model_instance = AircraftModel.objects.get(name=aircraft_model_name)
-        except AircraftModel.DoesNotExist:
+        # Uçak modeli ve parça tipleri referans önbelleğinden okunur.
+        aircraft_model_instance = reference_cache.get_aircraft_models().get(aircraft_model_name)
+        if aircraft_model_instance is None:
             return Response({"error": "Belirtilen uçak modeli bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
 
         required_part_type_names = ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK']
-        part_types_map = {pt.name: pt for pt in PartType.objects.filter(name__in=required_part_type_names)}
+        part_types_map = reference_cache.get_part_types()
 
         warnings = []
         available_parts_summary = {}
@@ -322,7 +164,10 @@ class AssembledAircraftViewSet(viewsets.ModelViewSet):
                 continue
 
             display_name_for_summary = pt.get_name_display()
+            # Başka montajcıların rezerve ettiği parçalar kullanılabilir stoğa sayılmaz, kullanıcının kendi
+            # rezervasyonundakiler sayılır (`PartFilter.available` ile aynı).
             count = Part.objects.filter(
+                KitReservation.available_to(request.user),
                 aircraft_model_compatibility=aircraft_model_instance,  # ForeignKey varsayımı
                 part_type=pt,
                 status='STOKTA'
@@ -345,4 +190,42 @@ class AssembledAircraftViewSet(viewsets.ModelViewSet):
             response_data[
                 "message"] = f"{aircraft_model_instance.get_name_display()} için tüm temel parçalardan en az birer adet stokta mevcut."
 
-        return Response(response_data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class KitReservationViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                            mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """
+    Montaj için parça seti rezervasyonları (bkz. apps.montaj.reservations).
+
+    - `create`: Verilen uçak modeli için her parça tipinden bir parçayı KIT_RESERVATION_TTL saniyeliğine
+      rezerve eder. Sadece Montaj Takımı. Tam set yoksa 409 döner.
+    - `list`, `retrieve`: Kullanıcının süresi dolmamış rezervasyonları (admin için tümü).
+    - `destroy`: Rezervasyonu iptal eder, parçalar serbest kalır.
+    """
+    serializer_class = KitReservationSerializer
+    queryset = KitReservation.objects.none()
+    pagination_class = None
+
+    def get_permissions(self):
+        if self.action == 'create':
+            return [permissions.IsAuthenticated(), IsAssemblyTeam()]
+        return [permissions.IsAuthenticated()]
+
+    def get_queryset(self):
+        queryset = (
+            KitReservation.objects
+            .filter(expires_at__gt=timezone.now())
+            .select_related('aircraft_model', 'reserved_by')
+            .prefetch_related(Prefetch('parts', queryset=Part.objects.select_related(
+                'part_type', 'aircraft_model_compatibility').order_by('part_type__name')))
+        )
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(reserved_by=self.request.user)
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.instance = reservations.reserve_kit(self.request.user, serializer.validated_data['aircraft_model'])
+
+    def perform_destroy(self, instance):
+        reservations.release(instance)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Team
+from .models import AircraftOrder, Team, WorkOrder
 
 
 @admin.register(Team)
@@ -8,4 +8,29 @@ class TeamAdmin(admin.ModelAdmin):
     list_display = ('name', 'responsible_part_type', 'created_at')
     list_filter = ('name',)
     search_fields = ('name',)
-    autocomplete_fields = ['responsible_part_type']
\ No newline at end of file
+    autocomplete_fields = ['responsible_part_type']
+
+
+@admin.register(AircraftOrder)
+class AircraftOrderAdmin(admin.ModelAdmin):
+    list_display = ('aircraft_model', 'quantity', 'fulfilled', 'due_date', 'created_at')
+    list_filter = ('aircraft_model',)
+    date_hierarchy = 'due_date'
+
+    def get_readonly_fields(self, request, obj=None):
+        # Uçak modeli değiştirilirse eski modelin iş emirleri güncellenmez.
+        return ('aircraft_model', 'fulfilled') if obj else ('fulfilled',)
+
+
+@admin.register(WorkOrder)
+class WorkOrderAdmin(admin.ModelAdmin):
+    """İş emirleri zamanlayıcı tarafından yönetilir, sadece görüntülenir."""
+    list_display = ('part_type', 'aircraft_model', 'required', 'in_stock', 'quantity', 'due_date', 'updated_at')
+    list_filter = ('part_type', 'aircraft_model')
+    list_select_related = ('part_type', 'aircraft_model')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UretimConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.uretim'
+
+    def ready(self):
+        from . import scheduler
+        scheduler.connect_signals()
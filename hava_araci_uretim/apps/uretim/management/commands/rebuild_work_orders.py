@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.uretim.scheduler import rebuild
+
+
+class Command(BaseCommand):
+    help = "Üretim iş emirlerini parça ve sipariş tablolarından yeniden hesaplar."
+
+    def handle(self, *args, **options):
+        created = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{created} iş emri oluşturuldu."))
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('envanter', '0008_part_status_constraint'),
+        ('uretim', '0002_populate_initial_teams'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AircraftOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('quantity', models.PositiveIntegerField(verbose_name='Adet')),
+                ('fulfilled', models.PositiveIntegerField(default=0, editable=False, verbose_name='Tamamlanan')),
+                ('due_date', models.DateField(verbose_name='Teslim Tarihi')),
+                ('aircraft_model', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='envanter.aircraftmodel', verbose_name='Uçak Modeli')),
+            ],
+            options={
+                'verbose_name': 'Uçak Siparişi',
+                'verbose_name_plural': 'Uçak Siparişleri',
+                'ordering': ['due_date', 'id'],
+                'indexes': [models.Index(condition=models.Q(('fulfilled__lt', models.F('quantity'))), fields=['aircraft_model', 'due_date', 'id'], name='aircraft_order_open_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('required', models.PositiveIntegerField(default=0, verbose_name='Gereken')),
+                ('in_stock', models.IntegerField(default=0, verbose_name='Stokta')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Üretilecek')),
+                ('due_date', models.DateField(blank=True, null=True, verbose_name='Teslim Tarihi')),
+                ('aircraft_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='work_orders', to='envanter.aircraftmodel', verbose_name='Uçak Modeli')),
+                ('part_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='work_orders', to='envanter.parttype', verbose_name='Parça Tipi')),
+            ],
+            options={
+                'verbose_name': 'İş Emri',
+                'verbose_name_plural': 'İş Emirleri',
+                'ordering': ['due_date', '-quantity'],
+                'indexes': [models.Index(condition=models.Q(('quantity__gt', 0)), fields=['part_type', 'due_date', '-quantity'], name='work_order_queue_idx')],
+                'constraints': [models.UniqueConstraint(fields=('part_type', 'aircraft_model'), name='uniq_work_order')],
+            },
+        ),
+    ]
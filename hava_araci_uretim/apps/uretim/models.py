@@ -50,4 +50,89 @@ class Team(TimeStampedModel):
             return False
         if not self.responsible_part_type:
             return False
-        return self.responsible_part_type == part_type_instance
\ No newline at end of file
+        return self.responsible_part_type == part_type_instance
+
+class AircraftOrder(TimeStampedModel):
+    """
+    Bir uçak modelinden belirli bir tarihe kadar monte edilmesi hedeflenen uçak sayısı.
+    Monte edilen her uçak, aynı modelin teslim tarihi en yakın açık siparişini bir tamamlar
+    (bkz. apps.uretim.scheduler). Uçak modeli sipariş oluşturulduktan sonra değiştirilemez.
+    """
+
+    aircraft_model = models.ForeignKey(
+        'envanter.AircraftModel',
+        on_delete=models.PROTECT,
+        related_name='orders',
+        verbose_name="Uçak Modeli"
+    )
+    quantity = models.PositiveIntegerField(verbose_name="Adet")
+    fulfilled = models.PositiveIntegerField(default=0, editable=False, verbose_name="Tamamlanan")
+    due_date = models.DateField(verbose_name="Teslim Tarihi")
+
+    def __str__(self):
+        return f"{self.aircraft_model} x {self.quantity} ({self.due_date})"
+
+    @property
+    def remaining(self):
+        return max(self.quantity - self.fulfilled, 0)
+
+    class Meta:
+        verbose_name = "Uçak Siparişi"
+        verbose_name_plural = "Uçak Siparişleri"
+        ordering = ['due_date', 'id']
+        indexes = [
+            # Zamanlayıcı sadece açık siparişleri (modele göre, teslim tarihi sırasıyla) okur.
+            models.Index(
+                fields=['aircraft_model', 'due_date', 'id'],
+                condition=models.Q(fulfilled__lt=models.F('quantity')),
+                name='aircraft_order_open_idx'
+            ),
+        ]
+
+
+class WorkOrder(TimeStampedModel):
+    """
+    Bir parça tipi x uçak modeli için açık siparişleri karşılamak üzere üretilmesi gereken parça sayısı.
+    Sorumlu takım parça tipinin takımıdır. Satırlar zamanlayıcı tarafından parça ve sipariş değişikliklerinde
+    güncellenir (bkz. apps.uretim.scheduler), elle düzenlenmez.
+    """
+
+    part_type = models.ForeignKey(
+        'envanter.PartType',
+        on_delete=models.CASCADE,
+        related_name='work_orders',
+        verbose_name="Parça Tipi"
+    )
+    aircraft_model = models.ForeignKey(
+        'envanter.AircraftModel',
+        on_delete=models.CASCADE,
+        related_name='work_orders',
+        verbose_name="Uçak Modeli"
+    )
+    # Açık siparişlerin kalan uçak sayısı (her uçak her parça tipinden bir tane kullanır)
+    required = models.PositiveIntegerField(default=0, verbose_name="Gereken")
+    # Stoktaki parça sayısı. Parça olaylarıyla artımlı olarak güncellenir.
+    in_stock = models.IntegerField(default=0, verbose_name="Stokta")
+    # Üretilmesi gereken parça sayısı: max(gereken - stok, 0)
+    quantity = models.PositiveIntegerField(default=0, verbose_name="Üretilecek")
+    # Stoğun karşılayamadığı ilk siparişin teslim tarihi (açık ihtiyaç yoksa boş)
+    due_date = models.DateField(null=True, blank=True, verbose_name="Teslim Tarihi")
+
+    def __str__(self):
+        return f"{self.part_type} ({self.aircraft_model}): {self.quantity}"
+
+    class Meta:
+        verbose_name = "İş Emri"
+        verbose_name_plural = "İş Emirleri"
+        ordering = ['due_date', '-quantity']
+        constraints = [
+            models.UniqueConstraint(fields=['part_type', 'aircraft_model'], name='uniq_work_order'),
+        ]
+        indexes = [
+            # Takım kuyruğu: Parça tipine göre açık iş emirleri, aciliyet sırasıyla.
+            models.Index(
+                fields=['part_type', 'due_date', '-quantity'],
+                condition=models.Q(quantity__gt=0),
+                name='work_order_queue_idx'
+            ),
+        ]
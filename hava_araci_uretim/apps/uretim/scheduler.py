@@ -0,0 +1,203 @@
+"""
+Eksik parçaya göre üretim iş emirleri.
+
+Açık uçak siparişleri (`AircraftOrder`) her parça tipi x uçak modeli için bir iş emrine (`WorkOrder`)
+dönüştürülür: Gereken parça sayısı modelin açık siparişlerinin kalan uçak sayısıdır, üretilecek sayı
+bunun stokla karşılanamayan kısmıdır. Siparişler teslim tarihi sırasıyla stoktan karşılanır. İş emrinin
+teslim tarihi stoğun yetmediği ilk siparişin teslim tarihidir ve takım kuyruğu bu tarihe göre sıralanır.
+
+İş emirleri sıfırdan hesaplanmaz. Parça olayları (`apps.envanter.history.parts_changed`) ve sipariş
+değişiklikleri sadece etkilenen kombinasyonların satırlarını değişikliği yapan kod ile aynı transaction
+içinde günceller:
+- Stok sayısı parça olaylarıyla artımlı tutulur (STOKTA'ya giren +1, STOKTA'dan çıkan -1). Parça tablosu
+  sadece bir kombinasyonun iş emri ilk kez oluşturulurken sayılır.
+- Monte edilen her uçak, modelinin teslim tarihi en yakın açık siparişini bir tamamlar. Uçak silinirse
+  sipariş geri açılmaz, parçalar stoğa döndüğü için iş emri azalır.
+- Siparişi değişen modelin parça tipi sayısı kadar satır güncellenir.
+
+Olay kaydedilmeden yapılan değişiklikler (örn: admin panelinden durumun elle değiştirilmesi) sayılara
+yansımaz. `manage.py rebuild_work_orders` tüm iş emirlerini kaynak tablolardan yeniden hesaplar.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from apps.core import reference_cache
+from apps.envanter.history import parts_changed
+from apps.envanter.models import Part
+from .models import AircraftOrder, WorkOrder
+
+
+def _combinations(combos, part_type_field='part_type_id', aircraft_model_field='aircraft_model_id'):
+    return Q(*[Q(**{part_type_field: part_type_id, aircraft_model_field: aircraft_model_id})
+               for part_type_id, aircraft_model_id in combos], _connector=Q.OR)
+
+
+def _count_stock(combos):
+    rows = (
+        Part.objects
+        .filter(_combinations(combos, aircraft_model_field='aircraft_model_compatibility_id'), status='STOKTA')
+        .values_list('part_type_id', 'aircraft_model_compatibility_id')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    return Counter({(part_type_id, aircraft_model_id): total for part_type_id, aircraft_model_id, total in rows})
+
+
+def _net(work_order, orders):
+    """Siparişleri (teslim tarihi sırasıyla) stoktan karşılar ve iş emrinin sayılarını hesaplar."""
+    required, due_date = 0, None
+    for order in orders:
+        required += order.remaining
+        if due_date is None and required > work_order.in_stock:
+            due_date = order.due_date
+    work_order.required = required
+    work_order.quantity = max(required - work_order.in_stock, 0)
+    work_order.due_date = due_date
+
+
+def refresh(stock_deltas=None, aircraft_model_ids=()):
+    """
+    Stok değişimlerinin (`stock_deltas`: (parça tipi ID, uçak modeli ID) -> fark) ve siparişleri değişen
+    uçak modellerinin etkilediği iş emirlerini günceller. Sadece bu kombinasyonlar okunur ve yazılır.
+    """
+    stock_deltas = stock_deltas or {}
+    combos = set(stock_deltas)
+    if aircraft_model_ids:
+        part_type_ids = [part_type.pk for part_type in reference_cache.get_part_types().values()]
+        combos |= {(part_type_id, model_id) for part_type_id in part_type_ids for model_id in aircraft_model_ids}
+    if not combos:
+        return
+
+    # Genellikle parçayı değiştiren transaction içinde çalışır, ayrıca savepoint açılmaz.
+    with transaction.atomic(savepoint=False):
+        # Eşzamanlı güncellemeler aynı satırları aynı sırayla kilitler.
+        work_orders = {
+            (work_order.part_type_id, work_order.aircraft_model_id): work_order
+            for work_order in WorkOrder.objects.select_for_update().filter(_combinations(combos)).order_by('pk')
+        }
+        missing = combos - set(work_orders)
+        if missing:
+            # Satırlar önce oluşturulup kilitlenir, stok kilitten sonra sayılır. Aynı kombinasyonun satırını
+            # eşzamanlı oluşturan transaction'ın INSERT'i kazanırsa bu transaction onun commit'ini bekler ve
+            # sayım kazananın ve bu transaction'ın değişikliklerini birlikte içerir.
+            WorkOrder.objects.bulk_create([
+                WorkOrder(part_type_id=part_type_id, aircraft_model_id=aircraft_model_id)
+                for part_type_id, aircraft_model_id in missing
+            ], ignore_conflicts=True)
+            work_orders.update({
+                (work_order.part_type_id, work_order.aircraft_model_id): work_order
+                for work_order in WorkOrder.objects.select_for_update().filter(_combinations(missing)).order_by('pk')
+            })
+            in_stock = _count_stock(missing)
+            for combo in missing:
+                work_orders[combo].in_stock = in_stock[combo]
+        for combo, delta in stock_deltas.items():
+            if combo not in missing:
+                work_orders[combo].in_stock += delta
+
+        orders = defaultdict(list)
+        for order in AircraftOrder.objects.filter(
+                aircraft_model_id__in={model_id for _part_type_id, model_id in combos},
+                fulfilled__lt=F('quantity')).order_by('due_date', 'id'):
+            orders[order.aircraft_model_id].append(order)
+
+        now = timezone.now()
+        for (_part_type_id, model_id), work_order in work_orders.items():
+            _net(work_order, orders[model_id])
+            work_order.updated_at = now
+        WorkOrder.objects.bulk_update(list(work_orders.values()),
+                                      ['required', 'in_stock', 'quantity', 'due_date', 'updated_at'])
+
+
+def fulfil_orders(assembled):
+    """
+    Monte edilen uçakları (`assembled`: uçak modeli ID -> adet) modelin teslim tarihi en yakın açık
+    siparişlerinden düşer. Siparişi değişen model ID'lerini döndürür.
+    """
+    changed = []
+    for model_id, count in assembled.items():
+        orders = list(
+            AircraftOrder.objects.select_for_update()
+            .filter(aircraft_model_id=model_id, fulfilled__lt=F('quantity'))
+            .order_by('due_date', 'id')
+        )
+        updated = []
+        for order in orders:
+            if not count:
+                break
+            used = min(order.remaining, count)
+            order.fulfilled += used
+            count -= used
+            updated.append(order)
+        if updated:
+            AircraftOrder.objects.bulk_update(updated, ['fulfilled'])
+            changed.append(model_id)
+    return changed
+
+
+def rebuild():
+    """Tüm iş emirlerini parça ve sipariş tablolarından yeniden hesaplar. Oluşturulan satır sayısını döndürür."""
+    part_type_ids = [part_type.pk for part_type in reference_cache.get_part_types().values()]
+    model_ids = [model.pk for model in reference_cache.get_aircraft_models().values()]
+    with transaction.atomic():
+        # Mevcut satırlar kilitlenir, böylece eşzamanlı artımlı güncellemeler yeniden hesaplamanın sonrasına kalır.
+        list(WorkOrder.objects.select_for_update().order_by('pk'))
+        in_stock = Counter({
+            (part_type_id, model_id): total
+            for part_type_id, model_id, total in Part.objects.filter(status='STOKTA')
+            .values_list('part_type_id', 'aircraft_model_compatibility_id').annotate(total=Count('id')).order_by()
+        })
+        orders = defaultdict(list)
+        for order in AircraftOrder.objects.filter(fulfilled__lt=F('quantity')).order_by('due_date', 'id'):
+            orders[order.aircraft_model_id].append(order)
+
+        work_orders = []
+        for part_type_id in part_type_ids:
+            for model_id in model_ids:
+                work_order = WorkOrder(part_type_id=part_type_id, aircraft_model_id=model_id,
+                                       in_stock=in_stock[(part_type_id, model_id)])
+                _net(work_order, orders[model_id])
+                work_orders.append(work_order)
+        WorkOrder.objects.all().delete()
+        WorkOrder.objects.bulk_create(work_orders)
+    return len(work_orders)
+
+
+def team_queue(team):
+    """Takımın sorumlu olduğu parça tipinin açık iş emirleri, aciliyet sırasıyla (teslim tarihi, adet)."""
+    return (
+        WorkOrder.objects
+        .filter(part_type_id=team.responsible_part_type_id, quantity__gt=0)
+        .select_related('part_type', 'aircraft_model')
+        .order_by('due_date', '-quantity', 'aircraft_model__name')
+    )
+
+
+def _parts_changed(sender, events, **kwargs):
+    stock_deltas = Counter()
+    assembled_aircraft = {}
+    for event in events:
+        combo = (event.part_type_id, event.aircraft_model_id)
+        if event.to_status == 'STOKTA':
+            stock_deltas[combo] += 1
+        if event.from_status == 'STOKTA':
+            stock_deltas[combo] -= 1
+        if event.kind == 'ASSEMBLED':
+            assembled_aircraft[event.aircraft_id] = event.aircraft_model_id
+    with transaction.atomic(savepoint=False):
+        changed_models = fulfil_orders(Counter(assembled_aircraft.values()))
+        refresh({combo: delta for combo, delta in stock_deltas.items() if delta}, changed_models)
+
+
+def _order_changed(sender, instance, **kwargs):
+    refresh(aircraft_model_ids=[instance.aircraft_model_id])
+
+
+def connect_signals():
+    parts_changed.connect(_parts_changed, dispatch_uid='uretim_scheduler_parts_changed')
+    post_save.connect(_order_changed, sender=AircraftOrder, dispatch_uid='uretim_scheduler_order_saved')
+    post_delete.connect(_order_changed, sender=AircraftOrder, dispatch_uid='uretim_scheduler_order_deleted')
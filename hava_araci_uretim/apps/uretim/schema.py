@@ -0,0 +1,167 @@
+"""
+Üretim uygulaması view'lerinin OpenAPI dökümantasyonu.
+
+Sadece şema üretilirken yüklenir (bkz. apps.core.schema).
+"""
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiResponse
+
+from apps.core.schema import ViewSchemaExtension
+from .serializers import AircraftOrderSerializer, TeamSerializer, WorkOrderSerializer
+
+
+class TeamViewSetSchema(ViewSchemaExtension):
+    target_class = 'apps.uretim.views.TeamViewSet'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Üretim - Takımlar"], # Swagger UI'da gruplama için etiket
+            description="Sistemdeki üretim ve montaj takımlarını yönetir. Tüm CRUD işlemleri sadece admin yetkisine sahip kullanıcılar tarafından gerçekleştirilebilir."
+        )
+        @extend_schema_view(
+            create=extend_schema(
+                summary="Yeni Takım Oluştur (Admin)",
+                description="Yeni bir üretim veya montaj takımı oluşturur. "
+                            "Takım adı (`name`) sistemde tanımlı tiplerden biri olmalıdır (KANAT, GOVDE, MONTAJ vb.). "
+                            "Eğer bir üretim takımı (`name` != 'MONTAJ') oluşturuluyorsa, "
+                            "`responsible_part_type` (ID olarak) gönderilmeli ve `name` ile eşleşmelidir. "
+                            "Montaj takımı için `responsible_part_type` gönderilmemeli veya null olmalıdır.",
+                request=TeamSerializer, # İstek body'si TeamSerializer'a uygun olmalı
+                responses={
+                    201: TeamSerializer, # Başarılı oluşturmada takım bilgileri döner
+                    400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası (örn: isim-parça tipi uyuşmazlığı)."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli (Token eksik veya geçersiz)."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz).")
+                }
+            ),
+            list=extend_schema(
+                summary="Tüm Takımları Listele (Admin)",
+                description="Sistemdeki tüm takımların sayfalanmış bir listesini döndürür.",
+                responses={
+                    200: TeamSerializer(many=True), # Başarılı yanıtta takım listesi
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz).")
+                }
+            ),
+            retrieve=extend_schema(
+                summary="Belirli Bir Takımın Detayını Getir (Admin)",
+                description="Verilen ID'ye sahip takımın detaylarını döndürür.",
+                parameters=[
+                    OpenApiParameter(name='id', description='Takımın unique IDsi.', required=True, type=OpenApiTypes.INT, location=OpenApiParameter.PATH)
+                ],
+                responses={
+                    200: TeamSerializer,
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
+                    404: OpenApiResponse(description="Belirtilen ID ile takım bulunamadı.")
+                }
+            ),
+            partial_update=extend_schema(
+                summary="Takımı Güncelle (Kısmi - Admin)",
+                description="Bir takımın belirli alanlarını günceller. Takım adı ('name') genellikle değiştirilemez. "
+                            "Eğer 'responsible_part_type' güncelleniyorsa, takımın 'name' alanı ile uyumlu olmalıdır.",
+                request=TeamSerializer, # İstek body'si TeamSerializer'a uygun olmalı
+                responses={
+                    200: TeamSerializer,
+                    400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
+                    404: OpenApiResponse(description="Takım bulunamadı.")
+                }
+            ),
+            update=extend_schema(
+                summary="Takımı Güncelle (Tam - Admin)",
+                description="Bir takımın tüm yazılabilir alanlarını günceller. `partial_update` ile benzer validasyon kurallarına tabidir.",
+                request=TeamSerializer,
+                responses={
+                    200: TeamSerializer,
+                    400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
+                    404: OpenApiResponse(description="Takım bulunamadı.")
+                }
+            ),
+            destroy=extend_schema(
+                summary="Takımı Sil (Admin)",
+                description="Belirli bir takımı veritabanından kalıcı olarak siler. "
+                            "Eğer bu takım UserProfile veya Part modellerinde `on_delete=models.SET_NULL` "
+                            "ile referans alınıyorsa, ilgili objelerdeki takım alanı null olur. "
+                            "Eğer `on_delete=models.PROTECT` ile referans alınıyorsa ve bağlı objeler varsa silme işlemi başarısız olur.",
+                parameters=[
+                    OpenApiParameter(name='id', description='Silinecek takımın unique IDsi.', required=True, type=OpenApiTypes.INT, location=OpenApiParameter.PATH)
+                ],
+                request=None, # İstek body'si yok
+                responses={
+                    204: OpenApiResponse(description="Takım başarıyla silindi (İçerik Yok)."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
+                    404: OpenApiResponse(description="Takım bulunamadı."),
+                    # Eğer PROTECT nedeniyle silinemezse 400 veya 409 gibi bir hata dönebilir, bu ayrıca belgelenebilir.
+                    409: OpenApiResponse(description="Takım, başka objeler tarafından kullanıldığı için silinemiyor (PROTECT).") 
+                }
+            ),
+        )
+        class TeamViewSet(self.target_class):
+            pass
+
+        return TeamViewSet
+
+
+class AircraftOrderViewSetSchema(ViewSchemaExtension):
+    target_class = 'apps.uretim.views.AircraftOrderViewSet'
+
+    def build_replacement(self):
+        admin_only = OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz).")
+
+        @extend_schema(
+            tags=["Üretim - Siparişler"],
+            description="Uçak modellerine göre hedef montaj siparişleri. Açık siparişler, stokla karşılanamayan kısım "
+                        "kadar takımlara üretim iş emri olarak dağıtılır. Monte edilen her uçak, modelinin teslim "
+                        "tarihi en yakın açık siparişini bir tamamlar (`fulfilled`)."
+        )
+        @extend_schema_view(
+            list=extend_schema(summary="Siparişleri Listele",
+                               description="Teslim tarihine göre sıralı siparişler."),
+            retrieve=extend_schema(summary="Sipariş Detayı"),
+            create=extend_schema(summary="Sipariş Oluştur (Admin)",
+                                 responses={201: AircraftOrderSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
+                                            403: admin_only}),
+            update=extend_schema(summary="Siparişi Güncelle (Admin)",
+                                 description="Uçak modeli değiştirilemez. Adet, tamamlanan sayıdan az olamaz.",
+                                 responses={200: AircraftOrderSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
+                                            403: admin_only}),
+            partial_update=extend_schema(summary="Siparişi Güncelle (Kısmi - Admin)",
+                                         description="Uçak modeli değiştirilemez. Adet, tamamlanan sayıdan az olamaz.",
+                                         responses={200: AircraftOrderSerializer,
+                                                    400: OpenApiResponse(description="Geçersiz veri."),
+                                                    403: admin_only}),
+            destroy=extend_schema(summary="Siparişi Sil (Admin)",
+                                  responses={204: OpenApiResponse(description="Sipariş silindi."), 403: admin_only}),
+        )
+        class AircraftOrderViewSet(self.target_class):
+            pass
+
+        return AircraftOrderViewSet
+
+
+class MyWorkOrderQueueViewSchema(ViewSchemaExtension):
+    target_class = 'apps.uretim.views.MyWorkOrderQueueView'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Üretim - Siparişler"],
+            summary="Takımımın İş Emri Kuyruğu",
+            description="Kullanıcının takımının sorumlu olduğu parça tipi için açık iş emirleri. Her satır bir uçak "
+                        "modeli için üretilmesi gereken parça sayısıdır (`quantity` = açık siparişlerin gerektirdiği - "
+                        "stok). Aciliyet sırasıyla döner: Stoğun yetmediği ilk siparişin teslim tarihi (`due_date`), "
+                        "sonra eksik adet.",
+            responses={
+                200: WorkOrderSerializer(many=True),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                403: OpenApiResponse(description="Kullanıcı bir üretim takımında değil."),
+            }
+        )
+        class MyWorkOrderQueueView(self.target_class):
+            pass
+
+        return MyWorkOrderQueueView
@@ -1,8 +1,8 @@
 from rest_framework import serializers
 
 from apps.core.serializers import TimeStampedSerializer
-from apps.envanter.models import PartType
-from .models import Team
+from apps.envanter.models import AircraftModel, PartType
+from .models import AircraftOrder, Team, WorkOrder
 
 
 class TeamNestedSerializer(serializers.ModelSerializer):
@@ -87,3 +87,47 @@ class TeamSerializer(TimeStampedSerializer):  # TimeStampedSerializer'dan miras
                                              f"Beklenen parça tipi: {current_name}, Atanan: {current_responsible_part_type.name}."
                 })
         return data
+
+
+class AircraftOrderSerializer(TimeStampedSerializer):
+    """Uçak siparişleri. Tamamlanan sayı montajlarla güncellenir, uçak modeli sonradan değiştirilemez."""
+
+    aircraft_model = serializers.PrimaryKeyRelatedField(queryset=AircraftModel.objects.all())
+    aircraft_model_name = serializers.CharField(source='aircraft_model.name', read_only=True)
+    quantity = serializers.IntegerField(min_value=1)
+    remaining = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = AircraftOrder
+        fields = [
+            'id', 'aircraft_model', 'aircraft_model_name', 'quantity', 'fulfilled', 'remaining', 'due_date',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'fulfilled']
+
+    def validate_aircraft_model(self, value):
+        if self.instance is not None and value != self.instance.aircraft_model:
+            raise serializers.ValidationError("Siparişin uçak modeli değiştirilemez.")
+        return value
+
+    def validate_quantity(self, value):
+        if self.instance is not None and value < self.instance.fulfilled:
+            raise serializers.ValidationError(
+                f"Adet, tamamlanan uçak sayısından ({self.instance.fulfilled}) az olamaz."
+            )
+        return value
+
+
+class WorkOrderSerializer(serializers.ModelSerializer):
+    """Takım kuyruğundaki bir iş emri."""
+
+    part_type_name = serializers.CharField(source='part_type.name', read_only=True)
+    aircraft_model_name = serializers.CharField(source='aircraft_model.name', read_only=True)
+
+    class Meta:
+        model = WorkOrder
+        fields = [
+            'id', 'part_type', 'part_type_name', 'aircraft_model', 'aircraft_model_name',
+            'required', 'in_stock', 'quantity', 'due_date', 'updated_at'
+        ]
+        read_only_fields = fields
@@ -1,13 +1,18 @@
-from unittest import TestCase
+from datetime import date
+from unittest import TestCase, mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from apps.envanter.factories import PartTypeFactory
+from apps.envanter.factories import AircraftModelFactory, PartFactory, PartTypeFactory
 from apps.envanter.models import PartType
+from apps.montaj.models import AssembledAircraft
+from apps.uretim import scheduler
 from apps.uretim.factories import TeamFactory, KanatTeamFactory, AssemblyTeamFactory
-from apps.uretim.models import Team
+from apps.uretim.models import AircraftOrder, Team, WorkOrder
 from apps.users.factories import AdminUserFactory, UserFactory
 
 
@@ -171,4 +176,128 @@ class TeamAPITest(APITestCase):
         self.client.force_authenticate(user=self.admin_user)
         response = self.client.delete(self.team_detail_url(team_to_delete.pk))
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertFalse(Team.objects.filter(pk=team_to_delete.pk).exists())
\ No newline at end of file
+        self.assertFalse(Team.objects.filter(pk=team_to_delete.pk).exists())
+
+
+class WorkOrderSchedulerTest(APITestCase):
+    """Siparişlerin iş emirlerine dönüştürülmesi ve takım kuyruğu testleri."""
+
+    def setUp(self):
+        self.part_types = {name: PartTypeFactory(name=name) for name in ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK']}
+        self.tb2 = AircraftModelFactory(name='TB2')
+        for _ in range(4):
+            self.produce('KANAT')
+        self.first_order = AircraftOrder.objects.create(aircraft_model=self.tb2, quantity=3, due_date=date(2030, 1, 10))
+        self.second_order = AircraftOrder.objects.create(aircraft_model=self.tb2, quantity=2, due_date=date(2030, 2, 10))
+
+        self.kanat_user = UserFactory()
+        self.kanat_user.profile.team = KanatTeamFactory()
+        self.kanat_user.profile.save()
+        self.queue_url = reverse('work-order-my-queue')
+
+    def produce(self, part_type):
+        return PartFactory(part_type=self.part_types[part_type], aircraft_model_compatibility=self.tb2)
+
+    def work_order(self, part_type):
+        return WorkOrder.objects.get(part_type=self.part_types[part_type], aircraft_model=self.tb2)
+
+    def test_orders_are_netted_against_stock(self):
+        wing = self.work_order('KANAT')
+        # 4 kanat ilk siparişi (3) karşılar, ikinci sipariş için 1 kanat eksik.
+        self.assertEqual((wing.required, wing.in_stock, wing.quantity, wing.due_date), (5, 4, 1, date(2030, 2, 10)))
+        fuselage = self.work_order('GOVDE')
+        self.assertEqual((fuselage.quantity, fuselage.due_date), (5, date(2030, 1, 10)))
+
+    def test_part_events_update_only_changed_combination(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.produce('KANAT')
+        sql = [query['sql'] for query in queries.captured_queries]
+        # Stok tablosu sayılmaz, sadece bu kombinasyonun iş emri güncellenir.
+        self.assertFalse([query for query in sql if 'COUNT(' in query and '"envanter_part"' in query])
+        self.assertEqual(len([query for query in sql if query.startswith('UPDATE "uretim_workorder"')]), 1)
+        wing = self.work_order('KANAT')
+        self.assertEqual((wing.in_stock, wing.quantity, wing.due_date), (5, 0, None))
+
+        part = self.produce('KANAT')
+        part.delete()
+        self.assertEqual(self.work_order('KANAT').in_stock, 5)
+
+    def test_assembly_fulfils_earliest_order(self):
+        for part_type in ['GOVDE', 'KUYRUK', 'AVIYONIK']:
+            self.produce(part_type)
+        parts = {part_type: part for part_type, part in zip(
+            ['wing', 'fuselage', 'tail', 'avionics'],
+            [self.tb2.compatible_parts.filter(part_type=self.part_types[name], status='STOKTA').first()
+             for name in ['KANAT', 'GOVDE', 'KUYRUK', 'AVIYONIK']])}
+        AssembledAircraft.objects.create(aircraft_model=self.tb2, tail_number='TB2-SCHED-1', **parts)
+
+        self.first_order.refresh_from_db()
+        self.assertEqual(self.first_order.fulfilled, 1)
+        wing = self.work_order('KANAT')
+        self.assertEqual((wing.required, wing.in_stock, wing.quantity), (4, 3, 1))
+        self.assertEqual(self.work_order('GOVDE').quantity, 4)
+
+    def test_order_changes_update_work_orders(self):
+        self.second_order.delete()
+        self.assertEqual(self.work_order('KANAT').quantity, 0)
+        self.first_order.quantity = 6
+        self.first_order.save()
+        self.assertEqual(self.work_order('KANAT').quantity, 2)
+
+    def test_first_work_order_counts_stock_after_concurrent_insert(self):
+        self.produce('GOVDE')
+        self.produce('GOVDE')
+        combo = (self.part_types['GOVDE'].pk, self.tb2.pk)
+        WorkOrder.objects.filter(part_type_id=combo[0], aircraft_model=self.tb2).delete()
+        bulk_create = WorkOrder.objects.bulk_create
+
+        def concurrent_insert(objs, **kwargs):
+            # Eşzamanlı transaction satırı bu transaction'ın parçasını görmeden (1 parça ile) oluşturdu.
+            bulk_create([WorkOrder(part_type_id=combo[0], aircraft_model_id=combo[1], in_stock=1)])
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(WorkOrder.objects, 'bulk_create', side_effect=concurrent_insert):
+            scheduler.refresh({combo: 1})
+        self.assertEqual(self.work_order('GOVDE').in_stock, 2)
+
+    def test_rebuild_matches_incremental_work_orders(self):
+        self.produce('GOVDE')
+        fields = ('part_type', 'aircraft_model', 'required', 'in_stock', 'quantity', 'due_date')
+        incremental = set(WorkOrder.objects.filter(aircraft_model=self.tb2).values_list(*fields))
+        scheduler.rebuild()
+        self.assertEqual(set(WorkOrder.objects.filter(aircraft_model=self.tb2).values_list(*fields)), incremental)
+
+    def test_my_queue_is_ordered_by_urgency(self):
+        akinci = AircraftModelFactory(name='AKINCI')
+        AircraftOrder.objects.create(aircraft_model=akinci, quantity=1, due_date=date(2030, 1, 1))
+        self.client.force_authenticate(user=self.kanat_user)
+        response = self.client.get(self.queue_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(row['aircraft_model_name'], row['quantity']) for row in response.data],
+                         [('AKINCI', 1), ('TB2', 1)])
+        self.assertEqual({row['part_type_name'] for row in response.data}, {'KANAT'})
+
+    def test_my_queue_requires_production_team(self):
+        user = UserFactory()
+        user.profile.team = AssemblyTeamFactory()
+        user.profile.save()
+        self.client.force_authenticate(user=user)
+        self.assertEqual(self.client.get(self.queue_url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_order_api(self):
+        url = reverse('aircraftorder-list')
+        self.client.force_authenticate(user=self.kanat_user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        data = {'aircraft_model': self.tb2.pk, 'quantity': 2, 'due_date': '2030-03-01'}
+        self.assertEqual(self.client.post(url, data).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=AdminUserFactory())
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(self.work_order('KANAT').quantity, 3)
+
+        detail_url = reverse('aircraftorder-detail', kwargs={'pk': response.data['id']})
+        akinci = AircraftModelFactory(name='AKINCI')
+        response = self.client.patch(detail_url, {'aircraft_model': akinci.pk})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('aircraft_model', response.data)
@@ -4,15 +4,19 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 # İlgili ViewSet'i import ediyoruz:
-from .views import TeamViewSet
+from .views import AircraftOrderViewSet, MyWorkOrderQueueView, TeamViewSet
 
 router = DefaultRouter()
 
 # TeamViewSet'i router'a kaydediyoruz.
 # URL: /api/v1/uretim/teams/
 router.register(r'teams', TeamViewSet, basename='team')
+# URL: /api/v1/uretim/orders/
+router.register(r'orders', AircraftOrderViewSet, basename='aircraftorder')
 
 urlpatterns = [
+    # Kullanıcının takımının iş emri kuyruğu: /api/v1/uretim/work-orders/my-queue/
+    path('work-orders/my-queue/', MyWorkOrderQueueView.as_view(), name='work-order-my-queue'),
     # Router tarafından oluşturulan tüm URL'leri dahil et.
     path('', include(router.urls)),
 ]
\ No newline at end of file
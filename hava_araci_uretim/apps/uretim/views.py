@@ -1,18 +1,15 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
-from rest_framework import viewsets, permissions
+from rest_framework import generics, viewsets, permissions
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework_datatables.filters import DatatablesFilterBackend
 
-from .models import Team
-from .serializers import TeamSerializer
+from . import scheduler
+from .models import AircraftOrder, Team, WorkOrder
+from .serializers import AircraftOrderSerializer, TeamSerializer, WorkOrderSerializer
 
+# OpenAPI dökümantasyonu (extend_schema tanımları) schema.py içindedir ve sadece şema üretilirken yüklenir.
 
-@extend_schema(
-    tags=["Üretim - Takımlar"], # Swagger UI'da gruplama için etiket
-    description="Sistemdeki üretim ve montaj takımlarını yönetir. Tüm CRUD işlemleri sadece admin yetkisine sahip kullanıcılar tarafından gerçekleştirilebilir."
-)
 class TeamViewSet(viewsets.ModelViewSet):
     """
     Üretim ve Montaj Takımlarını yönetmek için ViewSet.
@@ -37,102 +34,39 @@ class TeamViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'created_at']  # Sıralanabilir alanlar
     ordering = ['name']  # Varsayılan sıralama
 
-    @extend_schema(
-        summary="Yeni Takım Oluştur (Admin)",
-        description="Yeni bir üretim veya montaj takımı oluşturur. "
-                    "Takım adı (`name`) sistemde tanımlı tiplerden biri olmalıdır (KANAT, GOVDE, MONTAJ vb.). "
-                    "Eğer bir üretim takımı (`name` != 'MONTAJ') oluşturuluyorsa, "
-                    "`responsible_part_type` (ID olarak) gönderilmeli ve `name` ile eşleşmelidir. "
-                    "Montaj takımı için `responsible_part_type` gönderilmemeli veya null olmalıdır.",
-        request=TeamSerializer, # İstek body'si TeamSerializer'a uygun olmalı
-        responses={
-            201: TeamSerializer, # Başarılı oluşturmada takım bilgileri döner
-            400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası (örn: isim-parça tipi uyuşmazlığı)."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli (Token eksik veya geçersiz)."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz).")
-        }
-    )
-    def create(self, request, *args, **kwargs):
-        return super().create(request, *args, **kwargs)
 
-    @extend_schema(
-        summary="Tüm Takımları Listele (Admin)",
-        description="Sistemdeki tüm takımların sayfalanmış bir listesini döndürür.",
-        responses={
-            200: TeamSerializer(many=True), # Başarılı yanıtta takım listesi
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz).")
-        }
-    )
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Belirli Bir Takımın Detayını Getir (Admin)",
-        description="Verilen ID'ye sahip takımın detaylarını döndürür.",
-        parameters=[
-            OpenApiParameter(name='id', description='Takımın unique IDsi.', required=True, type=OpenApiTypes.INT, location=OpenApiParameter.PATH)
-        ],
-        responses={
-            200: TeamSerializer,
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
-            404: OpenApiResponse(description="Belirtilen ID ile takım bulunamadı.")
-        }
-    )
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+class AircraftOrderViewSet(viewsets.ModelViewSet):
+    """
+    Uçak modellerine göre hedef montaj siparişleri. Siparişler üretim iş emirlerine dönüştürülür
+    (bkz. apps.uretim.scheduler). Oluşturma, güncelleme ve silme için admin yetkisi gerekir.
+    """
+    queryset = AircraftOrder.objects.select_related('aircraft_model').order_by('due_date', 'id')
+    serializer_class = AircraftOrderSerializer
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = {
+        'aircraft_model': ['exact'],
+        'due_date': ['gte', 'lte'],
+    }
+    ordering_fields = ['due_date', 'created_at']
 
-    @extend_schema(
-        summary="Takımı Güncelle (Kısmi - Admin)",
-        description="Bir takımın belirli alanlarını günceller. Takım adı ('name') genellikle değiştirilemez. "
-                    "Eğer 'responsible_part_type' güncelleniyorsa, takımın 'name' alanı ile uyumlu olmalıdır.",
-        request=TeamSerializer, # İstek body'si TeamSerializer'a uygun olmalı
-        responses={
-            200: TeamSerializer,
-            400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
-            404: OpenApiResponse(description="Takım bulunamadı.")
-        }
-    )
-    def partial_update(self, request, *args, **kwargs):
-        return super().partial_update(request, *args, **kwargs)
+    def get_permissions(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return [permissions.IsAdminUser()]
+        return [permissions.IsAuthenticated()]
 
-    @extend_schema(
-        summary="Takımı Güncelle (Tam - Admin)",
-        description="Bir takımın tüm yazılabilir alanlarını günceller. `partial_update` ile benzer validasyon kurallarına tabidir.",
-        request=TeamSerializer,
-        responses={
-            200: TeamSerializer,
-            400: OpenApiResponse(description="Geçersiz veri veya validasyon hatası."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
-            404: OpenApiResponse(description="Takım bulunamadı.")
-        }
-    )
-    def update(self, request, *args, **kwargs):
-        return super().update(request, *args, **kwargs)
 
-    @extend_schema(
-        summary="Takımı Sil (Admin)",
-        description="Belirli bir takımı veritabanından kalıcı olarak siler. "
-                    "Eğer bu takım UserProfile veya Part modellerinde `on_delete=models.SET_NULL` "
-                    "ile referans alınıyorsa, ilgili objelerdeki takım alanı null olur. "
-                    "Eğer `on_delete=models.PROTECT` ile referans alınıyorsa ve bağlı objeler varsa silme işlemi başarısız olur.",
-        parameters=[
-            OpenApiParameter(name='id', description='Silinecek takımın unique IDsi.', required=True, type=OpenApiTypes.INT, location=OpenApiParameter.PATH)
-        ],
-        request=None, # İstek body'si yok
-        responses={
-            204: OpenApiResponse(description="Takım başarıyla silindi (İçerik Yok)."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
-            404: OpenApiResponse(description="Takım bulunamadı."),
-            # Eğer PROTECT nedeniyle silinemezse 400 veya 409 gibi bir hata dönebilir, bu ayrıca belgelenebilir.
-            409: OpenApiResponse(description="Takım, başka objeler tarafından kullanıldığı için silinemiyor (PROTECT).") 
-        }
-    )
-    def destroy(self, request, *args, **kwargs):
+class MyWorkOrderQueueView(generics.ListAPIView):
+    """
+    Kullanıcının takımının açık iş emirleri, aciliyet sırasıyla (teslim tarihi en yakın, sonra en çok eksik).
+    Sadece üretim takımlarının kuyruğu vardır.
+    """
+    queryset = WorkOrder.objects.none()
+    serializer_class = WorkOrderSerializer
+    pagination_class = None  # En fazla uçak modeli sayısı kadar satır
 
-        return super().destroy(request, *args, **kwargs)
\ No newline at end of file
+    def get_queryset(self):
+        profile = getattr(self.request.user, 'profile', None)
+        team = profile.team if profile else None
+        if team is None or team.responsible_part_type_id is None:
+            raise PermissionDenied("Sadece üretim takımlarının iş emri kuyruğu vardır.")
+        return scheduler.team_queue(team)
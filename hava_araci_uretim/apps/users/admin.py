@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 
-from .models import UserProfile
+from .models import AuthToken, UserProfile
 
 
 class UserProfileInline(admin.StackedInline):
@@ -28,3 +28,14 @@ class UserAdmin(BaseUserAdmin):
 admin.site.unregister(User)
 admin.site.register(User, UserAdmin)
 
+
+
+@admin.register(AuthToken)
+class AuthTokenAdmin(admin.ModelAdmin):
+    list_display = ('user', 'created_at', 'expires_at', 'rotated_at')
+    list_select_related = ('user',)
+    search_fields = ('user__username',)
+    raw_id_fields = ('user',)
+    # Anahtar listede gösterilmez, sadece detay sayfasında görünür.
+    fields = ('key', 'user', 'expires_at', 'rotated_at')
+    readonly_fields = ('key', 'rotated_at')
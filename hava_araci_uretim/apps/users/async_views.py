@@ -0,0 +1,62 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import Throttled
+
+from apps.core.async_views import async_api_view
+from apps.core.throttling import ScopedRateThrottle
+from . import login as login_pipeline
+from .serializers import LoginSerializer, UserSerializer
+
+
+@async_api_view
+async def me(request):
+    """
+    Giriş yapmış kullanıcının bilgilerini döndürür. `UserViewSet.me` ile aynı yanıtı döner.
+    Kullanıcı, profili ve takımı kimlik doğrulama sırasında tek sorguda yüklendiği için ek sorgu yapılmaz.
+    """
+    return JsonResponse(UserSerializer(request.user, context={'request': request}).data)
+
+
+class _LoginThrottleView:
+    # ScopedRateThrottle, scope'u view'den okur. `UserLoginAPIView` ile aynı limit paylaşılır.
+    throttle_scope = 'login_attempts'
+
+
+@csrf_exempt  # Token ile çalışan API, DRF view'leri gibi CSRF kontrolü yapılmaz.
+async def login(request):
+    """
+    `UserLoginAPIView`'in async karşılığı, aynı yanıtı döner. Şifre doğrulaması beklenirken worker başka
+    istekleri işlemeye devam eder. Sadece JSON gövdeli POST isteklerini kabul eder.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"detail": f'"{request.method}" metoduna izin verilmiyor.'}, status=405)
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({"detail": "Geçersiz JSON."}, status=400)
+
+    request.user = AnonymousUser()
+    throttle = ScopedRateThrottle()
+    if not await sync_to_async(throttle.allow_request)(request, _LoginThrottleView()):
+        wait = await sync_to_async(throttle.wait)()
+        response = JsonResponse({"detail": str(Throttled(wait).detail)}, status=429)
+        if wait is not None:
+            response['Retry-After'] = '%d' % wait
+        return response
+
+    serializer = LoginSerializer(data=data if isinstance(data, dict) else {})
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    try:
+        result = await login_pipeline.alogin(serializer.validated_data['username'],
+                                             serializer.validated_data['password'])
+    except login_pipeline.LoginError as exc:
+        response = JsonResponse({"error": exc.message}, status=exc.status_code)
+        if exc.retry_after is not None:
+            response['Retry-After'] = str(exc.retry_after)
+        return response
+    return JsonResponse(result)
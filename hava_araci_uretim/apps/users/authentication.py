@@ -0,0 +1,25 @@
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from .models import AuthToken
+
+
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """
+    `Authorization: Token <key>` başlığını süreli `AuthToken` tablosuna göre doğrular.
+    Token, kullanıcısı ile tek sorguda okunur. Süresi dolmuş token'lar reddedilir.
+    """
+    model = AuthToken
+
+    def authenticate_credentials(self, key):
+        try:
+            token = AuthToken.objects.select_related('user').get(key=key)
+        except AuthToken.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if token.expires_at <= timezone.now():
+            raise exceptions.AuthenticationFailed("Token'ın süresi doldu, tekrar giriş yapın.")
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return token.user, token
@@ -0,0 +1,175 @@
+"""
+Düşük gecikmeli giriş (login).
+
+Vardiya değişimlerinde yüzlerce kullanıcı aynı anda giriş yapar. Her girişte worker'da çalışan şifre
+doğrulaması (PBKDF2, yüzlerce ms CPU), ayrı kullanıcı ve token sorguları ve grupları/izinleri okuyan tam
+`UserSerializer` birkaç sync worker'ın hepsini girişlere kilitleyebilir. Bu modüldeki akış:
+
+- Kullanıcı, profili, takımı ve tekrar kullanılabilir token'ı tek sorguyla okunur.
+- Şifre doğrulaması LOGIN_HASH_THREADS thread'lik ortak bir havuzda çalışır. `hashlib.pbkdf2_hmac` GIL'i
+  bıraktığı için thread'ler paralel çalışır. Havuzda bekleyen ve çalışan doğrulama sayısı LOGIN_HASH_QUEUE
+  ile sınırlıdır. Sınır doluysa istek beklemeden `LoginBusy` (503, Retry-After) ile reddedilir, böylece giriş
+  dalgası worker'ları CPU kuyruğunda bekletmez ve diğer istekler hizmet almaya devam eder. ASGI modunda
+  async giriş view'i doğrulamayı event loop'u bloklamadan bekler.
+- Süresinin en az yarısı kalmış geçerli bir token varsa o döner (yazma yapılmaz). Yoksa yeni bir süreli
+  token oluşturulur (bkz. `AuthToken`).
+- Yanıttaki kullanıcı bilgisi grupları/izinleri içermeyen kısa bir özettir, tam bilgi `/users/users/me/` ile
+  alınır.
+
+Havuz ilk girişte oluşturulur, böylece gunicorn'un preload sonrası fork'u thread'leri kopyalamaz.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, verify_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import AuthToken
+
+DEFAULT_HASH_THREADS = 2
+DEFAULT_HASH_QUEUE = 32
+DEFAULT_ROTATION_GRACE = 60
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+
+
+class LoginError(Exception):
+    status_code = 401
+    message = "Geçersiz kullanıcı adı veya şifre."
+    retry_after = None
+
+
+class InactiveUser(LoginError):
+    status_code = 400
+    message = "Kullanıcı hesabı aktif değil."
+
+
+class LoginBusy(LoginError):
+    status_code = 503
+    message = "Şu anda çok fazla giriş isteği var, birkaç saniye sonra tekrar deneyin."
+    retry_after = 1
+
+
+def _pool():
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            threads = getattr(settings, 'LOGIN_HASH_THREADS', DEFAULT_HASH_THREADS)
+            _executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='login-hash')
+            _slots = threading.BoundedSemaphore(getattr(settings, 'LOGIN_HASH_QUEUE', DEFAULT_HASH_QUEUE))
+    return _executor, _slots
+
+
+def submit_password_check(password, encoded):
+    """
+    `verify_password(password, encoded)` çağrısını havuza gönderir ve Future döndürür. Sınır doluysa
+    `LoginBusy` fırlatır.
+    """
+    executor, slots = _pool()
+    if not slots.acquire(blocking=False):
+        raise LoginBusy()
+    try:
+        future = executor.submit(verify_password, password, encoded)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _future: slots.release())
+    return future
+
+
+def _user_query(username, now):
+    # Süresinin en az yarısı kalan, rotasyona uğramamış en yeni token.
+    reusable = (
+        AuthToken.objects
+        .filter(user=OuterRef('pk'), rotated_at__isnull=True, expires_at__gt=now + AuthToken.ttl() / 2)
+        .order_by('-expires_at')
+    )
+    return (
+        User.objects
+        .select_related('profile__team')
+        .annotate(reusable_token=Subquery(reusable.values('key')[:1]),
+                  reusable_token_expires_at=Subquery(reusable.values('expires_at')[:1]))
+        .filter(username=username)
+    )
+
+
+def _encoded_password(user):
+    # Kullanıcı yoksa da (kullanılamaz şifre ile) bir hash hesaplanır, yanıt süresi kullanıcının varlığını belli etmez.
+    return user.password if user is not None else UNUSABLE_PASSWORD_PREFIX
+
+
+def principal(user, key, expires_at):
+    """Giriş yanıtı: token, son geçerlilik ve kısa kullanıcı özeti."""
+    profile = getattr(user, 'profile', None)
+    team = profile.team if profile else None
+    return {
+        'token': key,
+        'expires_at': serializers.DateTimeField().to_representation(expires_at),
+        'user': {
+            'id': user.pk,
+            'username': user.username,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_staff': user.is_staff,
+            'team': {'id': team.pk, 'name': team.name, 'display_name': team.get_name_display()} if team else None,
+        },
+    }
+
+
+def _complete(user, password, valid, must_update):
+    if user is None or not valid:
+        raise LoginError()
+    if not user.is_active:
+        raise InactiveUser()
+    if must_update:
+        # Hasher veya iterasyon sayısı değişmiş: Şifre yeni ayarlarla tekrar hash'lenir (ModelBackend ile aynı).
+        user.set_password(password)
+        user.save(update_fields=['password'])
+    if user.reusable_token:
+        return principal(user, user.reusable_token, user.reusable_token_expires_at)
+    token = AuthToken.objects.create(user=user)
+    return principal(user, token.key, token.expires_at)
+
+
+def login(username, password):
+    """Kullanıcıyı doğrular ve giriş yanıtını döndürür. Başarısızsa `LoginError` (alt sınıfları) fırlatır."""
+    user = _user_query(username, timezone.now()).first()
+    valid, must_update = submit_password_check(password, _encoded_password(user)).result()
+    return _complete(user, password, valid, must_update)
+
+
+async def alogin(username, password):
+    """`login`'in async karşılığı: Şifre doğrulaması beklenirken event loop bloklanmaz."""
+    user = await _user_query(username, timezone.now()).afirst()
+    valid, must_update = await asyncio.wrap_future(submit_password_check(password, _encoded_password(user)))
+    return await sync_to_async(_complete)(user, password, valid, must_update)
+
+
+def rotate(token):
+    """
+    Token'ı yeniler: Yeni token oluşturulur, eskisi AUTH_TOKEN_ROTATION_GRACE saniye daha (o sırada gönderilmiş
+    istekler için) geçerli kalır. Yeni token'ı ve son geçerliliğini döndürür.
+    """
+    now = timezone.now()
+    grace = timedelta(seconds=getattr(settings, 'AUTH_TOKEN_ROTATION_GRACE', DEFAULT_ROTATION_GRACE))
+    with transaction.atomic():
+        new_token = AuthToken.objects.create(user_id=token.user_id)
+        AuthToken.objects.filter(pk=token.pk).update(rotated_at=now, expires_at=min(token.expires_at, now + grace))
+    return {'token': new_token.key,
+            'expires_at': serializers.DateTimeField().to_representation(new_token.expires_at)}
+
+
+def purge_expired_tokens(now=None):
+    """Süresi dolmuş token'ları siler, silinen satır sayısını döndürür."""
+    deleted, _by_model = AuthToken.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.login import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Süresi dolmuş API token'larını siler (örn: cron ile günde bir çalıştırılabilir)."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} süresi dolmuş token silindi."))
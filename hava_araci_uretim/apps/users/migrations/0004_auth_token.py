@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:54
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_legacy_tokens(apps, schema_editor):
+    # Mevcut (süresiz) DRF token'ları AUTH_TOKEN_TTL süreyle taşınır, giriş yapmış kullanıcıların oturumu kapanmaz.
+    Token = apps.get_model('authtoken', 'Token')
+    AuthToken = apps.get_model('users', 'AuthToken')
+    expires_at = timezone.now() + timedelta(seconds=getattr(settings, 'AUTH_TOKEN_TTL', 7 * 24 * 60 * 60))
+    AuthToken.objects.bulk_create(
+        [AuthToken(key=token.key, user_id=token.user_id, expires_at=expires_at) for token in Token.objects.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_create_default_team_users'),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthToken',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False, verbose_name='Anahtar')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('expires_at', models.DateTimeField(verbose_name='Son Geçerlilik')),
+                ('rotated_at', models.DateTimeField(blank=True, null=True, verbose_name='Yenilenme Tarihi')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='auth_tokens', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'API Token',
+                'verbose_name_plural': "API Token'ları",
+                'indexes': [models.Index(fields=['user', 'expires_at'], name='users_token_user_expiry_idx'), models.Index(fields=['expires_at'], name='users_token_expiry_idx')],
+            },
+        ),
+        migrations.RunPython(copy_legacy_tokens, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,13 @@
+import binascii
+import os
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from apps.core.models import TimeStampedModel
 
@@ -39,9 +45,56 @@ class UserProfile(TimeStampedModel):
         ordering = ['user__username']
 
 
-# User oluşunca profil de oluşsun sinyali
+
+DEFAULT_TOKEN_TTL = 7 * 24 * 60 * 60
+
+
+class AuthToken(models.Model):
+    """
+    Süreli API token'ı (`Authorization: Token <key>`, bkz. apps.users.authentication).
+    Bir kullanıcının birden fazla geçerli token'ı olabilir (örn: rotasyon sonrası kısa geçiş süresi).
+    Süresi dolan satırlar `manage.py purge_expired_tokens` ile silinir.
+    """
+    key = models.CharField(max_length=40, primary_key=True, verbose_name="Anahtar")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='auth_tokens', verbose_name="Kullanıcı")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+    expires_at = models.DateTimeField(verbose_name="Son Geçerlilik")
+    rotated_at = models.DateTimeField(null=True, blank=True, verbose_name="Yenilenme Tarihi")
+
+    class Meta:
+        verbose_name = "API Token"
+        verbose_name_plural = "API Token'ları"
+        indexes = [
+            # Girişte kullanıcının tekrar kullanılabilir token'ı ve süresi dolanların silinmesi.
+            models.Index(fields=['user', 'expires_at'], name='users_token_user_expiry_idx'),
+            models.Index(fields=['expires_at'], name='users_token_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} ({self.expires_at:%Y-%m-%d %H:%M})"
+
+    @staticmethod
+    def generate_key():
+        return binascii.hexlify(os.urandom(20)).decode()
+
+    @staticmethod
+    def ttl():
+        return timedelta(seconds=getattr(settings, 'AUTH_TOKEN_TTL', DEFAULT_TOKEN_TTL))
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = self.generate_key()
+        if self.expires_at is None:
+            self.expires_at = timezone.now() + self.ttl()
+        super().save(*args, **kwargs)
+
+# User oluşunca profil de oluşsun sinyali. Sonraki kayıtlarda (örn: last_login güncellemesi) profil yazılmaz.
+# Toplu oluşturmada (bulk_create) sinyal çalışmaz, profiller ayrıca oluşturulur (bkz. apps.users.provisioning).
 @receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
-    if created:
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
         UserProfile.objects.create(user=instance)
-    instance.profile.save() # Silinebilir (opsiyonel)
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""
+Çok sayıda şifrenin paralel hash'lenmesi.
+
+Varsayılan hasher (PBKDF2) şifre başına onlarca milisaniye CPU harcar, binlerce kullanıcı tek process'te
+dakikalar sürer. Şifreler HASH_CHUNK_SIZE'lık parçalara bölünür ve `workers` > 1 ise ayrı process'lerde
+hash'lenir. Hasher (PASSWORD_HASHERS'ın ilki) ana process'te seçilir ve worker'lara gönderilir.
+
+Bu modül process'lerde Django kurulmadan yüklenebilmesi için ayarları sadece fonksiyon içinde okur.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+HASH_CHUNK_SIZE = 50
+
+
+def hash_chunk(hasher, passwords):
+    return [hasher.encode(password, hasher.salt()) for password in passwords]
+
+
+def hash_passwords(passwords, workers=1):
+    """
+    `passwords` listesini sırasıyla hash'ler. Boş şifreler (None veya '') kullanılamaz şifre olur
+    (`make_password(None)`).
+    """
+    from django.contrib.auth.hashers import get_hasher, make_password
+
+    hasher = get_hasher()
+    indexes = [index for index, password in enumerate(passwords) if password]
+    chunks = [[passwords[index] for index in indexes[start:start + HASH_CHUNK_SIZE]]
+              for start in range(0, len(indexes), HASH_CHUNK_SIZE)]
+    if workers > 1 and len(chunks) > 1:
+        # fork yerine spawn: Web process'inin thread'leri ve veritabanı bağlantıları kopyalanmaz.
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(hash_chunk, [hasher] * len(chunks), chunks))
+    else:
+        results = [hash_chunk(hasher, chunk) for chunk in chunks]
+
+    encoded = [None if password else make_password(None) for password in passwords]
+    for index, value in zip(indexes, (value for chunk in results for value in chunk)):
+        encoded[index] = value
+    return encoded
@@ -0,0 +1,108 @@
+"""
+CSV'den toplu kullanıcı oluşturma (örn: yeni vardiyanın personeli).
+
+CSV'nin ilk satırı başlıktır: `username`, `email` zorunlu; `first_name`, `last_name`, `password` ve `team`
+(takım adı, örn: KANAT) isteğe bağlıdır. Şifresi boş kullanıcılar şifre ile giriş yapamaz.
+
+- Tüm satırlar önce doğrulanır (alanlar, dosya içinde tekrar eden ve veritabanında zaten olan kullanıcı
+  adları tek sorguyla). Hatalı satır varsa hiçbir kullanıcı oluşturulmaz, hatalar satır numaralarıyla döner.
+- Şifreler `apps.users.passwords` ile (istenirse process havuzunda) hash'lenir.
+- Kullanıcılar ve takımları atanmış profilleri iki `bulk_create` ile aynı transaction'da oluşturulur. Satır
+  başına `post_save` sinyali ve profil sorguları çalışmaz. Arama dokümanları da aynı transaction'da toplu eklenir.
+"""
+import csv
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+
+from apps.arama import index as search_index
+from apps.core import reference_cache
+from .models import UserProfile
+from .passwords import hash_passwords
+from .serializers import ProvisionedUserSerializer
+
+BATCH_SIZE = 1000
+COLUMNS = ('username', 'email', 'first_name', 'last_name', 'password', 'team')
+
+
+class InvalidRows(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "CSV'de hatalı satırlar var, hiçbir kullanıcı oluşturulmadı."
+    default_code = 'invalid_rows'
+
+    def __init__(self, errors):
+        super().__init__()
+        # Satır numaraları sayı olarak kalsın diye ValidationError yerine detay doğrudan atanır.
+        self.detail = {'detail': self.default_detail, 'errors': errors}
+
+
+def read_csv(stream):
+    """CSV'yi okur, (satır numarası, satır) listesi döndürür. Başlıkta zorunlu sütunlar yoksa ValidationError fırlatır."""
+    reader = csv.DictReader(stream)
+    missing = {'username', 'email'} - set(reader.fieldnames or ())
+    if missing:
+        raise serializers.ValidationError({'file': f"CSV başlığında eksik sütun: {', '.join(sorted(missing))}."})
+    return [(reader.line_num, {key: (row.get(key) or '').strip() for key in COLUMNS}) for row in reader]
+
+
+def _validate(rows):
+    teams = reference_cache.get_teams()
+    valid, errors = [], []
+    seen = {}
+    for line, row in rows:
+        serializer = ProvisionedUserSerializer(data=row)
+        if not serializer.is_valid():
+            errors.append({'line': line, 'errors': serializer.errors})
+            continue
+        data = serializer.validated_data
+        if data['username'] in seen:
+            errors.append({'line': line, 'errors': {
+                'username': [f"Kullanıcı adı {seen[data['username']]}. satırda da var."]}})
+            continue
+        seen[data['username']] = line
+        if data.get('team') and data['team'] not in teams:
+            errors.append({'line': line, 'errors': {'team': [f"'{data['team']}' takımı tanımlı değil."]}})
+            continue
+        valid.append((line, data))
+
+    existing = set(User.objects.filter(username__in=[data['username'] for _line, data in valid])
+                   .values_list('username', flat=True))
+    for line, data in valid:
+        if data['username'] in existing:
+            errors.append({'line': line, 'errors': {'username': ["Bu kullanıcı adı zaten kullanılıyor."]}})
+    if errors:
+        raise InvalidRows(sorted(errors, key=lambda error: error['line']))
+    return [data for _line, data in valid]
+
+
+def provision(rows, workers=1):
+    """
+    `rows` (`read_csv` çıktısı) için kullanıcıları ve profillerini oluşturur, oluşturulan kullanıcıları döndürür.
+    Hatalı satır varsa `InvalidRows` fırlatır ve hiçbir şey oluşturmaz.
+    """
+    rows = _validate(rows)
+    teams = reference_cache.get_teams()
+    passwords = hash_passwords([data.get('password') for data in rows], workers)
+    now = timezone.now()
+    users = [
+        User(username=data['username'], email=data['email'], first_name=data.get('first_name', ''),
+             last_name=data.get('last_name', ''), password=password, date_joined=now)
+        for data, password in zip(rows, passwords)
+    ]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+            UserProfile.objects.bulk_create([
+                UserProfile(user=user, team=teams.get(data.get('team')))
+                for user, data in zip(users, rows)
+            ], batch_size=BATCH_SIZE)
+            search_index.index('USER', [user.pk for user in users])
+    except IntegrityError:
+        # Doğrulamadan sonra aynı kullanıcı adıyla başka bir istek kullanıcı oluşturdu.
+        raise serializers.ValidationError(
+            {'detail': "Kullanıcı adlarından biri bu sırada başka bir işlem tarafından alındı, tekrar deneyin."}
+        ) from None
+    return users
@@ -0,0 +1,301 @@
+"""
+Kullanıcılar uygulaması view'lerinin OpenAPI dökümantasyonu.
+
+Sadece şema üretilirken yüklenir (bkz. apps.core.schema).
+"""
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiResponse, inline_serializer
+from rest_framework import serializers
+
+from apps.core.schema import ViewSchemaExtension
+from .serializers import (
+    UserSerializer, UserRegistrationSerializer, LoginSerializer, UserProfileSerializer, UserProvisioningSerializer
+)
+
+
+class UserViewSetSchema(ViewSchemaExtension):
+    target_class = 'apps.users.views.UserViewSet'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Kullanıcılar - User Yönetimi (Admin)"],
+            description=(
+                    "Sistemdeki Django User objelerini listeler ve detaylarını görüntüler. "
+                    "Bu endpoint'ler öncelikli olarak admin yetkisine sahip kullanıcılar için tasarlanmıştır.\n"
+                    "Giriş yapmış kullanıcılar kendi temel bilgilerine (profili dahil) `/me/` alt endpoint'inden erişebilir.\n"
+                    "Bu ViewSet, DataTables server-side processing'i destekler."
+            )
+        )
+        @extend_schema_view(
+            list=extend_schema(
+                summary="Tüm Kullanıcıları Listele (Admin)",
+                description="Sistemdeki tüm kullanıcıların (profilleri ve takımları dahil) sayfalanmış bir listesini döndürür. "
+                            "Sadece admin yetkisine sahip kullanıcılar erişebilir. DataTables ile uyumludur.",
+                parameters=[  # Örnek DjangoFilterBackend parametreleri
+                    OpenApiParameter(name='username__icontains', description='Kullanıcı adında geçen ifade.',
+                                     type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='email__icontains', description='E-posta adresinde geçen ifade.',
+                                     type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='is_active', description='Aktiflik durumuna göre filtrele (true/false).',
+                                     type=OpenApiTypes.BOOL, location=OpenApiParameter.QUERY),
+                    OpenApiParameter(name='profile__team', description='Kullanıcının ait olduğu takımın IDsi ile filtrele.',
+                                     type=OpenApiTypes.INT, location=OpenApiParameter.QUERY),
+                ],
+                responses={  # DataTables yanıtı için
+                    200: inline_serializer(
+                        name='UserListDatatablesResponse',
+                        fields={
+                            'draw': serializers.IntegerField(),
+                            'recordsTotal': serializers.IntegerField(),
+                            'recordsFiltered': serializers.IntegerField(),
+                            'data': UserSerializer(many=True)  # UserSerializer listesi
+                        }
+                    ),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz).")
+                }
+            ),
+            retrieve=extend_schema(
+                summary="Belirli Bir Kullanıcının Detayını Getir (Admin)",
+                description="Verilen ID'ye sahip kullanıcının detaylarını (profili ve takımı dahil) döndürür. "
+                            "Sadece admin yetkisine sahip kullanıcılar erişebilir.",
+                parameters=[
+                    OpenApiParameter(name='id', description='Kullanıcının unique IDsi.', required=True, type=OpenApiTypes.INT,
+                                     location=OpenApiParameter.PATH)
+                ],
+                responses={
+                    200: UserSerializer,
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
+                    404: OpenApiResponse(description="Belirtilen ID ile kullanıcı bulunamadı.")
+                }
+            ),
+            me=extend_schema(
+                summary="Giriş Yapmış Kullanıcının Bilgilerini Getir",
+                description="Oturum açmış olan kullanıcının kendi detaylı kullanıcı ve profil bilgilerini döndürür. "
+                            "Bu endpoint için kullanıcının sadece kimliğinin doğrulanmış olması yeterlidir.",
+                responses={
+                    200: UserSerializer,
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli (Token eksik veya geçersiz).")
+                }
+            ),
+            provision=extend_schema(
+                summary="CSV'den Toplu Kullanıcı Oluştur (Admin)",
+                description="Yüklenen CSV dosyasındaki (multipart, `file` alanı) kullanıcıları profilleri ve takımlarıyla "
+                            "birlikte oluşturur. Başlık satırı: `username`, `email` (zorunlu), `first_name`, "
+                            "`last_name`, `password`, `team` (takım adı, örn: KANAT). Şifresi boş kullanıcılar şifre "
+                            "ile giriş yapamaz. Herhangi bir satır hatalıysa hiçbir kullanıcı oluşturulmaz ve hatalar "
+                            "satır numaralarıyla döner. Tek istekteki satır sayısı USER_PROVISIONING_MAX_ROWS ile "
+                            "sınırlıdır (`manage.py provision_users` ile sınır yoktur).",
+                request={'multipart/form-data': UserProvisioningSerializer},
+                responses={
+                    201: inline_serializer(
+                        name='UserProvisioningResponse',
+                        fields={
+                            'created': serializers.IntegerField(),
+                            'users': inline_serializer(name='ProvisionedUser', many=True, fields={
+                                'id': serializers.IntegerField(),
+                                'username': serializers.CharField(),
+                            }),
+                        }
+                    ),
+                    400: OpenApiResponse(description="Geçersiz dosya veya hatalı satırlar "
+                                                     "(`errors`: [{`line`, `errors`}])."),
+                    403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz).")
+                }
+            ),
+        )
+        class UserViewSet(self.target_class):
+            pass
+
+        return UserViewSet
+
+
+class UserRegistrationAPIViewSchema(ViewSchemaExtension):
+    target_class = 'apps.users.views.UserRegistrationAPIView'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Kullanıcılar - Kimlik Doğrulama"],
+            summary="Yeni Kullanıcı Kaydı",
+            description="Yeni bir kullanıcı hesabı oluşturur. Kullanıcı adı, e-posta ve şifre zorunludur. "
+                        "İsteğe bağlı olarak bir `team_id` gönderilerek kullanıcı bir takıma atanabilir. "
+                        "Başarılı kayıt sonrası oluşturulan kullanıcı bilgileri (şifre hariç) döndürülür.",
+            request=UserRegistrationSerializer,
+            responses={
+                201: UserSerializer,  # Başarılı kayıtta UserSerializer ile kullanıcı bilgisi döner
+                400: OpenApiResponse(
+                    description="Geçersiz veri veya validasyon hatası (örn: şifreler uyuşmuyor, geçersiz team_id, eksik alanlar).")
+            }
+        )
+        class UserRegistrationAPIView(self.target_class):
+            pass
+
+        return UserRegistrationAPIView
+
+
+TOKEN_RESPONSE_FIELDS = {
+    'token': serializers.CharField(),
+    'expires_at': serializers.DateTimeField(help_text="Token'ın son geçerlilik zamanı."),
+}
+
+
+class UserLoginAPIViewSchema(ViewSchemaExtension):
+    target_class = 'apps.users.views.UserLoginAPIView'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Kullanıcılar - Kimlik Doğrulama"],
+            summary="Kullanıcı Girişi",
+            description="Kullanıcı adı ve şifre ile kimlik doğrulaması yapar. Başarılı girişte, kullanıcıya ait "
+                        "süreli bir API token'ı ve kısa kullanıcı bilgileri döndürülür (tam bilgi için `/users/me/`). "
+                        "Bu token, yetki gerektiren diğer API endpoint'lerine yapılan isteklerde "
+                        "`Authorization: Token <token_değeri>` başlığında kullanılmalıdır. Süresinin en az yarısı "
+                        "kalmış bir token varsa aynı token döner. Süresi dolmadan `/token/rotate/` ile yenilenmelidir.\n"
+                        "Aynı anda çok fazla giriş isteği varsa 503 döner, istek `Retry-After` saniye sonra tekrarlanmalıdır.",
+            request=LoginSerializer,  # İstek body'si username ve password içermeli
+            responses={
+                200: inline_serializer(  # Başarılı giriş yanıtı için anlık serializer
+                    name='UserLoginSuccessResponse',
+                    fields={
+                        **TOKEN_RESPONSE_FIELDS,
+                        'user': inline_serializer(
+                            name='LoginUser',
+                            fields={
+                                'id': serializers.IntegerField(),
+                                'username': serializers.CharField(),
+                                'first_name': serializers.CharField(),
+                                'last_name': serializers.CharField(),
+                                'is_staff': serializers.BooleanField(),
+                                'team': inline_serializer(
+                                    name='LoginUserTeam',
+                                    fields={
+                                        'id': serializers.IntegerField(),
+                                        'name': serializers.CharField(),
+                                        'display_name': serializers.CharField(),
+                                    },
+                                    allow_null=True,
+                                ),
+                            }
+                        ),
+                    }
+                ),
+                400: OpenApiResponse(description="Kullanıcı hesabı aktif değil."),
+                401: OpenApiResponse(description="Geçersiz kullanıcı adı veya şifre."),
+                503: OpenApiResponse(description="Çok fazla eşzamanlı giriş isteği, `Retry-After` sonra tekrar deneyin.")
+            }
+        )
+        class UserLoginAPIView(self.target_class):
+            pass
+
+        return UserLoginAPIView
+
+
+class TokenRotateAPIViewSchema(ViewSchemaExtension):
+    target_class = 'apps.users.views.TokenRotateAPIView'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Kullanıcılar - Kimlik Doğrulama"],
+            summary="Token Yenileme",
+            description="İstekte kullanılan token yerine yeni bir token oluşturur. Eski token, o sırada gönderilmiş "
+                        "istekler için kısa bir süre (AUTH_TOKEN_ROTATION_GRACE) daha geçerli kalır.",
+            request=None,
+            responses={
+                200: inline_serializer(name='TokenRotateResponse', fields=TOKEN_RESPONSE_FIELDS),
+                400: OpenApiResponse(description="İstek token ile kimliği doğrulanmamış."),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli veya token'ın süresi dolmuş.")
+            }
+        )
+        class TokenRotateAPIView(self.target_class):
+            pass
+
+        return TokenRotateAPIView
+
+
+class LogoutAPIViewSchema(ViewSchemaExtension):
+    target_class = 'apps.users.views.LogoutAPIView'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Kullanıcılar - Kimlik Doğrulama"],
+            summary="Çıkış",
+            description="İstekte kullanılan token'ı siler. Kullanıcının diğer cihazlardaki token'ları geçerli kalır.",
+            request=None,
+            responses={
+                204: OpenApiResponse(description="Token silindi."),
+                401: OpenApiResponse(description="Kimlik doğrulaması gerekli.")
+            }
+        )
+        class LogoutAPIView(self.target_class):
+            pass
+
+        return LogoutAPIView
+
+
+class UserProfileViewSetSchema(ViewSchemaExtension):
+    target_class = 'apps.users.views.UserProfileViewSet'
+
+    def build_replacement(self):
+        @extend_schema(
+            tags=["Kullanıcılar - User Profili Yönetimi"],
+            description="Kullanıcı profillerini yönetir. Adminler tüm profillere erişebilirken, "
+                        "normal kullanıcılar sadece kendi profillerini `/my_profile/` üzerinden yönetebilir."
+        )
+        @extend_schema_view(
+            list=extend_schema(
+                summary="Tüm Kullanıcı Profillerini Listele (Admin)",
+                description="Sistemdeki tüm kullanıcı profillerinin sayfalanmış bir listesini döndürür. Sadece adminler erişebilir.",
+                responses={200: UserProfileSerializer(many=True),
+                           401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                           403: OpenApiResponse(description="Yetkiniz yok.")}
+            ),
+            retrieve=extend_schema(
+                summary="Belirli Bir Kullanıcı Profilinin Detayını Getir (Admin)",
+                description="Verilen ID'ye sahip kullanıcı profilinin detaylarını döndürür. Sadece adminler erişebilir.",
+                parameters=[OpenApiParameter(name='id', type=OpenApiTypes.INT, location=OpenApiParameter.PATH,
+                                             description="Profil ID'si")],
+                responses={200: UserProfileSerializer, 401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                           403: OpenApiResponse(description="Yetkiniz yok."),
+                           404: OpenApiResponse(description="Profil bulunamadı.")}
+            ),
+            update=extend_schema(
+                summary="Kullanıcı Profilini Güncelle (Admin)",
+                description="Belirli bir kullanıcının profilini günceller (örn: takımını değiştirir). Sadece adminler erişebilir.",
+                request=UserProfileSerializer,
+                parameters=[OpenApiParameter(name='id', type=OpenApiTypes.INT, location=OpenApiParameter.PATH,
+                                             description="Profil ID'si")],
+                responses={200: UserProfileSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
+                           401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                           403: OpenApiResponse(description="Yetkiniz yok."),
+                           404: OpenApiResponse(description="Profil bulunamadı.")}
+            ),
+            partial_update=extend_schema(
+                summary="Kullanıcı Profilini Kısmen Güncelle (Admin)",
+                description="Belirli bir kullanıcının profilinin gönderilen alanlarını günceller. Sadece adminler erişebilir.",
+                request=UserProfileSerializer,
+                parameters=[OpenApiParameter(name='id', type=OpenApiTypes.INT, location=OpenApiParameter.PATH,
+                                             description="Profil ID'si")],
+                responses={200: UserProfileSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
+                           401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                           403: OpenApiResponse(description="Yetkiniz yok."),
+                           404: OpenApiResponse(description="Profil bulunamadı.")}
+            ),
+            create=extend_schema(exclude=True),
+            destroy=extend_schema(exclude=True),
+            my_profile=extend_schema(
+                summary="Kendi Profil Bilgilerimi Getir/Güncelle",
+                description="Giriş yapmış kullanıcının kendi profil bilgilerini (örn: takımını) görüntülemesini ve güncellemesini sağlar.",
+                request=UserProfileSerializer,  # Güncelleme için body şeması
+                responses={
+                    200: UserProfileSerializer,  # Başarılı GET veya PUT/PATCH yanıtı
+                    400: OpenApiResponse(description="Geçersiz veri (güncelleme sırasında)."),
+                    401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
+                    404: OpenApiResponse(description="Kullanıcı profili bulunamadı.")
+                }
+            ),
+        )
+        class UserProfileViewSet(self.target_class):
+            pass
+
+        return UserProfileViewSet
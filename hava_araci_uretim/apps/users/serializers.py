@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from rest_framework import serializers
 
 from apps.core.serializers import TimeStampedSerializer
@@ -112,4 +113,18 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
-    password = serializers.CharField(style={'input_type': 'password'})
\ No newline at end of file
+    password = serializers.CharField(style={'input_type': 'password'})
+
+
+class ProvisionedUserSerializer(serializers.Serializer):
+    """Toplu kullanıcı oluşturmada CSV'nin bir satırı (bkz. apps.users.provisioning)."""
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField()
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    password = serializers.CharField(required=False, allow_blank=True, trim_whitespace=False)
+    team = serializers.ChoiceField(choices=Team.TEAM_TYPE_CHOICES, required=False, allow_blank=True)
+
+
+class UserProvisioningSerializer(serializers.Serializer):
+    file = serializers.FileField(help_text="UTF-8 CSV. Sütunlar: username, email, first_name, last_name, password, team.")
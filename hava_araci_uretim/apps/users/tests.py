@@ -1,15 +1,29 @@
-from unittest import TestCase
+import io
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import TestCase, mock
 
 import factory
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
 from apps.uretim.factories import KanatTeamFactory, AssemblyTeamFactory, GovdeTeamFactory
+from apps.uretim.models import Team
+from . import login
 from .factories import UserFactory, AdminUserFactory
-from .models import UserProfile
+from .models import AuthToken, UserProfile
+from .passwords import hash_passwords
 from .serializers import UserSerializer
 
 
@@ -105,7 +119,7 @@ class UserAuthAPITests(APITestCase):
         self.assertIn("token", response.data)
         self.assertIn("user", response.data)
         self.assertEqual(response.data['user']['username'], "loginuser_success")
-        self.assertTrue(Token.objects.filter(user=user).exists())
+        self.assertTrue(AuthToken.objects.filter(user=user).exists())
 
     def test_user_login_inactive_user(self):
         """Aktif olmayan bir kullanıcıyla giriş denendiğinde 400 Bad Request alındığını
@@ -288,6 +302,222 @@ class UserViewSetAPITests(APITestCase):
         response = self.client.get(self.me_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_async_me_matches_sync_me(self):
+        """Async /me/ endpoint'inin token ile senkron /me/ action'ı ile aynı yanıtı döndürdüğünü test eder."""
+        token = AuthToken.objects.create(user=self.user1)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        sync_response = self.client.get(self.me_url)
+        async_response = self.client.get(reverse('async-user-me'))
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+    def test_async_me_rejects_missing_or_invalid_token(self):
+        """Async /me/ endpoint'inin token olmadan veya geçersiz token ile 401 döndürdüğünü test eder."""
+        response = self.client.get(reverse('async-user-me'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION="Token gecersiz-token")
+        response = self.client.get(reverse('async-user-me'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class LoginPipelineTests(APITestCase):
+    """Giriş akışını, süreli token'ları, token yenilemeyi ve çıkışı test eder."""
+
+    def setUp(self):
+        self.login_url = reverse('user-login')
+        self.me_url = reverse('user-me')
+        self.team = KanatTeamFactory()
+        self.user = UserFactory(username='vardiya', password='password123')
+        self.user.profile.team = self.team
+        self.user.profile.save()
+        self.credentials = {'username': 'vardiya', 'password': 'password123'}
+
+    def authenticate(self, key):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+
+    def test_login_returns_slim_principal_and_reuses_token(self):
+        first = self.client.post(self.login_url, self.credentials, format='json')
+        self.assertEqual(first.status_code, status.HTTP_200_OK, first.data)
+        self.assertEqual(first.data['user'], {
+            'id': self.user.pk, 'username': 'vardiya', 'first_name': self.user.first_name,
+            'last_name': self.user.last_name, 'is_staff': False,
+            'team': {'id': self.team.pk, 'name': 'KANAT', 'display_name': self.team.get_name_display()},
+        })
+        self.assertIn('expires_at', first.data)
+
+        second = self.client.post(self.login_url, self.credentials, format='json')
+        self.assertEqual(second.data['token'], first.data['token'])
+        self.assertEqual(AuthToken.objects.filter(user=self.user).count(), 1)
+
+    def test_login_reads_user_and_reusable_token_in_one_query(self):
+        login.login('vardiya', 'password123')
+        with CaptureQueriesContext(connection) as queries:
+            login.login('vardiya', 'password123')
+        self.assertEqual(len(queries), 1)
+
+    def test_token_close_to_expiry_is_not_reused(self):
+        old = AuthToken.objects.create(user=self.user, expires_at=timezone.now() + timedelta(minutes=5))
+        response = self.client.post(self.login_url, self.credentials, format='json')
+        self.assertNotEqual(response.data['token'], old.key)
+
+    def test_unknown_user_and_wrong_password_are_rejected(self):
+        for credentials in ({'username': 'yok', 'password': 'password123'},
+                            {'username': 'vardiya', 'password': 'yanlis'}):
+            response = self.client.post(self.login_url, credentials, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(response.data, {'error': "Geçersiz kullanıcı adı veya şifre."})
+        self.assertFalse(AuthToken.objects.exists())
+
+    def test_expired_token_is_rejected(self):
+        token = AuthToken.objects.create(user=self.user, expires_at=timezone.now() - timedelta(seconds=1))
+        self.authenticate(token.key)
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get(reverse('async-user-me')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rotated_token_stays_valid_for_grace_period(self):
+        old = AuthToken.objects.create(user=self.user)
+        self.authenticate(old.key)
+        response = self.client.post(reverse('user-token-rotate'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['token'], old.key)
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_200_OK)
+        old.refresh_from_db()
+        self.assertIsNotNone(old.rotated_at)
+
+        # Yenilenmiş token girişte tekrar verilmez.
+        self.client.credentials()
+        login_response = self.client.post(self.login_url, self.credentials, format='json')
+        self.assertEqual(login_response.data['token'], response.data['token'])
+
+    @override_settings(AUTH_TOKEN_ROTATION_GRACE=0)
+    def test_rotated_token_expires_without_grace(self):
+        old = AuthToken.objects.create(user=self.user)
+        self.authenticate(old.key)
+        new_key = self.client.post(reverse('user-token-rotate')).data['token']
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.authenticate(new_key)
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_200_OK)
+
+    def test_logout_deletes_token(self):
+        token = AuthToken.objects.create(user=self.user)
+        self.authenticate(token.key)
+        self.assertEqual(self.client.post(reverse('user-logout')).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(AuthToken.objects.filter(pk=token.pk).exists())
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_is_rejected_when_hash_queue_is_full(self):
+        executor, _slots = login._pool()
+        with mock.patch.object(login, '_pool', return_value=(executor, threading.Semaphore(0))):
+            response = self.client.post(self.login_url, self.credentials, format='json')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_async_login_matches_sync_login(self):
+        sync_response = self.client.post(self.login_url, self.credentials, format='json')
+        async_response = self.client.post(reverse('async-user-login'), self.credentials, format='json')
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+        response = self.client.post(reverse('async-user-login'), {'username': 'vardiya', 'password': 'yanlis'},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_purge_expired_tokens(self):
+        AuthToken.objects.create(user=self.user, expires_at=timezone.now() - timedelta(seconds=1))
+        valid = AuthToken.objects.create(user=self.user)
+        call_command('purge_expired_tokens', stdout=io.StringIO())
+        self.assertEqual(list(AuthToken.objects.values_list('pk', flat=True)), [valid.pk])
+
+
+class UserProvisioningTests(APITestCase):
+    """CSV'den toplu kullanıcı oluşturma endpoint'ini ve komutunu test eder."""
+
+    def setUp(self):
+        self.url = reverse('user-provision')
+        self.kanat_team = KanatTeamFactory()
+        self.montaj_team = AssemblyTeamFactory()
+        self.client.force_authenticate(AdminUserFactory())
+
+    def _upload(self, content):
+        upload = SimpleUploadedFile('users.csv', content.encode('utf-8'), content_type='text/csv')
+        return self.client.post(self.url, {'file': upload}, format='multipart')
+
+    def test_provision_creates_users_profiles_and_teams(self):
+        rows = ''.join(f'shift{i},shift{i}@example.com,Ad{i},Soyad,pass-{i},{"KANAT" if i % 2 else "MONTAJ"}\n'
+                       for i in range(20))
+        with CaptureQueriesContext(connection) as queries:
+            response = self._upload('username,email,first_name,last_name,password,team\n' + rows)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(response.data['created'], 20)
+        # Satır sayısından bağımsız: Kullanıcı adı kontrolü, kullanıcılar ve profiller birer sorgu.
+        self.assertLess(len(queries.captured_queries), 15)
+
+        user = User.objects.select_related('profile__team').get(username='shift3')
+        self.assertEqual(user.profile.team, self.kanat_team)
+        self.assertTrue(check_password('pass-3', user.password))
+        self.assertEqual(User.objects.get(username='shift4').profile.team, self.montaj_team)
+
+    def test_blank_password_and_team_are_allowed(self):
+        response = self._upload('username,email\nnopass,nopass@example.com\n')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        user = User.objects.get(username='nopass')
+        self.assertFalse(user.has_usable_password())
+        self.assertIsNone(user.profile.team)
+
+    def test_invalid_rows_create_nothing(self):
+        UserFactory(username='taken')
+        Team.objects.filter(name='GOVDE').delete()
+        response = self._upload(
+            'username,email,team\n'
+            'ok1,ok1@example.com,KANAT\n'
+            'taken,taken@example.com,\n'
+            'ok1,other@example.com,\n'
+            'bad-mail,not-an-email,\n'
+            'noteam,noteam@example.com,GOVDE\n'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = {error['line']: error['errors'] for error in response.data['errors']}
+        self.assertEqual(sorted(errors), [3, 4, 5, 6])
+        self.assertIn('email', errors[5])
+        self.assertIn('team', errors[6])
+        self.assertFalse(User.objects.filter(username='ok1').exists())
+
+    def test_missing_header_and_row_limit(self):
+        response = self._upload('name,mail\nx,y\n')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file', response.data)
+        with self.settings(USER_PROVISIONING_MAX_ROWS=1):
+            response = self._upload('username,email\na,a@example.com\nb,b@example.com\n')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_provision_requires_admin(self):
+        self.client.force_authenticate(UserFactory())
+        response = self._upload('username,email\na,a@example.com\n')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as csv_file:
+            csv_file.write('username,email,password,team\ncmd1,cmd1@example.com,secret,KANAT\n')
+        self.addCleanup(os.unlink, csv_file.name)
+        out = io.StringIO()
+        call_command('provision_users', csv_file.name, workers=1, stdout=out)
+        self.assertIn('1 kullanıcı oluşturuldu', out.getvalue())
+        self.assertEqual(User.objects.get(username='cmd1').profile.team, self.kanat_team)
+        with self.assertRaises(CommandError):
+            call_command('provision_users', csv_file.name, workers=1, stdout=out, stderr=io.StringIO())
+
+    def test_passwords_are_hashed_in_process_pool(self):
+        with mock.patch('apps.users.passwords.HASH_CHUNK_SIZE', 2):
+            encoded = hash_passwords(['a', '', 'b', 'c'], workers=2)
+        self.assertTrue(check_password('a', encoded[0]))
+        self.assertFalse(encoded[1].startswith('md5') or check_password('', encoded[1]))
+        self.assertTrue(check_password('c', encoded[3]))
+
+    def test_user_save_does_not_write_profile(self):
+        user = UserFactory()
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
 
 class UserSerializerTests(TestCase):
     """UserSerializer'ın, özellikle nested UserProfile güncelleme mantığının doğru çalıştığını test eder."""
@@ -4,7 +4,9 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 # İlgili view'leri ve viewset'leri import ediyoruz:
-from .views import UserViewSet, UserRegistrationAPIView, UserLoginAPIView, UserProfileViewSet
+from .views import (UserViewSet, UserRegistrationAPIView, UserLoginAPIView, UserProfileViewSet, TokenRotateAPIView,
+                    LogoutAPIView)
+from . import async_views
 
 # DefaultRouter, DRF'in sunduğu bir router sınıfıdır.
 # ViewSet'ler için standart URL pattern'lerini (list, create, retrieve, update, destroy)
@@ -41,9 +43,14 @@ urlpatterns = [
     # UserLoginAPIView (generics.GenericAPIView) için özel bir path tanımlıyoruz.
     path('login/', UserLoginAPIView.as_view(), name='user-login'),
 
-    # Token bazlı logout için DRF'in doğrudan bir endpoint'i yoktur.
-    # Genellikle client tarafında token silinir. Eğer sunucu tarafında token'ı
-    # geçersiz kılmak istenirse, özel bir endpoint yazılabilir. Şimdilik eklemiyoruz.
+    # ASGI modunda kullanılmak üzere 'me' action'ının async karşılığı.
+    path('async/users/me/', async_views.me, name='async-user-me'),
+    # Giriş dalgalarında worker'ı şifre doğrulaması boyunca bloklamayan async giriş.
+    path('async/login/', async_views.login, name='async-user-login'),
+
+    # Token'lar süreli olduğu için client süresi dolmadan token'ı yeniler; logout token'ı sunucuda siler.
+    path('token/rotate/', TokenRotateAPIView.as_view(), name='user-token-rotate'),
+    path('logout/', LogoutAPIView.as_view(), name='user-logout'),
 
     # UserProfileViewSet içindeki 'my_profile' action'ı için URL:
     # Eğer router.register içinde ViewSet'imiz varsa ve action detail=False ise
@@ -1,8 +1,8 @@
-from rest_framework import serializers
+import io
+
+from django.conf import settings
 from rest_framework import status, generics
-from rest_framework.authtoken.models import Token
 from rest_framework.filters import SearchFilter, OrderingFilter
-from rest_framework.throttling import ScopedRateThrottle
 from .serializers import (
     UserRegistrationSerializer,
     LoginSerializer,
@@ -12,25 +12,20 @@ from django.contrib.auth.models import User
 from rest_framework import viewsets, \
     permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from .models import UserProfile
-from .serializers import UserSerializer
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, inline_serializer
-from drf_spectacular.types import OpenApiTypes
+from . import login, provisioning
+from .models import AuthToken, UserProfile
+from .serializers import UserProvisioningSerializer, UserSerializer
 from rest_framework_datatables.pagination import DatatablesPageNumberPagination
 from rest_framework_datatables.filters import DatatablesFilterBackend
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.core.throttling import ScopedRateThrottle
+
+# OpenAPI dökümantasyonu (extend_schema tanımları) schema.py içindedir ve sadece şema üretilirken yüklenir.
 
-@extend_schema(
-    tags=["Kullanıcılar - User Yönetimi (Admin)"],
-    description=(
-            "Sistemdeki Django User objelerini listeler ve detaylarını görüntüler. "
-            "Bu endpoint'ler öncelikli olarak admin yetkisine sahip kullanıcılar için tasarlanmıştır.\n"
-            "Giriş yapmış kullanıcılar kendi temel bilgilerine (profili dahil) `/me/` alt endpoint'inden erişebilir.\n"
-            "Bu ViewSet, DataTables server-side processing'i destekler."
-    )
-)
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Kullanıcıları listelemek ve detaylarını görmek için salt okunur bir ViewSet.
@@ -80,66 +75,6 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     ]
     ordering = ['username']
 
-    @extend_schema(
-        summary="Tüm Kullanıcıları Listele (Admin)",
-        description="Sistemdeki tüm kullanıcıların (profilleri ve takımları dahil) sayfalanmış bir listesini döndürür. "
-                    "Sadece admin yetkisine sahip kullanıcılar erişebilir. DataTables ile uyumludur.",
-        parameters=[  # Örnek DjangoFilterBackend parametreleri
-            OpenApiParameter(name='username__icontains', description='Kullanıcı adında geçen ifade.',
-                             type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='email__icontains', description='E-posta adresinde geçen ifade.',
-                             type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='is_active', description='Aktiflik durumuna göre filtrele (true/false).',
-                             type=OpenApiTypes.BOOL, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='profile__team', description='Kullanıcının ait olduğu takımın IDsi ile filtrele.',
-                             type=OpenApiTypes.INT, location=OpenApiParameter.QUERY),
-        ],
-        responses={  # DataTables yanıtı için
-            200: inline_serializer(
-                name='UserListDatatablesResponse',
-                fields={
-                    'draw': serializers.IntegerField(),
-                    'recordsTotal': serializers.IntegerField(),
-                    'recordsFiltered': serializers.IntegerField(),
-                    'data': UserSerializer(many=True)  # UserSerializer listesi
-                }
-            ),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz).")
-        }
-    )
-    def list(self, request, *args, **kwargs):
-        """Kullanıcıların listesini döndürür."""
-        return super().list(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Belirli Bir Kullanıcının Detayını Getir (Admin)",
-        description="Verilen ID'ye sahip kullanıcının detaylarını (profili ve takımı dahil) döndürür. "
-                    "Sadece admin yetkisine sahip kullanıcılar erişebilir.",
-        parameters=[
-            OpenApiParameter(name='id', description='Kullanıcının unique IDsi.', required=True, type=OpenApiTypes.INT,
-                             location=OpenApiParameter.PATH)
-        ],
-        responses={
-            200: UserSerializer,
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            403: OpenApiResponse(description="Bu işlemi yapma yetkiniz yok (Admin değilsiniz)."),
-            404: OpenApiResponse(description="Belirtilen ID ile kullanıcı bulunamadı.")
-        }
-    )
-    def retrieve(self, request, *args, **kwargs):
-        """Belirli bir kullanıcının detaylarını döndürür."""
-        return super().retrieve(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Giriş Yapmış Kullanıcının Bilgilerini Getir",
-        description="Oturum açmış olan kullanıcının kendi detaylı kullanıcı ve profil bilgilerini döndürür. "
-                    "Bu endpoint için kullanıcının sadece kimliğinin doğrulanmış olması yeterlidir.",
-        responses={
-            200: UserSerializer,
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli (Token eksik veya geçersiz).")
-        }
-    )
     @action(detail=False, methods=['get'],
             permission_classes=[permissions.IsAuthenticated])  # İzin burada override ediliyor
     def me(self, request):
@@ -147,20 +82,27 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser],
+            serializer_class=UserProvisioningSerializer)
+    def provision(self, request):
+        """
+        CSV dosyasındaki kullanıcıları profilleri ve takımlarıyla birlikte toplu oluşturur (bkz. apps.users.provisioning).
+        Hatalı satır varsa hiçbir kullanıcı oluşturulmaz.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            rows = provisioning.read_csv(io.TextIOWrapper(serializer.validated_data['file'], encoding='utf-8-sig'))
+        except UnicodeDecodeError:
+            raise ValidationError({'file': "Dosya UTF-8 kodlamalı bir CSV olmalı."}) from None
+        if len(rows) > settings.USER_PROVISIONING_MAX_ROWS:
+            raise ValidationError({'file': f"Tek istekte en fazla {settings.USER_PROVISIONING_MAX_ROWS} kullanıcı "
+                                           f"oluşturulabilir (manage.py provision_users ile sınır yoktur)."})
+        users = provisioning.provision(rows, workers=settings.USER_PROVISIONING_WORKERS)
+        return Response({'created': len(users), 'users': [{'id': user.pk, 'username': user.username} for user in users]},
+                        status=status.HTTP_201_CREATED)
+
 
-@extend_schema(
-    tags=["Kullanıcılar - Kimlik Doğrulama"],
-    summary="Yeni Kullanıcı Kaydı",
-    description="Yeni bir kullanıcı hesabı oluşturur. Kullanıcı adı, e-posta ve şifre zorunludur. "
-                "İsteğe bağlı olarak bir `team_id` gönderilerek kullanıcı bir takıma atanabilir. "
-                "Başarılı kayıt sonrası oluşturulan kullanıcı bilgileri (şifre hariç) döndürülür.",
-    request=UserRegistrationSerializer,
-    responses={
-        201: UserSerializer,  # Başarılı kayıtta UserSerializer ile kullanıcı bilgisi döner
-        400: OpenApiResponse(
-            description="Geçersiz veri veya validasyon hatası (örn: şifreler uyuşmuyor, geçersiz team_id, eksik alanlar).")
-    }
-)
 class UserRegistrationAPIView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
@@ -168,26 +110,6 @@ class UserRegistrationAPIView(generics.CreateAPIView):
     throttle_scope = 'registration_attempts'
 
 
-@extend_schema(
-    tags=["Kullanıcılar - Kimlik Doğrulama"],
-    summary="Kullanıcı Girişi",
-    description="Kullanıcı adı ve şifre ile kimlik doğrulaması yapar. Başarılı girişte, kullanıcıya ait "
-                "bir API token'ı ve temel kullanıcı bilgileri döndürülür. "
-                "Bu token, yetki gerektiren diğer API endpoint'lerine yapılan isteklerde "
-                "`Authorization: Token <token_değeri>` başlığında kullanılmalıdır.",
-    request=LoginSerializer,  # İstek body'si username ve password içermeli
-    responses={
-        200: inline_serializer(  # Başarılı giriş yanıtı için anlık serializer
-            name='UserLoginSuccessResponse',
-            fields={
-                'token': serializers.CharField(),
-                'user': UserSerializer()  # UserSerializer'ı burada nested olarak kullanabiliriz
-            }
-        ),
-        400: OpenApiResponse(description="Kullanıcı hesabı aktif değil."),
-        401: OpenApiResponse(description="Geçersiz kullanıcı adı veya şifre.")
-    }
-)
 class UserLoginAPIView(generics.GenericAPIView):
     serializer_class = LoginSerializer
     permission_classes = [permissions.AllowAny]
@@ -197,29 +119,42 @@ class UserLoginAPIView(generics.GenericAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        username = serializer.validated_data['username']
-        password = serializer.validated_data['password']
         try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            return Response({"error": "Geçersiz kullanıcı adı veya şifre."}, status=status.HTTP_401_UNAUTHORIZED)
-        if not user.check_password(password):
-            return Response({"error": "Geçersiz kullanıcı adı veya şifre."}, status=status.HTTP_401_UNAUTHORIZED)
-        if not user.is_active:
-            return Response({"error": "Kullanıcı hesabı aktif değil."}, status=status.HTTP_400_BAD_REQUEST)
-        token, created = Token.objects.get_or_create(user=user)
-        user_data = UserSerializer(user, context={'request': request}).data
-        return Response({
-            "token": token.key,
-            "user": user_data
-        }, status=status.HTTP_200_OK)
+            data = login.login(serializer.validated_data['username'], serializer.validated_data['password'])
+        except login.LoginError as exc:
+            return _login_error_response(exc)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+def _login_error_response(exc):
+    response = Response({"error": exc.message}, status=exc.status_code)
+    if exc.retry_after is not None:
+        response['Retry-After'] = str(exc.retry_after)
+    return response
+
+
+class TokenRotateAPIView(generics.GenericAPIView):
+    """
+    İstekte kullanılan token'ı yeniler. Eski token AUTH_TOKEN_ROTATION_GRACE saniye daha geçerli kalır.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.auth, AuthToken):
+            raise ValidationError({'detail': "Sadece token ile kimliği doğrulanmış istekler token yenileyebilir."})
+        return Response(login.rotate(request.auth), status=status.HTTP_200_OK)
+
+
+class LogoutAPIView(generics.GenericAPIView):
+    """İstekte kullanılan token'ı siler (sunucu tarafında çıkış)."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if isinstance(request.auth, AuthToken):
+            request.auth.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-@extend_schema(
-    tags=["Kullanıcılar - User Profili Yönetimi"],
-    description="Kullanıcı profillerini yönetir. Adminler tüm profillere erişebilirken, "
-                "normal kullanıcılar sadece kendi profillerini `/my_profile/` üzerinden yönetebilir."
-)
 class UserProfileViewSet(viewsets.ModelViewSet):
     """
     Kullanıcı profillerini yönetmek için bir ViewSet.
@@ -231,76 +166,6 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAdminUser]  # Varsayılan izin
 
-    @extend_schema(
-        summary="Tüm Kullanıcı Profillerini Listele (Admin)",
-        description="Sistemdeki tüm kullanıcı profillerinin sayfalanmış bir listesini döndürür. Sadece adminler erişebilir.",
-        responses={200: UserProfileSerializer(many=True),
-                   401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-                   403: OpenApiResponse(description="Yetkiniz yok.")}
-    )
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Belirli Bir Kullanıcı Profilinin Detayını Getir (Admin)",
-        description="Verilen ID'ye sahip kullanıcı profilinin detaylarını döndürür. Sadece adminler erişebilir.",
-        parameters=[OpenApiParameter(name='id', type=OpenApiTypes.INT, location=OpenApiParameter.PATH,
-                                     description="Profil ID'si")],
-        responses={200: UserProfileSerializer, 401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-                   403: OpenApiResponse(description="Yetkiniz yok."),
-                   404: OpenApiResponse(description="Profil bulunamadı.")}
-    )
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Kullanıcı Profilini Güncelle (Admin)",
-        description="Belirli bir kullanıcının profilini günceller (örn: takımını değiştirir). Sadece adminler erişebilir.",
-        request=UserProfileSerializer,
-        parameters=[OpenApiParameter(name='id', type=OpenApiTypes.INT, location=OpenApiParameter.PATH,
-                                     description="Profil ID'si")],
-        responses={200: UserProfileSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
-                   401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-                   403: OpenApiResponse(description="Yetkiniz yok."),
-                   404: OpenApiResponse(description="Profil bulunamadı.")}
-    )
-    def update(self, request, *args, **kwargs):
-        return super().update(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Kullanıcı Profilini Kısmen Güncelle (Admin)",
-        description="Belirli bir kullanıcının profilinin gönderilen alanlarını günceller. Sadece adminler erişebilir.",
-        request=UserProfileSerializer,
-        parameters=[OpenApiParameter(name='id', type=OpenApiTypes.INT, location=OpenApiParameter.PATH,
-                                     description="Profil ID'si")],
-        responses={200: UserProfileSerializer, 400: OpenApiResponse(description="Geçersiz veri."),
-                   401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-                   403: OpenApiResponse(description="Yetkiniz yok."),
-                   404: OpenApiResponse(description="Profil bulunamadı.")}
-    )
-    def partial_update(self, request, *args, **kwargs):
-        return super().partial_update(request, *args, **kwargs)
-
-
-    @extend_schema(exclude=True)  # Dökümantasyondan çıkar
-    def create(self, request, *args, **kwargs):
-        return super().create(request, *args, **kwargs)
-
-    @extend_schema(exclude=True)  # Dökümantasyondan çıkar
-    def destroy(self, request, *args, **kwargs):
-        return super().destroy(request, *args, **kwargs)
-
-    @extend_schema(
-        summary="Kendi Profil Bilgilerimi Getir/Güncelle",
-        description="Giriş yapmış kullanıcının kendi profil bilgilerini (örn: takımını) görüntülemesini ve güncellemesini sağlar.",
-        request=UserProfileSerializer,  # Güncelleme için body şeması
-        responses={
-            200: UserProfileSerializer,  # Başarılı GET veya PUT/PATCH yanıtı
-            400: OpenApiResponse(description="Geçersiz veri (güncelleme sırasında)."),
-            401: OpenApiResponse(description="Kimlik doğrulaması gerekli."),
-            404: OpenApiResponse(description="Kullanıcı profili bulunamadı.")
-        }
-    )
     @action(detail=False, methods=['get', 'put', 'patch'], permission_classes=[permissions.IsAuthenticated])
     def my_profile(self, request):
         try:
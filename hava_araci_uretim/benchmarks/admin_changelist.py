@@ -0,0 +1,178 @@
+"""
+Admin listelerinin büyük tablolarda sorgu sayısı ve süresi.
+
+Verilen sayıda parça ve uçak oluşturulur. Parça ve uçak listeleri (filtresiz, arama, filtre) ve parça
+otomatik tamamlaması iki ayarla ölçülür: Django varsayılanlarıyla kurulmuş eski admin (tam COUNT'lar,
+`icontains` aramalar, `__str__` sütunları) ve mevcut admin (bkz. apps.core.admin). View'ler
+RequestFactory ile doğrudan çağrılır (middleware hariç, şablon render'ı dahil). İstek başına medyan
+süre ve sorgu sayısı raporlanır. Oluşturulan satırlar sonunda silinir.
+
+Tabloya doğrudan yazdığı için sadece test veritabanında çalıştırılmalıdır (`--yes` gerekir).
+
+Örnek:
+
+    python benchmarks/admin_changelist.py --parts 200000 --aircrafts 10000 --yes
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERIAL_PREFIX = 'BENCH-ADMIN-'
+SLOTS = {'wing': 'KANAT', 'fuselage': 'GOVDE', 'tail': 'KUYRUK', 'avionics': 'AVIYONIK'}
+
+
+def _setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apps.hava_araci_uretim_app.settings')
+    import django
+    django.setup()
+
+
+def _bulk_create(model, rows, batch_size=5000):
+    for start in range(0, len(rows), batch_size):
+        model.objects.bulk_create(rows[start:start + batch_size])
+
+
+def _seed(parts, aircrafts):
+    """Uçaklara takılı `aircrafts` x 4 parça ve stokta/geri dönüşümde kalan `parts` parça oluşturur."""
+    from apps.envanter.models import AircraftModel, Part, PartType
+    from apps.montaj.models import AssembledAircraft
+
+    part_types = {slot: PartType.objects.get_or_create(name=name)[0] for slot, name in SLOTS.items()}
+    aircraft_model, _ = AircraftModel.objects.get_or_create(name='TB2')
+    slots = list(SLOTS)
+    _bulk_create(Part, [
+        Part(part_type=part_types[slots[i % 4]], aircraft_model_compatibility=aircraft_model,
+             serial_number=f'{SERIAL_PREFIX}P{i:09d}', status='STOKTA' if i % 20 == 0 else 'GERI_DONUSUMDE')
+        for i in range(parts)
+    ])
+    _bulk_create(Part, [
+        Part(part_type=part_types[slot], aircraft_model_compatibility=aircraft_model,
+             serial_number=f'{SERIAL_PREFIX}A{i:09d}-{slot}')
+        for i in range(aircrafts) for slot in slots
+    ])
+    part_ids = dict(Part.objects.filter(serial_number__startswith=f'{SERIAL_PREFIX}A')
+                    .values_list('serial_number', 'id'))
+    # Parça kuralları trigger ile kontrol edildiği için parçalar uçaklar oluşturulduktan sonra kullanıldı olur.
+    _bulk_create(AssembledAircraft, [
+        AssembledAircraft(aircraft_model=aircraft_model, tail_number=f'{SERIAL_PREFIX}{i:09d}',
+                          **{f'{slot}_id': part_ids[f'{SERIAL_PREFIX}A{i:09d}-{slot}'] for slot in slots})
+        for i in range(aircrafts)
+    ])
+    Part.objects.filter(serial_number__startswith=f'{SERIAL_PREFIX}A').update(status='KULLANILDI')
+    return part_types['wing']
+
+
+def _baseline_admins(site):
+    """Bu değişiklikten önceki admin ayarları (Django varsayılanları)."""
+    from django.contrib import admin
+    from apps.envanter.models import Part
+    from apps.montaj.models import AssembledAircraft
+
+    class PartAdmin(admin.ModelAdmin):
+        list_display = ('serial_number', 'part_type', 'aircraft_model_compatibility', 'status', 'produced_by_team',
+                        'used_in_aircraft', 'created_at')
+        list_filter = ('status', 'part_type', 'aircraft_model_compatibility', 'produced_by_team')
+        search_fields = ('serial_number', 'used_in_aircraft__tail_number', 'part_type__name',
+                         'aircraft_model_compatibility__name')
+        list_select_related = ('part_type', 'aircraft_model_compatibility', 'produced_by_team', 'used_in_aircraft')
+
+    class AssembledAircraftAdmin(admin.ModelAdmin):
+        list_display = ('tail_number', 'aircraft_model', 'assembly_date', 'assembled_by_team', 'wing', 'fuselage',
+                        'tail', 'avionics')
+        list_filter = ('aircraft_model', 'assembly_date', 'assembled_by_team')
+        search_fields = ('tail_number', 'aircraft_model__name')
+
+    return {Part: PartAdmin(Part, site), AssembledAircraft: AssembledAircraftAdmin(AssembledAircraft, site)}
+
+
+def _measure(view, iterations):
+    """View'i çalıştırır, (medyan süre ms, istek başına sorgu sayısı) döndürür."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    view()  # ısınma
+    timings = []
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            response = view()
+            if hasattr(response, 'render'):
+                response.render()
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.status_code
+    return statistics.median(timings), len(queries.captured_queries) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--parts', type=int, default=200000)
+    parser.add_argument('--aircrafts', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--yes', action='store_true', help="Test veritabanında çalışıldığını onaylar")
+    args = parser.parse_args()
+    if not args.yes:
+        parser.error("Bu script parça ve uçak tablolarına yazar, test veritabanında --yes ile çalıştırın.")
+
+    _setup_django()
+    from django.contrib import admin
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import RequestFactory, override_settings
+    from django.urls import resolve, reverse
+    from apps.envanter.models import Part
+    from apps.montaj.models import AssembledAircraft
+
+    factory = RequestFactory()
+    user = User(username=f'{SERIAL_PREFIX}admin', is_staff=True, is_superuser=True)
+
+    def request(url, **params):
+        req = factory.get(url, params)
+        req.user = user
+        req.resolver_match = resolve(url)
+        return req
+
+    part_list = reverse('admin:envanter_part_changelist')
+    aircraft_list = reverse('admin:montaj_assembledaircraft_changelist')
+    autocomplete = reverse('admin:autocomplete')
+
+    print(f"Veritabanı: {connection.vendor}, {args.parts} parça, {args.aircrafts} uçak")
+    try:
+        wing_type = _seed(args.parts, args.aircrafts)
+        cases = {
+            'parça listesi': (Part, lambda a: a.changelist_view(request(part_list))),
+            'parça arama': (Part, lambda a: a.changelist_view(request(part_list, q=f'{SERIAL_PREFIX}P00001'))),
+            'parça filtresi': (Part, lambda a: a.changelist_view(request(part_list, part_type__id__exact=wing_type.pk))),
+            'uçak listesi': (AssembledAircraft, lambda a: a.changelist_view(request(aircraft_list))),
+            'uçak arama': (AssembledAircraft,
+                           lambda a: a.changelist_view(request(aircraft_list, q=f'{SERIAL_PREFIX}00001'))),
+            'parça otomatik tamamlama': (Part, lambda a: admin.site.autocomplete_view(request(
+                autocomplete, term=f'{SERIAL_PREFIX}A00001', app_label='montaj', model_name='assembledaircraft',
+                field_name='wing'))),
+        }
+        current = dict(admin.site._registry)
+        baseline = _baseline_admins(admin.site)
+        with override_settings(ALLOWED_HOSTS=['*']):
+            for label, (model, view) in cases.items():
+                results = []
+                for admins in (baseline, current):
+                    admin.site._registry[model] = admins[model]  # Otomatik tamamlama kayıtlı admin'i kullanır.
+                    try:
+                        results.append(_measure(lambda: view(admins[model]), args.iterations))
+                    finally:
+                        admin.site._registry[model] = current[model]
+                (old_ms, old_queries), (new_ms, new_queries) = results
+                print(f"{label:>25}: eski {old_ms:8.1f} ms {old_queries:5.1f} sorgu  "
+                      f"yeni {new_ms:8.1f} ms {new_queries:5.1f} sorgu")
+    finally:
+        AssembledAircraft.objects.filter(tail_number__startswith=SERIAL_PREFIX).delete()
+        Part.objects.filter(serial_number__startswith=SERIAL_PREFIX)._raw_delete(Part.objects.db)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Montaj yazma işlemlerinin sorgu sayısı ve süresi.
+
+Verilen sayıda uçak `POST /api/v1/montaj/assembled-aircrafts/` ile monte edilir, ardından her
+uçağın kanadı `PATCH` ile değiştirilir. İstekler Django test istemcisi ile process içinde yapılır
+(middleware, kimlik doğrulama, rate limit ve view dahil, ağ hariç). İstek başına ortalama sorgu
+sayısı ve süre raporlanır.
+
+Kullanıcı, takım, parça ve uçak oluşturup sildiği için sadece test veritabanında çalıştırılmalıdır
+(`--yes` gerekir). Veritabanı ayarları ortam değişkenlerinden okunur (manage.py ile aynı).
+
+Örnek:
+
+    python benchmarks/assembly_writes.py --aircrafts 20 --yes
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERIAL_PREFIX = 'BENCH-ASM-'
+SLOTS = {'wing': 'KANAT', 'fuselage': 'GOVDE', 'tail': 'KUYRUK', 'avionics': 'AVIYONIK'}
+
+
+def _setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apps.hava_araci_uretim_app.settings')
+    import django
+    django.setup()
+
+
+def _create_part(part_types, aircraft_model, slot, label):
+    from apps.envanter.models import Part
+
+    return Part.objects.create(part_type=part_types[slot], aircraft_model_compatibility=aircraft_model,
+                               serial_number=f'{SERIAL_PREFIX}{slot}-{label}')
+
+
+def _measure(requests):
+    """Her isteği çalıştırır, istek başına ortalama (süre ms, sorgu sayısı) döndürür."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for request in requests:
+            request()
+        elapsed = (time.perf_counter() - started) * 1000
+    return elapsed / len(requests), len(queries.captured_queries) / len(requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--aircrafts', type=int, default=20)
+    parser.add_argument('--yes', action='store_true', help="Test veritabanında çalışıldığını onaylar")
+    args = parser.parse_args()
+    if not args.yes:
+        parser.error("Bu script veritabanına yazar, test veritabanında --yes ile çalıştırın.")
+
+    _setup_django()
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.urls import reverse
+    from apps.envanter.models import AircraftModel, Part, PartType
+    from apps.montaj.models import AssembledAircraft
+    from apps.uretim.models import Team
+    from apps.users.models import AuthToken
+
+    part_types = {slot: PartType.objects.get_or_create(name=name)[0] for slot, name in SLOTS.items()}
+    aircraft_model, _ = AircraftModel.objects.get_or_create(name='TB2')
+    team, _ = Team.objects.get_or_create(name='MONTAJ')
+    user = User.objects.create_user(username=f'{SERIAL_PREFIX}user', password='x')
+    user.profile.team = team
+    user.profile.save()
+    token = AuthToken.objects.create(user=user)
+    client = Client(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    print(f"Veritabanı: {connection.vendor}, {args.aircrafts} uçak")
+    try:
+        with override_settings(ALLOWED_HOSTS=['*']):
+            aircraft_parts = [
+                {slot: _create_part(part_types, aircraft_model, slot, i).pk for slot in SLOTS}
+                for i in range(args.aircrafts)
+            ]
+            new_wings = [_create_part(part_types, aircraft_model, 'wing', f'new-{i}').pk for i in range(args.aircrafts)]
+            aircraft_ids = []
+
+            def assemble(i):
+                response = client.post(reverse('assembledaircraft-list'), {
+                    'aircraft_model': aircraft_model.pk, 'tail_number': f'{SERIAL_PREFIX}{i}', **aircraft_parts[i],
+                }, content_type='application/json')
+                assert response.status_code == 201, response.content
+                aircraft_ids.append(response.json()['id'])
+
+            def swap_wing(i):
+                response = client.patch(reverse('assembledaircraft-detail', kwargs={'pk': aircraft_ids[i]}),
+                                        {'wing': new_wings[i]}, content_type='application/json')
+                assert response.status_code == 200, response.content
+
+            for label, run in (('montaj', assemble), ('kanat değişimi', swap_wing)):
+                elapsed, queries = _measure([lambda i=i: run(i) for i in range(args.aircrafts)])
+                print(f"{label:>15}: {elapsed:8.1f} ms/istek  {queries:5.1f} sorgu/istek")
+    finally:
+        AssembledAircraft.objects.filter(tail_number__startswith=SERIAL_PREFIX).delete()
+        Part.objects.filter(serial_number__startswith=SERIAL_PREFIX).delete()
+        user.delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Ayrı isteklerle ve tek batch isteğiyle parça geri dönüşümü karşılaştırması.
+
+Aynı sayıda parça önce her biri için ayrı `POST .../recycle/` isteğiyle, sonra tek bir
+`POST /api/v1/batch/` isteğiyle geri dönüşüme gönderilir. İstekler Django test istemcisi ile
+process içinde yapılır (middleware, kimlik doğrulama, rate limit ve view dahil, ağ hariç).
+Toplam süre ve sorgu sayısı raporlanır.
+
+Kullanıcı, takım ve parça oluşturup sildiği için sadece test veritabanında çalıştırılmalıdır
+(`--yes` gerekir). Veritabanı ayarları ortam değişkenlerinden okunur (manage.py ile aynı).
+
+Örnek:
+
+    python benchmarks/batch.py --parts 50 --yes
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERIAL_PREFIX = 'BENCH-BATCH-'
+
+
+def _setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apps.hava_araci_uretim_app.settings')
+    import django
+    django.setup()
+
+
+def _create_parts(team, count, label):
+    from apps.envanter.models import AircraftModel, Part
+
+    aircraft_model, _ = AircraftModel.objects.get_or_create(name='TB2')
+    return [
+        Part.objects.create(part_type=team.responsible_part_type, aircraft_model_compatibility=aircraft_model,
+                            serial_number=f'{SERIAL_PREFIX}{label}-{i}', produced_by_team=team)
+        for i in range(count)
+    ]
+
+
+def _measure(run):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        run()
+        elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, len(queries.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--parts', type=int, default=50)
+    parser.add_argument('--yes', action='store_true', help="Test veritabanında çalışıldığını onaylar")
+    args = parser.parse_args()
+    if not args.yes:
+        parser.error("Bu script veritabanına yazar, test veritabanında --yes ile çalıştırın.")
+
+    _setup_django()
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.urls import reverse
+    from apps.envanter.models import Part, PartType
+    from apps.uretim.models import Team
+    from apps.users.models import AuthToken
+
+    part_type, _ = PartType.objects.get_or_create(name='KANAT')
+    team, _ = Team.objects.get_or_create(name='KANAT', defaults={'responsible_part_type': part_type})
+    user = User.objects.create_user(username=f'{SERIAL_PREFIX}user', password='x')
+    user.profile.team = team
+    user.profile.save()
+    token = AuthToken.objects.create(user=user)
+    client = Client(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def recycle_path(part):
+        return reverse('part-recycle', kwargs={'pk': part.pk})
+
+    print(f"Veritabanı: {connection.vendor}, {args.parts} parça")
+    try:
+        with override_settings(ALLOWED_HOSTS=['*']):
+            separate_parts = _create_parts(team, args.parts, 'A')
+            batch_parts = _create_parts(team, args.parts, 'B')
+
+            def separate():
+                for part in separate_parts:
+                    assert client.post(recycle_path(part)).status_code == 200
+
+            def batch():
+                response = client.post(reverse('batch'), {
+                    'requests': [{'method': 'POST', 'path': recycle_path(part)} for part in batch_parts],
+                }, content_type='application/json')
+                assert all(result['status'] == 200 for result in response.json()['results'])
+
+            for label, run in (('ayrı istekler', separate), ('batch', batch)):
+                elapsed, queries = _measure(run)
+                print(f"{label:>14}: {elapsed:8.1f} ms  {queries:5d} sorgu")
+    finally:
+        Part.objects.filter(serial_number__startswith=SERIAL_PREFIX).delete()
+        user.delete()
+
+
+if __name__ == '__main__':
+    main()
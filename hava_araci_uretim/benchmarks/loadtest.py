@@ -0,0 +1,165 @@
+"""
+Basit HTTP yük testi aracı (sadece standart kütüphane).
+
+Çalışan bir API sunucusuna belirtilen eşzamanlılıkla istek gönderir ve
+saniyedeki istek sayısını (req/s) ve gecikme yüzdeliklerini raporlar.
+
+Örnek - bağlantı havuzu karşılaştırması:
+
+    # 1) DB_CONNECTION_MODE=direct ile sunucuyu başlatıp ölçüm al
+    python benchmarks/loadtest.py --url http://localhost:8000/api/v1/envanter/part-types/ \
+        --token <token> --concurrency 32 --duration 30 --label direct
+
+    # 2) DB_CONNECTION_MODE=pool (ve istenirse DB_PREPARED_STATEMENTS=True) ile tekrar et
+    python benchmarks/loadtest.py --url http://localhost:8000/api/v1/envanter/part-types/ \
+        --token <token> --concurrency 32 --duration 30 --label pool
+
+WSGI / ASGI karşılaştırması (çok sayıda yavaş istemci):
+
+    # SERVER_MODE=wsgi ile senkron endpoint
+    python benchmarks/loadtest.py --url "http://localhost:8000/api/v1/montaj/assembled-aircrafts/check_missing_parts/?aircraft_model_name=TB2" \
+        --token <token> --concurrency 200 --think-time 0.5 --duration 30 --label wsgi
+
+    # SERVER_MODE=asgi ile async endpoint
+    python benchmarks/loadtest.py --url "http://localhost:8000/api/v1/montaj/async/assembled-aircrafts/check_missing_parts/?aircraft_model_name=TB2" \
+        --token <token> --concurrency 200 --think-time 0.5 --duration 30 --label asgi
+
+Login gibi kimlik doğrulaması gerektirmeyen POST istekleri için:
+
+    python benchmarks/loadtest.py --url http://localhost:8000/api/v1/users/login/ \
+        --method POST --data '{"username": "kanat", "password": "kanat123"}'
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LoadTest:
+    """Tek bir hedef URL'e sabit eşzamanlılıkla istek gönderen yük testi."""
+
+    def __init__(self, url, method='GET', data=None, headers=None, timeout=30):
+        self.url = url
+        self.method = method
+        self.data = data.encode('utf-8') if data else None
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.latencies = []
+        self.status_counts = {}
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _send_one(self):
+        request = urllib.request.Request(self.url, data=self.data, method=self.method, headers=self.headers)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                status_code = response.status
+        except urllib.error.HTTPError as e:
+            status_code = e.code
+        except (urllib.error.URLError, OSError):
+            status_code = None
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            if status_code is None:
+                self.errors += 1
+            else:
+                self.latencies.append(elapsed)
+                self.status_counts[status_code] = self.status_counts.get(status_code, 0) + 1
+
+    def _worker(self, deadline, remaining, think_time):
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                with self._lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+            self._send_one()
+            if think_time:
+                time.sleep(think_time)
+
+    def run(self, concurrency, duration=None, total_requests=None, think_time=0.0):
+        deadline = time.perf_counter() + (duration if duration else 10 ** 9)
+        remaining = [total_requests] if total_requests else None
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(self._worker, deadline, remaining, think_time)
+        return self.summary(time.perf_counter() - started)
+
+    def summary(self, wall_time):
+        latencies = sorted(self.latencies)
+        completed = len(latencies)
+        return {
+            'requests': completed,
+            'errors': self.errors,
+            'status_counts': self.status_counts,
+            'wall_time_s': round(wall_time, 3),
+            'requests_per_second': round(completed / wall_time, 2) if wall_time else 0.0,
+            'latency_ms': {
+                'mean': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+                'p50': round(_percentile(latencies, 50) * 1000, 2),
+                'p95': round(_percentile(latencies, 95) * 1000, 2),
+                'p99': round(_percentile(latencies, 99) * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            },
+        }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Hava Aracı Üretim API'si için HTTP yük testi.")
+    parser.add_argument('--url', required=True, help="Hedef URL.")
+    parser.add_argument('--method', default='GET', help="HTTP metodu (varsayılan: GET).")
+    parser.add_argument('--data', default=None, help="JSON istek gövdesi.")
+    parser.add_argument('--token', default=None, help="'Authorization: Token <token>' başlığı için token.")
+    parser.add_argument('--header', action='append', default=[], help="Ek başlık, 'Ad: Değer' formatında.")
+    parser.add_argument('--concurrency', type=int, default=10, help="Eşzamanlı istemci sayısı.")
+    parser.add_argument('--duration', type=float, default=None, help="Test süresi (saniye).")
+    parser.add_argument('--requests', type=int, default=None, help="Toplam istek sayısı.")
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help="Her istemcinin istekler arasında beklediği süre (saniye).")
+    parser.add_argument('--timeout', type=float, default=30, help="İstek zaman aşımı (saniye).")
+    parser.add_argument('--label', default=None, help="Sonuç çıktısına eklenecek etiket.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.duration and not args.requests:
+        args.duration = 10
+
+    headers = {'Accept': 'application/json'}
+    if args.data:
+        headers['Content-Type'] = 'application/json'
+    if args.token:
+        headers['Authorization'] = f"Token {args.token}"
+    for header in args.header:
+        name, _, value = header.partition(':')
+        headers[name.strip()] = value.strip()
+
+    load_test = LoadTest(args.url, method=args.method.upper(), data=args.data, headers=headers,
+                         timeout=args.timeout)
+    result = load_test.run(args.concurrency, duration=args.duration, total_requests=args.requests,
+                           think_time=args.think_time)
+    result['label'] = args.label
+    result['concurrency'] = args.concurrency
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return result
+
+
+if __name__ == '__main__':
+    main()
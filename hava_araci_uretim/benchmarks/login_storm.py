@@ -0,0 +1,136 @@
+"""
+Vardiya değişimindeki giriş dalgası (login storm).
+
+Verilen sayıda kullanıcı (varsayılan şifre hasher'ı ile) oluşturulur ve `--concurrency` thread'den (sync
+worker'ları temsil eder) eşzamanlı girişler yapılır. İki akış karşılaştırılır:
+
+- eski: Bu değişiklikten önceki `UserLoginAPIView` akışı. Kullanıcı sorgusu, worker'da `check_password`,
+  `Token.get_or_create` ve tam `UserSerializer`.
+- yeni: apps.users.login. Kullanıcı ve token tek sorgu, şifre doğrulaması sınırlı havuzda, kısa yanıt.
+
+Her kullanıcı `--rounds` kez giriş yapar (ilk turda token oluşturulur, sonrakilerde tekrar kullanılır).
+Saniyedeki giriş, p50/p99 süre, giriş başına sorgu sayısı ve reddedilen (503) girişler raporlanır.
+Oluşturulan kullanıcılar (ve token'ları) sonunda silinir.
+
+Tabloya doğrudan yazdığı için sadece test veritabanında çalıştırılmalıdır (`--yes` gerekir).
+
+Örnek:
+
+    python benchmarks/login_storm.py --users 200 --concurrency 16 --yes
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+USERNAME_PREFIX = 'bench-login-'
+PASSWORD = 'vardiya-sifresi'
+
+
+def _setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apps.hava_araci_uretim_app.settings')
+    import django
+    django.setup()
+
+
+def _seed(users):
+    from django.contrib.auth.models import User
+    from apps.users.models import UserProfile
+    from apps.users.passwords import hash_passwords
+
+    passwords = hash_passwords([PASSWORD] * users, workers=os.cpu_count() or 1)
+    created = User.objects.bulk_create([
+        User(username=f'{USERNAME_PREFIX}{i:06d}', password=password) for i, password in enumerate(passwords)
+    ])
+    UserProfile.objects.bulk_create([UserProfile(user=user) for user in created])
+    return [user.username for user in created]
+
+
+def _old_login(username):
+    """Bu değişiklikten önceki giriş akışı (bkz. git geçmişi, UserLoginAPIView.post)."""
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+    from apps.users.serializers import UserSerializer
+
+    user = User.objects.get(username=username)
+    if not user.check_password(PASSWORD):
+        raise AssertionError(username)
+    token, _created = Token.objects.get_or_create(user=user)
+    return {'token': token.key, 'user': UserSerializer(user).data}
+
+
+def _new_login(username):
+    from apps.users import login
+    return login.login(username, PASSWORD)
+
+
+def _queries_per_login(func, username):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        func(username)
+    return len(queries.captured_queries)
+
+
+def _storm(func, usernames, rounds, concurrency):
+    """(saniyedeki giriş, süreler ms, reddedilen giriş sayısı) döndürür."""
+    from django.db import connection
+    from apps.users.login import LoginBusy
+
+    def one(username):
+        started = time.perf_counter()
+        try:
+            func(username)
+        except LoginBusy:
+            return None
+        finally:
+            connection.close()  # Her thread kendi bağlantısını açar, worker'lar gibi istek sonunda kapatılır.
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, usernames * rounds))
+    elapsed = time.perf_counter() - started
+    timings = sorted(result for result in results if result is not None)
+    return len(timings) / elapsed, timings, results.count(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=2, help="Kullanıcı başına giriş sayısı")
+    parser.add_argument('--concurrency', type=int, default=16, help="Eşzamanlı giriş yapan thread sayısı")
+    parser.add_argument('--yes', action='store_true', help="Test veritabanında çalışıldığını onaylar")
+    args = parser.parse_args()
+    if not args.yes:
+        parser.error("Bu script kullanıcı ve token tablolarına yazar, test veritabanında --yes ile çalıştırın.")
+
+    _setup_django()
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.db import connection
+
+    print(f"Veritabanı: {connection.vendor}, {args.users} kullanıcı x {args.rounds} giriş, "
+          f"{args.concurrency} eşzamanlı, hash thread'leri {settings.LOGIN_HASH_THREADS}, "
+          f"kuyruk {settings.LOGIN_HASH_QUEUE}")
+    try:
+        usernames = _seed(args.users)
+        for label, func in (('eski', _old_login), ('yeni', _new_login)):
+            rate, timings, rejected = _storm(func, usernames, args.rounds, args.concurrency)
+            queries = _queries_per_login(func, usernames[0])
+            p50 = timings[len(timings) // 2] if timings else 0
+            p99 = timings[int(len(timings) * 0.99)] if timings else 0
+            print(f"{label:>5}: {rate:7.1f} giriş/sn  p50 {p50:8.1f} ms  p99 {p99:8.1f} ms  "
+                  f"{queries} sorgu/giriş  {rejected} reddedildi (503)")
+    finally:
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Soğuk parçaların arşivlenmesinin stok sorgularına etkisi.
+
+Verilen sayıda parça oluşturulur (çoğu geri dönüşümde, bir kısmı stokta). Sık kullanılan stok
+sorguları (stoktaki parçaların listesi ve sayımı) arşivlemeden önce ve sonra ölçülür.
+Oluşturulan satırlar sonunda silinir.
+
+Tabloya doğrudan yazdığı için sadece test veritabanında çalıştırılmalıdır (`--yes` gerekir).
+
+Örnek:
+
+    python benchmarks/part_storage.py --parts 200000 --in-stock-ratio 0.05 --yes
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERIAL_PREFIX = 'BENCH-STORAGE-'
+
+
+def _setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apps.hava_araci_uretim_app.settings')
+    import django
+    django.setup()
+
+
+def _create_parts(count, in_stock_ratio):
+    from django.utils import timezone
+    from apps.envanter.models import AircraftModel, Part, PartType
+
+    part_type, _ = PartType.objects.get_or_create(name='KANAT')
+    aircraft_model, _ = AircraftModel.objects.get_or_create(name='TB2')
+    in_stock_every = max(1, round(1 / in_stock_ratio)) if in_stock_ratio else 0
+    old = timezone.now() - timedelta(days=365)
+    batch = []
+    for i in range(count):
+        in_stock = in_stock_every and i % in_stock_every == 0
+        batch.append(Part(
+            part_type=part_type, aircraft_model_compatibility=aircraft_model,
+            serial_number=f'{SERIAL_PREFIX}{i:09d}', status='STOKTA' if in_stock else 'GERI_DONUSUMDE',
+        ))
+        if len(batch) == 5000:
+            Part.objects.bulk_create(batch)
+            batch = []
+    Part.objects.bulk_create(batch)
+    # auto_now alanı bulk_create ile geçmişe alınamaz.
+    Part.objects.filter(serial_number__startswith=SERIAL_PREFIX).update(updated_at=old)
+    return part_type, aircraft_model
+
+
+def _measure(part_type, aircraft_model, iterations):
+    from django.db.models import Count
+    from apps.envanter.models import Part
+
+    in_stock = Part.objects.filter(status='STOKTA', part_type=part_type, aircraft_model_compatibility=aircraft_model)
+    queries = {
+        'liste': lambda: list(in_stock.order_by('-created_at').values_list('id', flat=True)[:20]),
+        'sayım': lambda: in_stock.count(),
+        'durum sayımı': lambda: list(Part.objects.values('status').annotate(total=Count('id')).order_by()),
+    }
+    results = {}
+    for name, query in queries.items():
+        query()  # ısınma
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            query()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = statistics.median(timings)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--parts', type=int, default=100000)
+    parser.add_argument('--in-stock-ratio', type=float, default=0.05)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--yes', action='store_true', help="Test veritabanında çalışıldığını onaylar")
+    args = parser.parse_args()
+    if not args.yes:
+        parser.error("Bu script parça tablosuna yazar, test veritabanında --yes ile çalıştırın.")
+
+    _setup_django()
+    from django.db import connection
+    from django.utils import timezone
+    from apps.envanter.archive import archive_recycled_parts
+    from apps.envanter.models import Part, PartArchive
+
+    print(f"Veritabanı: {connection.vendor}, {args.parts} parça, stok oranı {args.in_stock_ratio}")
+    try:
+        part_type, aircraft_model = _create_parts(args.parts, args.in_stock_ratio)
+        before = _measure(part_type, aircraft_model, args.iterations)
+
+        started = time.perf_counter()
+        moved = archive_recycled_parts(timezone.now() - timedelta(days=90), batch_size=5000)
+        print(f"Arşivlenen: {moved} parça, {time.perf_counter() - started:.1f} sn")
+
+        after = _measure(part_type, aircraft_model, args.iterations)
+        for name in before:
+            print(f"{name:>14}: önce {before[name]:8.2f} ms  sonra {after[name]:8.2f} ms")
+    finally:
+        Part.objects.filter(serial_number__startswith=SERIAL_PREFIX)._raw_delete(Part.objects.db)
+        PartArchive.objects.filter(serial_number__startswith=SERIAL_PREFIX).delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Gunicorn soğuk başlangıç ve ilk istek gecikmesi ölçümü (sadece standart kütüphane).
+
+Sunucuyu seçilen profille başlatır, ilk yanıtın ne kadar sürede geldiğini ve ilk
+isteklerin (her worker'ın ilk isteği dahil) sonraki isteklere göre ne kadar yavaş
+olduğunu raporlar. Veritabanı ve diğer ayarlar ortam değişkenlerinden okunur.
+
+Profiller:
+- legacy: Eski entrypoint komutu (sabit 3 sync worker, preload yok, ısınma yok).
+- tuned:  gunicorn.conf.py (preload + fork öncesi ısınma, CPU'ya göre worker sayısı).
+
+Örnek:
+
+    python benchmarks/startup.py --profile legacy --runs 3
+    python benchmarks/startup.py --profile tuned --runs 3
+
+    # Kimlik doğrulamalı bir endpoint ile:
+    python benchmarks/startup.py --profile tuned --path /api/v1/envanter/part-types/ --token <token>
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+LEGACY_ARGS = [
+    'apps.hava_araci_uretim_app.wsgi:application',
+    '--workers', '3',
+    '--timeout', '120',
+]
+
+
+def _server_command(profile, bind, empty_config):
+    if profile == 'legacy':
+        # Çalışma dizinindeki gunicorn.conf.py'nin otomatik yüklenmemesi için boş bir config verilir.
+        return [sys.executable, '-m', 'gunicorn', '-c', empty_config, '--bind', bind, *LEGACY_ARGS]
+    return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py']
+
+
+def _port_open(host, port):
+    try:
+        with socket.create_connection((host, port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+
+def _request(url, headers):
+    request = urllib.request.Request(url, headers={**headers, 'Connection': 'close'})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            status_code = response.status
+    except urllib.error.HTTPError as e:
+        status_code = e.code
+    return status_code, time.perf_counter() - started
+
+
+def measure_once(profile, host, port, path, headers, requests_count, startup_timeout):
+    bind = f"{host}:{port}"
+    url = f"http://{bind}{path}"
+    env = {**os.environ, 'GUNICORN_BIND': bind, 'GUNICORN_LOG_LEVEL': 'warning'}
+
+    with tempfile.NamedTemporaryFile('w', suffix='.py') as empty_config:
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            _server_command(profile, bind, empty_config.name),
+            cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            while not _port_open(host, port):
+                if process.poll() is not None:
+                    raise RuntimeError(f"Sunucu başlatılamadı (çıkış kodu {process.returncode}).")
+                if time.perf_counter() - started > startup_timeout:
+                    raise RuntimeError("Sunucu zamanında başlamadı.")
+                time.sleep(0.02)
+            port_open_s = time.perf_counter() - started
+
+            first_status, first_latency = _request(url, headers)
+            first_response_s = time.perf_counter() - started
+
+            latencies = [first_latency]
+            statuses = {first_status: 1}
+            for _ in range(requests_count - 1):
+                status_code, latency = _request(url, headers)
+                latencies.append(latency)
+                statuses[status_code] = statuses.get(status_code, 0) + 1
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    steady = latencies[len(latencies) // 2:]
+    return {
+        'port_open_s': round(port_open_s, 3),
+        'first_response_s': round(first_response_s, 3),
+        'first_request_ms': round(first_latency * 1000, 2),
+        'max_first_10_ms': round(max(latencies[:10]) * 1000, 2),
+        'steady_p50_ms': round(statistics.median(steady) * 1000, 2),
+        'status_counts': statuses,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Gunicorn soğuk başlangıç ve ilk istek gecikmesi ölçümü.")
+    parser.add_argument('--profile', choices=['legacy', 'tuned'], default='tuned')
+    parser.add_argument('--path', default='/api/v1/envanter/part-types/', help="İstek atılacak yol.")
+    parser.add_argument('--token', default=None, help="'Authorization: Token <token>' başlığı için token.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--requests', type=int, default=40, help="Her çalıştırmada atılacak sıralı istek sayısı.")
+    parser.add_argument('--runs', type=int, default=3, help="Sunucunun kaç kez baştan başlatılacağı.")
+    parser.add_argument('--startup-timeout', type=float, default=60)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    headers = {'Accept': 'application/json'}
+    if args.token:
+        headers['Authorization'] = f"Token {args.token}"
+
+    runs = [
+        measure_once(args.profile, args.host, args.port, args.path, headers, args.requests, args.startup_timeout)
+        for _ in range(args.runs)
+    ]
+    result = {
+        'profile': args.profile,
+        'runs': runs,
+        'median': {
+            key: round(statistics.median(run[key] for run in runs), 3)
+            for key in ('port_open_s', 'first_response_s', 'first_request_ms', 'max_first_10_ms', 'steady_p50_ms')
+        },
+    }
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return result
+
+
+if __name__ == '__main__':
+    main()
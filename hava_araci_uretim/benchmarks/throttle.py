@@ -0,0 +1,76 @@
+"""
+Rate limit kontrolünün istek başına maliyeti.
+
+DRF throttle sınıflarının `allow_request` çağrısını doğrudan ölçer (HTTP ve view maliyeti
+dahil değildir). İki backend karşılaştırılır:
+
+- cache:    DRF varsayılanı. Process başına LocMem, istek zamanları listesi.
+- database: apps.core.throttling. Ortak token bucket tablosu, kontrol başına tek upsert.
+
+Veritabanı ayarları ortam değişkenlerinden okunur (manage.py ile aynı).
+
+Örnek:
+
+    python benchmarks/throttle.py --iterations 5000 --clients 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def _setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apps.hava_araci_uretim_app.settings')
+    import django
+    django.setup()
+
+
+def _measure(backend, iterations, clients):
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory, override_settings
+    from apps.core.throttling import AnonRateThrottle
+
+    factory = RequestFactory()
+    requests = [factory.get('/', REMOTE_ADDR=f'10.0.{i // 250}.{i % 250}') for i in range(clients)]
+    for request in requests:
+        request.user = AnonymousUser()
+    timings = []
+    # Limit ölçüm sırasında dolmasın diye oran yüksek tutulur.
+    with override_settings(THROTTLE_BACKEND=backend):
+        AnonRateThrottle.THROTTLE_RATES = {**AnonRateThrottle.THROTTLE_RATES, 'anon': '1000000/hour'}
+        for i in range(iterations):
+            request = requests[i % clients]
+            started = time.perf_counter()
+            AnonRateThrottle().allow_request(request, None)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--clients', type=int, default=50, help="Farklı IP adresi sayısı")
+    args = parser.parse_args()
+
+    _setup_django()
+    from apps.core.throttling import purge_expired_buckets
+    from django.db import connection
+
+    print(f"Veritabanı: {connection.vendor}, {args.iterations} kontrol, {args.clients} istemci")
+    for backend in ('cache', 'database'):
+        _measure(backend, min(200, args.iterations), args.clients)  # ısınma
+        timings = sorted(_measure(backend, args.iterations, args.clients))
+        p50 = timings[len(timings) // 2]
+        p99 = timings[int(len(timings) * 0.99)]
+        print(f"{backend:>9}: ortalama {statistics.mean(timings):7.1f} µs  p50 {p50:7.1f} µs  p99 {p99:7.1f} µs")
+    purge_expired_buckets(now=time.time() + 10 ** 9)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,8 +15,19 @@ set -e
 # done
 # >&2 echo "Postgres is up - continuing"
 
-echo "Applying database migrations..."
-python manage.py migrate --noinput
+# Migration'lar her container açılışında değil, ayrı ve tek seferlik bir adımda çalışır:
+#   ./entrypoint.sh migrate   (docker-compose'daki `migrate` servisi)
+# Tek container ile geliştirme yaparken RUN_MIGRATIONS=True verilerek eski davranış elde edilebilir.
+if [ "$1" = "migrate" ]; then
+    echo "Applying database migrations..."
+    exec python manage.py migrate --noinput
+fi
+
+RUN_MIGRATIONS=${RUN_MIGRATIONS:-False}
+if [ "$RUN_MIGRATIONS" = "True" ] || [ "$RUN_MIGRATIONS" = "true" ] || [ "$RUN_MIGRATIONS" = "1" ]; then
+    echo "Applying database migrations..."
+    python manage.py migrate --noinput
+fi
 
 # Statik dosyaları toplama (Nginx sunacaksa)
 # Eğer Django admin paneli veya WhiteNoise kullanılıyorsa gereklidir.
@@ -30,15 +41,10 @@ python manage.py migrate --noinput
 # python manage.py collectstatic --noinput --clear
 # echo "Static files collected."
 
-echo "Starting Gunicorn..."
-# `hava_araci_uretim_app` sizin ana proje klasörünüzün adı olmalı (wsgi.py'nin olduğu yer)
-# --workers: Genellikle 2 * CPU_CORES + 1 olarak ayarlanır.
-# --timeout: Uzun süren istekler için timeout süresi (saniye cinsinden).
-exec gunicorn apps.hava_araci_uretim_app.wsgi:application \
-    --bind 0.0.0.0:8000 \
-    --workers 3 \
-    --timeout 120 \
-    --log-level=info \
-    --access-logfile '-' \
-    --error-logfile '-'
-# '-' logları stdout/stderr'e yönlendirir, Docker logları için iyidir.
\ No newline at end of file
+# SERVER_MODE=wsgi (varsayılan): Senkron gunicorn worker'ları ile WSGI uygulaması.
+# SERVER_MODE=asgi: Uvicorn worker'ları ile ASGI uygulaması. Bu modda */async/* okuma endpoint'leri
+# veritabanını beklerken worker'ı bloklamaz. Senkron DRF ViewSet'leri de çalışmaya devam eder,
+# ancak Django onları bir thread üzerinden çalıştırır.
+# Worker sayısı, preload, ısınma ve worker geri dönüşümü gunicorn.conf.py içinde ayarlanır.
+echo "Starting Gunicorn (SERVER_MODE=${SERVER_MODE:-wsgi})..."
+exec gunicorn -c gunicorn.conf.py
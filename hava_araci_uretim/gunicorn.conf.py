@@ -0,0 +1,76 @@
+"""
+Gunicorn çalışma profili.
+
+`gunicorn -c gunicorn.conf.py` ile kullanılır (entrypoint.sh bunu yapar). Tüm değerler ortam
+değişkenleriyle değiştirilebilir:
+
+- SERVER_MODE: 'wsgi' (varsayılan) veya 'asgi' (Uvicorn worker'ları).
+- GUNICORN_WORKERS: Worker sayısı. Varsayılan WSGI için 2 * CPU + 1, ASGI için CPU sayısı.
+- GUNICORN_THREADS: Worker başına thread sayısı (sadece WSGI). 1'den büyükse gthread kullanılır.
+- GUNICORN_PRELOAD: Uygulamayı master process'te yükleyip ısıttıktan sonra fork et (varsayılan: True).
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: Worker'lar bu kadar istekten sonra
+  yeniden başlatılır, böylece bellek büyümesi sınırlanır. Jitter, tüm worker'ların aynı anda
+  yeniden başlamasını engeller.
+- GUNICORN_TIMEOUT, GUNICORN_KEEPALIVE, GUNICORN_LOG_LEVEL, GUNICORN_BIND.
+
+Not: DB_CONNECTION_MODE=pool iken toplam bağlantı sayısı workers * DB_POOL_MAX_SIZE olur.
+"""
+import os
+
+# `config` gunicorn'da bir ayar adı olduğu için farklı bir isimle import edilir.
+from decouple import Choices, config as _config
+
+
+def _cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+_server_mode = _config("SERVER_MODE", default='wsgi', cast=Choices(['wsgi', 'asgi']))
+_cpus = _cpu_count()
+
+if _server_mode == 'asgi':
+    wsgi_app = 'apps.hava_araci_uretim_app.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    workers = _config("GUNICORN_WORKERS", default=_cpus, cast=int)
+    threads = 1
+else:
+    wsgi_app = 'apps.hava_araci_uretim_app.wsgi:application'
+    threads = _config("GUNICORN_THREADS", default=1, cast=int)
+    worker_class = 'gthread' if threads > 1 else 'sync'
+    workers = _config("GUNICORN_WORKERS", default=2 * _cpus + 1, cast=int)
+
+bind = _config("GUNICORN_BIND", default='0.0.0.0:8000')
+preload_app = _config("GUNICORN_PRELOAD", default=True, cast=bool)
+
+max_requests = _config("GUNICORN_MAX_REQUESTS", default=1000, cast=int)
+max_requests_jitter = _config("GUNICORN_MAX_REQUESTS_JITTER", default=100, cast=int)
+
+timeout = _config("GUNICORN_TIMEOUT", default=120, cast=int)
+graceful_timeout = _config("GUNICORN_GRACEFUL_TIMEOUT", default=30, cast=int)
+keepalive = _config("GUNICORN_KEEPALIVE", default=5, cast=int)
+
+loglevel = _config("GUNICORN_LOG_LEVEL", default='info')
+accesslog = '-'  # '-' logları stdout/stderr'e yönlendirir, Docker logları için iyidir.
+errorlog = '-'
+
+
+def _warm_up(log):
+    from apps.core.warmup import warm_up
+
+    for step, details in warm_up().items():
+        log.info("Warm-up %s: %s (%s ms)", step, details['result'], details['ms'])
+
+
+def when_ready(server):
+    # preload_app açıkken uygulama bu noktada master'da yüklenmiştir, worker'lar henüz fork edilmemiştir.
+    if server.cfg.preload_app:
+        _warm_up(server.log)
+
+
+def post_worker_init(worker):
+    # Preload kapalıysa her worker kendi başına ısınır.
+    if not worker.cfg.preload_app:
+        _warm_up(worker.log)